@@ -3,9 +3,12 @@ from .exceptions import (
     ResourceExistsError,
     ResourceNotFoundError,
     ClientAuthenticationError,
-    HttpResponseError
+    HttpResponseError,
+    ThrottlingError
 )
 from .paging import ItemPaged
+from .async_paging import AsyncItemPaged
+from .policies import AdaptiveRateLimiter, RetryPolicy
 
 __all__ = [
     'AzureError',
@@ -13,5 +16,9 @@ __all__ = [
     'ResourceNotFoundError',
     'ClientAuthenticationError',
     'HttpResponseError',
-    'ItemPaged'
+    'ThrottlingError',
+    'ItemPaged',
+    'AsyncItemPaged',
+    'AdaptiveRateLimiter',
+    'RetryPolicy'
 ]
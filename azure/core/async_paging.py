@@ -0,0 +1,75 @@
+"""Async paging support for Azure SDK"""
+import asyncio
+from typing import Any, AsyncIterator, Callable, List, Optional, Sequence, Tuple, TypeVar, Generic
+from .instrumentation import Instrumentation
+from .paging import PageSnapshot
+from .simulation import DEFAULT_PROFILE, SimulationProfile
+
+T = TypeVar('T')
+
+
+class AsyncItemPaged(Generic[T], AsyncIterator[T]):
+    """Async paged iteration of items
+
+    The asyncio counterpart of ``ItemPaged``: pages come lazily from a
+    ``PageSnapshot`` and, with ``prefetch``, the next page is fetched in a
+    task while the caller works through the current one.
+    """
+
+    def __init__(self, items: Sequence[T], page_size: int = 100,
+                 resolve: Optional[Callable[[Sequence[Any]], List[T]]] = None,
+                 prefetch: bool = True, simulation: Optional[SimulationProfile] = None,
+                 instrumentation: Optional[Instrumentation] = None):
+        self.items = items
+        self.page_size = page_size
+        self.prefetch = prefetch
+        self.simulation = DEFAULT_PROFILE if simulation is None else simulation
+        self.instrumentation = instrumentation
+        self._snapshot = PageSnapshot(items, page_size, resolve)
+        self._iterator: Optional[AsyncIterator[T]] = None
+
+    def __aiter__(self) -> AsyncIterator[T]:
+        return self
+
+    async def __anext__(self) -> T:
+        if self._iterator is None:
+            self._iterator = self._items()
+        return await self._iterator.__anext__()
+
+    async def _items(self) -> AsyncIterator[T]:
+        async for page, _ in self.by_page():
+            for item in page:
+                yield item
+
+    async def by_page(self, continuation_token: Optional[str] = None) -> AsyncIterator[Tuple[List[T], Optional[str]]]:
+        """Return pages of items, as (items, continuation token of the next page)"""
+        start = self._snapshot.decode(continuation_token)
+        pending: Optional[asyncio.Task] = None
+        page = await self._fetch(start, delay=continuation_token is not None)
+        try:
+            while True:
+                items, next_token = page
+                if next_token is not None and self.prefetch:
+                    pending = asyncio.ensure_future(self._fetch(self._snapshot.decode(next_token), True))
+                if items or next_token is None:
+                    yield items, next_token
+                if next_token is None:
+                    return
+                page = await pending if pending is not None else \
+                    await self._fetch(self._snapshot.decode(next_token), True)
+                pending = None
+        finally:
+            # The caller stopped early: drop the page being prefetched
+            if pending is not None:
+                pending.cancel()
+
+    async def _fetch(self, start: int, delay: bool) -> Tuple[List[T], Optional[str]]:
+        if not delay:
+            return self._snapshot.page(start)
+        if self.instrumentation is not None:
+            return await self.instrumentation.call_async('paging.page', self._round_trip, start)
+        return await self._round_trip(start)
+
+    async def _round_trip(self, start: int) -> Tuple[List[T], Optional[str]]:
+        await self.simulation.delay_async('paging.page')
+        return self._snapshot.page(start)
@@ -1,4 +1,5 @@
 """Azure SDK exceptions"""
+from typing import Optional
 
 
 class AzureError(Exception):
@@ -37,5 +38,7 @@ class ClientAuthenticationError(HttpResponseError):
 
 class ThrottlingError(HttpResponseError):
     """Rate limiting error"""
-    def __init__(self, message: str):
+    def __init__(self, message: str, retry_after: Optional[float] = None):
         super().__init__(message, 429)
+        # Seconds the service asked us to wait (Retry-After header)
+        self.retry_after = retry_after
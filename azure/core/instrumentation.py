@@ -0,0 +1,309 @@
+"""Metrics and tracing of SDK operations
+
+A client built with ``metrics=True`` or a ``tracer`` routes every
+operation (and every page a pager fetches) through an ``Instrumentation``,
+which keeps per-operation ``Metrics`` and opens a span per call. Without
+either, operations are not wrapped at all and cost nothing extra.
+
+Tracers follow the OpenTelemetry ``Tracer`` interface: spans are opened
+with ``start_as_current_span(name, attributes=...)`` and ended when the
+``with`` block exits, recording any exception that escapes it. A tracer
+from ``opentelemetry.trace.get_tracer(...)`` can be passed as it is;
+``RecordingTracer`` keeps finished spans in memory, shaped like
+OpenTelemetry's span data, for tests and for exporting by hand.
+"""
+import functools
+import inspect
+import secrets
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional
+
+# Values below 2 ** _SUB_BUCKET_BITS microseconds are kept exactly; above
+# that each power of two is split in 2 ** (_SUB_BUCKET_BITS - 1) buckets,
+# so every recorded latency is known to within 1.6%
+_SUB_BUCKET_BITS = 7
+_HALF_BUCKETS = 1 << (_SUB_BUCKET_BITS - 1)
+_NO_SPAN = nullcontext()
+
+
+class LatencyHistogram:
+    """Latency distribution in log-linear buckets of microseconds, like an HDR histogram
+
+    Recording is O(1) and memory grows with the range of latencies seen,
+    not with the number of calls. Not thread-safe on its own.
+    """
+
+    def __init__(self):
+        self._buckets: Dict[int, int] = {}
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float) -> None:
+        micros = max(int(seconds * 1e6), 0)
+        shift = max(micros.bit_length() - _SUB_BUCKET_BITS, 0)
+        index = shift * _HALF_BUCKETS + (micros >> shift)
+        self._buckets[index] = self._buckets.get(index, 0) + 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def merge(self, other: 'LatencyHistogram') -> None:
+        """Add the latencies recorded by ``other``"""
+        for index, count in other._buckets.items():
+            self._buckets[index] = self._buckets.get(index, 0) + count
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+
+    def percentile(self, percent: float) -> float:
+        """Latency in seconds that ``percent`` of the calls did not exceed (0.0 if none were recorded)"""
+        if not self.count:
+            return 0.0
+        rank = max(percent / 100 * self.count, 1)
+        seen = 0
+        for index in sorted(self._buckets):
+            seen += self._buckets[index]
+            if seen >= rank:
+                return min(self._bucket_value(index), self.max)
+        return self.max
+
+    @staticmethod
+    def _bucket_value(index: int) -> float:
+        """The middle of a bucket, in seconds"""
+        shift = max(index // _HALF_BUCKETS - 1, 0)
+        low = (index - shift * _HALF_BUCKETS) << shift
+        return (low + ((1 << shift) - 1) / 2) / 1e6
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            'count': self.count,
+            'mean': self.total / self.count if self.count else 0.0,
+            'p50': self.percentile(50),
+            'p95': self.percentile(95),
+            'p99': self.percentile(99),
+            'max': self.max,
+        }
+
+
+class _OperationStats:
+    __slots__ = ('calls', 'errors', 'latency')
+
+    def __init__(self):
+        self.calls = 0
+        self.errors: Dict[Any, int] = {}
+        self.latency = LatencyHistogram()
+
+
+class Metrics:
+    """Call counts, errors by status code and latency histograms per operation
+
+    Errors are counted under their HTTP status code (429, 403, ...), or the
+    exception's class name if it has none; a batch call that succeeds also
+    counts the errors of its failed items. Latencies are measured on the
+    client's simulation clock, so they are simulated seconds on a virtual
+    clock. ``paging.page`` counts the pages fetched after the first of a
+    listing; its total is the time spent waiting for them.
+    """
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._operations: Dict[str, _OperationStats] = {}
+
+    def record(self, operation: str, seconds: float, error: Optional[BaseException] = None,
+               item_errors: Iterable[BaseException] = ()) -> None:
+        with self._lock:
+            stats = self._operations.get(operation)
+            if stats is None:
+                stats = self._operations[operation] = _OperationStats()
+            stats.calls += 1
+            stats.latency.record(seconds)
+            failures = list(item_errors)
+            if error is not None:
+                failures.append(error)
+            for failure in failures:
+                status = error_status(failure)
+                stats.errors[status] = stats.errors.get(status, 0) + 1
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """{operation: {'calls', 'errors': {status: count}, 'total_seconds', 'latency': {...}}}"""
+        with self._lock:
+            return {operation: {
+                'calls': stats.calls,
+                'errors': dict(stats.errors),
+                'total_seconds': stats.latency.total,
+                'latency': stats.latency.summary(),
+            } for operation, stats in sorted(self._operations.items())}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._operations.clear()
+
+
+def error_status(error: BaseException) -> Any:
+    """HTTP status code of an error, or its class name"""
+    status = getattr(error, 'status_code', None)
+    return status if status is not None else type(error).__name__
+
+
+class Span:
+    """A finished or running span, with the fields of an OpenTelemetry span"""
+
+    def __init__(self, name: str, trace_id: str, span_id: str, parent_id: Optional[str],
+                 start_time: int, attributes: Optional[Dict[str, Any]] = None):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = span_id
+        self.parent_id = parent_id
+        self.start_time = start_time
+        self.end_time: Optional[int] = None
+        self.attributes: Dict[str, Any] = dict(attributes or {})
+        self.status = 'UNSET'
+        self.events: List[Dict[str, Any]] = []
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def set_status(self, status: Any, description: Optional[str] = None) -> None:
+        """Accepts 'OK' / 'ERROR' or an OpenTelemetry ``Status``"""
+        code = getattr(status, 'status_code', status)
+        self.status = getattr(code, 'name', code)
+
+    def record_exception(self, exception: BaseException) -> None:
+        self.events.append({'name': 'exception', 'attributes': {
+            'exception.type': type(exception).__name__,
+            'exception.message': str(exception),
+        }})
+
+    def to_dict(self) -> Dict[str, Any]:
+        """The span in the layout of OpenTelemetry's JSON export"""
+        return {
+            'name': self.name,
+            'context': {'trace_id': self.trace_id, 'span_id': self.span_id},
+            'parent_id': self.parent_id,
+            'start_time': self.start_time,
+            'end_time': self.end_time,
+            'attributes': dict(self.attributes),
+            'status': {'status_code': self.status},
+            'events': list(self.events),
+        }
+
+
+class RecordingTracer:
+    """Tracer keeping the last ``max_spans`` finished spans in memory
+
+    Spans opened inside another span (in the same thread or task) become
+    its children. ``exporter``, if given, is called with each finished span.
+    Timestamps come from ``clock`` (real time by default); pass the client's
+    ``simulation.clock`` to trace simulated time.
+    """
+
+    def __init__(self, max_spans: int = 10_000, exporter: Optional[Callable[[Span], None]] = None,
+                 clock=None):
+        self.spans: Deque[Span] = deque(maxlen=max_spans)
+        self.exporter = exporter
+        self.clock = clock
+        self._current: ContextVar[Optional[Span]] = ContextVar('recording_tracer_span', default=None)
+
+    @contextmanager
+    def start_as_current_span(self, name: str, attributes: Optional[Dict[str, Any]] = None, **kwargs):
+        parent = self._current.get()
+        span = Span(name,
+                    parent.trace_id if parent is not None else secrets.token_hex(16),
+                    secrets.token_hex(8),
+                    parent.span_id if parent is not None else None,
+                    self._time_ns(), attributes)
+        token = self._current.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.record_exception(e)
+            span.set_status('ERROR')
+            raise
+        finally:
+            self._current.reset(token)
+            span.end_time = self._time_ns()
+            self.spans.append(span)
+            if self.exporter is not None:
+                self.exporter(span)
+
+    def finished_spans(self) -> List[Span]:
+        return list(self.spans)
+
+    def _time_ns(self) -> int:
+        return time.time_ns() if self.clock is None else int(self.clock.time() * 1e9)
+
+
+class Instrumentation:
+    """Wraps operations to record ``metrics`` and open spans on ``tracer``; either may be None"""
+
+    def __init__(self, metrics: Optional[Metrics], tracer=None, clock=None):
+        self.metrics = metrics
+        self.tracer = tracer
+        self.clock = clock
+
+    def wrap(self, operation: str, func: Callable) -> Callable:
+        """``func`` (sync or coroutine function), instrumented as ``operation``"""
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                return await self.call_async(operation, func, *args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            return self.call(operation, func, *args, **kwargs)
+        return wrapper
+
+    def call(self, operation: str, func: Callable, *args, **kwargs):
+        """Call ``func``, instrumented as ``operation``"""
+        with self.span(operation) if self.tracer is not None else _NO_SPAN:
+            started = self.clock.now()
+            try:
+                result = func(*args, **kwargs)
+            except Exception as e:
+                self._record(operation, started, e)
+                raise
+            self._record(operation, started, result=result)
+            return result
+
+    async def call_async(self, operation: str, func: Callable, *args, **kwargs):
+        """Await ``func``, instrumented as ``operation``"""
+        with self.span(operation) if self.tracer is not None else _NO_SPAN:
+            started = self.clock.now()
+            try:
+                result = await func(*args, **kwargs)
+            except Exception as e:
+                self._record(operation, started, e)
+                raise
+            self._record(operation, started, result=result)
+            return result
+
+    @contextmanager
+    def span(self, operation: str):
+        """A span for ``operation`` on the tracer"""
+        with self.tracer.start_as_current_span(operation, attributes={'az.operation': operation}) as span:
+            try:
+                yield span
+            except Exception as e:
+                span.set_attribute('error.type', type(e).__name__)
+                status = getattr(e, 'status_code', None)
+                if status is not None:
+                    span.set_attribute('http.response.status_code', status)
+                raise
+
+    def _record(self, operation: str, started: float, error: Optional[BaseException] = None,
+                result: Any = None) -> None:
+        if self.metrics is None:
+            return
+        item_errors = ()
+        # Batch calls return a result (with ``succeeded`` and ``error``) per item
+        if isinstance(result, list) and result and hasattr(result[0], 'succeeded'):
+            item_errors = [item.error for item in result if not item.succeeded]
+        self.metrics.record(operation, self.clock.now() - started, error, item_errors)
@@ -1,39 +1,135 @@
 """Paging support for Azure SDK"""
-import time
-from typing import Iterator, List, Any, Optional, TypeVar, Generic
+import base64
+import secrets
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Iterator, List, Any, Optional, Sequence, Tuple, TypeVar, Generic
+from .exceptions import HttpResponseError
+from .instrumentation import Instrumentation
+from .simulation import DEFAULT_PROFILE, SimulationProfile
 
 T = TypeVar('T')
 
+_prefetch_executor: Optional[ThreadPoolExecutor] = None
+_prefetch_executor_lock = threading.Lock()
+
+
+def _executor() -> ThreadPoolExecutor:
+    global _prefetch_executor
+    with _prefetch_executor_lock:
+        if _prefetch_executor is None:
+            _prefetch_executor = ThreadPoolExecutor(max_workers=16, thread_name_prefix='azure-core-paging')
+        return _prefetch_executor
+
+
+class PageSnapshot:
+    """The listing a pager walks, and its continuation tokens
+
+    ``entries`` is fixed when the listing starts (usually store keys, which
+    are cheap to copy); ``resolve`` turns a slice of entries into the items
+    of a page when that page is fetched, so item contents are read lazily
+    and entries that have disappeared are dropped. Because tokens are
+    offsets into the fixed snapshot, resuming never skips or repeats an
+    entry, however the store changes in between. Tokens are opaque and only
+    valid for the pager that issued them.
+    """
+
+    def __init__(self, entries: Sequence[Any], page_size: int,
+                 resolve: Optional[Callable[[Sequence[Any]], List[Any]]] = None):
+        if page_size < 1:
+            raise ValueError("page_size must be positive")
+        self.entries = entries
+        self.page_size = page_size
+        self.resolve = resolve
+        self._listing_id = secrets.token_hex(6)
+
+    def page(self, start: int) -> Tuple[List[Any], Optional[str]]:
+        """Items of the page at ``start`` and the token of the page after it"""
+        end = min(start + self.page_size, len(self.entries))
+        chunk = self.entries[start:end]
+        items = self.resolve(chunk) if self.resolve is not None else list(chunk)
+        return items, self.encode(end) if end < len(self.entries) else None
+
+    def encode(self, offset: int) -> str:
+        return base64.urlsafe_b64encode(f"{self._listing_id}:{offset}".encode()).decode().rstrip('=')
+
+    def decode(self, continuation_token: Optional[str]) -> int:
+        if not continuation_token:
+            return 0
+        try:
+            padded = continuation_token + '=' * (-len(continuation_token) % 4)
+            listing_id, offset = base64.urlsafe_b64decode(padded).decode().split(':')
+            offset = int(offset)
+        except (ValueError, UnicodeDecodeError):
+            listing_id, offset = None, -1
+        if listing_id != self._listing_id or not 0 <= offset <= len(self.entries):
+            raise HttpResponseError(f"Invalid continuation token '{continuation_token}'", 400)
+        return offset
+
 
 class ItemPaged(Generic[T], Iterator[T]):
-    """Paged iteration of items"""
-    
-    def __init__(self, items: List[T], page_size: int = 100):
+    """Paged iteration of items
+
+    Pages are produced on demand from a ``PageSnapshot`` (see there for the
+    consistency guarantees); a plain list of items also works. Every page
+    after the first costs a simulated round trip (the ``paging.page``
+    latency of ``simulation``), and with ``prefetch`` the next page is
+    fetched on a background thread while the caller works through the
+    current one. With ``instrumentation`` those round trips are recorded
+    as ``paging.page``.
+    """
+
+    def __init__(self, items: Sequence[T], page_size: int = 100,
+                 resolve: Optional[Callable[[Sequence[Any]], List[T]]] = None,
+                 prefetch: bool = True, simulation: Optional[SimulationProfile] = None,
+                 instrumentation: Optional[Instrumentation] = None):
         self.items = items
         self.page_size = page_size
-        self.current_index = 0
-        
+        self.prefetch = prefetch
+        self.simulation = DEFAULT_PROFILE if simulation is None else simulation
+        self.instrumentation = instrumentation
+        self._snapshot = PageSnapshot(items, page_size, resolve)
+        self._iterator: Optional[Iterator[T]] = None
+
     def __iter__(self) -> Iterator[T]:
         return self
-    
+
     def __next__(self) -> T:
-        if self.current_index >= len(self.items):
-            raise StopIteration
-        # Simulate realistic paging delays
-        if self.current_index % self.page_size == 0 and self.current_index > 0:
-            time.sleep(0.1)  # Small delay between pages
-        item = self.items[self.current_index]
-        self.current_index += 1
-        return item
-    
-    def by_page(self, continuation_token=None):
-        """Return pages of items"""
-        start_index = 0
-        if continuation_token:
-            start_index = int(continuation_token)
-        while start_index < len(self.items):
-            end_index = min(start_index + self.page_size, len(self.items))
-            page_items = self.items[start_index:end_index]
-            next_token = str(end_index) if end_index < len(self.items) else None
-            yield page_items, next_token
-            start_index = end_index
+        if self._iterator is None:
+            self._iterator = (item for page, _ in self.by_page() for item in page)
+        return next(self._iterator)
+
+    def by_page(self, continuation_token: Optional[str] = None) -> Iterator[Tuple[List[T], Optional[str]]]:
+        """Return pages of items, as (items, continuation token of the next page)"""
+        start = self._snapshot.decode(continuation_token)
+        # A fresh listing gets its first page with the list call; a resumed one pays a round trip
+        pending: Optional[Future] = None
+        page = self._fetch(start, delay=continuation_token is not None)
+        try:
+            while True:
+                items, next_token = page
+                if next_token is not None and self.prefetch:
+                    pending = _executor().submit(self.simulation.clock.bind(self._fetch),
+                                                 self._snapshot.decode(next_token), True)
+                if items or next_token is None:
+                    yield items, next_token
+                if next_token is None:
+                    return
+                page = pending.result() if pending is not None else \
+                    self._fetch(self._snapshot.decode(next_token), True)
+                pending = None
+        finally:
+            # The caller stopped early: drop the page being prefetched
+            if pending is not None:
+                pending.cancel()
+
+    def _fetch(self, start: int, delay: bool) -> Tuple[List[T], Optional[str]]:
+        if not delay:
+            return self._snapshot.page(start)
+        if self.instrumentation is not None:
+            return self.instrumentation.call('paging.page', self._round_trip, start)
+        return self._round_trip(start)
+
+    def _round_trip(self, start: int) -> Tuple[List[T], Optional[str]]:
+        self.simulation.delay('paging.page')
+        return self._snapshot.page(start)
@@ -0,0 +1,221 @@
+"""Retry and rate limiting policies"""
+import functools
+import inspect
+import threading
+from typing import Callable, Iterable, Optional
+from .exceptions import HttpResponseError
+from .simulation import DEFAULT_PROFILE, RealClock, SimulationProfile
+
+
+class AdaptiveRateLimiter:
+    """Client-side token bucket whose rate adapts to throttling (AIMD)
+
+    Every ``interval`` seconds the limiter looks at the share of requests that
+    came back throttled. Up to ``throttle_tolerance`` the rate grows by
+    ``additive_increase`` requests/second; above it the rate is multiplied by
+    ``multiplicative_decrease``. The tolerance keeps sporadic 429s from
+    collapsing the rate, while sustained throttling backs it off. A batch
+    request takes one token per item and each item's outcome is recorded, so
+    batching neither slips past the rate nor hides throttled items. The limiter
+    is thread safe so a single instance can pace every worker of a bulk run.
+    It keeps time on ``clock`` (real time by default), which should be the
+    clock of the simulation profile of the clients it paces.
+    """
+
+    def __init__(self, initial_rate: float = 10.0, min_rate: float = 1.0,
+                 max_rate: float = 1000.0, additive_increase: float = 5.0,
+                 multiplicative_decrease: float = 0.5, throttle_tolerance: float = 0.1,
+                 interval: float = 1.0, clock=None):
+        if not 0 < min_rate <= initial_rate <= max_rate:
+            raise ValueError("Rates must satisfy 0 < min_rate <= initial_rate <= max_rate")
+        self.rate = initial_rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.additive_increase = additive_increase
+        self.multiplicative_decrease = multiplicative_decrease
+        self.throttle_tolerance = throttle_tolerance
+        self.interval = interval
+        self.clock = RealClock() if clock is None else clock
+        self._lock = threading.Lock()
+        self._tokens = 1.0
+        self._updated = self.clock.now()
+        self._window_start = self._updated
+        self._window_requests = 0
+        self._window_throttled = 0
+
+    def reserve(self, requests: int = 1) -> float:
+        """Take ``requests`` tokens and return how long the caller must wait before sending"""
+        with self._lock:
+            self._refill()
+            self._tokens -= requests
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def _refill(self) -> None:
+        # Worker timelines of a virtual clock may read slightly earlier times
+        now = max(self.clock.now(), self._updated)
+        # Allow bursts of up to 100ms worth of requests
+        capacity = max(1.0, self.rate / 10)
+        self._tokens = min(capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def _set_rate(self, rate: float) -> None:
+        self._refill()
+        if self._tokens < 0:
+            # Requests already waiting keep their send times: the debt left
+            # when they are all sent stays the same length at the new rate
+            self._tokens *= rate / self.rate
+        self.rate = rate
+
+    def acquire(self, requests: int = 1) -> None:
+        """Block until ``requests`` requests may be sent"""
+        delay = self.reserve(requests)
+        if delay > 0:
+            self.clock.sleep(delay)
+
+    async def acquire_async(self, requests: int = 1) -> None:
+        """Wait (without blocking the event loop) until ``requests`` requests may be sent"""
+        delay = self.reserve(requests)
+        if delay > 0:
+            await self.clock.sleep_async(delay)
+
+    def record(self, throttled: bool) -> None:
+        """Feed back the outcome of a request"""
+        with self._lock:
+            self._window_requests += 1
+            if throttled:
+                self._window_throttled += 1
+            now = self.clock.now()
+            if now - self._window_start < self.interval:
+                return
+            if self._window_throttled > self.throttle_tolerance * self._window_requests:
+                self._set_rate(max(self.min_rate, self.rate * self.multiplicative_decrease))
+            else:
+                self._set_rate(min(self.max_rate, self.rate + self.additive_increase))
+            self._window_start = now
+            self._window_requests = 0
+            self._window_throttled = 0
+
+
+class RetryPolicy:
+    """Retry transient failures with exponential backoff and full jitter
+
+    Only errors whose status code is in ``retry_on_status_codes`` are retried.
+    A ``retry_after`` hint on the error (set on throttling responses) takes
+    precedence over the computed backoff. An optional ``rate_limiter`` paces
+    every attempt and learns from the throttling responses; for batch
+    operations (named ``batch_*``, taking a list of operations and returning
+    a ``BatchOperationResult`` per item) it paces and learns per item. Backoffs are
+    waited out on the clock of the ``SimulationProfile`` passed to
+    ``wrap`` (clients pass their own), with jitter drawn from it.
+    """
+
+    RETRY_ON_STATUS_CODES = frozenset({408, 429, 500, 502, 503, 504})
+
+    def __init__(self, total_retries: int = 5, backoff_factor: float = 0.2,
+                 backoff_max: float = 30.0,
+                 retry_on_status_codes: Optional[Iterable[int]] = None,
+                 rate_limiter: Optional[AdaptiveRateLimiter] = None):
+        self.total_retries = total_retries
+        self.backoff_factor = backoff_factor
+        self.backoff_max = backoff_max
+        self.retry_on_status_codes = frozenset(
+            self.RETRY_ON_STATUS_CODES if retry_on_status_codes is None else retry_on_status_codes
+        )
+        self.rate_limiter = rate_limiter
+
+    def is_retryable(self, error: Exception) -> bool:
+        """Whether a failed attempt may be retried"""
+        return (isinstance(error, HttpResponseError)
+                and error.status_code in self.retry_on_status_codes)
+
+    def get_backoff_time(self, attempt: int, error: Exception,
+                         simulation: Optional[SimulationProfile] = None) -> float:
+        """Seconds to wait before retry number ``attempt`` (0-based)"""
+        retry_after = getattr(error, 'retry_after', None)
+        if retry_after is not None:
+            return retry_after
+        simulation = DEFAULT_PROFILE if simulation is None else simulation
+        cap = min(self.backoff_max, self.backoff_factor * 2 ** attempt)
+        return simulation.uniform(0, cap, 'retry.backoff')
+
+    def _record(self, error: Optional[Exception]) -> None:
+        if self.rate_limiter is not None:
+            self.rate_limiter.record(getattr(error, 'status_code', None) == 429)
+
+    def _record_result(self, result, batch: bool) -> None:
+        if not batch:
+            self._record(None)
+        elif self.rate_limiter is not None:
+            for item in result:
+                self._record(item.error)
+
+    @staticmethod
+    def _requests(args, kwargs, batch: bool) -> int:
+        """Requests a call makes: one, or one per operation of a batch"""
+        if not batch:
+            return 1
+        return len(args[0] if args else kwargs.get('operations', ()))
+
+    def run(self, func: Callable, *args, **kwargs):
+        """Call ``func`` under this policy"""
+        return self._run(DEFAULT_PROFILE, func, args, kwargs, _is_batch(func))
+
+    async def run_async(self, func: Callable, *args, **kwargs):
+        """Await coroutine function ``func`` under this policy"""
+        return await self._run_async(DEFAULT_PROFILE, func, args, kwargs, _is_batch(func))
+
+    def _run(self, simulation: SimulationProfile, func: Callable, args, kwargs, batch: bool = False):
+        attempt = 0
+        while True:
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire(self._requests(args, kwargs, batch))
+            try:
+                result = func(*args, **kwargs)
+            except Exception as e:
+                self._record(e)
+                if attempt >= self.total_retries or not self.is_retryable(e):
+                    raise
+                simulation.clock.sleep(self.get_backoff_time(attempt, e, simulation))
+                attempt += 1
+                continue
+            self._record_result(result, batch)
+            return result
+
+    async def _run_async(self, simulation: SimulationProfile, func: Callable, args, kwargs,
+                         batch: bool = False):
+        attempt = 0
+        while True:
+            if self.rate_limiter is not None:
+                await self.rate_limiter.acquire_async(self._requests(args, kwargs, batch))
+            try:
+                result = await func(*args, **kwargs)
+            except Exception as e:
+                self._record(e)
+                if attempt >= self.total_retries or not self.is_retryable(e):
+                    raise
+                await simulation.clock.sleep_async(self.get_backoff_time(attempt, e, simulation))
+                attempt += 1
+                continue
+            self._record_result(result, batch)
+            return result
+
+    def wrap(self, func: Callable, simulation: Optional[SimulationProfile] = None) -> Callable:
+        """Wrap a sync or coroutine function so every call goes through the policy"""
+        simulation = DEFAULT_PROFILE if simulation is None else simulation
+        batch = _is_batch(func)
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                return await self._run_async(simulation, func, args, kwargs, batch)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            return self._run(simulation, func, args, kwargs, batch)
+        return wrapper
+
+
+def _is_batch(func: Callable) -> bool:
+    return getattr(func, '__name__', '').startswith('batch_')
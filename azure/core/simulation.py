@@ -0,0 +1,466 @@
+"""Simulated latency, failures and time for the mock services
+
+A ``SimulationProfile`` is handed to clients, credentials and pagers and
+decides how long each operation takes and whether it fails. It carries:
+
+- a seeded random source. Draws are keyed (by resource ID, scope, ...)
+  so that which requests fail does not depend on how threads happen to
+  be scheduled; unkeyed draws come from one seeded ``random.Random``.
+  Without a seed the global ``random`` module is used, as before.
+- a latency model: ``(low, high)`` seconds, drawn uniformly, per
+  operation name (see ``DEFAULT_LATENCIES``).
+- a clock: ``RealClock`` sleeps for real, ``ScaledClock`` runs time
+  faster by a factor, and ``VirtualClock`` never sleeps but keeps
+  account of the simulated time.
+"""
+import asyncio
+import contextvars
+import hashlib
+import heapq
+import random
+import selectors
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple
+
+# Seconds per operation, drawn uniformly between (low, high)
+DEFAULT_LATENCIES: Dict[str, Tuple[float, float]] = {
+    'identity.get_token': (0.1, 0.3),
+    'resource_groups.create_or_update': (0.5, 1.5),
+    'resource_groups.get': (0.1, 0.3),
+    'resource_groups.delete': (1.0, 2.0),
+    'resource_groups.check_existence': (0.05, 0.1),
+    'resources.create_or_update': (0.1, 0.3),
+    'resources.batch_create_or_update': (0.1, 0.3),
+    'resources.delete': (0.2, 0.5),
+    'tags.create_or_update_at_scope': (0.05, 0.15),
+    'tags.update_at_scope': (0.05, 0.15),
+    'tags.batch_update_at_scope': (0.05, 0.15),
+    'resource_graph.query': (0.05, 0.15),
+    # Every page of a listing after the first
+    'paging.page': (0.1, 0.1),
+}
+# Keys whose draw counters are remembered; retries of a key come soon after its failure
+_DRAW_COUNTERS = 65536
+
+
+def _running_loop() -> Optional[asyncio.AbstractEventLoop]:
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+class RealClock:
+    """Wall-clock time; sleeps block for real"""
+
+    def __init__(self):
+        self._start = time.monotonic()
+        self._wall_start = time.time()
+
+    def now(self) -> float:
+        """Monotonic seconds"""
+        return time.monotonic()
+
+    def time(self) -> float:
+        """Seconds since the epoch, on this clock"""
+        return self._wall_start + (self.now() - self._start)
+
+    def elapsed(self) -> float:
+        """Simulated seconds since the clock was created"""
+        return self.now() - self._start
+
+    def sleep(self, seconds: float) -> None:
+        if seconds > 0:
+            time.sleep(seconds)
+
+    async def sleep_async(self, seconds: float) -> None:
+        await asyncio.sleep(max(seconds, 0))
+
+    def run(self, coroutine):
+        """Run a coroutine to completion on an event loop that keeps this clock's time"""
+        return asyncio.run(coroutine)
+
+    def bind(self, func: Callable) -> Callable:
+        """``func``, to be run on another thread starting at the caller's time"""
+        return func
+
+    def executor(self, max_workers: Optional[int] = None, **kwargs) -> ThreadPoolExecutor:
+        """A thread pool whose tasks keep this clock's time"""
+        return ThreadPoolExecutor(max_workers, **kwargs)
+
+
+class ScaledClock(RealClock):
+    """Real time sped up ``factor`` times: sleeps are ``factor`` times shorter
+
+    ``now()`` and ``elapsed()`` report simulated time, so everything that
+    runs between sleeps (real work) is scaled up too.
+    """
+
+    def __init__(self, factor: float = 100.0):
+        if factor <= 0:
+            raise ValueError("factor must be positive")
+        super().__init__()
+        self.factor = factor
+
+    def now(self) -> float:
+        return self._start + (time.monotonic() - self._start) * self.factor
+
+    def sleep(self, seconds: float) -> None:
+        super().sleep(seconds / self.factor)
+
+    async def sleep_async(self, seconds: float) -> None:
+        await super().sleep_async(seconds / self.factor)
+
+
+class _VirtualSelector:
+    """Selector that, instead of waiting for the next timer, advances the loop's time to it"""
+
+    def __init__(self, loop: '_VirtualEventLoop'):
+        self._selector = selectors.DefaultSelector()
+        self._loop = loop
+
+    def select(self, timeout: Optional[float] = None):
+        if timeout is None:
+            # No timers: only I/O or another thread can wake the loop
+            return self._selector.select(None)
+        events = self._selector.select(0)
+        if not events and timeout > 0:
+            self._loop.advance(timeout)
+        return events
+
+    def __getattr__(self, name):
+        return getattr(self._selector, name)
+
+
+class _VirtualEventLoop(asyncio.SelectorEventLoop):
+    """Event loop on virtual time: whenever it would wait for a timer, the time jumps there"""
+
+    def __init__(self, clock: 'VirtualClock'):
+        self.virtual_clock = clock
+        self._virtual_time = clock._sync_root()
+        super().__init__(_VirtualSelector(self))
+
+    def time(self) -> float:
+        return self._virtual_time
+
+    def advance(self, seconds: float) -> None:
+        self._virtual_time += seconds
+        self.virtual_clock._reached(self._virtual_time)
+
+
+class _VirtualFuture(Future):
+    """Future of a task on virtual time: taking its outcome moves the caller to when the task finished"""
+
+    def __init__(self, clock: 'VirtualClock'):
+        super().__init__()
+        self._clock = clock
+        self._inner: Optional[Future] = None
+        self.finished_at: Optional[float] = None
+
+    def cancel(self) -> bool:
+        return self._inner.cancel()
+
+    def result(self, timeout=None):
+        try:
+            return super().result(timeout)
+        finally:
+            self._observed()
+
+    def exception(self, timeout=None):
+        try:
+            return super().exception(timeout)
+        finally:
+            self._observed()
+
+    def _observed(self) -> None:
+        if self.finished_at is not None:
+            self._clock._advance_to(self.finished_at)
+
+    def _copy(self, inner: Future) -> None:
+        if inner.cancelled():
+            super().cancel()
+            self.set_running_or_notify_cancel()
+        elif inner.exception() is not None:
+            self.set_exception(inner.exception())
+        else:
+            self.set_result(inner.result())
+
+
+class _VirtualThreadPoolExecutor(ThreadPoolExecutor):
+    """Thread pool on virtual time
+
+    Each task starts when it was submitted or, if every worker is busy then,
+    when the first of them would be free: a pool of N workers progresses N
+    tasks at a time, whichever real threads happen to run them. The
+    submitter sees a task finish when it takes the task's result (or shuts
+    the pool down), not when a thread happened to run it.
+    """
+
+    def __init__(self, clock: 'VirtualClock', max_workers: Optional[int] = None, **kwargs):
+        super().__init__(max_workers, **kwargs)
+        self._clock = clock
+        self._free_lock = threading.Lock()
+        # When each worker is next free (a heap); never empty, as no more
+        # than max_workers tasks run at once
+        self._free = [clock._start] * self._max_workers
+        self._last_finished = clock._start
+
+    def submit(self, fn, /, *args, **kwargs):
+        submitted = self._clock.now()
+        future = _VirtualFuture(self._clock)
+
+        def start() -> float:
+            with self._free_lock:
+                return max(submitted, heapq.heappop(self._free))
+
+        def finished(moment: float) -> None:
+            future.finished_at = moment
+            with self._free_lock:
+                heapq.heappush(self._free, moment)
+                self._last_finished = max(self._last_finished, moment)
+        future._inner = super().submit(self._clock._bind(fn, start, finished), *args, **kwargs)
+        future._inner.add_done_callback(future._copy)
+        return future
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False) -> None:
+        if cancel_futures:
+            super().shutdown(wait, cancel_futures=True)
+        else:
+            # cancel_futures only exists on Python 3.9+
+            super().shutdown(wait)
+        if wait:
+            self._clock._advance_to(self._last_finished)
+
+
+class VirtualClock:
+    """Simulated time that advances instantly
+
+    Sleeping advances the caller's timeline instead of blocking, so
+    concurrent work is accounted as concurrent:
+
+    - coroutines run with ``run()`` share an event loop on virtual time,
+      which jumps straight to the next timer whenever every task is
+      waiting, exactly as a real loop would behave, only without the wait;
+    - tasks run on a pool from ``executor()``, or wrapped with ``bind()``,
+      each have their own timeline, starting at the time they were
+      submitted (or a worker of the pool became free). Whoever takes the
+      result of a pool task moves on to the time the task finished;
+    - the main thread has one timeline. It catches up with every other
+      timeline whenever it reads the clock or sleeps, since it normally
+      waits for its workers;
+    - other threads each have a timeline starting no earlier than the main
+      thread's time, as do coroutines on an ordinary event loop.
+
+    ``elapsed()`` on the main thread is the simulated duration of
+    everything run so far.
+    """
+
+    def __init__(self, start: float = 0.0):
+        self._lock = threading.Lock()
+        self._start = start
+        self._wall_start = time.time()
+        self._root = start
+        # The furthest point in time any timeline has reached
+        self._latest = start
+        self._timeline: contextvars.ContextVar = contextvars.ContextVar('virtual_clock_timeline')
+        # The timeline of a bound task, as a one-item list
+        self._task: contextvars.ContextVar = contextvars.ContextVar('virtual_clock_task', default=None)
+
+    def now(self) -> float:
+        """The caller's simulated time, in seconds"""
+        loop = self._virtual_loop()
+        if loop is not None:
+            return loop.time()
+        task = self._task.get()
+        if task is not None:
+            return task[0]
+        if self._is_root():
+            return self._sync_root()
+        with self._lock:
+            return max(self._timeline.get(self._start), self._root)
+
+    def time(self) -> float:
+        """Seconds since the epoch, on this clock"""
+        return self._wall_start + (self.now() - self._start)
+
+    def elapsed(self) -> float:
+        """Simulated seconds since the clock was created, as seen by the caller"""
+        return self.now() - self._start
+
+    def sleep(self, seconds: float) -> None:
+        """Advance the caller's timeline by ``seconds`` without blocking"""
+        seconds = max(seconds, 0)
+        loop = self._virtual_loop()
+        if loop is not None:
+            # A blocking sleep inside the loop holds up every task
+            loop.advance(seconds)
+            return
+        task = self._task.get()
+        with self._lock:
+            if task is not None:
+                task[0] += seconds
+            elif self._is_root():
+                self._root = max(self._root, self._latest) + seconds
+                self._latest = self._root
+            else:
+                reached = max(self._timeline.get(self._start), self._root) + seconds
+                self._timeline.set(reached)
+                self._latest = max(self._latest, reached)
+
+    async def sleep_async(self, seconds: float) -> None:
+        if self._virtual_loop() is not None:
+            await asyncio.sleep(max(seconds, 0))
+            return
+        self.sleep(seconds)
+        await asyncio.sleep(0)
+
+    def run(self, coroutine):
+        """Run a coroutine to completion on an event loop on this clock's virtual time"""
+        loop = _VirtualEventLoop(self)
+        try:
+            asyncio.set_event_loop(loop)
+            return loop.run_until_complete(coroutine)
+        finally:
+            # Tear down like asyncio.run() does
+            try:
+                tasks = asyncio.all_tasks(loop)
+                for task in tasks:
+                    task.cancel()
+                loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+                loop.run_until_complete(loop.shutdown_asyncgens())
+            finally:
+                asyncio.set_event_loop(None)
+                loop.close()
+
+    def bind(self, func: Callable) -> Callable:
+        """``func``, to be run on another thread starting at the caller's time"""
+        submitted = self.now()
+        return self._bind(func, lambda: submitted, self._reached)
+
+    def executor(self, max_workers: Optional[int] = None, **kwargs) -> ThreadPoolExecutor:
+        """A thread pool whose tasks keep this clock's time"""
+        return _VirtualThreadPoolExecutor(self, max_workers, **kwargs)
+
+    def _bind(self, func: Callable, start: Callable[[], float],
+              finished: Optional[Callable[[float], None]] = None) -> Callable:
+        def run(*args, **kwargs):
+            task = [start()]
+            token = self._task.set(task)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self._task.reset(token)
+                if finished is not None:
+                    finished(task[0])
+        return run
+
+    def _advance_to(self, moment: float) -> None:
+        """Move the caller's timeline forward to ``moment``, if it is behind"""
+        seconds = moment - self.now()
+        if seconds > 0:
+            self.sleep(seconds)
+
+    def _virtual_loop(self) -> Optional[_VirtualEventLoop]:
+        loop = _running_loop()
+        if isinstance(loop, _VirtualEventLoop) and loop.virtual_clock is self:
+            return loop
+        return None
+
+    @staticmethod
+    def _is_root() -> bool:
+        return threading.current_thread() is threading.main_thread() and _running_loop() is None
+
+    def _sync_root(self) -> float:
+        with self._lock:
+            self._root = max(self._root, self._latest)
+            return self._root
+
+    def _reached(self, moment: float) -> None:
+        with self._lock:
+            self._latest = max(self._latest, moment)
+
+
+class SimulationProfile:
+    """Latency, failures and clock of the simulated services
+
+    ``latencies`` overrides entries of ``DEFAULT_LATENCIES``; a single
+    number is a fixed latency. ``latency_scale`` multiplies every latency.
+    Operations not in the model take no time.
+    """
+
+    def __init__(self, seed: Optional[int] = None, clock=None,
+                 latencies: Optional[Dict[str, Any]] = None,
+                 latency_scale: float = 1.0):
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.clock = RealClock() if clock is None else clock
+        self.latency_scale = latency_scale
+        self.latencies: Dict[str, Tuple[float, float]] = dict(DEFAULT_LATENCIES)
+        for operation, latency in (latencies or {}).items():
+            self.latencies[operation] = (latency, latency) if isinstance(latency, (int, float)) else tuple(latency)
+        self._lock = threading.Lock()
+        self._draws: "OrderedDict[Tuple[str, Any], int]" = OrderedDict()
+
+    @classmethod
+    def fast(cls, seed: int = 0, **kwargs) -> 'SimulationProfile':
+        """Seeded profile on a ``VirtualClock``: runs in no time, reports simulated time"""
+        return cls(seed, VirtualClock(), **kwargs)
+
+    @classmethod
+    def scaled(cls, factor: float = 100.0, seed: Optional[int] = None, **kwargs) -> 'SimulationProfile':
+        """Profile on a ``ScaledClock``"""
+        return cls(seed, ScaledClock(factor), **kwargs)
+
+    def random(self, operation: str, key: Any = None) -> float:
+        """A draw in [0, 1) for ``operation``
+
+        With a seed, the n-th draw for the same ``operation`` and ``key`` is
+        always the same number, whatever else runs concurrently.
+        """
+        if self.seed is None:
+            return random.random()
+        if key is None:
+            with self._lock:
+                return self.rng.random()
+        draw_key = (operation, key)
+        with self._lock:
+            count = self._draws.pop(draw_key, 0)
+            self._draws[draw_key] = count + 1
+            if len(self._draws) > _DRAW_COUNTERS:
+                self._draws.popitem(last=False)
+        digest = hashlib.blake2b(f"{self.seed}\0{operation}\0{key}\0{count}".encode(), digest_size=8).digest()
+        return int.from_bytes(digest, 'little') / 2 ** 64
+
+    def uniform(self, low: float, high: float, operation: str, key: Any = None) -> float:
+        """A draw in [low, high) for ``operation``"""
+        return low + (high - low) * self.random(operation, key)
+
+    def latency(self, operation: str, key: Any = None) -> float:
+        """Simulated duration of one ``operation`` request"""
+        low, high = self.latencies.get(operation, (0.0, 0.0))
+        if low == high:
+            return low * self.latency_scale
+        return self.uniform(low, high, operation, key) * self.latency_scale
+
+    def delay(self, operation: str, key: Any = None) -> None:
+        """Wait out the latency of ``operation`` on the profile's clock"""
+        self.clock.sleep(self.latency(operation, key))
+
+    async def delay_async(self, operation: str, key: Any = None) -> None:
+        """Wait out the latency of ``operation`` without blocking the event loop"""
+        await self.clock.sleep_async(self.latency(operation, key))
+
+    def elapsed(self) -> float:
+        """Simulated seconds since the profile's clock was created"""
+        return self.clock.elapsed()
+
+    def run(self, coroutine):
+        """Run a coroutine on an event loop that keeps the profile's time"""
+        return self.clock.run(coroutine)
+
+
+# Real time and the global random module, for callers that are not given a profile
+DEFAULT_PROFILE = SimulationProfile()
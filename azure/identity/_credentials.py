@@ -1,30 +1,117 @@
 """Mock Azure Identity credentials"""
+import threading
 import time
 import random
+from concurrent.futures import Future
+from typing import Dict, Optional, Tuple
 from azure.core.exceptions import ClientAuthenticationError
+from azure.core.simulation import DEFAULT_PROFILE, SimulationProfile
+
+# Lifetime of a minted token, and how long before expiry a cached one is renewed
+TOKEN_LIFETIME = 3600
+REFRESH_WINDOW = 300
+
+
+class MockAccessToken:
+    """Mock access token; ``now`` is the epoch time it is issued at (default: the real time)"""
+    def __init__(self, expires_in: float = TOKEN_LIFETIME, now: Optional[float] = None):
+        self.token = "mock_token_" + str(random.randint(100000, 999999))
+        self.expires_on = (time.time() if now is None else now) + expires_in
+
+
+def _cache_key(scopes: Tuple[str, ...]) -> Tuple[str, ...]:
+    return tuple(sorted(scopes))
+
+
+def _needs_refresh(token: MockAccessToken, refresh_window: float, now: float) -> bool:
+    return token.expires_on - now <= refresh_window
 
 
 class DefaultAzureCredential:
-    """Mock default Azure credential"""
-    
-    def __init__(self, **kwargs):
+    """Mock default Azure credential
+
+    Tokens are cached per set of scopes until they expire. Within
+    ``refresh_window`` seconds of expiry a call still returns the cached
+    token but starts a background refresh, so callers never wait on a
+    renewal while a usable token exists. Concurrent requests for a missing
+    or expired token share one request to the identity service
+    (single-flight). The cache is thread safe, so one credential can serve
+    every client and worker thread of a tool. Request latency, failures and
+    token expiry follow ``simulation``.
+    """
+
+    def __init__(self, token_lifetime: float = TOKEN_LIFETIME,
+                 refresh_window: float = REFRESH_WINDOW,
+                 simulation: Optional[SimulationProfile] = None, **kwargs):
         self.kwargs = kwargs
+        self.simulation = DEFAULT_PROFILE if simulation is None else simulation
+        self.token_lifetime = token_lifetime
+        self.refresh_window = refresh_window
         self._authenticated = False
-    
+        self._lock = threading.Lock()
+        self._tokens: Dict[Tuple[str, ...], MockAccessToken] = {}
+        self._in_flight: Dict[Tuple[str, ...], Future] = {}
+        # Requests actually sent to the (mock) identity service
+        self.token_requests = 0
+        self.last_refresh_error: Optional[Exception] = None
+
     def get_token(self, *scopes, **kwargs):
-        """Get an access token"""
+        """Get an access token, from the cache when a valid one is held"""
+        key = _cache_key(scopes)
+        with self._lock:
+            token = self._tokens.get(key)
+            now = self.simulation.clock.time()
+            if token is not None and token.expires_on > now:
+                if _needs_refresh(token, self.refresh_window, now) and key not in self._in_flight:
+                    self._start_request(key, background=True)
+                return token
+            future = self._in_flight.get(key)
+            if future is None:
+                future = self._start_request(key, background=False)
+                owner = True
+            else:
+                owner = False
+        if owner:
+            self._request(key, future)
+        return future.result()
+
+    def clear_cache(self) -> None:
+        """Forget every cached token"""
+        with self._lock:
+            self._tokens.clear()
+
+    def _start_request(self, key: Tuple[str, ...], background: bool) -> Future:
+        # Called with the lock held; the caller (or a thread) then runs _request
+        future = Future()
+        self._in_flight[key] = future
+        if background:
+            threading.Thread(target=self._request, args=(key, future),
+                             name='credential-refresh', daemon=True).start()
+        return future
+
+    def _request(self, key: Tuple[str, ...], future: Future) -> None:
+        with self._lock:
+            self.token_requests += 1
+        try:
+            token = self._request_token()
+        except Exception as e:
+            with self._lock:
+                self._in_flight.pop(key, None)
+                self.last_refresh_error = e
+            future.set_exception(e)
+            return
+        with self._lock:
+            self._tokens[key] = token
+            self._in_flight.pop(key, None)
+        future.set_result(token)
+
+    def _request_token(self) -> MockAccessToken:
+        """One round trip to the identity service"""
         # Simulate authentication delay
-        time.sleep(random.uniform(0.1, 0.3))
+        self.simulation.delay('identity.get_token')
         # Simulate occasional auth failures (2% rate)
-        if random.random() < 0.02:
+        if self.simulation.random('identity.get_token') < 0.02:
             raise ClientAuthenticationError("Authentication failed - invalid credentials")
         self._authenticated = True
         # Return mock token
-        return MockAccessToken()
-
-
-class MockAccessToken:
-    """Mock access token"""
-    def __init__(self):
-        self.token = "mock_token_" + str(random.randint(100000, 999999))
-        self.expires_on = time.time() + 3600  # 1 hour from now
+        return MockAccessToken(self.token_lifetime, self.simulation.clock.time())
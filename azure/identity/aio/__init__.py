@@ -0,0 +1,3 @@
+from ._credentials import DefaultAzureCredential
+
+__all__ = ['DefaultAzureCredential']
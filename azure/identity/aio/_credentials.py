@@ -0,0 +1,98 @@
+"""Mock Azure Identity credentials (asyncio)"""
+import asyncio
+from typing import Dict, Optional, Set, Tuple
+from azure.core.exceptions import ClientAuthenticationError
+from azure.core.simulation import DEFAULT_PROFILE, SimulationProfile
+from .._credentials import REFRESH_WINDOW, TOKEN_LIFETIME, MockAccessToken, _cache_key, _needs_refresh
+
+
+class DefaultAzureCredential:
+    """Mock default Azure credential for asyncio clients
+
+    Caches tokens like the synchronous credential: per set of scopes, with
+    a background refresh (a task) shortly before expiry and one shared
+    request for concurrent callers that need a new token. Request latency,
+    failures and token expiry follow ``simulation``.
+    """
+
+    def __init__(self, token_lifetime: float = TOKEN_LIFETIME,
+                 refresh_window: float = REFRESH_WINDOW,
+                 simulation: Optional[SimulationProfile] = None, **kwargs):
+        self.kwargs = kwargs
+        self.simulation = DEFAULT_PROFILE if simulation is None else simulation
+        self.token_lifetime = token_lifetime
+        self.refresh_window = refresh_window
+        self._authenticated = False
+        self._tokens: Dict[Tuple[str, ...], MockAccessToken] = {}
+        self._in_flight: Dict[Tuple[str, ...], asyncio.Task] = {}
+        self._background: Set[asyncio.Task] = set()
+        # Requests actually sent to the (mock) identity service
+        self.token_requests = 0
+        self.last_refresh_error: Optional[Exception] = None
+
+    async def get_token(self, *scopes, **kwargs):
+        """Get an access token, from the cache when a valid one is held"""
+        key = _cache_key(scopes)
+        token = self._tokens.get(key)
+        now = self.simulation.clock.time()
+        if token is not None and token.expires_on > now:
+            if _needs_refresh(token, self.refresh_window, now) and key not in self._in_flight:
+                task = self._start_request(key)
+                # Keep a reference so the refresh is not collected mid-flight
+                self._background.add(task)
+                task.add_done_callback(self._refresh_done)
+            return token
+        task = self._in_flight.get(key)
+        if task is None:
+            task = self._start_request(key)
+        # shield: one caller being cancelled must not cancel the shared request
+        return await asyncio.shield(task)
+
+    def clear_cache(self) -> None:
+        """Forget every cached token"""
+        self._tokens.clear()
+
+    def _refresh_done(self, task: asyncio.Task) -> None:
+        self._background.discard(task)
+        # A failed background refresh is only recorded; the next call retries
+        if not task.cancelled():
+            task.exception()
+
+    def _start_request(self, key: Tuple[str, ...]) -> asyncio.Task:
+        task = asyncio.ensure_future(self._request(key))
+        self._in_flight[key] = task
+        return task
+
+    async def _request(self, key: Tuple[str, ...]) -> MockAccessToken:
+        self.token_requests += 1
+        try:
+            token = await self._request_token()
+        except Exception as e:
+            self.last_refresh_error = e
+            raise
+        finally:
+            self._in_flight.pop(key, None)
+        self._tokens[key] = token
+        return token
+
+    async def _request_token(self) -> MockAccessToken:
+        """One round trip to the identity service"""
+        # Simulate authentication delay
+        await self.simulation.delay_async('identity.get_token')
+        # Simulate occasional auth failures (2% rate)
+        if self.simulation.random('identity.get_token') < 0.02:
+            raise ClientAuthenticationError("Authentication failed - invalid credentials")
+        self._authenticated = True
+        # Return mock token
+        return MockAccessToken(self.token_lifetime, self.simulation.clock.time())
+
+    async def close(self):
+        """Close the credential, cancelling any background refresh"""
+        for task in list(self._background):
+            task.cancel()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
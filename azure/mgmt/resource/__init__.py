@@ -1,5 +1,7 @@
 from ._resource_management_client import ResourceManagementClient
+from ._sqlite_storage import SqliteStorage
+from ._storage import MemoryStorage, StorageBackend
 from ._version import VERSION
 
 __version__ = VERSION
-__all__ = ['ResourceManagementClient']
+__all__ = ['ResourceManagementClient', 'StorageBackend', 'MemoryStorage', 'SqliteStorage']
@@ -0,0 +1,174 @@
+"""Append-only change log for the in-memory resource store"""
+import bisect
+import copy
+import threading
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional
+from azure.core.exceptions import HttpResponseError
+from azure.core.simulation import RealClock
+from azure.mgmt.resource.models import ChangeFeedPage, ChangeType, GenericResource, ResourceChange
+
+
+class ChangeSubscription:
+    """Handle returned by ``ChangeLog.subscribe``"""
+
+    def __init__(self, change_log: 'ChangeLog', callback: Callable[[ResourceChange], None]):
+        self._change_log = change_log
+        self.callback = callback
+        self.errors = 0
+        self.last_error: Optional[Exception] = None
+
+    def deliver(self, change: ResourceChange) -> None:
+        """Call the subscriber; its failures are counted, never raised into the writer"""
+        try:
+            self.callback(change)
+        except Exception as e:
+            self.errors += 1
+            self.last_error = e
+
+    def close(self) -> None:
+        """Stop receiving changes"""
+        self._change_log.unsubscribe(self)
+
+
+class ChangeLog:
+    """Sequence-numbered log of resource creates, updates, tag changes and deletes
+
+    Sequence numbers start at 1 and only grow; a cursor is the last sequence
+    number a consumer has processed (0 for "from the start"). At most
+    ``max_events`` changes are kept. When the log fills up it is first
+    compacted (changes superseded by a later change to the same resource are
+    dropped), then the oldest changes are discarded down to three quarters
+    of the limit. After compaction a consumer only sees the latest change to
+    each resource, so changes should be applied as upserts. Reading from a
+    cursor older than the retained history raises a 410
+    ``HttpResponseError``; the consumer must then rescan.
+
+    Changes are timestamped from ``clock`` (the client's simulation clock),
+    so a virtual clock's log reads in simulated time.
+    """
+
+    def __init__(self, max_events: int = 100_000, clock=None):
+        if max_events < 1:
+            raise ValueError("max_events must be positive")
+        self.max_events = max_events
+        self.clock = RealClock() if clock is None else clock
+        self._lock = threading.RLock()
+        self._events: List[ResourceChange] = []
+        # Sequence numbers and timestamps of _events, for bisecting (bisect's
+        # key= argument needs Python 3.10)
+        self._sequences: List[int] = []
+        self._timestamps: List[datetime] = []
+        self._last_sequence = 0
+        # Cursors below this have lost history to retention
+        self._oldest_cursor = 0
+        self._subscriptions: List[ChangeSubscription] = []
+
+    @property
+    def last_sequence(self) -> int:
+        """Sequence number of the newest change (0 if none yet)"""
+        return self._last_sequence
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+    def record(self, change_type: ChangeType, resource_id: str,
+               resource: Optional[GenericResource] = None) -> ResourceChange:
+        """Append a change and deliver it to the subscribers"""
+        with self._lock:
+            self._last_sequence += 1
+            timestamp = datetime.fromtimestamp(self.clock.time(), timezone.utc)
+            # Worker timelines of a virtual clock may read slightly earlier
+            # times; keep the timestamps sorted for cursor_at
+            if self._timestamps and timestamp < self._timestamps[-1]:
+                timestamp = self._timestamps[-1]
+            change = ResourceChange(
+                sequence=self._last_sequence,
+                change_type=change_type,
+                resource_id=resource_id,
+                timestamp=timestamp,
+                # Shallow copy: later updates swap the stored object's tags
+                # and timestamps, which must not rewrite history
+                resource=copy.copy(resource) if resource is not None else None,
+            )
+            self._events.append(change)
+            self._sequences.append(change.sequence)
+            self._timestamps.append(change.timestamp)
+            if len(self._events) > self.max_events:
+                self._enforce_retention()
+            for subscription in list(self._subscriptions):
+                subscription.deliver(change)
+            return change
+
+    def changes_since(self, cursor: int = 0, max_results: int = 1000) -> ChangeFeedPage:
+        """Changes after ``cursor``, oldest first, at most ``max_results`` of them"""
+        with self._lock:
+            if cursor < self._oldest_cursor:
+                raise HttpResponseError(
+                    f"Cursor {cursor} has expired; changes up to {self._oldest_cursor} "
+                    f"were discarded", 410)
+            start = bisect.bisect_right(self._sequences, cursor)
+            changes = self._events[start:start + max_results]
+            has_more = start + max_results < len(self._events)
+            return ChangeFeedPage(
+                changes=changes,
+                cursor=changes[-1].sequence if changes else cursor,
+                has_more=has_more,
+            )
+
+    def cursor_at(self, when: datetime) -> int:
+        """Cursor from which ``changes_since`` returns the changes made at or after ``when``"""
+        with self._lock:
+            index = bisect.bisect_left(self._timestamps, when)
+            if index < len(self._events):
+                return self._events[index].sequence - 1
+            return self._last_sequence
+
+    def subscribe(self, callback: Callable[[ResourceChange], None],
+                  cursor: Optional[int] = None) -> ChangeSubscription:
+        """Call ``callback`` with every new change, synchronously and in order
+
+        With a ``cursor`` the changes after it are replayed first, with no
+        gap before the live changes.
+        """
+        subscription = ChangeSubscription(self, callback)
+        with self._lock:
+            if cursor is not None:
+                while True:
+                    page = self.changes_since(cursor)
+                    for change in page.changes:
+                        subscription.deliver(change)
+                    cursor = page.cursor
+                    if not page.has_more:
+                        break
+            self._subscriptions.append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: ChangeSubscription) -> None:
+        """Stop delivering to ``subscription``"""
+        with self._lock:
+            if subscription in self._subscriptions:
+                self._subscriptions.remove(subscription)
+
+    def compact(self) -> int:
+        """Drop changes superseded by a later change to the same resource; return how many"""
+        with self._lock:
+            latest: Dict[str, int] = {}
+            for change in self._events:
+                latest[change.resource_id] = change.sequence
+            before = len(self._events)
+            self._events = [change for change in self._events
+                            if latest[change.resource_id] == change.sequence]
+            self._sequences = [change.sequence for change in self._events]
+            self._timestamps = [change.timestamp for change in self._events]
+            return before - len(self._events)
+
+    def _enforce_retention(self) -> None:
+        self.compact()
+        keep = self.max_events * 3 // 4
+        if len(self._events) > keep:
+            dropped = len(self._events) - keep
+            self._oldest_cursor = self._events[dropped - 1].sequence
+            del self._events[:dropped]
+            del self._sequences[:dropped]
+            del self._timestamps[:dropped]
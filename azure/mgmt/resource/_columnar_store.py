@@ -0,0 +1,298 @@
+"""Columnar resource store with categorical encoding
+
+Requires NumPy; the client only imports this module when created with
+``columnar_store=True``.
+"""
+import threading
+from collections.abc import MutableMapping
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+import numpy as np
+from azure.mgmt.resource._resource_id import parse_resource_id
+from azure.mgmt.resource.models import GenericResource
+from azure.mgmt.resource.models._models import from_timestamp, to_timestamp
+
+# Tags stored as category codes; every other tag goes to the sparse side table
+TAG_COLUMNS = ('owner', 'environment')
+CATEGORY_COLUMNS = ('location', 'type', 'resource_group', 'subscription',
+                    'provisioning_state') + TAG_COLUMNS
+# Optional fields kept in the sparse side table when set
+_EXTRA_FIELDS = ('kind', 'managed_by', 'sku', 'plan', 'identity')
+
+_NO_TIME = np.iinfo(np.int64).min
+_HAS_TAGS = 1
+_HAS_PROPERTIES = 2
+_INITIAL_CAPACITY = 1024
+
+
+class _CategoryColumn:
+    """Category codes for one column; -1 marks a missing value"""
+
+    __slots__ = ('codes', 'categories', '_lookup')
+
+    def __init__(self, capacity: int):
+        self.codes = np.full(capacity, -1, dtype=np.int32)
+        self.categories: List[Any] = []
+        self._lookup: Dict[Any, int] = {}
+
+    def encode(self, value) -> int:
+        if value is None:
+            return -1
+        code = self._lookup.get(value)
+        if code is None:
+            code = self._lookup[value] = len(self.categories)
+            self.categories.append(value)
+        return code
+
+    def decode(self, code) -> Any:
+        return None if code < 0 else self.categories[code]
+
+    def grow(self, capacity: int) -> None:
+        codes = np.full(capacity, -1, dtype=np.int32)
+        codes[:len(self.codes)] = self.codes
+        self.codes = codes
+
+
+class ColumnarResourceStore(MutableMapping):
+    """Resource store keeping one NumPy array per attribute instead of objects
+
+    Behaves like the client's plain ``{resource_id: GenericResource}`` dict,
+    but low-cardinality attributes (see ``CATEGORY_COLUMNS``) are held as
+    category codes, other tags and rarely set fields in sparse side tables,
+    and ``GenericResource`` objects are only built when read. Each read
+    returns a new object, so changes must be written back by assignment.
+    Deleted rows are reused by later inserts.
+
+    The analytic methods work on the code arrays directly: ``value_counts``
+    is a ``bincount`` and ``rows``/``codes``/``is_tagged`` give the arrays
+    needed to build vectorized masks.
+    """
+
+    def __init__(self, capacity: int = _INITIAL_CAPACITY):
+        self._lock = threading.RLock()
+        self._capacity = capacity
+        self._size = 0
+        self._free: List[int] = []
+        self._row_of: Dict[str, int] = {}
+        self._ids: List[Optional[str]] = [None] * capacity
+        self._names: List[Optional[str]] = [None] * capacity
+        self._alive = np.zeros(capacity, dtype=bool)
+        self._flags = np.zeros(capacity, dtype=np.uint8)
+        self._created = np.full(capacity, _NO_TIME, dtype=np.int64)
+        self._changed = np.full(capacity, _NO_TIME, dtype=np.int64)
+        self._columns = {name: _CategoryColumn(capacity) for name in CATEGORY_COLUMNS}
+        self._other_tags: Dict[int, Dict[str, Any]] = {}
+        self._extras: Dict[int, Dict[str, Any]] = {}
+
+    # Mapping interface
+
+    def __len__(self) -> int:
+        return len(self._row_of)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self._row_of))
+
+    def __contains__(self, resource_id) -> bool:
+        return resource_id in self._row_of
+
+    def __getitem__(self, resource_id: str) -> GenericResource:
+        with self._lock:
+            return self._materialize(self._row_of[resource_id])
+
+    def __setitem__(self, resource_id: str, resource: GenericResource) -> None:
+        with self._lock:
+            row = self._row_of.get(resource_id)
+            if row is None:
+                row = self._allocate()
+                self._row_of[resource_id] = row
+            self._write(row, resource_id, resource)
+
+    def __delitem__(self, resource_id: str) -> None:
+        with self._lock:
+            row = self._row_of.pop(resource_id)
+            self._release(row)
+
+    # Analytics
+
+    def rows(self) -> np.ndarray:
+        """Row numbers of the live resources"""
+        with self._lock:
+            return np.flatnonzero(self._alive[:self._size])
+
+    def codes(self, column: str, rows: Optional[np.ndarray] = None) -> np.ndarray:
+        """Category codes of ``column`` for ``rows`` (default: all live rows); -1 is missing"""
+        with self._lock:
+            codes = self._columns[column].codes
+            return codes[self.rows() if rows is None else rows]
+
+    def categories(self, column: str) -> List[Any]:
+        """Values of ``column``, indexed by category code"""
+        with self._lock:
+            return list(self._columns[column].categories)
+
+    def value_counts(self, column: str) -> Dict[Any, int]:
+        """Live resources per value of ``column``; missing values are counted under ``None``"""
+        with self._lock:
+            column_data = self._columns[column]
+            live = column_data.codes[:self._size][self._alive[:self._size]]
+            counts = np.bincount(live + 1, minlength=len(column_data.categories) + 1)
+            result = {}
+            if counts[0]:
+                result[None] = int(counts[0])
+            for code in np.flatnonzero(counts[1:]):
+                result[column_data.categories[code]] = int(counts[code + 1])
+            return result
+
+    def is_tagged(self, rows: Optional[np.ndarray] = None) -> np.ndarray:
+        """Whether each row has at least one tag"""
+        with self._lock:
+            rows = self.rows() if rows is None else rows
+            tagged = np.zeros(len(rows), dtype=bool)
+            for name in TAG_COLUMNS:
+                tagged |= self._columns[name].codes[rows] >= 0
+            if self._other_tags:
+                tagged |= np.isin(rows, np.fromiter(self._other_tags, dtype=np.int64))
+            return tagged
+
+    def ids_where(self, column: str, values: Sequence[Any], ignore_case: bool = False) -> List[str]:
+        """IDs of the live resources whose ``column`` is one of ``values``"""
+        with self._lock:
+            column_data = self._columns[column]
+            if ignore_case:
+                wanted = {str(value).lower() for value in values}
+                codes = [code for code, category in enumerate(column_data.categories)
+                         if str(category).lower() in wanted]
+            else:
+                codes = [column_data._lookup[value] for value in values if value in column_data._lookup]
+            if not codes:
+                return []
+            live = column_data.codes[:self._size]
+            rows = np.flatnonzero(np.isin(live, codes) & self._alive[:self._size])
+            return self.ids(rows)
+
+    def ids(self, rows: Sequence[int]) -> List[str]:
+        """Resource IDs of ``rows``"""
+        with self._lock:
+            return [self._ids[row] for row in rows]
+
+    def names(self, rows: Sequence[int]) -> List[str]:
+        """Resource names of ``rows``"""
+        with self._lock:
+            return [self._names[row] for row in rows]
+
+    # Row storage
+
+    def _allocate(self) -> int:
+        if self._free:
+            return self._free.pop()
+        if self._size == self._capacity:
+            self._grow(max(self._capacity * 2, _INITIAL_CAPACITY))
+        row = self._size
+        self._size += 1
+        return row
+
+    def _grow(self, capacity: int) -> None:
+        extra = capacity - self._capacity
+        self._ids.extend([None] * extra)
+        self._names.extend([None] * extra)
+        self._alive = np.concatenate([self._alive, np.zeros(extra, dtype=bool)])
+        self._flags = np.concatenate([self._flags, np.zeros(extra, dtype=np.uint8)])
+        self._created = np.concatenate([self._created, np.full(extra, _NO_TIME, dtype=np.int64)])
+        self._changed = np.concatenate([self._changed, np.full(extra, _NO_TIME, dtype=np.int64)])
+        for column in self._columns.values():
+            column.grow(capacity)
+        self._capacity = capacity
+
+    def _write(self, row: int, resource_id: str, resource: GenericResource) -> None:
+        columns = self._columns
+        try:
+            parsed = parse_resource_id(resource_id)
+            resource_group, subscription = parsed.resource_group, parsed.subscription_id
+        except ValueError:
+            resource_group = subscription = None
+        self._ids[row] = resource_id
+        self._names[row] = resource.name
+        self._alive[row] = True
+        columns['location'].codes[row] = columns['location'].encode(resource.location)
+        columns['type'].codes[row] = columns['type'].encode(resource.type)
+        columns['resource_group'].codes[row] = columns['resource_group'].encode(resource_group)
+        columns['subscription'].codes[row] = columns['subscription'].encode(subscription)
+        provisioning_state = getattr(resource, 'provisioning_state', None)
+        columns['provisioning_state'].codes[row] = columns['provisioning_state'].encode(provisioning_state)
+
+        flags = 0
+        other_tags = {}
+        for name in TAG_COLUMNS:
+            columns[name].codes[row] = -1
+        if resource.tags is not None:
+            flags |= _HAS_TAGS
+            for name, value in resource.tags.items():
+                if name in TAG_COLUMNS and type(value) is str:
+                    columns[name].codes[row] = columns[name].encode(value)
+                else:
+                    other_tags[name] = value
+        self._set_sparse(self._other_tags, row, other_tags)
+
+        extras = {field: getattr(resource, field, None) for field in _EXTRA_FIELDS}
+        extras = {field: value for field, value in extras.items() if value is not None}
+        properties = getattr(resource, 'properties', None)
+        if properties is not None:
+            flags |= _HAS_PROPERTIES
+            if properties:
+                extras['properties'] = dict(properties)
+        self._set_sparse(self._extras, row, extras)
+        self._flags[row] = flags
+
+        created = to_timestamp(getattr(resource, 'created_time', None))
+        changed = to_timestamp(getattr(resource, 'changed_time', None))
+        self._created[row] = _NO_TIME if created is None else created
+        self._changed[row] = _NO_TIME if changed is None else changed
+
+    @staticmethod
+    def _set_sparse(table: Dict[int, Dict[str, Any]], row: int, values: Dict[str, Any]) -> None:
+        if values:
+            table[row] = values
+        else:
+            table.pop(row, None)
+
+    def _release(self, row: int) -> None:
+        self._ids[row] = None
+        self._names[row] = None
+        self._alive[row] = False
+        self._flags[row] = 0
+        for column in self._columns.values():
+            column.codes[row] = -1
+        self._other_tags.pop(row, None)
+        self._extras.pop(row, None)
+        self._free.append(row)
+
+    def _materialize(self, row: int) -> GenericResource:
+        columns = self._columns
+        flags = int(self._flags[row])
+        tags = None
+        if flags & _HAS_TAGS:
+            tags = {}
+            for name in TAG_COLUMNS:
+                code = columns[name].codes[row]
+                if code >= 0:
+                    tags[name] = columns[name].categories[code]
+            tags.update(self._other_tags.get(row, ()))
+        extras = self._extras.get(row, {})
+        properties = extras.get('properties')
+        if properties is not None:
+            properties = dict(properties)
+        elif flags & _HAS_PROPERTIES:
+            properties = {}
+        created, changed = int(self._created[row]), int(self._changed[row])
+        return GenericResource(
+            id=self._ids[row],
+            name=self._names[row],
+            type=columns['type'].decode(columns['type'].codes[row]),
+            location=columns['location'].decode(columns['location'].codes[row]),
+            tags=tags,
+            properties=properties,
+            provisioning_state=columns['provisioning_state'].decode(
+                columns['provisioning_state'].codes[row]),
+            created_time=None if created == _NO_TIME else from_timestamp(created),
+            changed_time=None if changed == _NO_TIME else from_timestamp(changed),
+            **{field: extras[field] for field in _EXTRA_FIELDS if field in extras},
+        )
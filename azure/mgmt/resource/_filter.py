@@ -0,0 +1,283 @@
+"""OData ``$filter`` support for listing resources
+
+Grammar accepted by ``ResourcesOperations.list`` and ``list_by_resource_group``::
+
+    filter     := or_expr
+    or_expr    := and_expr ('or' and_expr)*
+    and_expr   := term ('and' term)*
+    term       := '(' or_expr ')'
+                | 'resourceType' 'eq' string
+                | 'location' 'eq' string
+                | 'resourceGroup' 'eq' string
+                | 'name' 'eq' string
+                | 'tagName' 'eq' string ['and' 'tagValue' 'eq' string]
+                | 'substringof' '(' string ',' ('name' | 'resourceGroup') ')'
+
+Strings are single quoted, with ``''`` for a quote. As in ARM, values are
+compared case-insensitively, except tag names which must match exactly.
+``tagValue`` is only valid straight after the ``tagName`` it qualifies.
+
+A filter is compiled once (and cached by its text) into a predicate plus an
+access path: tag filters are served from the tag index, resource group
+filters from the resource group index and, on a columnar store, type and
+location filters from the category codes. Only the candidates an index
+returns are tested against the predicate.
+"""
+import itertools
+import re
+from functools import lru_cache
+from typing import Any, Callable, List, Optional, Tuple
+from azure.core.exceptions import HttpResponseError
+from azure.mgmt.resource._resource_id import parse_resource_id
+from azure.mgmt.resource._tag_index import TagIndex
+
+_TOKEN = re.compile(r"\s*(?:(?P<string>'(?:[^']|'')*')|(?P<punct>[(),])|(?P<name>[A-Za-z_$][A-Za-z0-9_]*))")
+
+# A candidate lookup returns resource IDs (a superset of the matches) or None for "scan everything"
+Lookup = Callable[[Any], Optional[List[str]]]
+
+
+class CompiledFilter:
+    """A parsed filter: ``matches(resource)`` and ``candidates(client)``"""
+
+    __slots__ = ('text', 'matches', '_lookup')
+
+    def __init__(self, text: str, matches: Callable[[Any], bool], lookup: Lookup):
+        self.text = text
+        self.matches = matches
+        self._lookup = lookup
+
+    def candidates(self, client) -> Optional[List[str]]:
+        """IDs of the resources that may match, from the narrowest index; None means no index applies"""
+        return self._lookup(client)
+
+
+def _invalid(text: str, reason: str) -> HttpResponseError:
+    return HttpResponseError(f"Invalid $filter: {text} ({reason})")
+
+
+def _tokenize(text: str) -> List[Tuple[str, str]]:
+    tokens = []
+    position = 0
+    stripped = text.rstrip()
+    while position < len(stripped):
+        match = _TOKEN.match(stripped, position)
+        if match is None:
+            raise _invalid(text, f"unexpected character at position {position}")
+        kind = match.lastgroup
+        value = match.group(kind)
+        if kind == 'string':
+            value = value[1:-1].replace("''", "'")
+        tokens.append((kind, value))
+        position = match.end()
+    return tokens
+
+
+# Leaf predicates and their index lookups
+
+def _resource_group(resource) -> str:
+    try:
+        return parse_resource_id(resource.id).resource_group or ''
+    except ValueError:
+        return ''
+
+
+def _equals(field: str, value: str) -> Tuple[Callable[[Any], bool], Lookup]:
+    wanted = value.lower()
+    if field == 'resourcegroup':
+        return (lambda resource: _resource_group(resource).lower() == wanted,
+                lambda client: client._resource_group_index.ids_in_group_ignore_case(value))
+    if field == 'name':
+        return lambda resource: (resource.name or '').lower() == wanted, _no_index
+    attribute = 'type' if field == 'resourcetype' else 'location'
+
+    def matches(resource):
+        actual = getattr(resource, attribute)
+        return actual is not None and actual.lower() == wanted
+
+    def lookup(client):
+        store = client.columnar_store
+        return store.ids_where(attribute, [value], ignore_case=True) if store is not None else None
+    return matches, lookup
+
+
+def _tag(name: str, value: Optional[str]) -> Tuple[Callable[[Any], bool], Lookup]:
+    if value is None:
+        return (lambda resource: name in (resource.tags or ()),
+                lambda client: client._tag_index.ids_with_tag(name))
+    wanted = TagIndex.normalize_value(value)
+
+    def matches(resource):
+        tags = resource.tags or {}
+        return name in tags and TagIndex.normalize_value(tags[name]) == wanted
+    return matches, lambda client: client._tag_index.ids_with_tag_value(name, value)
+
+
+def _substring(value: str, field: str) -> Tuple[Callable[[Any], bool], Lookup]:
+    wanted = value.lower()
+    if field == 'name':
+        return lambda resource: wanted in (resource.name or '').lower(), _no_index
+    return lambda resource: wanted in _resource_group(resource).lower(), _no_index
+
+
+def _no_index(client) -> None:
+    return None
+
+
+# Combinators
+
+def _all(parts: List[Tuple[Callable, Lookup]]) -> Tuple[Callable[[Any], bool], Lookup]:
+    predicates = [predicate for predicate, _ in parts]
+    lookups = [lookup for _, lookup in parts]
+
+    def matches(resource):
+        for predicate in predicates:
+            if not predicate(resource):
+                return False
+        return True
+
+    def lookup(client):
+        # Every term must hold, so any one index answer bounds the result
+        best = None
+        for part in lookups:
+            resource_ids = part(client)
+            if resource_ids is not None and (best is None or len(resource_ids) < len(best)):
+                best = resource_ids
+        return best
+    return matches, lookup
+
+
+def _any(parts: List[Tuple[Callable, Lookup]]) -> Tuple[Callable[[Any], bool], Lookup]:
+    predicates = [predicate for predicate, _ in parts]
+    lookups = [lookup for _, lookup in parts]
+
+    def matches(resource):
+        for predicate in predicates:
+            if predicate(resource):
+                return True
+        return False
+
+    def lookup(client):
+        # Only indexable if every alternative is
+        merged = {}
+        for part in lookups:
+            resource_ids = part(client)
+            if resource_ids is None:
+                return None
+            merged.update(dict.fromkeys(resource_ids))
+        return list(merged)
+    return matches, lookup
+
+
+class _Parser:
+    def __init__(self, text: str):
+        self.text = text
+        self.tokens = _tokenize(text)
+        self.position = 0
+
+    def peek(self, offset: int = 0) -> Tuple[Optional[str], Optional[str]]:
+        index = self.position + offset
+        return self.tokens[index] if index < len(self.tokens) else (None, None)
+
+    def next(self) -> Tuple[Optional[str], Optional[str]]:
+        token = self.peek()
+        self.position += 1
+        return token
+
+    def at_word(self, word: str, offset: int = 0) -> bool:
+        kind, value = self.peek(offset)
+        return kind == 'name' and value.lower() == word
+
+    def expect(self, kind: str, value: Optional[str] = None) -> str:
+        actual_kind, actual = self.next()
+        if actual_kind != kind or (value is not None and actual.lower() != value):
+            raise _invalid(self.text, f"expected {value or kind}, found {actual!r}")
+        return actual
+
+    def parse(self) -> Tuple[Callable[[Any], bool], Lookup]:
+        result = self.parse_or()
+        if self.peek()[0] is not None:
+            raise _invalid(self.text, f"unexpected {self.peek()[1]!r}")
+        return result
+
+    def parse_or(self):
+        parts = [self.parse_and()]
+        while self.at_word('or'):
+            self.next()
+            parts.append(self.parse_and())
+        return parts[0] if len(parts) == 1 else _any(parts)
+
+    def parse_and(self):
+        parts = [self.parse_term()]
+        while self.at_word('and'):
+            self.next()
+            parts.append(self.parse_term())
+        return parts[0] if len(parts) == 1 else _all(parts)
+
+    def parse_term(self):
+        kind, value = self.next()
+        if (kind, value) == ('punct', '('):
+            result = self.parse_or()
+            self.expect('punct', ')')
+            return result
+        if kind != 'name':
+            raise _invalid(self.text, f"expected a condition, found {value!r}")
+        field = value.lower()
+        if field == 'substringof':
+            self.expect('punct', '(')
+            substring = self.expect('string')
+            self.expect('punct', ',')
+            target = self.expect('name').lower()
+            self.expect('punct', ')')
+            if target not in ('name', 'resourcegroup'):
+                raise _invalid(self.text, "substringof applies to name or resourceGroup")
+            return _substring(substring, target)
+        if field == 'tagvalue':
+            raise _invalid(self.text, "tagValue must follow tagName")
+        if field not in ('resourcetype', 'location', 'resourcegroup', 'name', 'tagname'):
+            raise _invalid(self.text, f"unsupported property {value!r}")
+        self.expect('name', 'eq')
+        operand = self.expect('string')
+        if field != 'tagname':
+            return _equals(field, operand)
+        tag_value = None
+        if self.at_word('and') and self.at_word('tagvalue', 1):
+            self.next()
+            self.next()
+            self.expect('name', 'eq')
+            tag_value = self.expect('string')
+        return _tag(operand, tag_value)
+
+
+@lru_cache(maxsize=256)
+def compile_filter(text: str) -> CompiledFilter:
+    """Parse and compile an OData filter (cached by its text)"""
+    if not text.strip():
+        raise _invalid(text, "empty filter")
+    matches, lookup = _Parser(text).parse()
+    return CompiledFilter(text, matches, lookup)
+
+
+def select_resources(store, compiled: Optional[CompiledFilter], client,
+                     resource_ids: Optional[List[str]] = None,
+                     top: Optional[int] = None) -> List[Any]:
+    """Resources from ``store`` matching ``compiled`` (and within ``resource_ids``, if given)
+
+    The scan starts from the smaller of ``resource_ids`` and the filter's
+    index candidates, and stops after ``top`` matches.
+    """
+    candidates = resource_ids
+    if compiled is not None:
+        indexed = compiled.candidates(client)
+        if indexed is not None and (candidates is None or len(indexed) < len(candidates)):
+            if candidates is not None:
+                allowed = set(candidates)
+                indexed = [resource_id for resource_id in indexed if resource_id in allowed]
+            candidates = indexed
+    if candidates is None:
+        resources = iter(list(store.values()))
+    else:
+        resources = filter(None, map(store.get, candidates))
+    if compiled is not None:
+        resources = filter(compiled.matches, resources)
+    return list(itertools.islice(resources, top))
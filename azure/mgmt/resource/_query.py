@@ -0,0 +1,757 @@
+"""Parser and executor for a small Resource Graph (KQL) query language
+
+Supported pipeline, after an optional ``Resources`` table name::
+
+    where <predicate>
+    project [name =] <column>, ...
+    summarize [name =] count() | sum(<column>) | avg(..) | min(..) | max(..), ... [by <column>, ...]
+    order by <column> [asc | desc], ...      (also ``sort by``)
+    take <n>                                 (also ``limit``)
+    count
+
+Predicates combine ``==``, ``!=``, ``=~``, ``!~``, ``<``, ``<=``, ``>``,
+``>=``, ``contains``, ``!contains``, ``startswith``, ``endswith``,
+``in (..)``, ``!in (..)``, ``in~ (..)``, ``isempty()``, ``isnotempty()``
+with ``and``, ``or``, ``not()`` and parentheses. Columns are resource
+fields (``id``, ``name``, ``type``, ``location``, ``resourceGroup``,
+``subscriptionId``, ``kind``, ``managedBy``, ``tags``, ``properties``) and
+paths into them such as ``tags.owner``, ``tags['cost center']`` or
+``properties.monthlyCost``.
+
+Leading ``where`` operators are planned against the store's indexes: tag,
+resource group and ID equality (plus location and type on a columnar store)
+narrow the candidates before the full predicate is evaluated.
+"""
+import heapq
+import itertools
+import re
+from collections import Counter
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple, Union
+from azure.core.exceptions import HttpResponseError
+from azure.mgmt.resource._resource_id import parse_resource_id
+
+_TOKEN = re.compile(r"""
+    \s*(?:
+        (?P<string>'(?:[^'\\]|\\.)*'|"(?:[^"\\]|\\.)*")
+      | (?P<number>\d+(?:\.\d+)?)
+      | (?P<operator>==|!=|=~|!~|<=|>=|!in~|!in|in~|!contains|!startswith|[<>|,()\[\].=])
+      | (?P<name>[A-Za-z_][A-Za-z0-9_]*)
+    )""", re.VERBOSE)
+
+_COMPARISONS = {'==', '!=', '=~', '!~', '<', '<=', '>', '>=',
+                'contains', '!contains', 'startswith', '!startswith', 'endswith'}
+_AGGREGATES = {'count', 'sum', 'avg', 'min', 'max'}
+
+
+# Syntax tree
+
+class Column(NamedTuple):
+    path: Tuple[str, ...]
+
+    @property
+    def output_name(self) -> str:
+        """Column name in results, e.g. ``tags.owner`` -> ``tags_owner``"""
+        return '_'.join(self.path)
+
+
+class Literal(NamedTuple):
+    value: Any
+
+
+class Compare(NamedTuple):
+    op: str
+    left: Union[Column, Literal]
+    right: Union[Column, Literal]
+
+
+class InList(NamedTuple):
+    column: Column
+    values: Tuple[Any, ...]
+    negate: bool
+    ignore_case: bool
+
+
+class Call(NamedTuple):
+    function: str
+    column: Column
+
+
+class And(NamedTuple):
+    items: Tuple[Any, ...]
+
+
+class Or(NamedTuple):
+    items: Tuple[Any, ...]
+
+
+class Not(NamedTuple):
+    item: Any
+
+
+class Where(NamedTuple):
+    predicate: Any
+
+
+class Project(NamedTuple):
+    columns: Tuple[Tuple[str, Column], ...]
+
+
+class Aggregate(NamedTuple):
+    name: str
+    function: str
+    column: Optional[Column]
+
+
+class Summarize(NamedTuple):
+    aggregates: Tuple[Aggregate, ...]
+    by: Tuple[Tuple[str, Column], ...]
+
+
+class OrderBy(NamedTuple):
+    keys: Tuple[Tuple[Column, bool], ...]  # (column, descending)
+
+
+class Take(NamedTuple):
+    count: int
+
+
+class CountRows(NamedTuple):
+    pass
+
+
+# Parsing
+
+def _tokenize(text: str) -> List[Tuple[str, str]]:
+    tokens = []
+    position = 0
+    text = text.rstrip()
+    while position < len(text):
+        match = _TOKEN.match(text, position)
+        if match is None or match.end() == position:
+            raise _syntax_error(f"unexpected character at position {position}: {text[position:position + 10]!r}")
+        kind = match.lastgroup
+        tokens.append((kind, match.group(kind)))
+        position = match.end()
+    return tokens
+
+
+def _syntax_error(message: str) -> HttpResponseError:
+    return HttpResponseError(f"Invalid query: {message}", 400)
+
+
+class _Parser:
+    """Recursive descent parser over the token list"""
+
+    def __init__(self, text: str):
+        self.tokens = _tokenize(text)
+        self.position = 0
+
+    def peek(self, offset: int = 0) -> Tuple[Optional[str], Optional[str]]:
+        index = self.position + offset
+        return self.tokens[index] if index < len(self.tokens) else (None, None)
+
+    def next(self) -> Tuple[Optional[str], Optional[str]]:
+        token = self.peek()
+        self.position += 1
+        return token
+
+    def at_keyword(self, *words: str) -> bool:
+        kind, value = self.peek()
+        return kind == 'name' and value.lower() in words
+
+    def at_operator(self, *operators: str) -> bool:
+        kind, value = self.peek()
+        return kind == 'operator' and value in operators
+
+    def expect_operator(self, operator: str) -> None:
+        if not self.at_operator(operator):
+            raise _syntax_error(f"expected '{operator}' but found {self.peek()[1]!r}")
+        self.next()
+
+    def expect_keyword(self, word: str) -> None:
+        if not self.at_keyword(word):
+            raise _syntax_error(f"expected '{word}' but found {self.peek()[1]!r}")
+        self.next()
+
+    def parse_query(self) -> Tuple[Any, ...]:
+        operators = []
+        if self.at_keyword('resources'):
+            self.next()
+            if self.peek()[0] is not None:
+                self.expect_operator('|')
+        while self.peek()[0] is not None:
+            operators.append(self.parse_operator())
+            if self.peek()[0] is not None:
+                self.expect_operator('|')
+        return tuple(operators)
+
+    def parse_operator(self):
+        kind, word = self.next()
+        word = (word or '').lower()
+        if kind != 'name':
+            raise _syntax_error(f"expected an operator but found {word!r}")
+        if word == 'where':
+            return Where(self.parse_or())
+        if word == 'project':
+            return Project(tuple(self.parse_named_columns()))
+        if word == 'summarize':
+            return self.parse_summarize()
+        if word in ('order', 'sort'):
+            self.expect_keyword('by')
+            return self.parse_order_by()
+        if word in ('take', 'limit'):
+            kind, value = self.next()
+            if kind != 'number' or '.' in value:
+                raise _syntax_error(f"'{word}' needs a whole number")
+            return Take(int(value))
+        if word == 'count':
+            return CountRows()
+        raise _syntax_error(f"unsupported operator '{word}'")
+
+    def parse_named_columns(self) -> Iterator[Tuple[str, Column]]:
+        while True:
+            name = None
+            if self.peek()[0] == 'name' and self.peek(1) == ('operator', '='):
+                name = self.next()[1]
+                self.next()
+            column = self.parse_column()
+            yield name or column.output_name, column
+            if not self.at_operator(','):
+                return
+            self.next()
+
+    def parse_summarize(self) -> Summarize:
+        aggregates = []
+        while True:
+            name = None
+            if self.peek()[0] == 'name' and self.peek(1) == ('operator', '='):
+                name = self.next()[1]
+                self.next()
+            kind, function = self.next()
+            function = (function or '').lower()
+            if kind != 'name' or function not in _AGGREGATES:
+                raise _syntax_error(f"unsupported aggregation {function!r}")
+            self.expect_operator('(')
+            column = None
+            if not self.at_operator(')'):
+                column = self.parse_column()
+            self.expect_operator(')')
+            if function != 'count' and column is None:
+                raise _syntax_error(f"{function}() needs a column")
+            default_name = 'count_' if column is None else f"{function}_{column.output_name}"
+            aggregates.append(Aggregate(name or default_name, function, column))
+            if not self.at_operator(','):
+                break
+            self.next()
+        by = ()
+        if self.at_keyword('by'):
+            self.next()
+            by = tuple(self.parse_named_columns())
+        return Summarize(tuple(aggregates), by)
+
+    def parse_order_by(self) -> OrderBy:
+        keys = []
+        while True:
+            column = self.parse_column()
+            descending = True  # KQL sorts descending by default
+            if self.at_keyword('asc', 'desc'):
+                descending = self.next()[1].lower() == 'desc'
+            keys.append((column, descending))
+            if not self.at_operator(','):
+                return OrderBy(tuple(keys))
+            self.next()
+
+    def parse_column(self) -> Column:
+        kind, name = self.next()
+        if kind != 'name':
+            raise _syntax_error(f"expected a column but found {name!r}")
+        path = [name]
+        while self.at_operator('.', '['):
+            if self.next()[1] == '.':
+                kind, name = self.next()
+                if kind != 'name':
+                    raise _syntax_error(f"expected a name after '.' but found {name!r}")
+                path.append(name)
+            else:
+                kind, name = self.next()
+                if kind != 'string':
+                    raise _syntax_error(f"expected a quoted key but found {name!r}")
+                path.append(_unquote(name))
+                self.expect_operator(']')
+        return Column(tuple(path))
+
+    def parse_or(self):
+        items = [self.parse_and()]
+        while self.at_keyword('or'):
+            self.next()
+            items.append(self.parse_and())
+        return items[0] if len(items) == 1 else Or(tuple(items))
+
+    def parse_and(self):
+        items = [self.parse_unary()]
+        while self.at_keyword('and'):
+            self.next()
+            items.append(self.parse_unary())
+        return items[0] if len(items) == 1 else And(tuple(items))
+
+    def parse_unary(self):
+        if self.at_keyword('not') and self.peek(1) == ('operator', '('):
+            self.next()
+            self.next()
+            item = self.parse_or()
+            self.expect_operator(')')
+            return Not(item)
+        if self.at_operator('('):
+            self.next()
+            item = self.parse_or()
+            self.expect_operator(')')
+            return item
+        if self.at_keyword('isempty', 'isnotempty') and self.peek(1) == ('operator', '('):
+            function = self.next()[1].lower()
+            self.next()
+            column = self.parse_column()
+            self.expect_operator(')')
+            return Call(function, column)
+        return self.parse_comparison()
+
+    def parse_comparison(self):
+        left = self.parse_operand()
+        kind, op = self.peek()
+        if op in ('in', '!in', 'in~', '!in~'):
+            self.next()
+            if not isinstance(left, Column):
+                raise _syntax_error("'in' needs a column on the left")
+            self.expect_operator('(')
+            values = [self.parse_literal()]
+            while self.at_operator(','):
+                self.next()
+                values.append(self.parse_literal())
+            self.expect_operator(')')
+            return InList(left, tuple(values), op.startswith('!'), op.endswith('~'))
+        if op is None or op.lower() not in _COMPARISONS:
+            raise _syntax_error(f"expected a comparison but found {op!r}")
+        self.next()
+        return Compare(op.lower(), left, self.parse_operand())
+
+    def parse_operand(self):
+        kind, value = self.peek()
+        if kind in ('string', 'number') or (kind == 'name' and value.lower() in ('true', 'false')):
+            return Literal(self.parse_literal())
+        return self.parse_column()
+
+    def parse_literal(self):
+        kind, value = self.next()
+        if kind == 'string':
+            return _unquote(value)
+        if kind == 'number':
+            return float(value) if '.' in value else int(value)
+        if kind == 'name' and value.lower() in ('true', 'false'):
+            return value.lower() == 'true'
+        raise _syntax_error(f"expected a literal but found {value!r}")
+
+
+def _unquote(token: str) -> str:
+    return re.sub(r'\\(.)', r'\1', token[1:-1])
+
+
+@lru_cache(maxsize=256)
+def parse_query(text: str) -> Tuple[Any, ...]:
+    """Parse a query into its tuple of operators (cached by query text)"""
+    return _Parser(text).parse_query()
+
+
+# Column access
+
+def _resource_group(resource) -> Optional[str]:
+    try:
+        return parse_resource_id(resource.id).resource_group
+    except ValueError:
+        return None
+
+
+def _subscription(resource) -> Optional[str]:
+    try:
+        return parse_resource_id(resource.id).subscription_id
+    except ValueError:
+        return None
+
+
+# Fields of a resource row, by lower-cased name, with the result column name
+_RESOURCE_FIELDS: Dict[str, Tuple[str, Callable[[Any], Any]]] = {
+    'id': ('id', lambda resource: resource.id),
+    'name': ('name', lambda resource: resource.name),
+    'type': ('type', lambda resource: resource.type),
+    'location': ('location', lambda resource: resource.location),
+    'resourcegroup': ('resourceGroup', _resource_group),
+    'subscriptionid': ('subscriptionId', _subscription),
+    'kind': ('kind', lambda resource: getattr(resource, 'kind', None)),
+    'managedby': ('managedBy', lambda resource: getattr(resource, 'managed_by', None)),
+    'tags': ('tags', lambda resource: resource.tags or {}),
+    'properties': ('properties', lambda resource: getattr(resource, 'properties', None) or {}),
+}
+
+
+_EMPTY: Dict[str, Any] = {}
+
+
+def resource_row(resource) -> Dict[str, Any]:
+    """A resource as a result row"""
+    row = {name: getter(resource) for name, getter in _RESOURCE_FIELDS.values()}
+    row['tags'] = dict(row['tags'])
+    row['properties'] = dict(row['properties'])
+    return row
+
+
+def _getter(column: Column, on_resources: bool) -> Callable[[Any], Any]:
+    """Value of ``column`` for a resource (before project/summarize) or a result row"""
+    head, rest = column.path[0], column.path[1:]
+    if on_resources:
+        field = _RESOURCE_FIELDS.get(head.lower())
+        if field is None:
+            raise _syntax_error(f"unknown column '{head}'")
+        get_head = field[1]
+    else:
+        def get_head(row):
+            return row.get(head)
+
+    if not rest:
+        return get_head
+    if len(rest) == 1:
+        key = rest[0]
+        if on_resources and head.lower() == 'tags':
+            return lambda resource: (resource.tags or _EMPTY).get(key)
+        if on_resources and head.lower() == 'properties':
+            return lambda resource: (getattr(resource, 'properties', None) or _EMPTY).get(key)
+
+        def get_one(row):
+            value = get_head(row)
+            return value.get(key) if isinstance(value, dict) else None
+        return get_one
+
+    def get(row):
+        value = get_head(row)
+        for key in rest:
+            if not isinstance(value, dict):
+                return None
+            value = value.get(key)
+        return value
+    return get
+
+
+def _to_number(value) -> Optional[float]:
+    if type(value) in (int, float):
+        return value
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return value
+    if isinstance(value, str):
+        try:
+            return float(value)
+        except ValueError:
+            return None
+    return None
+
+
+def _compare(op: str, left, right) -> bool:
+    if left is None or right is None:
+        return op in ('!=', '!~', '!contains', '!startswith') and left is not right
+    if op == '==':
+        return left == right
+    if op == '!=':
+        return left != right
+    if op in ('<', '<=', '>', '>='):
+        if isinstance(left, str) and isinstance(right, str):
+            pair = (left, right)
+        else:
+            pair = (_to_number(left), _to_number(right))
+            if None in pair:
+                return False
+        return {'<': pair[0] < pair[1], '<=': pair[0] <= pair[1],
+                '>': pair[0] > pair[1], '>=': pair[0] >= pair[1]}[op]
+    left, right = str(left).lower(), str(right).lower()
+    if op == '=~':
+        return left == right
+    if op == '!~':
+        return left != right
+    if op == 'contains':
+        return right in left
+    if op == '!contains':
+        return right not in left
+    if op == 'startswith':
+        return left.startswith(right)
+    if op == '!startswith':
+        return not left.startswith(right)
+    return left.endswith(right)
+
+
+def compile_predicate(node, on_resources: bool) -> Callable[[Any], bool]:
+    """Turn a predicate tree into a function of one row"""
+    if isinstance(node, (And, Or)):
+        parts = [compile_predicate(item, on_resources) for item in node.items]
+        combine = _both if isinstance(node, And) else _either
+        predicate = parts[0]
+        for part in parts[1:]:
+            predicate = combine(predicate, part)
+        return predicate
+    if isinstance(node, Not):
+        part = compile_predicate(node.item, on_resources)
+        return lambda row: not part(row)
+    if isinstance(node, Call):
+        get = _getter(node.column, on_resources)
+        empty = node.function == 'isempty'
+        return lambda row: (get(row) in (None, '')) == empty
+    if isinstance(node, InList):
+        get = _getter(node.column, on_resources)
+        if node.ignore_case:
+            values = {str(value).lower() for value in node.values}
+
+            def member(row):
+                value = get(row)
+                return value is not None and str(value).lower() in values
+        else:
+            values = set(node.values)
+
+            def member(row):
+                return get(row) in values
+        return (lambda row: not member(row)) if node.negate else member
+    if isinstance(node, Compare):
+        fast = _compile_column_compare(node, on_resources)
+        if fast is not None:
+            return fast
+        left, right = (_operand(side, on_resources) for side in (node.left, node.right))
+        op = node.op
+        return lambda row: _compare(op, left(row), right(row))
+    raise _syntax_error(f"unsupported predicate {node!r}")
+
+
+def _both(first, second):
+    return lambda row: first(row) and second(row)
+
+
+def _either(first, second):
+    return lambda row: first(row) or second(row)
+
+
+def _compile_column_compare(node: Compare, on_resources: bool) -> Optional[Callable[[Any], bool]]:
+    """Specialised ``column <op> 'literal'`` for the common equality operators"""
+    if not (isinstance(node.left, Column) and isinstance(node.right, Literal)) or node.right.value is None:
+        return None
+    get, value = _getter(node.left, on_resources), node.right.value
+    if node.op == '==':
+        return lambda row: get(row) == value
+    if node.op == '!=':
+        return lambda row: get(row) != value
+    if node.op in ('=~', '!~'):
+        lowered, equal = str(value).lower(), node.op == '=~'
+
+        def matches(row):
+            actual = get(row)
+            if actual is None:
+                return not equal
+            return (str(actual).lower() == lowered) == equal
+        return matches
+    return None
+
+
+def _operand(node, on_resources: bool) -> Callable[[Any], Any]:
+    if isinstance(node, Literal):
+        value = node.value
+        return lambda row: value
+    return _getter(node, on_resources)
+
+
+# Planning
+
+def _conjuncts(predicate) -> List[Any]:
+    if isinstance(predicate, And):
+        return [part for item in predicate.items for part in _conjuncts(item)]
+    return [predicate]
+
+
+def _column_and_values(node) -> Optional[Tuple[Column, Tuple[Any, ...], bool]]:
+    """(column, accepted values, ignore_case) for equality-style predicates"""
+    if isinstance(node, Compare) and node.op in ('==', '=~'):
+        column, literal = node.left, node.right
+        if isinstance(column, Literal):
+            column, literal = literal, column
+        if isinstance(column, Column) and isinstance(literal, Literal):
+            return column, (literal.value,), node.op == '=~'
+    if isinstance(node, InList) and not node.negate:
+        return node.column, node.values, node.ignore_case
+    return None
+
+
+def _access_path(node, client) -> Optional[List[str]]:
+    """Candidate resource IDs (a superset of the matches) from an index, if one applies"""
+    if isinstance(node, Call) and node.function == 'isnotempty':
+        path = node.column.path
+        if len(path) == 2 and path[0].lower() == 'tags':
+            return client._tag_index.ids_with_tag(path[1])
+        return None
+    match = _column_and_values(node)
+    if match is None:
+        return None
+    column, values, ignore_case = match
+    path = tuple(part.lower() for part in column.path[:1]) + column.path[1:]
+    if not all(isinstance(value, str) for value in values):
+        return None
+    if len(path) == 2 and path[0] == 'tags':
+        # The tag index matches values case-insensitively, a superset of ==
+        return _union(client._tag_index.ids_with_tag_value(path[1], value) for value in values)
+    if path == ('resourcegroup',) and not ignore_case:
+        return _union(client._resource_group_index.ids_in_group(value) for value in values)
+    if path == ('id',) and not ignore_case:
+        return [value for value in values if value in client._resource_store]
+    store = client.columnar_store
+    if store is not None and path in (('location',), ('type',)):
+        return store.ids_where(path[0], values, ignore_case)
+    return None
+
+
+def _union(id_lists: Iterable[List[str]]) -> List[str]:
+    return list(dict.fromkeys(itertools.chain.from_iterable(id_lists)))
+
+
+def _candidates(predicates: List[Any], client) -> Iterator[Any]:
+    """Resources that can satisfy ``predicates``, read from the narrowest index"""
+    store = client._resource_store
+    best = None
+    for node in predicates:
+        resource_ids = _access_path(node, client)
+        if resource_ids is not None and (best is None or len(resource_ids) < len(best)):
+            best = resource_ids
+    if best is None:
+        with client._lock:
+            best = list(store)
+    # Looked up as the query advances: resources deleted since are skipped
+    return filter(None, map(store.get, best))
+
+
+# Execution
+
+def _sort_key(value):
+    # None sorts after everything; numbers before strings
+    if value is None:
+        return (2, 0)
+    number = _to_number(value) if not isinstance(value, str) else None
+    return (0, number) if number is not None else (1, str(value))
+
+
+def _order(rows: Iterable[Any], keys: Tuple[Tuple[Column, bool], ...], on_resources: bool,
+           limit: Optional[int] = None) -> List[Any]:
+    getters = [(_getter(column, on_resources), descending) for column, descending in keys]
+    rows = list(rows)
+    if limit is not None and len(getters) == 1:
+        # Top-N with a single key: a bounded heap instead of a full sort
+        get, descending = getters[0]
+        choose = heapq.nlargest if descending else heapq.nsmallest
+        if descending:
+            return choose(limit, rows, key=lambda row: _descending_key(get(row)))
+        return choose(limit, rows, key=lambda row: _sort_key(get(row)))
+    for get, descending in reversed(getters):
+        if descending:
+            rows.sort(key=lambda row: _descending_key(get(row)), reverse=True)
+        else:
+            rows.sort(key=lambda row: _sort_key(get(row)))
+    return rows if limit is None else rows[:limit]
+
+
+def _descending_key(value):
+    # Reverse sort still keeps missing values last
+    rank, inner = _sort_key(value)
+    return (-rank, inner) if rank == 2 else (2 - rank, inner)
+
+
+def _summarize(rows: Iterable[Any], summarize: Summarize, on_resources: bool) -> List[Dict[str, Any]]:
+    getters = [_getter(column, on_resources) for _, column in summarize.by]
+    if not getters:
+        def key(row):
+            return ()
+    elif len(getters) == 1:
+        get = getters[0]
+
+        def key(row):
+            return (get(row),)
+    else:
+        def key(row):
+            return tuple(get(row) for get in getters)
+
+    if all(aggregate.function == 'count' for aggregate in summarize.aggregates):
+        counts = Counter(map(key, rows))
+        groups = {group: None for group in counts}
+    else:
+        groups: Dict[Tuple, List[Any]] = {}
+        for row in rows:
+            group = key(row)
+            members = groups.get(group)
+            if members is None:
+                groups[group] = [row]
+            else:
+                members.append(row)
+        counts = {group: len(members) for group, members in groups.items()}
+    results = []
+    for group, members in groups.items():
+        result = {name: value for (name, _), value in zip(summarize.by, group)}
+        for aggregate in summarize.aggregates:
+            result[aggregate.name] = counts[group] if aggregate.function == 'count' else \
+                _aggregate(aggregate, members, on_resources)
+        results.append(result)
+    return results
+
+
+def _aggregate(aggregate: Aggregate, rows: List[Any], on_resources: bool):
+    numbers = [number for number in map(_to_number, map(_getter(aggregate.column, on_resources), rows))
+               if number is not None]
+    if aggregate.function == 'sum':
+        return sum(numbers)
+    if not numbers:
+        return None
+    if aggregate.function == 'avg':
+        return sum(numbers) / len(numbers)
+    return min(numbers) if aggregate.function == 'min' else max(numbers)
+
+
+def execute(operators: Tuple[Any, ...], client) -> Union[List[Dict[str, Any]], Iterator[Dict[str, Any]]]:
+    """Run parsed operators against the client's store
+
+    Returns a list when a blocking operator (summarize, order by, count)
+    forced the whole result to be built, otherwise a lazy iterator.
+    """
+    leading = []
+    remaining = list(operators)
+    while remaining and isinstance(remaining[0], Where):
+        leading.extend(_conjuncts(remaining.pop(0).predicate))
+    rows: Iterable[Any] = _candidates(leading, client)
+    if leading:
+        rows = filter(compile_predicate(And(tuple(leading)), True), rows)
+    on_resources = True
+    materialized = False
+    for index, operator in enumerate(remaining):
+        if isinstance(operator, Where):
+            rows = filter(compile_predicate(operator.predicate, on_resources), rows)
+        elif isinstance(operator, Project):
+            getters = [(name, _getter(column, on_resources)) for name, column in operator.columns]
+            rows = ({name: get(row) for name, get in getters} for row in rows)
+            on_resources = False
+        elif isinstance(operator, Summarize):
+            rows = _summarize(rows, operator, on_resources)
+            on_resources, materialized = False, True
+        elif isinstance(operator, OrderBy):
+            following = remaining[index + 1] if index + 1 < len(remaining) else None
+            limit = following.count if isinstance(following, Take) else None
+            rows = _order(rows, operator.keys, on_resources, limit)
+            materialized = True
+        elif isinstance(operator, Take):
+            rows = itertools.islice(rows, operator.count)
+            if materialized:
+                rows = list(rows)
+        elif isinstance(operator, CountRows):
+            rows = [{'Count': sum(1 for _ in rows)}]
+            on_resources, materialized = False, True
+    if on_resources:
+        rows = map(resource_row, rows)
+        if materialized:
+            rows = list(rows)
+    return rows if materialized else iter(rows)
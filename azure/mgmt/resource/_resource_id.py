@@ -0,0 +1,84 @@
+"""Resource ID parsing and the resource group -> children index"""
+import threading
+from typing import Dict, List, NamedTuple, Optional
+
+
+class ResourceId(NamedTuple):
+    """Parsed ARM resource ID"""
+    subscription_id: str
+    resource_group: Optional[str] = None
+    namespace: Optional[str] = None
+    resource_type: Optional[str] = None
+    name: Optional[str] = None
+
+    @property
+    def full_type(self) -> Optional[str]:
+        """Provider-qualified type, e.g. ``Microsoft.Compute/virtualMachines``"""
+        if self.namespace is None:
+            return None
+        return f"{self.namespace}/{self.resource_type}"
+
+
+def parse_resource_id(resource_id: str) -> ResourceId:
+    """Parse ``/subscriptions/{sub}/resourceGroups/{rg}/providers/{ns}/{type...}/{name}``"""
+    segments = resource_id.strip('/').split('/')
+    if len(segments) < 2 or segments[0].lower() != 'subscriptions':
+        raise ValueError(f"Invalid resource ID: '{resource_id}'")
+    subscription_id = segments[1]
+    if len(segments) == 2:
+        return ResourceId(subscription_id)
+    if len(segments) < 4 or segments[2].lower() != 'resourcegroups':
+        raise ValueError(f"Invalid resource ID: '{resource_id}'")
+    resource_group = segments[3]
+    if len(segments) == 4:
+        return ResourceId(subscription_id, resource_group)
+    if len(segments) < 7 or segments[4].lower() != 'providers':
+        raise ValueError(f"Invalid resource ID: '{resource_id}'")
+    return ResourceId(
+        subscription_id,
+        resource_group,
+        segments[5],
+        '/'.join(segments[6:-1]),
+        segments[-1],
+    )
+
+
+class ResourceGroupIndex:
+    """Index from resource group name to the IDs of the resources it contains"""
+
+    def __init__(self):
+        self._children: Dict[str, Dict[str, None]] = {}
+        self._lock = threading.RLock()
+
+    def add(self, resource_id: str) -> None:
+        """Register a resource under its resource group"""
+        resource_group = parse_resource_id(resource_id).resource_group
+        with self._lock:
+            self._children.setdefault(resource_group, {})[resource_id] = None
+
+    def remove(self, resource_id: str) -> None:
+        """Forget a resource"""
+        resource_group = parse_resource_id(resource_id).resource_group
+        with self._lock:
+            children = self._children.get(resource_group)
+            if children is not None:
+                children.pop(resource_id, None)
+                if not children:
+                    del self._children[resource_group]
+
+    def ids_in_group(self, resource_group_name: str) -> List[str]:
+        """IDs of the resources in a resource group"""
+        with self._lock:
+            return list(self._children.get(resource_group_name, ()))
+
+    def ids_in_group_ignore_case(self, resource_group_name: str) -> List[str]:
+        """IDs of the resources in every resource group whose name matches case-insensitively"""
+        wanted = resource_group_name.lower()
+        with self._lock:
+            return [resource_id for name, children in self._children.items() if name.lower() == wanted
+                    for resource_id in children]
+
+    def pop_group(self, resource_group_name: str) -> List[str]:
+        """Remove a resource group's bucket and return the IDs it held"""
+        with self._lock:
+            return list(self._children.pop(resource_group_name, ()))
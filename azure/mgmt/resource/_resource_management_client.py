@@ -1,43 +1,238 @@
 """Azure Resource Management Client"""
-import time
+import functools
+import inspect
 import random
-from typing import Dict, Optional
+import threading
+from typing import Any, List, Optional
 from azure.identity import DefaultAzureCredential
-from azure.core.exceptions import ClientAuthenticationError
-from azure.mgmt.resource.operations import ResourceGroupsOperations, ResourcesOperations, TagsOperations
+from azure.core.exceptions import ClientAuthenticationError, ThrottlingError
+from azure.core.instrumentation import Instrumentation, Metrics
+from azure.core.policies import RetryPolicy
+from azure.core.simulation import SimulationProfile
+from azure.mgmt.resource.operations import (
+    ResourceGraphOperations, ResourceGroupsOperations, ResourcesOperations, TagsOperations
+)
+from azure.mgmt.resource._change_log import ChangeLog
+from azure.mgmt.resource._storage import MemoryStorage, StorageBackend
+from azure.mgmt.resource.models import ChangeType
+
+MANAGEMENT_SCOPE = "https://management.azure.com/.default"
 
 
 class ResourceManagementClient:
-    """Client for Azure Resource Management"""
+    """Client for Azure Resource Management
+    
+    ``retry_policy`` wraps every operation (except listing) in retries and
+    optional client-side rate limiting. ``write_rate_limit`` makes the mock
+    service throttle writes above that many requests/second per subscription,
+    like ARM does, instead of only failing at random. ``columnar_store``
+    keeps resources in a NumPy-backed ``ColumnarResourceStore`` (exposed as
+    ``client.columnar_store``) instead of a dict of objects, for fast
+    aggregations over millions of resources. Every resource change is
+    recorded in ``client.changes``, a ``ChangeLog`` keeping the last
+    ``change_log_retention`` changes. ``client.resource_graph`` runs
+    Resource Graph style (KQL) queries directly against the store.
+    
+    ``storage`` replaces the in-memory dicts with another backend, such as
+    ``SqliteStorage`` (persistent) or ``open_snapshot(path)`` (a read-only,
+    memory-mapped snapshot); the client indexes whatever it already holds.
+    Closing the client closes its storage.
+    
+    ``simulation`` sets the simulated latency, failure rates and clock of
+    every request (see ``azure.core.simulation``); by default requests take
+    real time and fail at random. Pass the same profile to the credential
+    and rate limiter. ``SimulationProfile.fast(seed)`` runs whole scenarios
+    in milliseconds with reproducible failures and reports the simulated
+    time on ``client.simulation.elapsed()``.
+    
+    ``metrics=True`` counts the calls, errors (by status code) and latency
+    percentiles of every operation and page fetch, read with
+    ``client.metrics.snapshot()``; a ``tracer`` (an OpenTelemetry tracer or
+    ``RecordingTracer``) gets a span per call. Both are off by default, and
+    then operations are not wrapped at all.
+    
+    The client authenticates in the constructor unless
+    ``lazy_authentication`` is set, in which case the token is fetched by
+    the first request (and again once it expires). Share one credential
+    between clients: it caches tokens, so only the first client pays for
+    authentication.
+    """
     
     def __init__(self, credential: DefaultAzureCredential, subscription_id: str, 
-                 api_version: str = "2021-04-01"):
+                 api_version: str = "2021-04-01",
+                 retry_policy: Optional[RetryPolicy] = None,
+                 write_rate_limit: Optional[float] = None,
+                 columnar_store: bool = False,
+                 change_log_retention: int = 100_000,
+                 lazy_authentication: bool = False,
+                 storage: Optional[StorageBackend] = None,
+                 simulation: Optional[SimulationProfile] = None,
+                 metrics: bool = False,
+                 tracer=None):
         self.credential = credential
         self.subscription_id = subscription_id
         self.api_version = api_version
+        self.retry_policy = retry_policy
+        self.write_rate_limit = write_rate_limit
+        self.simulation = SimulationProfile() if simulation is None else simulation
+        self._write_tokens = write_rate_limit or 0.0
+        self._write_tokens_updated = self.simulation.clock.now()
+        self._token = None
+        self.metrics = Metrics(enabled=metrics)
+        self.tracer = tracer
+        self._instrumentation: Optional[Instrumentation] = None
+        if metrics or tracer is not None:
+            self._instrumentation = Instrumentation(self.metrics if metrics else None, tracer,
+                                                    self.simulation.clock)
         
-        # In-memory storage for workshop
-        self._resource_store: Dict = {}
-        self._resource_groups_store: Dict = {}
+        # In-memory storage for workshop unless a backend is given; the lock keeps
+        # the store and its secondary indexes consistent across worker threads
+        self._lock = threading.RLock()
+        if storage is not None and columnar_store:
+            raise ValueError("columnar_store cannot be combined with a storage backend")
+        if columnar_store:
+            # Imported here so NumPy is only needed when the option is used
+            from azure.mgmt.resource._columnar_store import ColumnarResourceStore
+            storage = MemoryStorage(ColumnarResourceStore())
+        self.storage = MemoryStorage() if storage is None else storage
+        self._resource_store = self.storage.resources
+        self._resource_groups_store = self.storage.resource_groups
+        # Stores with the columnar analytics API (columnar stores, snapshots) serve vectorized reports
+        self.columnar_store = self._resource_store if hasattr(self._resource_store, 'value_counts') else None
+        self._store_listeners: List[Any] = []
+        self.changes = ChangeLog(change_log_retention, self.simulation.clock)
+        self._load_indexes()
         
-        # Initialize operations
+        # Initialize operations; instrumentation goes innermost so every attempt is recorded
+        self._init_operations()
+        if self._instrumentation is not None:
+            self._apply_instrumentation()
+        if lazy_authentication:
+            self._apply_lazy_authentication()
+        if self.retry_policy is not None:
+            self._apply_retry_policy()
+        
+        # Authenticate
+        if not lazy_authentication:
+            self._authenticate()
+    
+    def _init_operations(self):
+        """Create the operation groups"""
         self.resource_groups = ResourceGroupsOperations(self)
         self.resources = ResourcesOperations(self)
         self.tags = TagsOperations(self)
-        
-        # Authenticate
-        self._authenticate()
+        self.resource_graph = ResourceGraphOperations(self)
+    
+    def _apply_retry_policy(self):
+        """Route every non-listing operation through the retry policy"""
+        for operations in (self.resource_groups, self.resources, self.tags):
+            for name in dir(type(operations)):
+                if name.startswith('_') or name.startswith('list'):
+                    continue
+                setattr(operations, name, self.retry_policy.wrap(getattr(operations, name), self.simulation))
+    
+    def _apply_instrumentation(self):
+        """Record metrics and spans for every operation, named like ``resources.get``"""
+        for group in ('resource_groups', 'resources', 'tags', 'resource_graph'):
+            operations = getattr(self, group)
+            for name in dir(type(operations)):
+                operation = getattr(operations, name)
+                # Generators of pages are recorded by the page requests they make
+                if name.startswith('_') or inspect.isgeneratorfunction(operation) \
+                        or inspect.isasyncgenfunction(operation):
+                    continue
+                setattr(operations, name, self._instrumentation.wrap(f"{group}.{name}", operation))
+    
+    def _apply_lazy_authentication(self):
+        """Authenticate on the first request instead of in the constructor"""
+        for operations in (self.resource_groups, self.resources, self.tags, self.resource_graph):
+            for name in dir(type(operations)):
+                if name.startswith('_'):
+                    continue
+                setattr(operations, name, self._with_authentication(getattr(operations, name)))
+    
+    def _with_authentication(self, operation):
+        @functools.wraps(operation)
+        def authenticated(*args, **kwargs):
+            self._ensure_authenticated()
+            return operation(*args, **kwargs)
+        return authenticated
+    
+    def _ensure_authenticated(self):
+        """Fetch a token unless the client holds one that is not yet due for renewal"""
+        if not self._token_is_fresh():
+            self._authenticate()
+    
+    def _token_is_fresh(self) -> bool:
+        # Inside the credential's refresh window, asking it again lets it renew in the background
+        token = self._token
+        refresh_window = getattr(self.credential, 'refresh_window', 0)
+        return token is not None and token.expires_on - self.simulation.clock.time() > refresh_window
     
     def _authenticate(self):
         """Authenticate with Azure"""
         try:
-            self.credential.get_token("https://management.azure.com/.default")
+            self._token = self.credential.get_token(MANAGEMENT_SCOPE)
         except Exception as e:
             raise ClientAuthenticationError(f"Failed to authenticate: {str(e)}")
     
+    def _check_write_quota(self) -> None:
+        """Simulate ARM's per-subscription write throttling"""
+        if self.write_rate_limit is None:
+            return
+        with self._lock:
+            # Worker timelines of a virtual clock may read slightly earlier times
+            now = max(self.simulation.clock.now(), self._write_tokens_updated)
+            self._write_tokens = min(
+                self.write_rate_limit,
+                self._write_tokens + (now - self._write_tokens_updated) * self.write_rate_limit
+            )
+            self._write_tokens_updated = now
+            if self._write_tokens < 1:
+                retry_after = (1 - self._write_tokens) / self.write_rate_limit
+                raise ThrottlingError("TooManyRequests: subscription write limit exceeded",
+                                      retry_after=retry_after)
+            self._write_tokens -= 1
+    
+    def _load_indexes(self) -> None:
+        """Index the resources a storage backend already holds (not recorded as changes)"""
+        self._tag_index, self._resource_group_index = self.storage.indexes()
+    
+    def add_store_listener(self, listener) -> None:
+        """Notify ``listener`` of every resource write and delete
+        
+        ``listener.resource_stored(resource)`` is called after a resource is
+        created or updated (tag changes included) and
+        ``listener.resource_removed(resource_id)`` after it is deleted, both
+        while the client's lock is held.
+        """
+        with self._lock:
+            self._store_listeners.append(listener)
+    
+    def remove_store_listener(self, listener) -> None:
+        """Stop notifying ``listener``"""
+        with self._lock:
+            self._store_listeners.remove(listener)
+    
+    def _index_resource(self, resource, change_type: ChangeType) -> None:
+        """Bring the secondary indexes, listeners and change log in line with a stored resource"""
+        self._tag_index.update(resource.id, resource.tags)
+        self._resource_group_index.add(resource.id)
+        for listener in self._store_listeners:
+            listener.resource_stored(resource)
+        self.changes.record(change_type, resource.id, resource)
+    
+    def _unindex_resource(self, resource_id: str) -> None:
+        """Drop a deleted resource from the secondary indexes, listeners and change log"""
+        self._tag_index.remove(resource_id)
+        self._resource_group_index.remove(resource_id)
+        for listener in self._store_listeners:
+            listener.resource_removed(resource_id)
+        self.changes.record(ChangeType.DELETE, resource_id)
+    
     def close(self):
-        """Close the client"""
-        pass
+        """Close the client and its storage backend"""
+        self.storage.close()
     
     def __enter__(self):
         return self
@@ -0,0 +1,549 @@
+"""Binary snapshots of a client's store that open with a memory map
+
+A snapshot is one file: a JSON header (categories, resource groups and
+the layout of the arrays) followed by the columnar arrays of
+``ColumnarResourceStore``, aligned so they can be used straight from a
+read-only memory map. Opening a snapshot reads only the header, however
+many resources it holds, and processes that open the same file share its
+pages through the OS cache. IDs are found by binary search over a sorted
+array of their 64-bit hashes, and resources are built only when read.
+
+``open_snapshot`` gives a read-only backend, which also supports the
+columnar analytics API; ``restore_snapshot`` copies a snapshot into a
+writable backend. Requires NumPy.
+"""
+import hashlib
+import json
+import mmap
+import os
+import struct
+from collections.abc import ItemsView, MutableMapping, ValuesView
+from dataclasses import asdict
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+import numpy as np
+from azure.core.exceptions import HttpResponseError
+from azure.mgmt.resource._columnar_store import (
+    _EXTRA_FIELDS, _HAS_PROPERTIES, _HAS_TAGS, _NO_TIME, CATEGORY_COLUMNS, TAG_COLUMNS, ColumnarResourceStore
+)
+from azure.mgmt.resource._resource_id import parse_resource_id
+from azure.mgmt.resource._storage import (
+    MemoryStorage, StorageBackend, _ScanItemsView, _ScanValuesView, resource_from_dict,
+    resource_group_from_dict, resource_group_to_dict
+)
+from azure.mgmt.resource._tag_index import TagIndex
+from azure.mgmt.resource.models import GenericResource, ResourceGroup
+
+_MAGIC = b"SNPPSNAP"
+_VERSION = 1
+_ALIGNMENT = 64
+# Set when a row has tags outside TAG_COLUMNS (kept in the sparse table)
+_HAS_OTHER_TAGS = 4
+
+
+def _id_hash(resource_id: str) -> int:
+    # Stable across processes, unlike hash()
+    return int.from_bytes(hashlib.blake2b(resource_id.encode(), digest_size=8).digest(), 'little')
+
+
+def _encode_strings(values: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """(offsets, bytes) of a list of strings, for slicing without a Python object per value"""
+    encoded = [value.encode() for value in values]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(value) for value in encoded], out=offsets[1:])
+    return offsets, np.frombuffer(b''.join(encoded), dtype=np.uint8)
+
+
+def _json_extras(extras: Dict[str, Any]) -> Dict[str, Any]:
+    return {field: asdict(value) if field in ('sku', 'plan', 'identity') else value
+            for field, value in extras.items()}
+
+
+class _Columns:
+    """Column arrays of a snapshot being written"""
+
+    def __init__(self):
+        self.ids: List[str] = []
+        self.names: List[str] = []
+        self.codes: Dict[str, List[int]] = {name: [] for name in CATEGORY_COLUMNS}
+        self.categories: Dict[str, List[Any]] = {name: [] for name in CATEGORY_COLUMNS}
+        self._lookup: Dict[str, Dict[Any, int]] = {name: {} for name in CATEGORY_COLUMNS}
+        self.flags: List[int] = []
+        self.created: List[int] = []
+        self.changed: List[int] = []
+        self.sparse: Dict[int, Dict[str, Any]] = {}
+
+    def encode(self, column: str, value) -> int:
+        if value is None:
+            return -1
+        lookup = self._lookup[column]
+        code = lookup.get(value)
+        if code is None:
+            code = lookup[value] = len(self.categories[column])
+            self.categories[column].append(value)
+        return code
+
+    def add(self, resource_id: str, resource: GenericResource) -> None:
+        row = len(self.ids)
+        try:
+            parsed = parse_resource_id(resource_id)
+            resource_group, subscription = parsed.resource_group, parsed.subscription_id
+        except ValueError:
+            resource_group = subscription = None
+        self.ids.append(resource_id)
+        self.names.append(resource.name)
+        codes = self.codes
+        codes['location'].append(self.encode('location', resource.location))
+        codes['type'].append(self.encode('type', resource.type))
+        codes['resource_group'].append(self.encode('resource_group', resource_group))
+        codes['subscription'].append(self.encode('subscription', subscription))
+        codes['provisioning_state'].append(self.encode('provisioning_state', resource.provisioning_state))
+
+        flags = 0
+        tag_codes = dict.fromkeys(TAG_COLUMNS, -1)
+        sparse = {}
+        if resource.tags is not None:
+            flags |= _HAS_TAGS
+            other_tags = {}
+            for name, value in resource.tags.items():
+                if name in tag_codes and type(value) is str:
+                    tag_codes[name] = self.encode(name, value)
+                else:
+                    other_tags[name] = value
+            if other_tags:
+                flags |= _HAS_OTHER_TAGS
+                sparse['tags'] = other_tags
+        for name, code in tag_codes.items():
+            codes[name].append(code)
+        extras = {field: getattr(resource, field) for field in _EXTRA_FIELDS
+                  if getattr(resource, field) is not None}
+        if resource.properties is not None:
+            flags |= _HAS_PROPERTIES
+            if resource.properties:
+                extras['properties'] = resource.properties
+        if extras:
+            sparse['extras'] = _json_extras(extras)
+        if sparse:
+            self.sparse[row] = sparse
+        self.flags.append(flags)
+        self.created.append(_NO_TIME if resource._created is None else resource._created)
+        self.changed.append(_NO_TIME if resource._changed is None else resource._changed)
+
+    def arrays(self) -> Dict[str, np.ndarray]:
+        arrays = {name: np.asarray(codes, dtype=np.int32) for name, codes in self.codes.items()}
+        arrays.update(flags=np.asarray(self.flags, dtype=np.uint8),
+                      created=np.asarray(self.created, dtype=np.int64),
+                      changed=np.asarray(self.changed, dtype=np.int64))
+        return arrays
+
+
+def _columnar_arrays(store: ColumnarResourceStore):
+    """(ids, names, arrays, categories, sparse) straight from a columnar store's arrays"""
+    with store._lock:
+        rows = store.rows()
+        position = {int(row): index for index, row in enumerate(rows)}
+        arrays = {name: store._columns[name].codes[rows].copy() for name in CATEGORY_COLUMNS}
+        flags = store._flags[rows].copy()
+        sparse = {}
+        for row, tags in store._other_tags.items():
+            sparse.setdefault(position[row], {})['tags'] = dict(tags)
+            flags[position[row]] |= _HAS_OTHER_TAGS
+        for row, extras in store._extras.items():
+            sparse.setdefault(position[row], {})['extras'] = _json_extras(extras)
+        arrays.update(flags=flags, created=store._created[rows].copy(), changed=store._changed[rows].copy())
+        categories = {name: list(store._columns[name].categories) for name in CATEGORY_COLUMNS}
+        return store.ids(rows), store.names(rows), arrays, categories, sparse
+
+
+def save_snapshot(source, path: str) -> int:
+    """Write the resources and resource groups of ``source`` to a snapshot file
+
+    ``source`` is a client or a storage backend. The file is written next
+    to ``path`` and renamed into place, so readers never see a partial
+    snapshot. Returns the number of resources written.
+    """
+    resources = getattr(source, '_resource_store', None)
+    groups = getattr(source, '_resource_groups_store', None)
+    if resources is None:
+        resources, groups = source.resources, source.resource_groups
+    lock = getattr(source, '_lock', None)
+    if lock is not None:
+        # A client: hold its lock so the snapshot is consistent
+        with lock:
+            return _write_snapshot(resources, groups, path)
+    return _write_snapshot(resources, groups, path)
+
+
+def _write_snapshot(resources, groups, path: str) -> int:
+    if isinstance(resources, ColumnarResourceStore):
+        ids, names, arrays, categories, sparse = _columnar_arrays(resources)
+    else:
+        columns = _Columns()
+        for resource_id, resource in resources.items():
+            columns.add(resource_id, resource)
+        ids, names, arrays, categories, sparse = (
+            columns.ids, columns.names, columns.arrays(), columns.categories, columns.sparse)
+
+    arrays['id_offsets'], arrays['id_bytes'] = _encode_strings(ids)
+    arrays['name_offsets'], arrays['name_bytes'] = _encode_strings(names)
+    hashes = np.fromiter(map(_id_hash, ids), dtype=np.uint64, count=len(ids))
+    order = np.argsort(hashes, kind='stable')
+    arrays['id_hashes'], arrays['hash_rows'] = hashes[order], order.astype(np.int64)
+    sparse_rows = sorted(sparse)
+    arrays['sparse_rows'] = np.asarray(sparse_rows, dtype=np.int64)
+    arrays['sparse_offsets'], arrays['sparse_bytes'] = _encode_strings(
+        [json.dumps(sparse[row]) for row in sparse_rows])
+
+    header = {
+        'version': _VERSION,
+        'count': len(ids),
+        'categories': categories,
+        'resource_groups': [resource_group_to_dict(group) for group in groups.values()],
+        'arrays': {},
+    }
+    # Array offsets are relative to the first aligned byte after the header
+    layout, position = {}, 0
+    for name, array in arrays.items():
+        layout[name] = [position, array.dtype.str, len(array)]
+        position += -(-array.nbytes // _ALIGNMENT) * _ALIGNMENT
+    header['arrays'] = layout
+    encoded = json.dumps(header).encode()
+    data_start = -(-(len(_MAGIC) + 8 + len(encoded)) // _ALIGNMENT) * _ALIGNMENT
+
+    temporary = f"{path}.tmp-{os.getpid()}"
+    with open(temporary, 'wb') as file:
+        file.write(_MAGIC + struct.pack('<Q', len(encoded)) + encoded)
+        for name, array in arrays.items():
+            file.seek(data_start + layout[name][0])
+            file.write(np.ascontiguousarray(array).tobytes())
+        file.truncate(data_start + position)
+    os.replace(temporary, path)
+    return len(ids)
+
+
+class _ReadOnlyMixin:
+    def __setitem__(self, key, value) -> None:
+        raise HttpResponseError("The store is a read-only snapshot", 405)
+
+    def __delitem__(self, key) -> None:
+        if key not in self:
+            raise KeyError(key)
+        raise HttpResponseError("The store is a read-only snapshot", 405)
+
+
+class SnapshotResourceStore(_ReadOnlyMixin, MutableMapping):
+    """Read-only resources of a memory-mapped snapshot
+
+    Supports the analytics methods of ``ColumnarResourceStore`` (``rows``,
+    ``codes``, ``categories``, ``value_counts``, ``is_tagged``,
+    ``ids_where``, ``ids`` and ``names``); writes raise an
+    ``HttpResponseError`` with status 405.
+    """
+
+    def __init__(self, header: Dict[str, Any], arrays: Dict[str, np.ndarray]):
+        self._count = header['count']
+        self._categories = header['categories']
+        self._arrays = arrays
+        self._id_offsets = arrays['id_offsets']
+        self._id_bytes = arrays['id_bytes']
+        self._name_offsets = arrays['name_offsets']
+        self._name_bytes = arrays['name_bytes']
+
+    # Mapping interface
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __iter__(self) -> Iterator[str]:
+        return map(self._id, range(self._count))
+
+    def __contains__(self, resource_id) -> bool:
+        return isinstance(resource_id, str) and self._row(resource_id) is not None
+
+    def __getitem__(self, resource_id: str) -> GenericResource:
+        row = self._row(resource_id) if isinstance(resource_id, str) else None
+        if row is None:
+            raise KeyError(resource_id)
+        return self._materialize(row)
+
+    def items(self) -> ItemsView:
+        return _ScanItemsView(self)
+
+    def values(self) -> ValuesView:
+        return _ScanValuesView(self)
+
+    def _scan(self) -> Iterator[Tuple[str, GenericResource]]:
+        for row in range(self._count):
+            yield self._id(row), self._materialize(row)
+
+    # Analytics
+
+    def rows(self) -> np.ndarray:
+        """Row numbers of the resources"""
+        return np.arange(self._count)
+
+    def codes(self, column: str, rows: Optional[np.ndarray] = None) -> np.ndarray:
+        """Category codes of ``column`` for ``rows`` (default: all rows); -1 is missing"""
+        codes = self._arrays[column]
+        return np.array(codes) if rows is None else codes[rows]
+
+    def categories(self, column: str) -> List[Any]:
+        """Values of ``column``, indexed by category code"""
+        return list(self._categories[column])
+
+    def value_counts(self, column: str) -> Dict[Any, int]:
+        """Resources per value of ``column``; missing values are counted under ``None``"""
+        categories = self._categories[column]
+        counts = np.bincount(self._arrays[column] + 1, minlength=len(categories) + 1)
+        result = {}
+        if counts[0]:
+            result[None] = int(counts[0])
+        for code in np.flatnonzero(counts[1:]):
+            result[categories[code]] = int(counts[code + 1])
+        return result
+
+    def is_tagged(self, rows: Optional[np.ndarray] = None) -> np.ndarray:
+        """Whether each row has at least one tag"""
+        rows = self.rows() if rows is None else rows
+        tagged = (self._arrays['flags'][rows] & _HAS_OTHER_TAGS) != 0
+        for name in TAG_COLUMNS:
+            tagged |= self._arrays[name][rows] >= 0
+        return tagged
+
+    def ids_where(self, column: str, values: Sequence[Any], ignore_case: bool = False) -> List[str]:
+        """IDs of the resources whose ``column`` is one of ``values``"""
+        categories = self._categories[column]
+        if ignore_case:
+            wanted = {str(value).lower() for value in values}
+            codes = [code for code, category in enumerate(categories) if str(category).lower() in wanted]
+        else:
+            wanted = set(values)
+            codes = [code for code, category in enumerate(categories) if category in wanted]
+        if not codes:
+            return []
+        return self.ids(np.flatnonzero(np.isin(self._arrays[column], codes)))
+
+    def ids(self, rows: Sequence[int]) -> List[str]:
+        """Resource IDs of ``rows``"""
+        return [self._id(row) for row in rows]
+
+    def names(self, rows: Sequence[int]) -> List[str]:
+        """Resource names of ``rows``"""
+        offsets, data = self._name_offsets, self._name_bytes
+        return [data[offsets[row]:offsets[row + 1]].tobytes().decode() for row in rows]
+
+    # Rows
+
+    def _id(self, row: int) -> str:
+        offsets = self._id_offsets
+        return self._id_bytes[offsets[row]:offsets[row + 1]].tobytes().decode()
+
+    def _row(self, resource_id: str) -> Optional[int]:
+        hashes = self._arrays['id_hashes']
+        wanted = _id_hash(resource_id)
+        index = int(np.searchsorted(hashes, np.uint64(wanted)))
+        while index < self._count and int(hashes[index]) == wanted:
+            row = int(self._arrays['hash_rows'][index])
+            if self._id(row) == resource_id:
+                return row
+            index += 1
+        return None
+
+    def _sparse(self, row: int) -> Dict[str, Any]:
+        sparse_rows = self._arrays['sparse_rows']
+        index = int(np.searchsorted(sparse_rows, row))
+        if index == len(sparse_rows) or sparse_rows[index] != row:
+            return {}
+        offsets = self._arrays['sparse_offsets']
+        return json.loads(self._arrays['sparse_bytes'][offsets[index]:offsets[index + 1]].tobytes())
+
+    def _decode(self, column: str, row: int) -> Any:
+        code = self._arrays[column][row]
+        return None if code < 0 else self._categories[column][code]
+
+    def _materialize(self, row: int) -> GenericResource:
+        flags = int(self._arrays['flags'][row])
+        sparse = self._sparse(row)
+        data = dict(sparse.get('extras', ()))
+        data.update(id=self._id(row), name=self.names([row])[0],
+                    type=self._decode('type', row), location=self._decode('location', row))
+        state = self._decode('provisioning_state', row)
+        if state is not None:
+            data['provisioning_state'] = state
+        if flags & _HAS_TAGS:
+            tags = {name: self._decode(name, row) for name in TAG_COLUMNS if self._arrays[name][row] >= 0}
+            tags.update(sparse.get('tags', ()))
+            data['tags'] = tags
+        if flags & _HAS_PROPERTIES:
+            data.setdefault('properties', {})
+        for field in ('created', 'changed'):
+            timestamp = int(self._arrays[field][row])
+            if timestamp != _NO_TIME:
+                data[field] = timestamp
+        return resource_from_dict(data)
+
+
+class SnapshotResourceGroupStore(_ReadOnlyMixin, MutableMapping):
+    """Read-only resource groups of a snapshot"""
+
+    def __init__(self, groups: List[Dict[str, Any]]):
+        self._groups = {group['name']: resource_group_from_dict(group) for group in groups}
+
+    def __len__(self) -> int:
+        return len(self._groups)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self._groups))
+
+    def __getitem__(self, name: str) -> ResourceGroup:
+        return self._groups[name]
+
+
+class _SnapshotIndex:
+    """Read-only index over a snapshot's arrays; answers are cached, as a snapshot never changes"""
+
+    def __init__(self, store: SnapshotResourceStore):
+        self._store = store
+        self._cache: Dict[Any, List[str]] = {}
+
+    def _cached(self, key, rows) -> List[str]:
+        ids = self._cache.get(key)
+        if ids is None:
+            ids = self._cache[key] = self._store.ids(rows())
+        return list(ids)
+
+    def _read_only(self, *args) -> None:
+        raise HttpResponseError("The store is a read-only snapshot", 405)
+
+
+class SnapshotTagIndex(_SnapshotIndex):
+    """``TagIndex`` lookups answered from a snapshot's tag columns
+
+    Tags outside ``TAG_COLUMNS`` (or with non-string values) live in the
+    sparse table; the few rows holding them are decoded on first use.
+    """
+
+    update = remove = _SnapshotIndex._read_only
+
+    def __init__(self, store: SnapshotResourceStore):
+        super().__init__(store)
+        self._other_tags: Optional[Dict[int, Dict[str, Any]]] = None
+
+    def ids_with_tag(self, name: str) -> List[str]:
+        """Resource IDs carrying the given tag name"""
+        def rows():
+            matches = [row for row, tags in self._others().items() if name in tags]
+            if name in TAG_COLUMNS:
+                matches.extend(np.flatnonzero(self._store._arrays[name] >= 0).tolist())
+            return sorted(matches)
+        return self._cached(name, rows)
+
+    def ids_with_tag_value(self, name: str, value: Any) -> List[str]:
+        """Resource IDs whose tag ``name`` equals ``value`` (case-insensitive)"""
+        wanted = TagIndex.normalize_value(value)
+
+        def rows():
+            matches = [row for row, tags in self._others().items()
+                       if name in tags and TagIndex.normalize_value(tags[name]) == wanted]
+            if name in TAG_COLUMNS:
+                codes = [code for code, category in enumerate(self._store._categories[name])
+                         if TagIndex.normalize_value(category) == wanted]
+                matches.extend(np.flatnonzero(np.isin(self._store._arrays[name], codes)).tolist())
+            return sorted(matches)
+        return self._cached((name, wanted), rows)
+
+    def _others(self) -> Dict[int, Dict[str, Any]]:
+        if self._other_tags is None:
+            rows = np.flatnonzero(self._store._arrays['flags'] & _HAS_OTHER_TAGS).tolist()
+            self._other_tags = {row: self._store._sparse(row)['tags'] for row in rows}
+        return self._other_tags
+
+
+class SnapshotResourceGroupIndex(_SnapshotIndex):
+    """``ResourceGroupIndex`` lookups answered from a snapshot's resource group column"""
+
+    add = remove = pop_group = _SnapshotIndex._read_only
+
+    def ids_in_group(self, resource_group_name: str) -> List[str]:
+        """IDs of the resources in a resource group"""
+        return self._cached(resource_group_name, lambda: self._rows(resource_group_name))
+
+    def ids_in_group_ignore_case(self, resource_group_name: str) -> List[str]:
+        """IDs of the resources in every resource group whose name matches case-insensitively"""
+        wanted = resource_group_name.lower()
+        # Group by group, in the order the groups first appear, like ResourceGroupIndex
+        return [resource_id for name in self._store._categories['resource_group'] if name.lower() == wanted
+                for resource_id in self.ids_in_group(name)]
+
+    def _rows(self, name: str) -> np.ndarray:
+        categories = self._store._categories['resource_group']
+        if name not in categories:
+            return np.empty(0, dtype=np.int64)
+        return np.flatnonzero(self._store._arrays['resource_group'] == categories.index(name))
+
+
+class SnapshotStorage(StorageBackend):
+    """Read-only storage backend over a memory-mapped snapshot file"""
+
+    read_only = True
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, 'rb') as file:
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._map[:len(_MAGIC)] != _MAGIC:
+            self._map.close()
+            raise ValueError(f"{path} is not a resource store snapshot")
+        header_length, = struct.unpack_from('<Q', self._map, len(_MAGIC))
+        start = len(_MAGIC) + 8
+        header = json.loads(self._map[start:start + header_length])
+        if header['version'] != _VERSION:
+            self._map.close()
+            raise ValueError(f"Unsupported snapshot version {header['version']}")
+        data_start = -(-(start + header_length) // _ALIGNMENT) * _ALIGNMENT
+        arrays = {name: np.frombuffer(self._map, dtype=np.dtype(dtype), count=length,
+                                      offset=data_start + offset)
+                  for name, (offset, dtype, length) in header['arrays'].items()}
+        super().__init__(SnapshotResourceStore(header, arrays),
+                         SnapshotResourceGroupStore(header['resource_groups']))
+
+    def tag_entries(self) -> Iterator[Tuple[str, Optional[Dict[str, Any]]]]:
+        """(resource ID, tags) of every resource, decoded from the tag columns"""
+        store = self.resources
+        columns = [(name, store._arrays[name].tolist(), store._categories[name]) for name in TAG_COLUMNS]
+        flags = store._arrays['flags'].tolist()
+        for row, resource_id in enumerate(store):
+            if not flags[row] & _HAS_TAGS:
+                yield resource_id, None
+                continue
+            tags = {name: categories[codes[row]] for name, codes, categories in columns if codes[row] >= 0}
+            if flags[row] & _HAS_OTHER_TAGS:
+                tags.update(store._sparse(row)['tags'])
+            yield resource_id, tags
+
+    def indexes(self) -> Tuple[SnapshotTagIndex, SnapshotResourceGroupIndex]:
+        """Indexes answering from the snapshot's columns, so opening a client builds nothing"""
+        return SnapshotTagIndex(self.resources), SnapshotResourceGroupIndex(self.resources)
+
+    def close(self) -> None:
+        """Unmap the file, unless arrays of it are still in use elsewhere"""
+        try:
+            self._map.close()
+        except BufferError:
+            pass
+
+
+def open_snapshot(path: str) -> SnapshotStorage:
+    """Open a snapshot read-only; only its header is read up front"""
+    return SnapshotStorage(path)
+
+
+def restore_snapshot(path: str, storage: Optional[StorageBackend] = None) -> StorageBackend:
+    """Copy a snapshot into a writable backend (by default a new ``MemoryStorage``)"""
+    storage = MemoryStorage() if storage is None else storage
+    with open_snapshot(path) as snapshot, storage.transaction():
+        for name, group in snapshot.resource_groups.items():
+            storage.resource_groups[name] = group
+        resources = storage.resources
+        for resource_id, resource in snapshot.resources.items():
+            resources[resource_id] = resource
+    return storage
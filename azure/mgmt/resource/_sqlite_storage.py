@@ -0,0 +1,227 @@
+"""SQLite storage backend
+
+Resources and resource groups are stored as JSON bodies, with the resource
+group, type and location of each resource in indexed columns and its tags
+in a separate indexed table, so the database can be queried (by the
+``ids_*`` methods here, or any SQLite client) without loading it. The
+database runs in WAL mode: readers in other processes are not blocked by
+the client's writes.
+"""
+import json
+import sqlite3
+import threading
+from collections.abc import ItemsView, MutableMapping, ValuesView
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from azure.mgmt.resource._resource_id import parse_resource_id
+from azure.mgmt.resource._storage import (
+    StorageBackend, _ScanItemsView, _ScanValuesView, resource_from_dict, resource_group_from_dict,
+    resource_group_to_dict, resource_to_dict
+)
+from azure.mgmt.resource.models import GenericResource, ResourceGroup
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS resource_groups (
+    name TEXT PRIMARY KEY,
+    body TEXT NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS resources (
+    id TEXT PRIMARY KEY,
+    resource_group TEXT,
+    type TEXT,
+    location TEXT,
+    body TEXT NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS resources_by_group ON resources (resource_group COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS resources_by_type ON resources (type COLLATE NOCASE);
+CREATE TABLE IF NOT EXISTS resource_tags (
+    resource_id TEXT NOT NULL,
+    name TEXT NOT NULL,
+    value TEXT,
+    PRIMARY KEY (resource_id, name)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS resource_tags_by_value ON resource_tags (name, value COLLATE NOCASE);
+"""
+# Rows read per query when scanning the whole table
+_SCAN_BATCH = 1000
+
+
+class _Database:
+    """One connection shared by both mappings, with nested transactions"""
+
+    def __init__(self, path: str):
+        # Autocommit mode; transactions are opened explicitly
+        self.connection = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        self.lock = threading.RLock()
+        self._depth = 0
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        # Durable across application crashes; only a power loss can drop the last commits
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(_SCHEMA)
+
+    @contextmanager
+    def transaction(self):
+        with self.lock:
+            if self._depth == 0:
+                self.connection.execute("BEGIN")
+            self._depth += 1
+            try:
+                yield self.connection
+            except BaseException:
+                self._depth -= 1
+                if self._depth == 0:
+                    self.connection.execute("ROLLBACK")
+                raise
+            self._depth -= 1
+            if self._depth == 0:
+                self.connection.execute("COMMIT")
+
+    def query(self, sql: str, parameters=()) -> List[tuple]:
+        with self.lock:
+            return self.connection.execute(sql, parameters).fetchall()
+
+    def scan(self, sql: str) -> Iterator[tuple]:
+        """Rows of ``sql`` (keyed on its first column) in batches, without holding the lock between them"""
+        last = ''
+        while True:
+            rows = self.query(sql, (last, _SCAN_BATCH))
+            yield from rows
+            if len(rows) < _SCAN_BATCH:
+                return
+            last = rows[-1][0]
+
+
+class SqliteResourceStore(MutableMapping):
+    """Resources in SQLite, read back as new ``GenericResource`` objects"""
+
+    def __init__(self, database: _Database):
+        self._db = database
+
+    def __len__(self) -> int:
+        return self._db.query("SELECT COUNT(*) FROM resources")[0][0]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter([row[0] for row in self._db.query("SELECT id FROM resources")])
+
+    def __contains__(self, resource_id) -> bool:
+        return bool(self._db.query("SELECT 1 FROM resources WHERE id = ?", (resource_id,)))
+
+    def __getitem__(self, resource_id: str) -> GenericResource:
+        rows = self._db.query("SELECT body FROM resources WHERE id = ?", (resource_id,))
+        if not rows:
+            raise KeyError(resource_id)
+        return resource_from_dict(json.loads(rows[0][0]))
+
+    def __setitem__(self, resource_id: str, resource: GenericResource) -> None:
+        try:
+            resource_group = parse_resource_id(resource_id).resource_group
+        except ValueError:
+            resource_group = None
+        body = json.dumps(resource_to_dict(resource))
+        tags = [(resource_id, name, None if value is None else str(value))
+                for name, value in (resource.tags or {}).items()]
+        with self._db.transaction() as connection:
+            connection.execute("INSERT OR REPLACE INTO resources VALUES (?, ?, ?, ?, ?)",
+                               (resource_id, resource_group, resource.type, resource.location, body))
+            connection.execute("DELETE FROM resource_tags WHERE resource_id = ?", (resource_id,))
+            connection.executemany("INSERT INTO resource_tags VALUES (?, ?, ?)", tags)
+
+    def __delitem__(self, resource_id: str) -> None:
+        with self._db.transaction() as connection:
+            if not connection.execute("DELETE FROM resources WHERE id = ?", (resource_id,)).rowcount:
+                raise KeyError(resource_id)
+            connection.execute("DELETE FROM resource_tags WHERE resource_id = ?", (resource_id,))
+
+    def items(self) -> ItemsView:
+        return _ScanItemsView(self)
+
+    def values(self) -> ValuesView:
+        return _ScanValuesView(self)
+
+    def _scan(self) -> Iterator[Tuple[str, GenericResource]]:
+        for resource_id, body in self._db.scan(
+                "SELECT id, body FROM resources WHERE id > ? ORDER BY id LIMIT ?"):
+            yield resource_id, resource_from_dict(json.loads(body))
+
+    # Indexed queries
+
+    def ids_in_group(self, resource_group_name: str) -> List[str]:
+        """IDs of the resources in a resource group (case-insensitive)"""
+        return self._ids("SELECT id FROM resources WHERE resource_group = ? COLLATE NOCASE",
+                         resource_group_name)
+
+    def ids_of_type(self, resource_type: str) -> List[str]:
+        """IDs of the resources of a type such as ``Microsoft.Compute/virtualMachines`` (case-insensitive)"""
+        return self._ids("SELECT id FROM resources WHERE type = ? COLLATE NOCASE", resource_type)
+
+    def ids_with_tag(self, name: str, value: Optional[Any] = None) -> List[str]:
+        """IDs of the resources carrying tag ``name``, or with it equal to ``value`` (case-insensitive)"""
+        if value is None:
+            return self._ids("SELECT resource_id FROM resource_tags WHERE name = ?", name)
+        return self._ids("SELECT resource_id FROM resource_tags WHERE name = ? AND value = ? COLLATE NOCASE",
+                         name, str(value))
+
+    def _ids(self, sql: str, *parameters) -> List[str]:
+        return [row[0] for row in self._db.query(sql, parameters)]
+
+
+class SqliteResourceGroupStore(MutableMapping):
+    """Resource groups in SQLite"""
+
+    def __init__(self, database: _Database):
+        self._db = database
+
+    def __len__(self) -> int:
+        return self._db.query("SELECT COUNT(*) FROM resource_groups")[0][0]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter([row[0] for row in self._db.query("SELECT name FROM resource_groups")])
+
+    def __contains__(self, name) -> bool:
+        return bool(self._db.query("SELECT 1 FROM resource_groups WHERE name = ?", (name,)))
+
+    def __getitem__(self, name: str) -> ResourceGroup:
+        rows = self._db.query("SELECT body FROM resource_groups WHERE name = ?", (name,))
+        if not rows:
+            raise KeyError(name)
+        return resource_group_from_dict(json.loads(rows[0][0]))
+
+    def __setitem__(self, name: str, group: ResourceGroup) -> None:
+        with self._db.transaction() as connection:
+            connection.execute("INSERT OR REPLACE INTO resource_groups VALUES (?, ?)",
+                               (name, json.dumps(resource_group_to_dict(group))))
+
+    def __delitem__(self, name: str) -> None:
+        with self._db.transaction() as connection:
+            if not connection.execute("DELETE FROM resource_groups WHERE name = ?", (name,)).rowcount:
+                raise KeyError(name)
+
+
+class SqliteStorage(StorageBackend):
+    """Storage backend keeping everything in a SQLite database at ``path``
+
+    Each write is its own transaction; wrap bulk loads in
+    ``transaction()`` to commit them together, which is much faster.
+    """
+
+    def __init__(self, path: str = ":memory:"):
+        self.path = path
+        self._db = _Database(path)
+        super().__init__(SqliteResourceStore(self._db), SqliteResourceGroupStore(self._db))
+
+    def tag_entries(self) -> Iterator[Tuple[str, Optional[Dict[str, Any]]]]:
+        """(resource ID, tags) of every stored resource, read without decoding the bodies"""
+        for resource_id, tags in self._db.scan(
+                "SELECT id, json_extract(body, '$.tags') FROM resources WHERE id > ? ORDER BY id LIMIT ?"):
+            yield resource_id, None if tags is None else json.loads(tags)
+
+    @contextmanager
+    def transaction(self):
+        """Apply the writes made inside the block in one transaction"""
+        with self._db.transaction():
+            yield self
+
+    def close(self) -> None:
+        """Close the database connection"""
+        with self._db.lock:
+            self._db.connection.close()
@@ -0,0 +1,129 @@
+"""Pluggable storage backends for the client's resources and resource groups
+
+A backend hands the client two mutable mappings: ``resources`` (resource
+ID to ``GenericResource``) and ``resource_groups`` (name to
+``ResourceGroup``). The client keeps its secondary indexes (tags, resource
+groups) in memory and rebuilds them from a backend's existing contents
+when it is created, so a persistent backend is all that is needed to
+survive a restart; a backend may serve them some faster way instead
+(``indexes()``). Backends may hand out copies on read, so every change
+is written back by assignment.
+"""
+from collections.abc import ItemsView, ValuesView
+from contextlib import contextmanager
+from dataclasses import asdict
+from typing import Any, Dict, Iterator, MutableMapping, Optional, Tuple
+from azure.mgmt.resource._resource_id import ResourceGroupIndex
+from azure.mgmt.resource._tag_index import TagIndex
+from azure.mgmt.resource.models import GenericResource, Identity, Plan, ResourceGroup, Sku
+from azure.mgmt.resource.models._models import from_timestamp
+
+# Optional fields held as dataclasses, serialized as dicts
+_DATACLASS_FIELDS = {'sku': Sku, 'plan': Plan, 'identity': Identity}
+_PLAIN_FIELDS = ('tags', 'kind', 'managed_by', 'properties', 'provisioning_state')
+
+
+class StorageBackend:
+    """Where a client keeps its resources and resource groups
+
+    Subclasses set ``resources`` and ``resource_groups``; a read-only
+    backend rejects writes with an ``HttpResponseError``.
+    """
+
+    read_only = False
+
+    def __init__(self, resources: MutableMapping[str, GenericResource],
+                 resource_groups: MutableMapping[str, ResourceGroup]):
+        self.resources = resources
+        self.resource_groups = resource_groups
+
+    def tag_entries(self) -> Iterator[Tuple[str, Optional[Dict[str, Any]]]]:
+        """(resource ID, tags) of every stored resource, for rebuilding the client's indexes"""
+        for resource_id, resource in self.resources.items():
+            yield resource_id, resource.tags
+
+    def indexes(self) -> Tuple[TagIndex, ResourceGroupIndex]:
+        """The client's tag and resource group indexes, holding what is already stored"""
+        tag_index, resource_group_index = TagIndex(), ResourceGroupIndex()
+        for resource_id, tags in self.tag_entries():
+            tag_index.update(resource_id, tags)
+            resource_group_index.add(resource_id)
+        return tag_index, resource_group_index
+
+    @contextmanager
+    def transaction(self):
+        """Group writes; a backend that supports it applies them atomically"""
+        yield self
+
+    def close(self) -> None:
+        """Release the backend's files or connections"""
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+class MemoryStorage(StorageBackend):
+    """The default backend: plain dicts that live as long as the process"""
+
+    def __init__(self, resources: Optional[MutableMapping[str, GenericResource]] = None,
+                 resource_groups: Optional[MutableMapping[str, ResourceGroup]] = None):
+        super().__init__({} if resources is None else resources,
+                         {} if resource_groups is None else resource_groups)
+
+
+class _ScanItemsView(ItemsView):
+    """Items view iterating the mapping's ``_scan()`` instead of one lookup per key"""
+
+    def __iter__(self):
+        return self._mapping._scan()
+
+
+class _ScanValuesView(ValuesView):
+    def __iter__(self):
+        return (value for _, value in self._mapping._scan())
+
+
+def resource_to_dict(resource: GenericResource) -> Dict[str, Any]:
+    """JSON-ready dict of a resource; unset fields are left out"""
+    data = {'id': resource.id, 'name': resource.name, 'type': resource.type,
+            'location': resource.location}
+    for field in _PLAIN_FIELDS:
+        value = getattr(resource, field, None)
+        if value is not None:
+            data[field] = value
+    for field in _DATACLASS_FIELDS:
+        value = getattr(resource, field, None)
+        if value is not None:
+            data[field] = asdict(value)
+    for field, timestamp in (('created', resource._created), ('changed', resource._changed)):
+        if timestamp is not None:
+            data[field] = timestamp
+    return data
+
+
+def resource_from_dict(data: Dict[str, Any]) -> GenericResource:
+    """Inverse of ``resource_to_dict``"""
+    return GenericResource(
+        id=data['id'],
+        name=data['name'],
+        type=data['type'],
+        location=data['location'],
+        created_time=from_timestamp(data.get('created')),
+        changed_time=from_timestamp(data.get('changed')),
+        **{field: data[field] for field in _PLAIN_FIELDS if field in data},
+        **{field: model(**data[field]) for field, model in _DATACLASS_FIELDS.items() if field in data},
+    )
+
+
+def resource_group_to_dict(group: ResourceGroup) -> Dict[str, Any]:
+    """JSON-ready dict of a resource group"""
+    return {field: getattr(group, field) for field in ResourceGroup._fields}
+
+
+def resource_group_from_dict(data: Dict[str, Any]) -> ResourceGroup:
+    """Inverse of ``resource_group_to_dict``"""
+    return ResourceGroup(**data)
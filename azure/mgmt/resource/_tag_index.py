@@ -0,0 +1,65 @@
+"""Secondary tag index for the in-memory resource store"""
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class TagIndex:
+    """Inverted index from tag name and (name, value) to resource IDs
+
+    Tag names are matched exactly, tag values case-insensitively. The index
+    keeps its own snapshot of each resource's tags so it can be re-synced even
+    when a caller mutated the resource's tag dict in place.
+    """
+
+    def __init__(self):
+        self._by_name: Dict[str, Dict[str, None]] = {}
+        self._by_value: Dict[Tuple[str, str], Dict[str, None]] = {}
+        self._indexed: Dict[str, Dict[str, str]] = {}
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def normalize_value(value: Any) -> str:
+        """Normalize a tag value for case-insensitive lookups"""
+        return str(value).lower()
+
+    def update(self, resource_id: str, tags: Optional[Dict[str, Any]]) -> None:
+        """Index (or re-index) a resource with its current tags"""
+        new = {name: self.normalize_value(value) for name, value in (tags or {}).items()}
+        with self._lock:
+            old = self._indexed.get(resource_id, {})
+            for name, value in old.items():
+                if name not in new:
+                    self._discard(self._by_name, name, resource_id)
+                if new.get(name) != value:
+                    self._discard(self._by_value, (name, value), resource_id)
+            for name, value in new.items():
+                if name not in old:
+                    self._by_name.setdefault(name, {})[resource_id] = None
+                if old.get(name) != value:
+                    self._by_value.setdefault((name, value), {})[resource_id] = None
+            if new:
+                self._indexed[resource_id] = new
+            else:
+                self._indexed.pop(resource_id, None)
+
+    def remove(self, resource_id: str) -> None:
+        """Drop a resource from the index"""
+        self.update(resource_id, None)
+
+    def ids_with_tag(self, name: str) -> List[str]:
+        """Resource IDs carrying the given tag name"""
+        with self._lock:
+            return list(self._by_name.get(name, ()))
+
+    def ids_with_tag_value(self, name: str, value: Any) -> List[str]:
+        """Resource IDs whose tag ``name`` equals ``value`` (case-insensitive)"""
+        with self._lock:
+            return list(self._by_value.get((name, self.normalize_value(value)), ()))
+
+    @staticmethod
+    def _discard(index: Dict, key, resource_id: str) -> None:
+        bucket = index.get(key)
+        if bucket is not None:
+            bucket.pop(resource_id, None)
+            if not bucket:
+                del index[key]
@@ -0,0 +1,3 @@
+from ._resource_management_client import ResourceManagementClient
+
+__all__ = ['ResourceManagementClient']
@@ -0,0 +1,74 @@
+"""Azure Resource Management Client (asyncio)"""
+import asyncio
+from typing import Optional
+from azure.core.exceptions import ClientAuthenticationError
+from azure.core.policies import RetryPolicy
+from azure.core.simulation import SimulationProfile
+from azure.mgmt.resource._storage import StorageBackend
+from azure.mgmt.resource._resource_management_client import (
+    MANAGEMENT_SCOPE, ResourceManagementClient as _ResourceManagementClient
+)
+from azure.mgmt.resource.aio.operations import (
+    ResourceGraphOperations, ResourceGroupsOperations, ResourcesOperations, TagsOperations
+)
+
+
+class ResourceManagementClient(_ResourceManagementClient):
+    """Client for Azure Resource Management with coroutine operations
+    
+    Shares the in-memory store and indexes of the synchronous client. The
+    credential must come from ``azure.identity.aio``; it is awaited on the
+    first request rather than in the constructor.
+    """
+    
+    def __init__(self, credential, subscription_id: str, 
+                 api_version: str = "2021-04-01",
+                 retry_policy: Optional[RetryPolicy] = None,
+                 write_rate_limit: Optional[float] = None,
+                 columnar_store: bool = False,
+                 change_log_retention: int = 100_000,
+                 storage: Optional[StorageBackend] = None,
+                 simulation: Optional[SimulationProfile] = None,
+                 metrics: bool = False,
+                 tracer=None):
+        self._token = None
+        self._auth_lock: Optional[asyncio.Lock] = None
+        super().__init__(credential, subscription_id, api_version,
+                         retry_policy=retry_policy, write_rate_limit=write_rate_limit,
+                         columnar_store=columnar_store,
+                         change_log_retention=change_log_retention, storage=storage,
+                         simulation=simulation, metrics=metrics, tracer=tracer)
+    
+    def _init_operations(self):
+        """Create the async operation groups"""
+        self.resource_groups = ResourceGroupsOperations(self)
+        self.resources = ResourcesOperations(self)
+        self.tags = TagsOperations(self)
+        self.resource_graph = ResourceGraphOperations(self)
+    
+    def _authenticate(self):
+        """Defer authentication to the first request"""
+        pass
+    
+    async def _ensure_authenticated(self):
+        """Authenticate on first use and on renewal, sharing the in-flight attempt between coroutines"""
+        if self._token_is_fresh():
+            return
+        if self._auth_lock is None:
+            self._auth_lock = asyncio.Lock()
+        async with self._auth_lock:
+            if not self._token_is_fresh():
+                try:
+                    self._token = await self.credential.get_token(MANAGEMENT_SCOPE)
+                except Exception as e:
+                    raise ClientAuthenticationError(f"Failed to authenticate: {str(e)}")
+    
+    async def close(self):
+        """Close the client and its storage backend"""
+        self.storage.close()
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
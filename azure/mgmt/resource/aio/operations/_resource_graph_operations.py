@@ -0,0 +1,27 @@
+"""Resource Graph operations (asyncio)"""
+from typing import AsyncIterator, Optional
+from ...models import QueryResponse
+from ...operations import ResourceGraphOperations as _ResourceGraphOperations
+from ...operations._resource_graph_operations import MAX_PAGE_SIZE
+
+
+class ResourceGraphOperations(_ResourceGraphOperations):
+    """Async operations for Resource Graph queries"""
+
+    async def query(self, query: str, top: Optional[int] = None, skip: int = 0,
+                    skip_token: Optional[str] = None,
+                    max_page_size: int = MAX_PAGE_SIZE) -> QueryResponse:
+        """Run a query and return its first page, or the page after ``skip_token``"""
+        await self._client._ensure_authenticated()
+        await self._client.simulation.delay_async('resource_graph.query')
+        return self._query(query, top, skip, skip_token, max_page_size)
+
+    async def query_pages(self, query: str, top: Optional[int] = None,
+                          max_page_size: int = MAX_PAGE_SIZE) -> AsyncIterator[QueryResponse]:
+        """Yield every page of a query, following the skip tokens"""
+        response = await self.query(query, top=top, max_page_size=max_page_size)
+        yield response
+        while response.skip_token is not None:
+            response = await self.query(query, skip_token=response.skip_token,
+                                        max_page_size=max_page_size)
+            yield response
@@ -0,0 +1,38 @@
+"""Resource Groups operations (asyncio)"""
+from typing import Dict, Any
+from azure.core.async_paging import AsyncItemPaged
+from ...models import ResourceGroup
+from ...operations import ResourceGroupsOperations as _ResourceGroupsOperations
+
+
+class ResourceGroupsOperations(_ResourceGroupsOperations):
+    """Async operations for Resource Groups"""
+    
+    async def create_or_update(self, resource_group_name: str, parameters: Dict[str, Any]) -> ResourceGroup:
+        """Create or update a resource group"""
+        await self._client._ensure_authenticated()
+        await self._client.simulation.delay_async('resource_groups.create_or_update', resource_group_name)
+        return self._create_or_update(resource_group_name, parameters)
+    
+    async def get(self, resource_group_name: str) -> ResourceGroup:
+        """Get a resource group"""
+        await self._client._ensure_authenticated()
+        await self._client.simulation.delay_async('resource_groups.get', resource_group_name)
+        return self._get(resource_group_name)
+    
+    async def delete(self, resource_group_name: str) -> None:
+        """Delete a resource group"""
+        await self._client._ensure_authenticated()
+        await self._client.simulation.delay_async('resource_groups.delete', resource_group_name)
+        self._delete(resource_group_name)
+    
+    def list(self) -> AsyncItemPaged[ResourceGroup]:
+        """List all resource groups"""
+        return AsyncItemPaged(self._list(), resolve=self._resolve, simulation=self._client.simulation,
+                              instrumentation=self._client._instrumentation)
+    
+    async def check_existence(self, resource_group_name: str) -> bool:
+        """Check if resource group exists"""
+        await self._client._ensure_authenticated()
+        await self._client.simulation.delay_async('resource_groups.check_existence', resource_group_name)
+        return resource_group_name in self._store
@@ -0,0 +1,77 @@
+"""Resources operations (asyncio)"""
+from typing import Dict, Any, List, Optional
+from azure.core.async_paging import AsyncItemPaged
+from azure.core.exceptions import ResourceNotFoundError
+from ...models import BatchOperationResult, GenericResource
+from ...operations import ResourcesOperations as _ResourcesOperations
+from ...operations._batch import check_batch_size
+
+
+class ResourcesOperations(_ResourcesOperations):
+    """Async operations for Resources"""
+    
+    async def create_or_update(self, resource_group_name: str, 
+                               resource_provider_namespace: str,
+                               parent_resource_path: str,
+                               resource_type: str,
+                               resource_name: str,
+                               parameters: Dict[str, Any],
+                               api_version: str = "2021-04-01") -> GenericResource:
+        """Create or update a resource"""
+        await self._client._ensure_authenticated()
+        await self._client.simulation.delay_async('resources.create_or_update', self._resource_id(
+            resource_group_name, resource_provider_namespace, resource_type, resource_name))
+        return self._create_or_update(resource_group_name, resource_provider_namespace,
+                                      resource_type, resource_name, parameters)
+    
+    async def get(self, resource_group_name: str,
+                  resource_provider_namespace: str,
+                  parent_resource_path: str,
+                  resource_type: str,
+                  resource_name: str,
+                  api_version: str = "2021-04-01") -> GenericResource:
+        """Get a resource"""
+        await self._client._ensure_authenticated()
+        return super().get(resource_group_name, resource_provider_namespace,
+                           parent_resource_path, resource_type, resource_name, api_version)
+    
+    async def delete(self, resource_group_name: str,
+                     resource_provider_namespace: str,
+                     parent_resource_path: str,
+                     resource_type: str,
+                     resource_name: str,
+                     api_version: str = "2021-04-01") -> None:
+        """Delete a resource"""
+        await self._client._ensure_authenticated()
+        resource_id = self._resource_id(resource_group_name, resource_provider_namespace,
+                                        resource_type, resource_name)
+        
+        if resource_id not in self._store:
+            raise ResourceNotFoundError(f"Resource '{resource_name}' not found")
+        
+        await self._client.simulation.delay_async('resources.delete', resource_id)
+        self._delete(resource_id, resource_name)
+    
+    async def batch_create_or_update(self, operations: List[Dict[str, Any]]) -> List[BatchOperationResult]:
+        """Create or update many resources in one round trip"""
+        check_batch_size(operations)
+        if not operations:
+            return []
+        await self._client._ensure_authenticated()
+        await self._client.simulation.delay_async('resources.batch_create_or_update')
+        return self._batch_create_or_update(operations)
+    
+    def list(self, filter: Optional[str] = None,
+             top: Optional[int] = None) -> AsyncItemPaged[GenericResource]:
+        """List all resources in subscription, optionally filtered (OData) and capped"""
+        entries, resolve = self._list(filter, top)
+        return AsyncItemPaged(entries, resolve=resolve, simulation=self._client.simulation,
+                              instrumentation=self._client._instrumentation)
+    
+    def list_by_resource_group(self, resource_group_name: str,
+                               filter: Optional[str] = None,
+                               top: Optional[int] = None) -> AsyncItemPaged[GenericResource]:
+        """List resources in a resource group, optionally filtered (OData) and capped"""
+        entries, resolve = self._list_by_resource_group(resource_group_name, filter, top)
+        return AsyncItemPaged(entries, resolve=resolve, simulation=self._client.simulation,
+                              instrumentation=self._client._instrumentation)
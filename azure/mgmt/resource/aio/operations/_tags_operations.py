@@ -0,0 +1,43 @@
+"""Tags operations (asyncio)"""
+from typing import Dict, Any, List
+from ...models import BatchOperationResult
+from ...operations import TagsOperations as _TagsOperations
+from ...operations._batch import check_batch_size
+
+
+class TagsOperations(_TagsOperations):
+    """Async operations for Tags"""
+    
+    async def create_or_update_at_scope(self, scope: str, 
+                                        parameters: Dict[str, Any]) -> Dict[str, Any]:
+        """Create or update tags at scope"""
+        await self._client._ensure_authenticated()
+        await self._client.simulation.delay_async('tags.create_or_update_at_scope', scope)
+        return self._create_or_update_at_scope(scope, parameters)
+    
+    async def update_at_scope(self, scope: str, parameters: Dict[str, Any]) -> Dict[str, Any]:
+        """Selectively update tags at scope (Merge, Replace or Delete)"""
+        await self._client._ensure_authenticated()
+        if self._is_noop_patch(scope, parameters):
+            return super().get_at_scope(scope)
+        await self._client.simulation.delay_async('tags.update_at_scope', scope)
+        return self._update_at_scope(scope, parameters)
+    
+    async def batch_update_at_scope(self, operations: List[Dict[str, Any]]) -> List[BatchOperationResult]:
+        """Update tags at many scopes in one round trip"""
+        check_batch_size(operations)
+        await self._client._ensure_authenticated()
+        if not all(self._is_noop_patch(operation['scope'], operation['parameters'])
+                   for operation in operations):
+            await self._client.simulation.delay_async('tags.batch_update_at_scope')
+        return self._batch_update_at_scope(operations)
+    
+    async def get_at_scope(self, scope: str) -> Dict[str, Any]:
+        """Get tags at scope"""
+        await self._client._ensure_authenticated()
+        return super().get_at_scope(scope)
+    
+    async def delete_at_scope(self, scope: str) -> None:
+        """Delete all tags at scope"""
+        await self._client._ensure_authenticated()
+        super().delete_at_scope(scope)
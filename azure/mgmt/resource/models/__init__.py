@@ -2,6 +2,11 @@ from ._models import (
     Resource,
     ResourceGroup,
     GenericResource,
+    BatchOperationResult,
+    ChangeFeedPage,
+    ChangeType,
+    QueryResponse,
+    ResourceChange,
     Identity,
     Sku,
     Plan,
@@ -12,6 +17,11 @@ __all__ = [
     'Resource',
     'ResourceGroup',
     'GenericResource',
+    'BatchOperationResult',
+    'ChangeFeedPage',
+    'ChangeType',
+    'QueryResponse',
+    'ResourceChange',
     'Identity',
     'Sku',
     'Plan',
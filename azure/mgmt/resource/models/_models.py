@@ -1,9 +1,51 @@
 """Azure Resource Management models"""
-from dataclasses import dataclass, field
-from datetime import datetime, timezone
-from typing import Dict, Optional, Any
+import sys
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Any, Tuple
 from enum import Enum
 
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+# Default for timestamps that should be set to the creation time
+_NOW: Any = object()
+
+
+def _intern(value):
+    return sys.intern(value) if type(value) is str else value
+
+
+def intern_tags(tags: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Copy a tag dict with its string keys and values interned
+
+    Tag names and most values (owners, environments, cost centers) repeat
+    across resources, so interning stores each distinct string once.
+    """
+    if tags is None:
+        return None
+    return {_intern(name): _intern(value) for name, value in tags.items()}
+
+
+def to_timestamp(value: Optional[datetime]) -> Optional[int]:
+    """Integer microseconds since the epoch; naive datetimes are taken as UTC"""
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    delta = value - _EPOCH
+    return (delta.days * 86400 + delta.seconds) * 1_000_000 + delta.microseconds
+
+
+def from_timestamp(timestamp: Optional[int]) -> Optional[datetime]:
+    """UTC datetime for a ``to_timestamp`` value"""
+    if timestamp is None:
+        return None
+    return _EPOCH + timedelta(microseconds=timestamp)
+
+
+def _now_timestamp() -> int:
+    return time.time_ns() // 1000
+
 
 class ProvisioningState(str, Enum):
     """Resource provisioning states"""
@@ -15,6 +57,14 @@ class ProvisioningState(str, Enum):
     CANCELED = "Canceled"
 
 
+class ChangeType(str, Enum):
+    """Kinds of change recorded in the client's change log"""
+    CREATE = "Create"
+    UPDATE = "Update"
+    TAG_CHANGE = "TagChange"
+    DELETE = "Delete"
+
+
 @dataclass
 class Sku:
     """Resource SKU"""
@@ -42,36 +92,158 @@ class Identity:
     type: Optional[str] = None
 
 
-@dataclass
-class Resource:
+class _SlotModel:
+    """Base for the slot-based models: dataclass-style init order, repr and equality
+    
+    Resources are held by the million in the client's store, so the models
+    avoid a per-instance ``__dict__``, intern their tag strings and keep
+    timestamps as integer microseconds since the epoch.
+    """
+    __slots__ = ()
+    _fields: Tuple[str, ...] = ()
+    
+    def __repr__(self) -> str:
+        values = ', '.join(f"{name}={getattr(self, name)!r}" for name in self._fields)
+        return f"{type(self).__name__}({values})"
+    
+    def __eq__(self, other) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self._fields)
+    
+    __hash__ = None
+
+
+class Resource(_SlotModel):
     """Base Azure resource"""
-    id: str
-    name: str
-    type: str
-    location: str
-    tags: Optional[Dict[str, str]] = None
+    __slots__ = ('id', 'name', 'type', 'location', '_tags')
+    _fields = ('id', 'name', 'type', 'location', 'tags')
+    
+    def __init__(self, id: str, name: str, type: str, location: str,
+                 tags: Optional[Dict[str, str]] = None):
+        self.id = id
+        self.name = name
+        self.type = _intern(type)
+        self.location = _intern(location)
+        self.tags = tags
+    
+    @property
+    def tags(self) -> Optional[Dict[str, str]]:
+        """Resource tags; assigning stores an interned copy"""
+        return self._tags
+    
+    @tags.setter
+    def tags(self, tags: Optional[Dict[str, str]]) -> None:
+        self._tags = intern_tags(tags)
 
 
-@dataclass
 class GenericResource(Resource):
     """Generic Azure resource with additional properties"""
-    kind: Optional[str] = None
-    managed_by: Optional[str] = None
-    sku: Optional[Sku] = None
-    plan: Optional[Plan] = None
-    identity: Optional[Identity] = None
-    properties: Optional[Dict[str, Any]] = None
-    provisioning_state: Optional[str] = None
-    created_time: Optional[datetime] = field(default_factory=lambda: datetime.now(timezone.utc))
-    changed_time: Optional[datetime] = field(default_factory=lambda: datetime.now(timezone.utc))
+    __slots__ = ('kind', 'managed_by', 'sku', 'plan', 'identity', 'properties',
+                 'provisioning_state', '_created', '_changed')
+    _fields = Resource._fields + ('kind', 'managed_by', 'sku', 'plan', 'identity', 'properties',
+                                  'provisioning_state', 'created_time', 'changed_time')
+    
+    def __init__(self, id: str, name: str, type: str, location: str,
+                 tags: Optional[Dict[str, str]] = None,
+                 kind: Optional[str] = None,
+                 managed_by: Optional[str] = None,
+                 sku: Optional[Sku] = None,
+                 plan: Optional[Plan] = None,
+                 identity: Optional[Identity] = None,
+                 properties: Optional[Dict[str, Any]] = None,
+                 provisioning_state: Optional[str] = None,
+                 created_time: Optional[datetime] = _NOW,
+                 changed_time: Optional[datetime] = _NOW):
+        super().__init__(id, name, type, location, tags)
+        self.kind = kind
+        self.managed_by = managed_by
+        self.sku = sku
+        self.plan = plan
+        self.identity = identity
+        self.properties = properties
+        self.provisioning_state = provisioning_state
+        now = _now_timestamp() if created_time is _NOW or changed_time is _NOW else None
+        # A new resource shares one timestamp object for both fields
+        self._created = now if created_time is _NOW else to_timestamp(created_time)
+        self._changed = now if changed_time is _NOW else to_timestamp(changed_time)
+    
+    @property
+    def created_time(self) -> Optional[datetime]:
+        """Creation time (UTC)"""
+        return from_timestamp(self._created)
+    
+    @created_time.setter
+    def created_time(self, value: Optional[datetime]) -> None:
+        self._created = to_timestamp(value)
+    
+    @property
+    def changed_time(self) -> Optional[datetime]:
+        """Last change time (UTC)"""
+        return from_timestamp(self._changed)
+    
+    @changed_time.setter
+    def changed_time(self, value: Optional[datetime]) -> None:
+        self._changed = to_timestamp(value)
 
 
 @dataclass
-class ResourceGroup:
+class BatchOperationResult:
+    """Outcome of one operation inside a batch request"""
+    status_code: int
+    result: Optional[Any] = None
+    error: Optional[Exception] = None
+    
+    @property
+    def succeeded(self) -> bool:
+        """Whether the operation succeeded"""
+        return self.error is None
+
+
+class ResourceGroup(_SlotModel):
     """Azure resource group"""
-    id: str
-    name: str
-    location: str
-    tags: Optional[Dict[str, str]] = None
-    properties: Optional[Dict[str, Any]] = None
-    managed_by: Optional[str] = None
+    __slots__ = ('id', 'name', 'location', '_tags', 'properties', 'managed_by')
+    _fields = ('id', 'name', 'location', 'tags', 'properties', 'managed_by')
+    
+    def __init__(self, id: str, name: str, location: str,
+                 tags: Optional[Dict[str, str]] = None,
+                 properties: Optional[Dict[str, Any]] = None,
+                 managed_by: Optional[str] = None):
+        self.id = id
+        self.name = name
+        self.location = _intern(location)
+        self.tags = tags
+        self.properties = properties
+        self.managed_by = managed_by
+    
+    tags = Resource.tags
+
+
+@dataclass
+class ResourceChange:
+    """One entry of the change log"""
+    sequence: int
+    change_type: ChangeType
+    resource_id: str
+    timestamp: datetime
+    # State of the resource after the change; None for deletes
+    resource: Optional[GenericResource] = None
+
+
+@dataclass
+class ChangeFeedPage:
+    """A page of changes and the cursor to continue from"""
+    changes: List[ResourceChange]
+    cursor: int
+    has_more: bool
+
+
+@dataclass
+class QueryResponse:
+    """A page of Resource Graph query results"""
+    count: int
+    data: List[Dict[str, Any]]
+    # Pass back as ``skip_token`` to fetch the next page; None on the last page
+    skip_token: Optional[str] = None
+    # Total rows the query produces, when known without running it to the end
+    total_records: Optional[int] = None
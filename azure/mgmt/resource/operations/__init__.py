@@ -1,8 +1,10 @@
+from ._resource_graph_operations import ResourceGraphOperations
 from ._resource_groups_operations import ResourceGroupsOperations
 from ._resources_operations import ResourcesOperations
 from ._tags_operations import TagsOperations
 
 __all__ = [
+    'ResourceGraphOperations',
     'ResourceGroupsOperations',
     'ResourcesOperations', 
     'TagsOperations'
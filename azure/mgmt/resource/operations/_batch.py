@@ -0,0 +1,27 @@
+"""Batch request support shared by the operation groups"""
+from typing import Any, Callable, Dict, List, Sequence
+from azure.core.exceptions import HttpResponseError
+from ..models import BatchOperationResult
+
+# Most operations ARM accepts in a single $batch request
+MAX_BATCH_SIZE = 500
+
+
+def check_batch_size(operations: Sequence[Dict[str, Any]]) -> None:
+    """Reject batches the service would not accept"""
+    if len(operations) > MAX_BATCH_SIZE:
+        raise HttpResponseError(
+            f"Batch of {len(operations)} operations exceeds the limit of {MAX_BATCH_SIZE}", 400
+        )
+
+
+def run_batch(operations: Sequence[Dict[str, Any]],
+              handler: Callable[[Dict[str, Any]], Any]) -> List[BatchOperationResult]:
+    """Apply ``handler`` to every operation, collecting per-item results"""
+    results = []
+    for operation in operations:
+        try:
+            results.append(BatchOperationResult(200, result=handler(operation)))
+        except HttpResponseError as e:
+            results.append(BatchOperationResult(e.status_code, error=e))
+    return results
@@ -0,0 +1,116 @@
+"""Resource Graph operations"""
+import itertools
+import secrets
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterator, NamedTuple, Optional
+from azure.core.exceptions import HttpResponseError
+from .._query import execute, parse_query
+from ..models import QueryResponse
+
+# Rows per page, as capped by the real service
+MAX_PAGE_SIZE = 1000
+# Open continuations kept server-side; the least recently issued are dropped first
+MAX_OPEN_CURSORS = 256
+
+
+class _Cursor(NamedTuple):
+    """Server-side state behind a skip token"""
+    query: str
+    rows: Iterator[Dict[str, Any]]
+    remaining: Optional[int]
+    total_records: Optional[int]
+    # The row read past the end of the previous page, returned first
+    pending: Optional[Dict[str, Any]] = None
+
+
+class ResourceGraphOperations:
+    """Operations for Resource Graph queries
+
+    Queries run against the client's store. Leading ``where`` clauses are
+    answered from the tag, resource group and (on a columnar store) location
+    and type indexes where possible, and rows are produced lazily: a page
+    only evaluates as many resources as it returns, unless the query needs
+    the whole result first (``summarize``, ``order by``, ``count``).
+
+    A ``skip_token`` resumes the query where the previous page stopped.
+    Tokens are single use. Resources are looked up as the query advances, so
+    a resource deleted between pages is skipped and one updated between pages
+    is seen in its new state.
+    """
+
+    def __init__(self, client):
+        self._client = client
+        self._cursors: "OrderedDict[str, _Cursor]" = OrderedDict()
+        self._cursors_lock = threading.Lock()
+
+    def query(self, query: str, top: Optional[int] = None, skip: int = 0,
+              skip_token: Optional[str] = None,
+              max_page_size: int = MAX_PAGE_SIZE) -> QueryResponse:
+        """Run a query and return its first page, or the page after ``skip_token``
+
+        ``top`` caps the total rows across all pages, ``skip`` drops rows from
+        the start of the result and ``max_page_size`` (at most 1000) sizes each
+        page. When a page is not the last, its ``skip_token`` continues it.
+        """
+        self._client.simulation.delay('resource_graph.query')
+        return self._query(query, top, skip, skip_token, max_page_size)
+
+    def query_pages(self, query: str, top: Optional[int] = None,
+                    max_page_size: int = MAX_PAGE_SIZE) -> Iterator[QueryResponse]:
+        """Yield every page of a query, following the skip tokens"""
+        response = self.query(query, top=top, max_page_size=max_page_size)
+        yield response
+        while response.skip_token is not None:
+            response = self.query(query, skip_token=response.skip_token, max_page_size=max_page_size)
+            yield response
+
+    def _query(self, query: str, top: Optional[int], skip: int, skip_token: Optional[str],
+               max_page_size: int) -> QueryResponse:
+        if not 1 <= max_page_size <= MAX_PAGE_SIZE:
+            raise HttpResponseError(f"max_page_size must be between 1 and {MAX_PAGE_SIZE}", 400)
+        if skip_token is not None:
+            cursor = self._take_cursor(skip_token, query)
+        else:
+            if (top is not None and top < 0) or skip < 0:
+                raise HttpResponseError("top and skip must not be negative", 400)
+            rows = execute(parse_query(query), self._client)
+            total_records = None
+            if isinstance(rows, list):
+                total_records = len(rows)
+                rows = iter(rows)
+            if skip:
+                rows = itertools.islice(rows, skip, None)
+            cursor = _Cursor(query, rows, top, total_records)
+        return self._next_page(cursor, max_page_size)
+
+    def _next_page(self, cursor: _Cursor, max_page_size: int) -> QueryResponse:
+        page_size = max_page_size if cursor.remaining is None else min(max_page_size, cursor.remaining)
+        # One row past the page tells whether another page follows
+        data = [] if cursor.pending is None else [cursor.pending]
+        data.extend(itertools.islice(cursor.rows, page_size + 1 - len(data)))
+        skip_token = None
+        if len(data) > page_size:
+            pending = data.pop()
+            remaining = None if cursor.remaining is None else cursor.remaining - page_size
+            if remaining != 0:
+                skip_token = self._save_cursor(cursor._replace(pending=pending, remaining=remaining))
+        return QueryResponse(count=len(data), data=data, skip_token=skip_token,
+                             total_records=cursor.total_records)
+
+    def _save_cursor(self, cursor: _Cursor) -> str:
+        token = secrets.token_urlsafe(16)
+        with self._cursors_lock:
+            self._cursors[token] = cursor
+            while len(self._cursors) > MAX_OPEN_CURSORS:
+                self._cursors.popitem(last=False)
+        return token
+
+    def _take_cursor(self, skip_token: str, query: str) -> _Cursor:
+        with self._cursors_lock:
+            cursor = self._cursors.pop(skip_token, None)
+        if cursor is None:
+            raise HttpResponseError(f"Skip token '{skip_token}' is invalid or has expired", 400)
+        if cursor.query != query:
+            raise HttpResponseError("Skip token was issued for a different query", 400)
+        return cursor
@@ -1,7 +1,5 @@
 """Resource Groups operations"""
-import time
-import random
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 from azure.core.exceptions import ResourceExistsError, ResourceNotFoundError, HttpResponseError
 from azure.core.paging import ItemPaged
 from ..models import ResourceGroup
@@ -17,59 +15,78 @@ class ResourceGroupsOperations:
     def create_or_update(self, resource_group_name: str, parameters: Dict[str, Any]) -> ResourceGroup:
         """Create or update a resource group"""
         # Simulate network delay
-        time.sleep(random.uniform(0.5, 1.5))
-        
+        self._client.simulation.delay('resource_groups.create_or_update', resource_group_name)
+        return self._create_or_update(resource_group_name, parameters)
+    
+    def get(self, resource_group_name: str) -> ResourceGroup:
+        """Get a resource group"""
+        self._client.simulation.delay('resource_groups.get', resource_group_name)
+        return self._get(resource_group_name)
+    
+    def delete(self, resource_group_name: str) -> None:
+        """Delete a resource group"""
+        self._client.simulation.delay('resource_groups.delete', resource_group_name)
+        self._delete(resource_group_name)
+    
+    def list(self) -> ItemPaged[ResourceGroup]:
+        """List all resource groups"""
+        return ItemPaged(self._list(), resolve=self._resolve, simulation=self._client.simulation,
+                         instrumentation=self._client._instrumentation)
+    
+    def check_existence(self, resource_group_name: str) -> bool:
+        """Check if resource group exists"""
+        self._client.simulation.delay('resource_groups.check_existence', resource_group_name)
+        return resource_group_name in self._store
+    
+    # Request bodies shared with the asyncio operations (azure.mgmt.resource.aio),
+    # which only differ in how they wait out the simulated latency
+    
+    def _create_or_update(self, resource_group_name: str, parameters: Dict[str, Any]) -> ResourceGroup:
         # Validate parameters
         if 'location' not in parameters:
             raise HttpResponseError("Location is required for resource group")
         
+        self._client._check_write_quota()
+        
         # Simulate occasional failures
-        if random.random() < 0.05:  # 5% failure rate
+        if self._client.simulation.random('resource_groups.create_or_update', resource_group_name) < 0.05:
             raise HttpResponseError("Service temporarily unavailable", 503)
         
         rg = ResourceGroup(
             id=f"/subscriptions/{self._client.subscription_id}/resourceGroups/{resource_group_name}",
             name=resource_group_name,
             location=parameters['location'],
-            tags=parameters.get('tags'),
+            tags=parameters.get('tags'),  # Copied by the model
             properties={'provisioningState': 'Succeeded'}
         )
         
         self._store[resource_group_name] = rg
         return rg
     
-    def get(self, resource_group_name: str) -> ResourceGroup:
-        """Get a resource group"""
-        time.sleep(random.uniform(0.1, 0.3))
-        
+    def _get(self, resource_group_name: str) -> ResourceGroup:
         if resource_group_name not in self._store:
             raise ResourceNotFoundError(f"Resource group '{resource_group_name}' not found")
         
         return self._store[resource_group_name]
     
-    def delete(self, resource_group_name: str) -> None:
-        """Delete a resource group"""
-        time.sleep(random.uniform(1, 2))
-        
+    def _delete(self, resource_group_name: str) -> None:
         if resource_group_name not in self._store:
             raise ResourceNotFoundError(f"Resource group '{resource_group_name}' not found")
         
-        # Delete all resources in the group
-        resources_to_delete = []
-        for resource_id, resource in self._client._resource_store.items():
-            if f"/resourceGroups/{resource_group_name}/" in resource_id:
-                resources_to_delete.append(resource_id)
+        self._client._check_write_quota()
         
-        for resource_id in resources_to_delete:
-            del self._client._resource_store[resource_id]
-        
-        del self._store[resource_group_name]
+        # Delete all resources in the group
+        with self._client._lock:
+            for resource_id in self._client._resource_group_index.pop_group(resource_group_name):
+                self._client._resource_store.pop(resource_id, None)
+                self._client._unindex_resource(resource_id)
+            
+            self._store.pop(resource_group_name, None)
     
-    def list(self) -> ItemPaged[ResourceGroup]:
-        """List all resource groups"""
-        return ItemPaged(list(self._store.values()))
+    def _list(self) -> List[str]:
+        # Only the names are copied; pages read the groups when fetched
+        return list(self._store)
     
-    def check_existence(self, resource_group_name: str) -> bool:
-        """Check if resource group exists"""
-        time.sleep(random.uniform(0.05, 0.1))
-        return resource_group_name in self._store
+    def _resolve(self, names: List[str]) -> List[ResourceGroup]:
+        """Current state of a page of listed groups, skipping any deleted since"""
+        return [group for group in map(self._store.get, names) if group is not None]
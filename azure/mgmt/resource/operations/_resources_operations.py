@@ -1,12 +1,10 @@
 """Resources operations"""
-import time
-import random
-from typing import Dict, Any, Optional
-from azure.core.exceptions import ResourceExistsError, ResourceNotFoundError, HttpResponseError
+from typing import Callable, Dict, Any, List, Optional, Tuple
+from azure.core.exceptions import ResourceExistsError, ResourceNotFoundError, HttpResponseError, ThrottlingError
 from azure.core.paging import ItemPaged
-from ..models import GenericResource, ProvisioningState
-from datetime import datetime, timezone
-
+from .._filter import compile_filter, select_resources
+from ..models import BatchOperationResult, ChangeType, GenericResource, ProvisioningState
+from ._batch import check_batch_size, run_batch
 
 class ResourcesOperations:
     """Operations for Resources"""
@@ -24,47 +22,10 @@ class ResourcesOperations:
                         api_version: str = "2021-04-01") -> GenericResource:
         """Create or update a resource"""
         # Simulate API delay
-        time.sleep(random.uniform(0.1, 0.3))
-        
-        # Validate resource group exists
-        if resource_group_name not in self._client._resource_groups_store:
-            raise ResourceNotFoundError(f"Resource group '{resource_group_name}' not found")
-        
-        # Build resource ID
-        resource_id = (f"/subscriptions/{self._client.subscription_id}"
-                      f"/resourceGroups/{resource_group_name}"
-                      f"/providers/{resource_provider_namespace}"
-                      f"/{resource_type}/{resource_name}")
-        
-        # Enhanced failure simulation
-        failure_scenarios = [
-            (0.02, "QuotaExceeded", 429),
-            (0.01, "InvalidLocation", 400), 
-            (0.015, "AuthorizationFailed", 403),
-            (0.005, "InternalServerError", 500)
-        ]
-        for probability, error_msg, status_code in failure_scenarios:
-            if random.random() < probability:
-                raise HttpResponseError(f"{error_msg}: {resource_name}", status_code)
-        # Simulate occasional failures (5% failure rate)
-        if random.random() < 0.05:
-            raise HttpResponseError(f"Failed to create resource '{resource_name}' - Rate limited", 429)
-        
-        # Create resource
-        resource = GenericResource(
-            id=resource_id,
-            name=resource_name,
-            type=f"{resource_provider_namespace}/{resource_type}",
-            location=parameters.get('location', 'uksouth'),
-            tags=parameters.get('tags', {}),
-            properties=parameters.get('properties', {}),
-            provisioning_state=ProvisioningState.SUCCEEDED,
-            created_time=datetime.now(timezone.utc),
-            changed_time=datetime.now(timezone.utc)
-        )
-        
-        self._store[resource_id] = resource
-        return resource
+        self._client.simulation.delay('resources.create_or_update', self._resource_id(
+            resource_group_name, resource_provider_namespace, resource_type, resource_name))
+        return self._create_or_update(resource_group_name, resource_provider_namespace,
+                                      resource_type, resource_name, parameters)
     
     def get(self, resource_group_name: str,
             resource_provider_namespace: str,
@@ -73,10 +34,8 @@ class ResourcesOperations:
             resource_name: str,
             api_version: str = "2021-04-01") -> GenericResource:
         """Get a resource"""
-        resource_id = (f"/subscriptions/{self._client.subscription_id}"
-                      f"/resourceGroups/{resource_group_name}"
-                      f"/providers/{resource_provider_namespace}"
-                      f"/{resource_type}/{resource_name}")
+        resource_id = self._resource_id(resource_group_name, resource_provider_namespace,
+                                        resource_type, resource_name)
         
         if resource_id not in self._store:
             raise ResourceNotFoundError(f"Resource '{resource_name}' not found")
@@ -90,37 +49,155 @@ class ResourcesOperations:
                resource_name: str,
                api_version: str = "2021-04-01") -> None:
         """Delete a resource"""
-        resource_id = (f"/subscriptions/{self._client.subscription_id}"
-                      f"/resourceGroups/{resource_group_name}"
-                      f"/providers/{resource_provider_namespace}"
-                      f"/{resource_type}/{resource_name}")
+        resource_id = self._resource_id(resource_group_name, resource_provider_namespace,
+                                        resource_type, resource_name)
         
         if resource_id not in self._store:
             raise ResourceNotFoundError(f"Resource '{resource_name}' not found")
         
         # Simulate deletion delay
-        time.sleep(random.uniform(0.2, 0.5))
-        del self._store[resource_id]
+        self._client.simulation.delay('resources.delete', resource_id)
+        self._delete(resource_id, resource_name)
     
-    def list(self, filter: Optional[str] = None) -> ItemPaged[GenericResource]:
-        """List all resources in subscription"""
-        resources = list(self._store.values())
+    def batch_create_or_update(self, operations: List[Dict[str, Any]]) -> List[BatchOperationResult]:
+        """Create or update many resources in one round trip
         
-        # Apply filter if provided
-        if filter:
-            # Simple tag-based filtering
-            if "tagName eq" in filter:
-                tag_filter = filter.split("'")[1] if "'" in filter else ""
-                resources = [r for r in resources if r.tags and tag_filter in r.tags]
+        Each operation is a dict of ``create_or_update`` keyword arguments.
+        Latency is charged once per batch; results are returned per item, in
+        order, with failures reported instead of raised.
+        """
+        check_batch_size(operations)
+        if not operations:
+            return []
+        self._client.simulation.delay('resources.batch_create_or_update')
+        return self._batch_create_or_update(operations)
+    
+    def list(self, filter: Optional[str] = None,
+             top: Optional[int] = None) -> ItemPaged[GenericResource]:
+        """List all resources in subscription
         
-        return ItemPaged(resources)
+        ``filter`` is an OData filter such as ``resourceType eq '...'``,
+        ``location eq '...'``, ``tagName eq '...' and tagValue eq '...'``,
+        ``resourceGroup eq '...'`` or ``substringof('...', name)``, combined
+        with ``and``/``or`` and parentheses. ``top`` caps the number of
+        resources returned.
+        """
+        entries, resolve = self._list(filter, top)
+        return ItemPaged(entries, resolve=resolve, simulation=self._client.simulation,
+                         instrumentation=self._client._instrumentation)
     
     def list_by_resource_group(self, resource_group_name: str,
-                              filter: Optional[str] = None) -> ItemPaged[GenericResource]:
-        """List resources in a resource group"""
-        resources = []
-        for resource in self._store.values():
-            if f"/resourceGroups/{resource_group_name}/" in resource.id:
-                resources.append(resource)
+                              filter: Optional[str] = None,
+                              top: Optional[int] = None) -> ItemPaged[GenericResource]:
+        """List resources in a resource group, optionally filtered as for ``list``"""
+        entries, resolve = self._list_by_resource_group(resource_group_name, filter, top)
+        return ItemPaged(entries, resolve=resolve, simulation=self._client.simulation,
+                         instrumentation=self._client._instrumentation)
+    
+    # Request bodies shared with the asyncio operations (azure.mgmt.resource.aio)
+    
+    def _resource_id(self, resource_group_name: str, resource_provider_namespace: str,
+                     resource_type: str, resource_name: str) -> str:
+        return (f"/subscriptions/{self._client.subscription_id}"
+                f"/resourceGroups/{resource_group_name}"
+                f"/providers/{resource_provider_namespace}"
+                f"/{resource_type}/{resource_name}")
+    
+    def _create_or_update(self, resource_group_name: str,
+                          resource_provider_namespace: str,
+                          resource_type: str,
+                          resource_name: str,
+                          parameters: Dict[str, Any]) -> GenericResource:
+        # Validate resource group exists
+        if resource_group_name not in self._client._resource_groups_store:
+            raise ResourceNotFoundError(f"Resource group '{resource_group_name}' not found")
+        
+        # Build resource ID
+        resource_id = self._resource_id(resource_group_name, resource_provider_namespace,
+                                        resource_type, resource_name)
+        
+        self._client._check_write_quota()
+        
+        # Enhanced failure simulation
+        simulation = self._client.simulation
+        failure_scenarios = [
+            (0.02, "QuotaExceeded", 429),
+            (0.01, "InvalidLocation", 400), 
+            (0.015, "AuthorizationFailed", 403),
+            (0.005, "InternalServerError", 500)
+        ]
+        for probability, error_msg, status_code in failure_scenarios:
+            if simulation.random(f'resources.create_or_update.{error_msg}', resource_id) < probability:
+                if status_code == 429:
+                    raise ThrottlingError(f"{error_msg}: {resource_name}",
+                                          retry_after=self._retry_after(resource_id))
+                raise HttpResponseError(f"{error_msg}: {resource_name}", status_code)
+        # Simulate occasional failures (5% failure rate)
+        if simulation.random('resources.create_or_update.RateLimited', resource_id) < 0.05:
+            raise ThrottlingError(f"Failed to create resource '{resource_name}' - Rate limited",
+                                  retry_after=self._retry_after(resource_id))
         
-        return ItemPaged(resources)
+        # Create resource
+        resource = GenericResource(
+            id=resource_id,
+            name=resource_name,
+            type=f"{resource_provider_namespace}/{resource_type}",
+            location=parameters.get('location', 'uksouth'),
+            # The model copies (and interns) the tags; properties are copied here,
+            # so later changes to the caller's dicts don't leak into the store
+            tags=parameters.get('tags') or {},
+            properties=dict(parameters.get('properties') or {}),
+            provisioning_state=ProvisioningState.SUCCEEDED
+        )
+        
+        with self._client._lock:
+            change_type = ChangeType.UPDATE if resource_id in self._store else ChangeType.CREATE
+            self._store[resource_id] = resource
+            self._client._index_resource(resource, change_type)
+        return resource
+    
+    def _retry_after(self, resource_id: str) -> float:
+        return round(self._client.simulation.uniform(0.2, 1.0, 'resources.retry_after', resource_id), 1)
+    
+    def _batch_create_or_update(self, operations: List[Dict[str, Any]]) -> List[BatchOperationResult]:
+        return run_batch(operations, lambda operation: self._create_or_update(
+            operation['resource_group_name'],
+            operation['resource_provider_namespace'],
+            operation['resource_type'],
+            operation['resource_name'],
+            operation['parameters'],
+        ))
+    
+    def _delete(self, resource_id: str, resource_name: str) -> None:
+        self._client._check_write_quota()
+        with self._client._lock:
+            if self._store.pop(resource_id, None) is None:
+                raise ResourceNotFoundError(f"Resource '{resource_name}' not found")
+            self._client._unindex_resource(resource_id)
+    
+    def _list(self, filter: Optional[str] = None, top: Optional[int] = None) -> Tuple[List, Optional[Callable]]:
+        """(entries, resolve) for a pager: matches are selected up front, a full listing pages lazily"""
+        if filter is None and top is None:
+            with self._client._lock:
+                return list(self._store), self._resolve
+        # Filters are planned against the tag, resource group and column indexes
+        compiled = self._compile_filter(filter, top)
+        return select_resources(self._store, compiled, self._client, top=top), None
+    
+    def _list_by_resource_group(self, resource_group_name: str, filter: Optional[str] = None,
+                                top: Optional[int] = None) -> Tuple[List, Optional[Callable]]:
+        resource_ids = self._client._resource_group_index.ids_in_group(resource_group_name)
+        if filter is None and top is None:
+            return resource_ids, self._resolve
+        compiled = self._compile_filter(filter, top)
+        return select_resources(self._store, compiled, self._client, resource_ids, top), None
+    
+    def _resolve(self, resource_ids: List[str]) -> List[GenericResource]:
+        """Current state of a page of listed resources, skipping any deleted since"""
+        return [resource for resource in map(self._store.get, resource_ids) if resource is not None]
+    
+    @staticmethod
+    def _compile_filter(filter: Optional[str], top: Optional[int]):
+        if top is not None and top < 0:
+            raise HttpResponseError(f"Invalid $top: {top}")
+        return compile_filter(filter) if filter else None
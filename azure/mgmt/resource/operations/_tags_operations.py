@@ -1,8 +1,30 @@
 """Tags operations"""
-import time
-import random
-from typing import Dict, Any, Optional
+from datetime import datetime, timezone
+from typing import Dict, Any, List, Optional
 from azure.core.exceptions import ResourceNotFoundError, HttpResponseError
+from ..models import BatchOperationResult, ChangeType
+from ._batch import check_batch_size, run_batch
+
+# Tag PATCH modes, as accepted by the real update_at_scope
+TAG_PATCH_OPERATIONS = ('Merge', 'Replace', 'Delete')
+
+
+def apply_tag_patch(current: Dict[str, Any], operation: str, tags: Dict[str, Any]) -> Dict[str, Any]:
+    """Return the tags resulting from a PATCH, leaving ``current`` untouched
+    
+    Merge adds or overwrites the given keys, Replace swaps the whole set and
+    Delete removes the given keys (only where the value matches, if one is given).
+    """
+    if operation == 'Merge':
+        return {**current, **tags}
+    if operation == 'Replace':
+        return dict(tags)
+    if operation == 'Delete':
+        return {name: value for name, value in current.items()
+                if name not in tags or tags[name] not in (None, '', value)}
+    raise HttpResponseError(
+        f"Invalid tag patch operation '{operation}', expected one of {', '.join(TAG_PATCH_OPERATIONS)}"
+    )
 
 
 class TagsOperations:
@@ -15,43 +37,105 @@ class TagsOperations:
                                  parameters: Dict[str, Any]) -> Dict[str, Any]:
         """Create or update tags at scope"""
         # Simulate API delay
-        time.sleep(random.uniform(0.05, 0.15))
+        self._client.simulation.delay('tags.create_or_update_at_scope', scope)
+        return self._create_or_update_at_scope(scope, parameters)
+    
+    def update_at_scope(self, scope: str, parameters: Dict[str, Any]) -> Dict[str, Any]:
+        """Selectively update tags at scope
         
-        # Find resource by scope (resource ID)
-        if scope in self._client._resource_store:
-            resource = self._client._resource_store[scope]
-            
-            # Update tags
-            new_tags = parameters.get('properties', {}).get('tags', {})
-            if resource.tags:
-                resource.tags.update(new_tags)
-            else:
-                resource.tags = new_tags.copy()
-            
-            return {
-                'properties': {
-                    'tags': resource.tags
-                }
-            }
-        else:
-            raise ResourceNotFoundError(f"Resource with scope '{scope}' not found")
+        ``parameters`` is ``{'operation': 'Merge' | 'Replace' | 'Delete',
+        'properties': {'tags': {...}}}``. Only keys that change are written;
+        a patch that changes nothing returns without a write or any latency.
+        """
+        if self._is_noop_patch(scope, parameters):
+            return self.get_at_scope(scope)
+        self._client.simulation.delay('tags.update_at_scope', scope)
+        return self._update_at_scope(scope, parameters)
+    
+    def batch_update_at_scope(self, operations: List[Dict[str, Any]]) -> List[BatchOperationResult]:
+        """Update tags at many scopes in one round trip
+        
+        Each operation is a dict with ``scope`` and ``parameters`` as for
+        ``update_at_scope``; ``operation`` defaults to Merge. Latency is charged
+        once per batch, and not at all if every patch is a no-op.
+        """
+        check_batch_size(operations)
+        if not all(self._is_noop_patch(operation['scope'], operation['parameters'])
+                   for operation in operations):
+            self._client.simulation.delay('tags.batch_update_at_scope')
+        return self._batch_update_at_scope(operations)
     
     def get_at_scope(self, scope: str) -> Dict[str, Any]:
         """Get tags at scope"""
-        if scope in self._client._resource_store:
-            resource = self._client._resource_store[scope]
-            return {
-                'properties': {
-                    'tags': resource.tags or {}
-                }
-            }
-        else:
-            raise ResourceNotFoundError(f"Resource with scope '{scope}' not found")
+        resource = self._get_resource(scope)
+        return self._tags_response(resource.tags)
     
     def delete_at_scope(self, scope: str) -> None:
         """Delete all tags at scope"""
-        if scope in self._client._resource_store:
-            resource = self._client._resource_store[scope]
+        with self._client._lock:
+            resource = self._get_resource(scope)
             resource.tags = {}
-        else:
+            self._store_resource(resource)
+    
+    # Request bodies shared with the asyncio operations (azure.mgmt.resource.aio)
+    
+    def _get_resource(self, scope: str):
+        # Find resource by scope (resource ID)
+        if scope not in self._client._resource_store:
             raise ResourceNotFoundError(f"Resource with scope '{scope}' not found")
+        return self._client._resource_store[scope]
+    
+    def _store_resource(self, resource) -> None:
+        # Written back because a columnar store hands out copies, then re-indexed
+        self._client._resource_store[resource.id] = resource
+        self._client._index_resource(resource, ChangeType.TAG_CHANGE)
+    
+    @staticmethod
+    def _tags_response(tags: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        # Hand out a copy so callers never alias the stored tags
+        return {
+            'properties': {
+                'tags': dict(tags or {})
+            }
+        }
+    
+    def _create_or_update_at_scope(self, scope: str, 
+                                   parameters: Dict[str, Any]) -> Dict[str, Any]:
+        return self._update_at_scope(scope, {
+            'operation': 'Merge',
+            'properties': parameters.get('properties', {})
+        }, skip_unchanged=False)
+    
+    def _is_noop_patch(self, scope: str, parameters: Dict[str, Any]) -> bool:
+        # Anything that would fail is not a no-op, so the error surfaces on the real call
+        resource = self._client._resource_store.get(scope)
+        if resource is None:
+            return False
+        try:
+            return self._patched_tags(resource, parameters) == (resource.tags or {})
+        except HttpResponseError:
+            return False
+    
+    @staticmethod
+    def _patched_tags(resource, parameters: Dict[str, Any]) -> Dict[str, Any]:
+        return apply_tag_patch(resource.tags or {},
+                               parameters.get('operation', 'Merge'),
+                               parameters.get('properties', {}).get('tags', {}))
+    
+    def _update_at_scope(self, scope: str, parameters: Dict[str, Any],
+                         skip_unchanged: bool = True) -> Dict[str, Any]:
+        with self._client._lock:
+            resource = self._get_resource(scope)
+            new_tags = self._patched_tags(resource, parameters)
+            if not skip_unchanged or new_tags != (resource.tags or {}):
+                self._client._check_write_quota()
+                # Swap in a new dict rather than mutating the stored one
+                resource.tags = new_tags
+                resource.changed_time = datetime.now(timezone.utc)
+                self._store_resource(resource)
+            return self._tags_response(resource.tags)
+    
+    def _batch_update_at_scope(self, operations: List[Dict[str, Any]]) -> List[BatchOperationResult]:
+        return run_batch(operations, lambda operation: self._update_at_scope(
+            operation['scope'], operation['parameters']
+        ))
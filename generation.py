@@ -2,6 +2,9 @@
 """
 Springfield Nuclear Power Plant - Azure Migration Data Generator
 Generates realistic Azure resource data with intentional quality issues for workshop
+
+For multi-million-row load-test inventories with the same distributions, use
+``python -m workshop.generator ROWS`` (sharded across processes, streamed to disk)
 """
 
 import csv
@@ -0,0 +1,108 @@
+"""Shared helpers for the tests"""
+import random
+from contextlib import contextmanager
+from unittest import mock
+from azure.core.exceptions import ClientAuthenticationError
+from azure.identity import DefaultAzureCredential
+from azure.mgmt.resource import ResourceManagementClient
+from azure.mgmt.resource.models import ChangeType, GenericResource, ProvisioningState
+
+GROUPS = ['rg-a', 'rg-b', 'rg-c']
+TYPES = [('Microsoft.Compute', 'virtualMachines'), ('Microsoft.Storage', 'storageAccounts')]
+OWNERS = ['Homer', 'Marge', 'Lisa', 'Bart', 'Ned']
+ENVIRONMENTS = ['dev', 'prod', 'test', 'qa', 'staging']
+LOCATIONS = ['uksouth', 'eastus', 'Springfield']
+
+
+@contextmanager
+def no_simulated_latency():
+    """Skip the SDK's simulated network delays"""
+    with mock.patch('time.sleep'):
+        yield
+
+
+def make_client(subscription_id: str = "springfield-test", **kwargs) -> ResourceManagementClient:
+    """Create a client, retrying the mock credential's random auth failures"""
+    with no_simulated_latency():
+        while True:
+            try:
+                credential = DefaultAzureCredential(simulation=kwargs.get('simulation'))
+                return ResourceManagementClient(credential, subscription_id, **kwargs)
+            except ClientAuthenticationError:
+                continue
+
+
+def load_resources(client: ResourceManagementClient, count: int, group: str = 'rg-load') -> None:
+    """Load ``count`` resources into one resource group, bypassing the API"""
+    with no_simulated_latency():
+        while True:
+            try:
+                client.resource_groups.create_or_update(group, {'location': 'uksouth'})
+                break
+            except Exception:
+                continue
+    for i in range(count):
+        name = f"res-{i:06d}"
+        resource = GenericResource(
+            id=f"/subscriptions/{client.subscription_id}/resourceGroups/{group}"
+               f"/providers/Microsoft.Storage/storageAccounts/{name}",
+            name=name,
+            type='Microsoft.Storage/storageAccounts',
+            location='uksouth',
+            tags={'owner': OWNERS[i % len(OWNERS)]},
+            provisioning_state=ProvisioningState.SUCCEEDED,
+        )
+        client._resource_store[resource.id] = resource
+        client._index_resource(resource, ChangeType.CREATE)
+
+
+def comparable(report: dict, ordered: bool = True) -> dict:
+    """A compliance report without its timestamp, with its lists sorted unless ``ordered``"""
+    report = {key: value for key, value in report.items() if key != 'timestamp'}
+    if not ordered:
+        report['untagged_resources'] = sorted(report['untagged_resources'])
+        report['non_compliant_resources'] = sorted(report['non_compliant_resources'],
+                                                   key=lambda item: item['resource_id'])
+    return report
+
+
+def random_tags(rng: random.Random) -> dict:
+    tags = {}
+    if rng.random() < 0.8:
+        tags['owner'] = rng.choice(OWNERS)
+    if rng.random() < 0.8:
+        tags['environment'] = rng.choice(ENVIRONMENTS)
+    if rng.random() < 0.3:
+        tags['cost_center'] = rng.choice(['CC001', 'CC002'])
+    return tags
+
+
+def mutate(client, rng: random.Random) -> None:
+    """Apply one random change; simulated failures just leave the store unchanged"""
+    resource_ids = list(client._resource_store)
+    action = rng.random()
+    try:
+        if action < 0.45 or not resource_ids:
+            group = rng.choice(GROUPS)
+            if not client.resource_groups.check_existence(group):
+                client.resource_groups.create_or_update(group, {'location': 'uksouth'})
+            namespace, resource_type = rng.choice(TYPES)
+            client.resources.create_or_update(
+                group, namespace, '', resource_type, f"res-{rng.randrange(200)}",
+                {'location': rng.choice(LOCATIONS), 'tags': random_tags(rng)}
+            )
+        elif action < 0.75:
+            client.tags.update_at_scope(rng.choice(resource_ids), {
+                'operation': rng.choice(['Merge', 'Replace', 'Delete']),
+                'properties': {'tags': random_tags(rng)}
+            })
+        elif action < 0.85:
+            client.tags.delete_at_scope(rng.choice(resource_ids))
+        elif action < 0.98:
+            resource = client._resource_store[rng.choice(resource_ids)]
+            _, group, _, namespace, resource_type, name = resource.id.rsplit('/', 5)
+            client.resources.delete(group, namespace, '', resource_type, name)
+        else:
+            client.resource_groups.delete(rng.choice(GROUPS))
+    except Exception:
+        pass
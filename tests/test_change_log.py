@@ -0,0 +1,25 @@
+"""Change log timestamps follow the client's simulation clock"""
+from datetime import datetime, timezone
+from azure.core.simulation import SimulationProfile
+from helpers import make_client
+
+
+def create(client, name):
+    client.resources.create_or_update('rg-log', 'Microsoft.Storage', '', 'storageAccounts', name,
+                                      {'location': 'uksouth', 'tags': {'owner': 'Lisa'}})
+
+
+def test_changes_stamped_in_simulated_time():
+    client = make_client(simulation=SimulationProfile.fast(3))
+    clock = client.simulation.clock
+    client.resource_groups.create_or_update('rg-log', {'location': 'uksouth'})
+    create(client, 'early')
+    clock.sleep(3600)
+    middle = datetime.fromtimestamp(clock.time(), timezone.utc)
+    create(client, 'late')
+    changes = client.changes.changes_since(0).changes
+    assert changes[0].timestamp < middle <= changes[-1].timestamp
+    assert changes[-1].timestamp <= datetime.fromtimestamp(clock.time(), timezone.utc)
+    late = client.changes.changes_since(client.changes.cursor_at(middle)).changes
+    assert late and all(change.timestamp >= middle for change in late)
+    assert len(late) < len(changes)
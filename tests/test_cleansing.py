@@ -0,0 +1,17 @@
+"""Owner rules of cleanse() with and without an environment column"""
+import pandas as pd
+from workshop.cleansing import cleanse
+
+
+def test_unauthorized_owners_dropped_without_environment():
+    df = pd.DataFrame({'owner': ['Bart', 'homer', 'Ned', None, 'Lisa', 'Apu', 'Milhouse']})
+    owners = cleanse(df)['owner'].tolist()
+    assert owners[1] == 'Homer' and owners[4] == 'Lisa'
+    assert all(pd.isna(owners[i]) for i in (0, 2, 3, 5, 6))
+
+
+def test_environment_assigns_owner():
+    df = pd.DataFrame({'owner': ['Bart', 'homer', 'Ned', 'Lisa'],
+                       'environment': ['Production', 'unknown', 'dev', None]})
+    owners = cleanse(df)['owner'].tolist()
+    assert owners[:2] == ['Homer', 'Homer'] and owners[2] == 'Marge' and owners[3] == 'Lisa'
@@ -0,0 +1,41 @@
+"""ComplianceView must stay equal to a full compliance report through random changes
+
+Random sequences of creates, updates, tag patches, tag deletes, resource
+deletes and resource group deletes are applied through the client API,
+on the dict and the columnar store, checking the view after every step.
+"""
+import random
+import pytest
+from helpers import comparable, make_client, mutate, no_simulated_latency
+from workshop.compliance import ComplianceView
+from workshop.utilities import WorkshopUtilities
+
+SEEDS = range(3)
+STEPS = 150
+
+
+@pytest.mark.parametrize('columnar', [False, True], ids=['dict', 'columnar'])
+@pytest.mark.parametrize('seed', SEEDS)
+def test_view_matches_full_report(columnar, seed):
+    # The columnar report lists resources in row order rather than store order
+    rng = random.Random(seed)
+    client = make_client(columnar_store=columnar)
+    view = ComplianceView.attach(client)
+    try:
+        with no_simulated_latency():
+            for step in range(STEPS):
+                mutate(client, rng)
+                expected = WorkshopUtilities.generate_compliance_report(client)
+                assert comparable(view.report(), not columnar) == comparable(expected, not columnar), \
+                    f"step {step}"
+    finally:
+        view.close()
+
+
+def test_attach_returns_the_clients_view():
+    client = make_client()
+    view = ComplianceView.attach(client)
+    assert ComplianceView.attach(client) is view
+    assert ComplianceView.attach(make_client()) is not view
+    view.close()
+    assert ComplianceView.attach(client) is not view
@@ -0,0 +1,37 @@
+"""Paging a Resource Graph query must return every row once, in order"""
+import pytest
+from helpers import load_resources, make_client, no_simulated_latency
+
+ROWS = 3000
+
+
+@pytest.fixture(scope='module')
+def client():
+    client = make_client()
+    load_resources(client, ROWS)
+    return client
+
+
+def rows(pages):
+    return [row['id'] for page in pages for row in page.data]
+
+
+@pytest.mark.parametrize('max_page_size', [1, 2, 7])
+def test_small_pages_match_a_single_pass(client, max_page_size):
+    query = "Resources | project id"
+    with no_simulated_latency():
+        expected = rows(client.resource_graph.query_pages(query))
+        pages = list(client.resource_graph.query_pages(query, max_page_size=max_page_size))
+    assert len(expected) == ROWS
+    assert rows(pages) == expected
+    assert all(page.count == max_page_size for page in pages[:-1])
+    assert pages[-1].skip_token is None
+
+
+def test_top_caps_rows_across_pages(client):
+    query = "Resources | where tags.owner == 'Lisa' | project id"
+    with no_simulated_latency():
+        expected = rows(client.resource_graph.query_pages(query))
+        pages = list(client.resource_graph.query_pages(query, top=101, max_page_size=2))
+    assert rows(pages) == expected[:101]
+    assert pages[-1].skip_token is None
@@ -0,0 +1,170 @@
+"""Asyncio workshop utilities for the azure.mgmt.resource.aio client"""
+import asyncio
+from collections import defaultdict
+from typing import Any, Callable, Dict, List, Optional
+from azure.mgmt.resource.aio import ResourceManagementClient
+from workshop.utilities import ProgressTracker, WorkshopUtilities
+
+
+class AsyncWorkshopUtilities:
+    """Coroutine versions of the WorkshopUtilities scenarios
+    
+    Every fan-out is bounded by an ``asyncio.Semaphore`` of ``max_concurrency``
+    in-flight requests. Progress callbacks run on the event loop thread.
+    """
+    
+    @staticmethod
+    async def bulk_create_resources(client: ResourceManagementClient,
+                                    resources_data: List[Dict[str, Any]],
+                                    progress_callback: Optional[Callable] = None,
+                                    max_concurrency: int = 100) -> ProgressTracker:
+        """Bulk create resources with progress tracking"""
+        semaphore = asyncio.Semaphore(max_concurrency)
+        resources_by_group: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        for resource_data in resources_data:
+            resources_by_group[resource_data['resource_group']].append(resource_data)
+        tracker = ProgressTracker(len(resources_data), progress_callback, client.simulation.clock)
+        
+        async def create_resources(chunk: List[Dict[str, Any]]) -> None:
+            async with semaphore:
+                started = tracker.clock.now()
+                errors = await AsyncWorkshopUtilities._create_resources(client, chunk)
+                tracker.record_latency(tracker.clock.now() - started)
+            for error in errors:
+                tracker.update(error is None, error)
+        
+        async def create_group(rg_name: str) -> None:
+            try:
+                async with semaphore:
+                    exists = await client.resource_groups.check_existence(rg_name)
+                if not exists:
+                    async with semaphore:
+                        await client.resource_groups.create_or_update(
+                            rg_name,
+                            {"location": "uksouth", "tags": {"created_by": "bulk_migration"}}
+                        )
+            except Exception as e:
+                print(f"Warning: Could not create resource group {rg_name}: {e}")
+            # Fan out the group's resources once the group exists
+            group_resources = resources_by_group[rg_name]
+            chunk_size = WorkshopUtilities._chunk_size(client, client.resources, 'batch_create_or_update')
+            await asyncio.gather(*(create_resources(group_resources[start:start + chunk_size])
+                                   for start in range(0, len(group_resources), chunk_size)))
+        
+        await asyncio.gather(*(create_group(rg_name) for rg_name in resources_by_group))
+        return tracker
+    
+    @staticmethod
+    async def find_resources_by_owner(client: ResourceManagementClient, owner: str) -> List[Any]:
+        """Find all resources owned by a specific user"""
+        return [resource async for resource in
+                client.resources.list(filter=WorkshopUtilities._owner_filter(owner))]
+    
+    @staticmethod
+    async def transfer_ownership(client: ResourceManagementClient,
+                                 from_owner: str,
+                                 to_owner: str,
+                                 progress_callback: Optional[Callable] = None,
+                                 max_concurrency: int = 100) -> Dict[str, Any]:
+        """Transfer ownership of all resources"""
+        semaphore = asyncio.Semaphore(max_concurrency)
+        resources_to_transfer = await AsyncWorkshopUtilities.find_resources_by_owner(client, from_owner)
+        tracker = ProgressTracker(len(resources_to_transfer), progress_callback, client.simulation.clock)
+        transferred_resources = []
+        
+        chunk_size = WorkshopUtilities._chunk_size(client, client.tags, 'batch_update_at_scope')
+        
+        async def transfer(chunk: List[Any]) -> None:
+            operations = [{
+                'scope': resource.id,
+                'parameters': WorkshopUtilities._transfer_parameters(from_owner, to_owner)
+            } for resource in chunk]
+            async with semaphore:
+                started = tracker.clock.now()
+                errors = await AsyncWorkshopUtilities._update_tags(client, operations)
+                tracker.record_latency(tracker.clock.now() - started)
+            for resource, error in zip(chunk, errors):
+                if error is None:
+                    transferred_resources.append(resource)
+                    tracker.update(True)
+                else:
+                    tracker.update(False, error)
+        
+        await asyncio.gather(*(transfer(resources_to_transfer[start:start + chunk_size])
+                               for start in range(0, len(resources_to_transfer), chunk_size)))
+        return WorkshopUtilities._transfer_result(resources_to_transfer, transferred_resources, tracker)
+    
+    @staticmethod
+    async def _create_resources(client: ResourceManagementClient,
+                                chunk: List[Dict[str, Any]]) -> List[Optional[Exception]]:
+        """Create a chunk of resources, returning the error (or None) per item"""
+        operations = [WorkshopUtilities._creation_arguments(r) for r in chunk]
+        if callable(getattr(client.resources, 'batch_create_or_update', None)):
+            return await AsyncWorkshopUtilities._run_batch(
+                client, client.resources.batch_create_or_update, operations
+            )
+        return await AsyncWorkshopUtilities._run_each(client.resources.create_or_update, operations)
+    
+    @staticmethod
+    async def _update_tags(client: ResourceManagementClient,
+                           operations: List[Dict[str, Any]]) -> List[Optional[Exception]]:
+        """Apply a chunk of tag updates, returning the error (or None) per item"""
+        if callable(getattr(client.tags, 'batch_update_at_scope', None)):
+            return await AsyncWorkshopUtilities._run_batch(
+                client, client.tags.batch_update_at_scope, operations
+            )
+        return await AsyncWorkshopUtilities._run_each(client.tags.update_at_scope, operations)
+    
+    @staticmethod
+    async def _run_each(method: Callable, operations: List[Dict[str, Any]]) -> List[Optional[Exception]]:
+        """Issue one request per operation"""
+        errors: List[Optional[Exception]] = []
+        for operation in operations:
+            try:
+                await method(**operation)
+                errors.append(None)
+            except Exception as e:
+                errors.append(e)
+        return errors
+    
+    @staticmethod
+    async def _run_batch(client: ResourceManagementClient, batch_method: Callable,
+                         operations: List[Dict[str, Any]]) -> List[Optional[Exception]]:
+        """Send operations as one batch, resubmitting retryable item failures"""
+        errors: List[Optional[Exception]] = [None] * len(operations)
+        pending = list(range(len(operations)))
+        attempt = 0
+        while pending:
+            try:
+                results = await batch_method([operations[i] for i in pending])
+            except Exception as e:
+                for i in pending:
+                    errors[i] = e
+                break
+            pending, backoff = WorkshopUtilities._batch_retries(client, pending, results, errors, attempt)
+            if pending:
+                await client.simulation.clock.sleep_async(backoff)
+            attempt += 1
+        return errors
+    
+    @staticmethod
+    async def generate_compliance_report(client: ResourceManagementClient,
+                                         max_concurrency: int = 100) -> Dict[str, Any]:
+        """Generate compliance report for all resources
+        
+        Resource groups are paged concurrently so their paging delays overlap.
+        A client with a columnar store is reported on from its code arrays.
+        """
+        if client.columnar_store is not None:
+            return WorkshopUtilities._columnar_compliance_report(client.columnar_store)
+        semaphore = asyncio.Semaphore(max_concurrency)
+        report = WorkshopUtilities._new_compliance_report()
+        
+        async def scan_group(rg_name: str) -> None:
+            async with semaphore:
+                async for resource in client.resources.list_by_resource_group(rg_name):
+                    WorkshopUtilities._add_to_compliance_report(report, resource)
+        
+        rg_names = [rg.name async for rg in client.resource_groups.list()]
+        await asyncio.gather(*(scan_group(rg_name) for rg_name in rg_names))
+        return WorkshopUtilities._finish_compliance_report(report)
@@ -0,0 +1 @@
+"""Benchmarks for the Springfield workshop SDK"""
@@ -0,0 +1,76 @@
+"""Shared helpers for the workshop benchmarks"""
+import random
+import time
+from contextlib import contextmanager
+from unittest import mock
+from azure.core.exceptions import ClientAuthenticationError
+from azure.identity import DefaultAzureCredential
+from azure.mgmt.resource import ResourceManagementClient
+from azure.mgmt.resource.models import ChangeType, GenericResource, ProvisioningState
+
+RESOURCE_TYPES = [
+    'Microsoft.Compute/virtualMachines',
+    'Microsoft.Storage/storageAccounts',
+    'Microsoft.Sql/servers',
+    'Microsoft.Web/sites',
+    'Microsoft.Network/virtualNetworks',
+]
+OWNERS = ['Homer', 'Marge', 'Lisa', 'Bart', 'Ned', 'Apu', 'Milhouse']
+ENVIRONMENTS = ['dev', 'prod', 'test', 'staging']
+
+
+@contextmanager
+def no_simulated_latency():
+    """Skip the SDK's simulated network delays while benchmarking"""
+    with mock.patch('time.sleep'):
+        yield
+
+
+def make_client(subscription_id: str = "springfield-bench", **kwargs) -> ResourceManagementClient:
+    """Create a client, retrying the mock credential's random auth failures
+
+    A ``simulation`` profile in ``kwargs`` is given to the credential too.
+    """
+    with no_simulated_latency():
+        while True:
+            try:
+                credential = DefaultAzureCredential(simulation=kwargs.get('simulation'))
+                return ResourceManagementClient(credential, subscription_id, **kwargs)
+            except ClientAuthenticationError:
+                continue
+
+
+def populate(client: ResourceManagementClient, resource_groups: int,
+             resources_per_group: int, first_group: int = 0, seed: int = 42) -> None:
+    """Load resources straight into the client's store, bypassing the API"""
+    rng = random.Random(seed + first_group)
+    for g in range(first_group, first_group + resource_groups):
+        rg_name = f"rg-bench-{g:06d}"
+        with no_simulated_latency():
+            while True:
+                try:
+                    client.resource_groups.create_or_update(rg_name, {"location": "uksouth"})
+                    break
+                except Exception:
+                    continue
+        for i in range(resources_per_group):
+            resource_type = rng.choice(RESOURCE_TYPES)
+            name = f"res-{g:06d}-{i:04d}"
+            resource = GenericResource(
+                id=(f"/subscriptions/{client.subscription_id}/resourceGroups/{rg_name}"
+                    f"/providers/{resource_type}/{name}"),
+                name=name,
+                type=resource_type,
+                location='uksouth',
+                tags={'owner': rng.choice(OWNERS), 'environment': rng.choice(ENVIRONMENTS)},
+                provisioning_state=ProvisioningState.SUCCEEDED,
+            )
+            client._resource_store[resource.id] = resource
+            client._index_resource(resource, ChangeType.CREATE)
+
+
+def timed(func, *args, **kwargs):
+    """Run ``func`` and return (result, seconds)"""
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
@@ -0,0 +1,52 @@
+"""Benchmark: bulk creation against a write-throttled subscription
+
+The mock service is limited to ``write_rate_limit`` writes/second. Parallel
+bulk creation is run without a retry policy, with retries only, and with
+retries plus the adaptive rate limiter, against the real simulated latency.
+Resources are created in batches, which the limiter paces and learns from
+item by item.
+
+Run with ``python -m workshop.benchmarks.adaptive_throttling [rows] [write_rate_limit]``.
+"""
+import sys
+from azure.core.exceptions import ClientAuthenticationError
+from azure.core.policies import AdaptiveRateLimiter, RetryPolicy
+from azure.identity import DefaultAzureCredential
+from azure.mgmt.resource import ResourceManagementClient
+from workshop.benchmarks._common import timed
+from workshop.benchmarks.bulk_create_speedup import load_rows
+from workshop.utilities import WorkshopUtilities
+
+
+def make_throttled_client(write_rate_limit: float, retry_policy=None) -> ResourceManagementClient:
+    """Client whose mock subscription throttles writes"""
+    while True:
+        try:
+            return ResourceManagementClient(DefaultAzureCredential(), "springfield-bench",
+                                            retry_policy=retry_policy,
+                                            write_rate_limit=write_rate_limit)
+        except ClientAuthenticationError:
+            continue
+
+
+def main(rows: int = 600, write_rate_limit: float = 40):
+    resources_data = load_rows(rows)
+    print(f"Creating {len(resources_data)} resources, service limit {write_rate_limit} writes/s")
+    limiter = AdaptiveRateLimiter(initial_rate=10)
+    scenarios = [
+        ("no retries", None),
+        ("retries", RetryPolicy()),
+        ("retries + adaptive limiter", RetryPolicy(rate_limiter=limiter)),
+    ]
+    for label, retry_policy in scenarios:
+        client = make_throttled_client(write_rate_limit, retry_policy)
+        tracker, seconds = timed(WorkshopUtilities.bulk_create_resources, client, resources_data,
+                                 parallel=True, max_workers=64)
+        throttled = tracker.errors_by_status.get(429, 0)
+        print(f"  {label:<28} {seconds:6.2f}s  {tracker.completed / seconds:6.1f} created/s  "
+              f"{tracker.failed} failed ({throttled} by the write limit)")
+    print(f"  limiter settled at {limiter.rate:.1f} requests/s")
+
+
+if __name__ == "__main__":
+    main(*[float(arg) if i else int(arg) for i, arg in enumerate(sys.argv[1:])])
@@ -0,0 +1,106 @@
+"""Benchmark: incremental sync from the change log vs relisting
+
+A consumer keeps a mirror of the store's tags, once by applying
+``client.changes.changes_since(cursor)`` pages and once through a live
+subscription. Random API mutations are applied between syncs and both
+mirrors are checked against the store, including with a retention limit
+small enough to force compaction. Then the cost of one incremental sync is
+timed against relisting a large subscription.
+
+Run with ``python -m workshop.benchmarks.change_feed [resources...]``.
+"""
+import random
+import sys
+from azure.core.exceptions import HttpResponseError
+from azure.mgmt.resource.models import ChangeType
+from workshop.benchmarks._common import make_client, no_simulated_latency, populate, timed
+from workshop.benchmarks.compliance_view import mutate
+
+DEFAULT_SIZES = [100_000, 1_000_000]
+RESOURCES_PER_GROUP = 1000
+CHANGED_PER_SYNC = 100
+
+
+class Mirror:
+    """Downstream copy of every resource's tags, fed by change log entries"""
+
+    def __init__(self):
+        self.tags = {}
+        self.cursor = 0
+
+    def apply(self, change) -> None:
+        if change.change_type == ChangeType.DELETE:
+            self.tags.pop(change.resource_id, None)
+        else:
+            self.tags[change.resource_id] = dict(change.resource.tags or {})
+        self.cursor = change.sequence
+
+    def sync(self, change_log) -> int:
+        applied = 0
+        while True:
+            page = change_log.changes_since(self.cursor)
+            for change in page.changes:
+                self.apply(change)
+            applied += len(page.changes)
+            if not page.has_more:
+                return applied
+
+
+def store_tags(client) -> dict:
+    return {resource_id: dict(resource.tags or {})
+            for resource_id, resource in client._resource_store.items()}
+
+
+def cross_check(retention: int, seeds=range(3), rounds: int = 40, steps: int = 20) -> None:
+    for seed in seeds:
+        rng = random.Random(seed)
+        client = make_client(change_log_retention=retention)
+        polled, pushed = Mirror(), Mirror()
+        client.changes.subscribe(pushed.apply)
+        with no_simulated_latency():
+            for _ in range(rounds):
+                for _ in range(steps):
+                    mutate(client, rng)
+                polled.sync(client.changes)
+                assert polled.tags == store_tags(client) == pushed.tags
+    print(f"retention {retention:,}: {len(seeds)} seeds x {rounds} syncs match")
+
+
+def check_expiry() -> None:
+    client = make_client(change_log_retention=10)
+    for i in range(100):
+        client.changes.record(ChangeType.DELETE, f"/subscriptions/s/resourceGroups/rg/providers/A/b/{i}")
+    try:
+        client.changes.changes_since(0)
+    except HttpResponseError as e:
+        assert e.status_code == 410
+    else:
+        raise AssertionError("expired cursor was accepted")
+    print("expired cursor rejected with 410")
+
+
+def main(sizes=None):
+    sizes = sizes or DEFAULT_SIZES
+    cross_check(retention=100_000)
+    cross_check(retention=400)
+    check_expiry()
+    print(f"{'resources':>10} {'relist':>9} {'sync':>9}")
+    for count in sizes:
+        client = make_client(change_log_retention=count * 2)
+        populate(client, count // RESOURCES_PER_GROUP, RESOURCES_PER_GROUP)
+        mirror = Mirror()
+        mirror.sync(client.changes)
+        resource_ids = list(client._resource_store)[:CHANGED_PER_SYNC]
+        with no_simulated_latency():
+            for resource_id in resource_ids:
+                client.tags.update_at_scope(resource_id, {
+                    'operation': 'Merge', 'properties': {'tags': {'reviewed': 'yes'}}
+                })
+            _, relist_seconds = timed(store_tags, client)
+        applied, sync_seconds = timed(mirror.sync, client.changes)
+        assert applied == CHANGED_PER_SYNC
+        print(f"{count:>10,} {relist_seconds:>8.3f}s {sync_seconds * 1000:>7.2f}ms")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,86 @@
+"""Benchmark: vectorized cleansing vs a row-wise implementation
+
+Builds synthetic inventories by resampling the rows of the workshop CSV,
+cleanses them with ``workshop.cleansing.cleanse`` and with a row-by-row
+``DataFrame.apply`` version of the same rules, and checks both agree. The
+row-wise version takes minutes at 2.5M rows, so it is skipped above
+``ROW_WISE_LIMIT`` rows unless ``--all`` is passed.
+
+Run with ``python -m workshop.benchmarks.cleansing_throughput [--all] [rows...]``.
+"""
+import sys
+import numpy as np
+import pandas as pd
+from workshop.benchmarks._common import timed
+from workshop.cleansing import (
+    BOOLEAN_COLUMNS, BOOLEAN_VARIANTS, COMPLIANCE_VARIANTS, ENVIRONMENT_OWNERS,
+    ENVIRONMENT_VARIANTS, STATUS_VARIANTS, TARGET_LOCATION, _WAVE_NUMBER, cleanse, normalize_key
+)
+from workshop.utilities import VALID_OWNERS
+
+CSV_PATH = "springfield_azure_resources.csv"
+DEFAULT_SIZES = [2_500, 250_000, 2_500_000]
+ROW_WISE_LIMIT = 250_000
+COLUMNS = ['location', 'owner', 'environment', 'status', 'compliance_status',
+           'migration_wave'] + BOOLEAN_COLUMNS
+
+
+def load_inventory(rows: int, seed: int = 42) -> pd.DataFrame:
+    """Resample the workshop CSV up to ``rows`` rows"""
+    source = pd.read_csv(CSV_PATH, usecols=lambda column: column in COLUMNS)
+    picks = np.random.default_rng(seed).integers(0, len(source), rows)
+    return source.iloc[picks].reset_index(drop=True)
+
+
+def cleanse_row(row: pd.Series) -> pd.Series:
+    """The Phase 2 rules applied to one row, as notebook code does"""
+    row = row.astype(object)
+    row['location'] = TARGET_LOCATION
+    environment = ENVIRONMENT_VARIANTS.get(normalize_key(row['environment']))
+    row['environment'] = environment
+    if environment is not None:
+        row['owner'] = ENVIRONMENT_OWNERS[environment]
+    elif row['owner'] not in VALID_OWNERS:
+        row['owner'] = None
+    row['status'] = STATUS_VARIANTS.get(normalize_key(row['status']))
+    row['compliance_status'] = COMPLIANCE_VARIANTS.get(normalize_key(row['compliance_status']))
+    match = _WAVE_NUMBER.search(str(row['migration_wave']))
+    row['migration_wave'] = int(match.group(1)) if match else None
+    for column in BOOLEAN_COLUMNS:
+        row[column] = BOOLEAN_VARIANTS.get(normalize_key(row[column]))
+    return row
+
+
+def cleanse_row_wise(df: pd.DataFrame) -> pd.DataFrame:
+    return df.apply(cleanse_row, axis=1)
+
+
+def same_result(vectorized: pd.DataFrame, row_wise: pd.DataFrame) -> bool:
+    """Compare column by column as plain objects, treating missing values alike"""
+    for column in COLUMNS:
+        left = vectorized[column].astype(object).where(vectorized[column].notna(), None)
+        right = row_wise[column].astype(object).where(row_wise[column].notna(), None)
+        if not left.tolist() == right.tolist():
+            return False
+    return True
+
+
+def main(sizes=None, row_wise_limit=ROW_WISE_LIMIT):
+    sizes = sizes or DEFAULT_SIZES
+    print(f"{'rows':>10} {'vectorized':>11} {'row-wise':>10} {'speedup':>8}")
+    for rows in sizes:
+        df = load_inventory(rows)
+        vectorized, vectorized_seconds = timed(cleanse, df)
+        if rows > row_wise_limit:
+            print(f"{rows:>10,} {vectorized_seconds:>10.3f}s {'skipped':>10}")
+            continue
+        row_wise, row_wise_seconds = timed(cleanse_row_wise, df)
+        assert same_result(vectorized, row_wise), f"results differ at {rows} rows"
+        print(f"{rows:>10,} {vectorized_seconds:>10.3f}s {row_wise_seconds:>9.2f}s "
+              f"{row_wise_seconds / vectorized_seconds:>7.0f}x")
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    limit = float('inf') if '--all' in args else ROW_WISE_LIMIT
+    main([int(arg) for arg in args if arg != '--all'], limit)
@@ -0,0 +1,54 @@
+"""Benchmark: compliance report over a dict store vs a columnar store
+
+Populates a client's plain resource dict, copies it into a
+``ColumnarResourceStore`` and times the compliance report computed by
+iterating resource objects against the bincount-based columnar report. Both
+reports are checked to agree.
+
+Run with ``python -m workshop.benchmarks.columnar_store [resources...]``.
+"""
+import sys
+from azure.mgmt.resource._columnar_store import ColumnarResourceStore
+from workshop.benchmarks._common import make_client, populate, timed
+from workshop.utilities import WorkshopUtilities
+
+DEFAULT_SIZES = [250_000, 1_000_000]
+RESOURCES_PER_GROUP = 1000
+COUNT_KEYS = ['total_resources', 'resources_by_owner', 'resources_by_environment',
+              'resources_by_location', 'resources_by_type']
+
+
+def object_report(store) -> dict:
+    """The report as ``generate_compliance_report`` builds it, minus the paging delays"""
+    report = WorkshopUtilities._new_compliance_report()
+    for resource in store.values():
+        WorkshopUtilities._add_to_compliance_report(report, resource)
+    return WorkshopUtilities._finish_compliance_report(report)
+
+
+def copy_to_columnar(store) -> ColumnarResourceStore:
+    columnar = ColumnarResourceStore()
+    for resource_id, resource in store.items():
+        columnar[resource_id] = resource
+    return columnar
+
+
+def main(sizes=None):
+    sizes = sizes or DEFAULT_SIZES
+    print(f"{'resources':>10} {'objects':>9} {'columnar':>9} {'counts only':>12} {'speedup':>8}")
+    for count in sizes:
+        client = make_client()
+        populate(client, count // RESOURCES_PER_GROUP, RESOURCES_PER_GROUP)
+        columnar = copy_to_columnar(client._resource_store)
+        expected, object_seconds = timed(object_report, client._resource_store)
+        report, columnar_seconds = timed(WorkshopUtilities._columnar_compliance_report, columnar)
+        _, counts_seconds = timed(lambda: [columnar.value_counts(column)
+                                           for column in ('owner', 'environment', 'location', 'type')])
+        assert all(report[key] == expected[key] for key in COUNT_KEYS)
+        assert len(report['non_compliant_resources']) == len(expected['non_compliant_resources'])
+        print(f"{count:>10,} {object_seconds:>8.3f}s {columnar_seconds:>8.3f}s "
+              f"{counts_seconds * 1000:>10.1f}ms {object_seconds / columnar_seconds:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,92 @@
+"""Benchmark of the incrementally maintained compliance report
+
+Times ``ComplianceView.report()`` against a full
+``generate_compliance_report`` on a large store, and the view's initial
+seeding. That the view stays equal to the full report through random
+changes is tested in ``tests/test_compliance_view.py``; the random changes
+(``mutate``) are also used by the change feed benchmark.
+
+Run with ``python -m workshop.benchmarks.compliance_view [resources...]``.
+"""
+import random
+import sys
+from workshop.benchmarks._common import make_client, no_simulated_latency, populate, timed
+from workshop.compliance import ComplianceView
+from workshop.utilities import WorkshopUtilities
+
+DEFAULT_SIZES = [100_000, 1_000_000]
+RESOURCES_PER_GROUP = 1000
+GROUPS = ['rg-a', 'rg-b', 'rg-c']
+TYPES = [('Microsoft.Compute', 'virtualMachines'), ('Microsoft.Storage', 'storageAccounts')]
+OWNERS = ['Homer', 'Marge', 'Lisa', 'Bart', 'Ned']
+ENVIRONMENTS = ['dev', 'prod', 'test', 'qa', 'staging']
+LOCATIONS = ['uksouth', 'eastus', 'Springfield']
+
+
+def comparable(report: dict, ordered: bool = True) -> dict:
+    report = {key: value for key, value in report.items() if key != 'timestamp'}
+    if not ordered:
+        report['untagged_resources'] = sorted(report['untagged_resources'])
+        report['non_compliant_resources'] = sorted(report['non_compliant_resources'],
+                                                   key=lambda item: item['resource_id'])
+    return report
+
+
+def random_tags(rng: random.Random) -> dict:
+    tags = {}
+    if rng.random() < 0.8:
+        tags['owner'] = rng.choice(OWNERS)
+    if rng.random() < 0.8:
+        tags['environment'] = rng.choice(ENVIRONMENTS)
+    if rng.random() < 0.3:
+        tags['cost_center'] = rng.choice(['CC001', 'CC002'])
+    return tags
+
+
+def mutate(client, rng: random.Random) -> None:
+    """Apply one random change; simulated failures just leave the store unchanged"""
+    resource_ids = list(client._resource_store)
+    action = rng.random()
+    try:
+        if action < 0.45 or not resource_ids:
+            group = rng.choice(GROUPS)
+            if not client.resource_groups.check_existence(group):
+                client.resource_groups.create_or_update(group, {'location': 'uksouth'})
+            namespace, resource_type = rng.choice(TYPES)
+            client.resources.create_or_update(
+                group, namespace, '', resource_type, f"res-{rng.randrange(200)}",
+                {'location': rng.choice(LOCATIONS), 'tags': random_tags(rng)}
+            )
+        elif action < 0.75:
+            client.tags.update_at_scope(rng.choice(resource_ids), {
+                'operation': rng.choice(['Merge', 'Replace', 'Delete']),
+                'properties': {'tags': random_tags(rng)}
+            })
+        elif action < 0.85:
+            client.tags.delete_at_scope(rng.choice(resource_ids))
+        elif action < 0.98:
+            resource = client._resource_store[rng.choice(resource_ids)]
+            _, group, _, namespace, resource_type, name = resource.id.rsplit('/', 5)
+            client.resources.delete(group, namespace, '', resource_type, name)
+        else:
+            client.resource_groups.delete(rng.choice(GROUPS))
+    except Exception:
+        pass
+
+
+def main(sizes=None):
+    sizes = sizes or DEFAULT_SIZES
+    print(f"{'resources':>10} {'full scan':>10} {'view':>9} {'seed view':>10}")
+    for count in sizes:
+        client = make_client()
+        populate(client, count // RESOURCES_PER_GROUP, RESOURCES_PER_GROUP)
+        view, seed_seconds = timed(ComplianceView, client)
+        with no_simulated_latency():
+            expected, scan_seconds = timed(WorkshopUtilities.generate_compliance_report, client)
+        report, view_seconds = timed(view.report)
+        assert comparable(report) == comparable(expected)
+        print(f"{count:>10,} {scan_seconds:>9.3f}s {view_seconds:>8.3f}s {seed_seconds:>9.3f}s")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,60 @@
+"""Benchmark: building many clients with and without a shared token cache
+
+A tool that creates one client per subscription (or per worker thread)
+used to pay a 100-300ms token request, with a 2% failure chance, per
+client. Here the clients are built by a pool of worker threads three ways:
+a new credential per client (no cache reuse, the old cost), one shared
+credential, and one shared credential with lazy authentication. The
+simulated latency is real here, since it is what is being measured.
+
+Run with ``python -m workshop.benchmarks.credential_cache [clients...]``.
+"""
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from azure.core.exceptions import ClientAuthenticationError
+from azure.identity import DefaultAzureCredential
+from azure.mgmt.resource import ResourceManagementClient
+from workshop.benchmarks._common import timed
+
+DEFAULT_SIZES = [50, 200]
+WORKERS = 16
+
+
+def build_clients(count: int, credential_for, **client_kwargs):
+    """Build ``count`` clients on a thread pool; return (auth failures, token requests)"""
+    credentials = {}
+    failures = [0]
+
+    def build(index):
+        credential = credential_for(index)
+        credentials[id(credential)] = credential
+        while True:
+            try:
+                return ResourceManagementClient(credential, f"sub-{index:04d}", **client_kwargs)
+            except ClientAuthenticationError:
+                failures[0] += 1
+
+    with ThreadPoolExecutor(WORKERS) as pool:
+        clients = list(pool.map(build, range(count)))
+    assert len(clients) == count
+    return failures[0], sum(credential.token_requests for credential in credentials.values())
+
+
+def main(sizes=None):
+    sizes = sizes or DEFAULT_SIZES
+    print(f"{'clients':>8} {'mode':<28} {'seconds':>8} {'token requests':>15} {'auth failures':>14}")
+    for count in sizes:
+        shared = DefaultAzureCredential()
+        lazy_shared = DefaultAzureCredential()
+        modes = [
+            ("credential per client", lambda index: DefaultAzureCredential(), {}),
+            ("shared credential", lambda index: shared, {}),
+            ("shared credential, lazy", lambda index: lazy_shared, {'lazy_authentication': True}),
+        ]
+        for label, credential_for, kwargs in modes:
+            (failures, requests), seconds = timed(build_clients, count, credential_for, **kwargs)
+            print(f"{count:>8} {label:<28} {seconds:>7.2f}s {requests:>15} {failures:>14}")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]])
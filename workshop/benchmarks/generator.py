@@ -0,0 +1,135 @@
+"""Benchmark: sharded inventory generation
+
+- determinism: one worker with small shards and two worker processes with
+  larger ones write the same bytes, and a row range regenerated on its own
+  matches the same rows of the full file;
+- encoding: the vectorized CSV lines match ``csv.writer``;
+- data quality: value frequencies follow the probabilities of
+  ``generation.py`` and stay close to the workshop CSV it produced;
+- throughput: rows per second streaming inventories to disk, and the
+  parent's tracemalloc peak for a few shards (tracing is too slow for more).
+
+Run with ``python -m workshop.benchmarks.generator [rows...]``.
+"""
+import csv
+import io
+import os
+import sys
+import tempfile
+import tracemalloc
+from collections import Counter
+import pandas as pd
+from workshop.benchmarks._common import timed
+from workshop.cleansing import normalize_migration_wave
+from workshop.generator import (BOOLEAN_FORMATS, COLUMNS, COMPLIANCE_STATUSES, COST_CENTERS,
+                                INCONSISTENT_ENVIRONMENTS, MESSY_LOCATIONS, MIGRATION_STATUSES,
+                                MIGRATION_WAVES, OWNER_WEIGHTS, RESOURCE_TYPES, csv_text, iter_blocks,
+                                write_inventory)
+
+CSV_PATH = "springfield_azure_resources.csv"
+DEFAULT_SIZES = [100_000, 1_000_000]
+CHECK_ROWS = 45_000
+MEMORY_ROWS = 300_000
+SAMPLE_ROWS = 200_000
+# Largest allowed gap between a generated and an expected frequency, and the
+# total variation distance allowed from the 2,500-row workshop CSV
+FREQUENCY_TOLERANCE = 0.01
+WORKSHOP_TOLERANCE = 0.06
+
+
+def uniform(values):
+    return {value: 1 / len(values) for value in values}
+
+
+EXPECTED = {
+    'owner': {owner: weight / sum(OWNER_WEIGHTS.values()) for owner, weight in OWNER_WEIGHTS.items()},
+    'environment': uniform(INCONSISTENT_ENVIRONMENTS),
+    'location': uniform(MESSY_LOCATIONS),
+    'resource_type': uniform([resource_type for resource_type, _, _ in RESOURCE_TYPES]),
+    'cost_center': uniform(COST_CENTERS),
+    'compliance_status': uniform(COMPLIANCE_STATUSES),
+    'backup_enabled': uniform(BOOLEAN_FORMATS),
+    'migration_wave': uniform(MIGRATION_WAVES),
+    'migration_status': uniform(MIGRATION_STATUSES),
+}
+# Share of rows left empty
+EXPECTED_EMPTY = {'security_group': 0.2, 'on_premises_server': 0.3, 'dependencies': 0.7, 'tags': 0.2,
+                  'encryption_status': 0.2}
+
+
+def check_determinism(tmp: str) -> None:
+    single, pooled, part = (os.path.join(tmp, name) for name in ('single.csv', 'pooled.csv', 'part.csv'))
+    write_inventory(single, CHECK_ROWS, workers=1, shard_rows=10_000)
+    write_inventory(pooled, CHECK_ROWS, workers=2, shard_rows=20_000)
+    with open(single, encoding='utf-8') as a, open(pooled, encoding='utf-8') as b:
+        lines = a.read().splitlines()
+        assert lines == b.read().splitlines(), "the process pool wrote different rows"
+    start, stop = 12_345, 31_000
+    write_inventory(part, stop, workers=1, start=start)
+    with open(part, encoding='utf-8') as c:
+        assert c.read().splitlines() == lines[:1] + lines[1 + start:1 + stop], "the range differs"
+    print(f"determinism: {CHECK_ROWS:,} rows identical on 1 and 2 workers; "
+          f"rows {start:,}:{stop:,} regenerated alone")
+
+
+def check_encoding() -> None:
+    reference = io.StringIO()
+    writer = csv.writer(reference)
+    encoded = []
+    for columns in iter_blocks(5_000, 25_000):
+        writer.writerows(zip(*(columns[name] for name in COLUMNS)))
+        encoded.append(csv_text(columns))
+    assert ''.join(encoded) == reference.getvalue()
+    print("encoding: vectorized CSV lines match csv.writer, CRLF line endings included")
+
+
+def distance(counts: Counter, expected) -> float:
+    total = sum(counts.values())
+    return max(abs(counts.get(value, 0) / total - p) for value, p in expected.items())
+
+
+def check_distributions() -> None:
+    sample = pd.concat(pd.DataFrame(columns) for columns in iter_blocks(0, SAMPLE_ROWS))
+    workshop = pd.read_csv(CSV_PATH, dtype=str, keep_default_na=False)
+    for column, expected in EXPECTED.items():
+        gap = distance(Counter(sample[column]), expected)
+        assert gap < FREQUENCY_TOLERANCE, f"{column} is {gap:.1%} off"
+        generated = sample[column].value_counts(normalize=True)
+        original = workshop[column].value_counts(normalize=True)
+        variation = generated.sub(original, fill_value=0).abs().sum() / 2
+        assert variation < WORKSHOP_TOLERANCE, f"{column} is {variation:.1%} from the workshop CSV"
+    for column, share in EXPECTED_EMPTY.items():
+        empty = (sample[column] == '').mean()
+        assert abs(empty - share) < FREQUENCY_TOLERANCE, f"{column} is empty in {empty:.1%} of rows"
+    managed = sample['resource_type'].isin(['Microsoft.Compute/virtualMachines',
+                                            'Microsoft.Storage/storageAccounts'])
+    assert abs((sample.loc[managed, 'managed_by'] != '').mean() - 0.15) < FREQUENCY_TOLERANCE
+    assert (sample.loc[~managed, 'managed_by'] == '').all()
+    waves = normalize_migration_wave(sample['migration_wave'])
+    assert waves.notna().all() and set(waves.unique()) == {1, 2, 3, 4}
+    print(f"data quality: {len(EXPECTED)} columns within {FREQUENCY_TOLERANCE:.0%} of generation.py's "
+          f"probabilities and {WORKSHOP_TOLERANCE:.0%} of the workshop CSV")
+
+
+def main(sizes=None):
+    sizes = sizes or DEFAULT_SIZES
+    with tempfile.TemporaryDirectory() as tmp:
+        check_determinism(tmp)
+        check_encoding()
+        check_distributions()
+        path = os.path.join(tmp, "inventory.csv")
+        tracemalloc.start()
+        write_inventory(path, MEMORY_ROWS)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"memory: {peak / 2 ** 20:.1f}MiB peak streaming {MEMORY_ROWS:,} rows "
+              f"({os.path.getsize(path) / 2 ** 20:.0f}MiB of CSV)")
+        print(f"{'rows':>10} {'workers':>8} {'time':>8} {'rows/s':>10} {'file':>10}")
+        for rows in sizes:
+            _, seconds = timed(write_inventory, path, rows)
+            print(f"{rows:>10,} {os.cpu_count():>8} {seconds:>7.2f}s {rows / seconds:>10,.0f} "
+                  f"{os.path.getsize(path) / 2 ** 20:>6.0f}MiB")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]])
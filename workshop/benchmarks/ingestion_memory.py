@@ -0,0 +1,53 @@
+"""Benchmark: peak memory of streaming ingestion vs inventory size
+
+Builds synthetic inventories by repeating the rows of the workshop CSV and
+measures the tracemalloc peak while streaming them into payload chunks. The
+peak should stay flat as the row count grows.
+
+Run with ``python -m workshop.benchmarks.ingestion_memory [rows...]``.
+"""
+import os
+import sys
+import tempfile
+import tracemalloc
+from workshop.benchmarks._common import timed
+from workshop.ingestion import DEFAULT_CHUNK_SIZE, iter_payload_chunks
+
+CSV_PATH = "springfield_azure_resources.csv"
+DEFAULT_SIZES = [2_500, 250_000, 5_000_000]
+
+
+def write_inventory(path: str, rows: int) -> None:
+    """Write an inventory of ``rows`` rows by cycling the workshop CSV"""
+    with open(CSV_PATH, encoding='utf-8') as source:
+        header, *body = source.read().splitlines(keepends=True)
+    with open(path, 'w', encoding='utf-8') as target:
+        target.write(header)
+        for start in range(0, rows, len(body)):
+            target.writelines(body[:min(len(body), rows - start)])
+
+
+def consume(path: str) -> int:
+    """Stream the file and count payloads, keeping only one chunk alive"""
+    return sum(len(payloads) for payloads in iter_payload_chunks(path, DEFAULT_CHUNK_SIZE))
+
+
+def main(sizes=None):
+    sizes = sizes or DEFAULT_SIZES
+    print(f"chunk size {DEFAULT_CHUNK_SIZE:,}")
+    print(f"{'rows':>10} {'peak memory':>12} {'time':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in sizes:
+            path = os.path.join(tmp, f"inventory_{rows}.csv")
+            write_inventory(path, rows)
+            tracemalloc.start()
+            count, seconds = timed(consume, path)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            assert count == rows
+            print(f"{rows:>10,} {peak / 2**20:>10.1f}MB {seconds:>7.2f}s")
+            os.remove(path)
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]])
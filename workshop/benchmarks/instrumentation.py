@@ -0,0 +1,75 @@
+"""Benchmark: cost of per-operation metrics and tracing
+
+The same bulk creation and ownership transfer run on a virtual clock
+(so only the SDK's own work is timed) with instrumentation off, with
+metrics, and with metrics and a ``RecordingTracer``. Off must cost nothing,
+as operations are then not wrapped at all; the snapshot of the metrics run
+must account for every request. Bulk operations make few, large requests,
+so the cost per request is measured too, on ``check_existence`` calls.
+
+Run with ``python -m workshop.benchmarks.instrumentation [resources...]``.
+"""
+import io
+import sys
+from contextlib import redirect_stdout
+from azure.core.instrumentation import RecordingTracer
+from azure.core.simulation import SimulationProfile
+from workshop.benchmarks._common import make_client, timed
+from workshop.benchmarks.virtual_clock import payloads
+from workshop.utilities import WorkshopUtilities
+
+DEFAULT_SIZES = [25_000, 100_000]
+SEED = 5
+ROUNDS = 3
+CALLS = 100_000
+
+
+def scenario(client, resources_data) -> None:
+    with redirect_stdout(io.StringIO()):
+        WorkshopUtilities.bulk_create_resources(client, resources_data)
+        WorkshopUtilities.transfer_ownership(client, 'Homer', 'Marge')
+
+
+def best_of(resources_data, metrics: bool = False, traced: bool = False):
+    """(fastest wall seconds of ROUNDS runs, the last run's client)"""
+    best = None
+    for _ in range(ROUNDS):
+        simulation = SimulationProfile.fast(SEED)
+        tracer = RecordingTracer(clock=simulation.clock) if traced else None
+        client = make_client(simulation=simulation, metrics=metrics, tracer=tracer)
+        _, seconds = timed(scenario, client, resources_data)
+        best = seconds if best is None else min(best, seconds)
+    return best, client
+
+
+def per_call(metrics: bool = False, traced: bool = False) -> float:
+    """Microseconds per ``check_existence`` call"""
+    simulation = SimulationProfile.fast(SEED)
+    tracer = RecordingTracer(clock=simulation.clock) if traced else None
+    client = make_client(simulation=simulation, metrics=metrics, tracer=tracer)
+    check_existence = client.resource_groups.check_existence
+    _, seconds = timed(lambda: [check_existence('rg-missing') for _ in range(CALLS)])
+    return seconds / CALLS * 1e6
+
+
+def main(sizes=None):
+    sizes = sizes or DEFAULT_SIZES
+    print(f"{'resources':>10} {'off':>8} {'metrics':>17} {'metrics+tracing':>17} {'requests':>9}")
+    for count in sizes:
+        resources_data = payloads(count)
+        off, plain = best_of(resources_data)
+        metered, client = best_of(resources_data, metrics=True)
+        traced, _ = best_of(resources_data, metrics=True, traced=True)
+        assert plain._instrumentation is None and not plain.metrics.snapshot()
+        snapshot = client.metrics.snapshot()
+        groups = len({resource['resource_group'] for resource in resources_data})
+        assert snapshot['resource_groups.check_existence']['calls'] == groups
+        requests = sum(stats['calls'] for stats in snapshot.values())
+        print(f"{count:>10,} {off:>7.2f}s {metered:>7.2f}s ({metered / off - 1:>+5.1%}) "
+              f"{traced:>7.2f}s ({traced / off - 1:>+5.1%}) {requests:>9,}")
+    off, metered, traced = per_call(), per_call(metrics=True), per_call(metrics=True, traced=True)
+    print(f"per request: {off:.1f}us off, {metered:.1f}us with metrics, {traced:.1f}us with metrics and tracing")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]])
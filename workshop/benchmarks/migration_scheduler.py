@@ -0,0 +1,114 @@
+"""Benchmark: dependency-aware migration against its critical path
+
+- planning: a small plan with a cycle, an unknown dependency and a
+  dependency on a later wave must report all three, raise in strict mode
+  and skip them (and their dependents) otherwise;
+- ordering: on generated inventories no resource may start before each of
+  its dependencies finished, and every dependent of a failure is skipped
+  without being attempted;
+- efficiency: simulated time of each run next to the critical path of its
+  waves, for several pool sizes, and of file-order ``bulk_create_resources``;
+- the inventory file: its plan, as loaded from the CSV.
+
+Runs on a seeded virtual clock. Run with
+``python -m workshop.benchmarks.migration_scheduler [resources...]``.
+"""
+import io
+import random
+import sys
+from contextlib import redirect_stdout
+from azure.core.simulation import SimulationProfile
+from workshop.benchmarks._common import OWNERS, RESOURCE_TYPES, make_client, timed
+from workshop.migration import MigrationPlan, MigrationPlanError, load_plan, run_migration
+from workshop.utilities import WorkshopUtilities
+
+CSV_PATH = "springfield_azure_resources.csv"
+DEFAULT_SIZES = [2_500, 25_000]
+WORKERS = [8, 32, 128]
+WAVES = 4
+RESOURCES_PER_GROUP = 50
+SEED = 13
+
+
+def payload(name: str, group: int, rng: random.Random):
+    return {'name': name, 'resource_type': rng.choice(RESOURCE_TYPES), 'resource_group': f"rg-wave-{group:05d}",
+            'location': 'uksouth', 'tags': {'owner': rng.choice(OWNERS), 'environment': 'prod'}}
+
+
+def generated_plan(count: int, seed: int = SEED) -> MigrationPlan:
+    """Waves of resources, each depending on up to three earlier ones of its own or an earlier wave"""
+    rng = random.Random(seed)
+    names = [f"res-{i:07d}" for i in range(count)]
+    payloads = [payload(name, i // RESOURCES_PER_GROUP, rng) for i, name in enumerate(names)]
+    waves = [1 + i * WAVES // count for i in range(count)]
+    dependencies = [rng.sample(names[max(0, i - 500):i], min(i, rng.choice([0, 0, 1, 2, 3])))
+                    for i in range(count)]
+    return MigrationPlan(payloads, waves, dependencies)
+
+
+def check_planning() -> None:
+    rng = random.Random(SEED)
+    rows = [('a', 1, []), ('b', 1, ['a', 'c']), ('c', 1, ['b']), ('d', 1, ['b']),
+            ('e', 1, ['ghost']), ('f', 1, ['g']), ('g', 2, []), ('h', 2, ['a'])]
+    plan = MigrationPlan([payload(name, 0, rng) for name, _, _ in rows],
+                         [wave for _, wave, _ in rows], [needs for _, _, needs in rows])
+    assert plan.cycles == [['b', 'c']] and plan.missing == {'e': ['ghost']}, (plan.cycles, plan.missing)
+    assert plan.wave_conflicts == {'f': ['g']} and plan.blocked == {'b', 'c', 'e', 'f'}
+    try:
+        run_migration(make_client(simulation=SimulationProfile.fast(SEED)), plan, strict=True)
+        raise AssertionError("strict mode ran a plan with problems")
+    except MigrationPlanError as e:
+        assert 'cycle' in str(e) and 'ghost' in str(e)
+    with redirect_stdout(io.StringIO()):
+        report = run_migration(make_client(simulation=SimulationProfile.fast(SEED)), plan)
+    assert set(report.skipped) >= {'b', 'c', 'd', 'e', 'f'}, report.skipped
+    assert not set(report.timings) & {'b', 'c', 'd', 'e', 'f'}
+    print(f"planning: {len(plan.problems())} problems found, {len(report.skipped)} of {len(plan)} skipped")
+
+
+def check_order(plan: MigrationPlan, report) -> None:
+    outcome = {name: 'succeeded' for name in report.succeeded}
+    outcome.update({name: 'failed' for name in report.failed})
+    outcome.update({name: 'skipped' for name in report.skipped})
+    assert len(outcome) == len(plan) == report.tracker.completed + report.tracker.failed
+    for name, needs in plan.dependencies.items():
+        if outcome[name] == 'skipped':
+            assert name not in report.timings
+            continue
+        for need in needs:
+            assert outcome[need] == 'succeeded', f"{name} ran although {need} {outcome[need]}"
+            assert report.timings[need][1] <= report.timings[name][0], f"{name} started before {need} finished"
+    for name, needs in plan.dependencies.items():
+        if any(outcome[need] != 'succeeded' for need in needs):
+            assert outcome[name] == 'skipped', f"{name} was not skipped"
+
+
+def main(sizes=None):
+    sizes = sizes or DEFAULT_SIZES
+    check_planning()
+    print(f"{'resources':>10} {'scheduler':<22} {'wall':>7} {'simulated':>10} {'critical path':>14} "
+          f"{'efficiency':>11} {'failed':>7} {'skipped':>8}")
+    for count in sizes:
+        plan = generated_plan(count)
+        for workers in WORKERS:
+            client = make_client(simulation=SimulationProfile.fast(SEED))
+            with redirect_stdout(io.StringIO()):
+                report, seconds = timed(run_migration, client, plan, workers)
+            check_order(plan, report)
+            summary = report.summary()
+            print(f"{count:>10,} {f'waves, {workers} workers':<22} {seconds:>6.2f}s "
+                  f"{summary['elapsed_seconds']:>9.1f}s {summary['critical_path_seconds']:>13.1f}s "
+                  f"{summary['efficiency']:>10.1%} {summary['failed']:>7} {summary['skipped']:>8}")
+        client = make_client(simulation=SimulationProfile.fast(SEED))
+        with redirect_stdout(io.StringIO()):
+            tracker, seconds = timed(WorkshopUtilities.bulk_create_resources, client,
+                                     list(plan.payloads.values()))
+        print(f"{count:>10,} {'file order, batched':<22} {seconds:>6.2f}s {client.simulation.elapsed():>9.1f}s "
+              f"{'(ignores dependencies)':>26} {tracker.failed:>7}")
+    plan = load_plan(CSV_PATH)
+    print(f"{CSV_PATH}: {len(plan)} resources in waves {plan.wave_order()}, {len(plan.missing)} with "
+          f"unknown dependencies, {len(plan.cycles)} cycles, {len(plan.wave_conflicts)} on later waves")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,92 @@
+"""Benchmark: memory held by a store of resource models
+
+Builds ``GenericResource`` objects the way the create path does, with tag
+strings decoded per row as they would be when read from a CSV, and measures
+the traced memory they keep alive. The same is done with the previous
+dataclass models for comparison.
+
+Run with ``python -m workshop.benchmarks.model_memory [resources...]``.
+"""
+import gc
+import sys
+import tracemalloc
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+from azure.mgmt.resource.models import GenericResource, ProvisioningState
+from workshop.benchmarks._common import ENVIRONMENTS, OWNERS, RESOURCE_TYPES, timed
+
+DEFAULT_SIZES = [1_000_000]
+SUBSCRIPTION = "12345678-1234-1234-1234-123456789012"
+
+
+@dataclass
+class DataclassResource:
+    """The dataclass model ``GenericResource`` replaced"""
+    id: str
+    name: str
+    type: str
+    location: str
+    tags: Optional[Dict[str, str]] = None
+    kind: Optional[str] = None
+    managed_by: Optional[str] = None
+    sku: Optional[Any] = None
+    plan: Optional[Any] = None
+    identity: Optional[Any] = None
+    properties: Optional[Dict[str, Any]] = None
+    provisioning_state: Optional[str] = None
+    created_time: Optional[datetime] = field(default_factory=lambda: datetime.now(timezone.utc))
+    changed_time: Optional[datetime] = field(default_factory=lambda: datetime.now(timezone.utc))
+
+
+def _decoded(value: str) -> str:
+    """A fresh string object, as a CSV reader would produce for every row"""
+    return value.encode().decode()
+
+
+def build(model, count: int) -> list:
+    resources = []
+    for i in range(count):
+        group = f"rg-bench-{i // 1000:06d}"
+        resource_type = RESOURCE_TYPES[i % len(RESOURCE_TYPES)]
+        name = f"res-{i:08d}"
+        resources.append(model(
+            id=f"/subscriptions/{SUBSCRIPTION}/resourceGroups/{group}/providers/{resource_type}/{name}",
+            name=name,
+            type=_decoded(resource_type),
+            location=_decoded('uksouth'),
+            tags={
+                _decoded('owner'): _decoded(OWNERS[i % len(OWNERS)]),
+                _decoded('environment'): _decoded(ENVIRONMENTS[i % len(ENVIRONMENTS)]),
+                _decoded('migration_wave'): _decoded(f"Wave {i % 4 + 1}"),
+            },
+            properties={},
+            provisioning_state=ProvisioningState.SUCCEEDED,
+        ))
+    return resources
+
+
+def measure(model, count: int):
+    """Return (bytes retained, seconds) for ``count`` models"""
+    gc.collect()
+    tracemalloc.start()
+    resources, seconds = timed(build, model, count)
+    gc.collect()
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del resources
+    return retained, seconds
+
+
+def main(sizes=None):
+    sizes = sizes or DEFAULT_SIZES
+    print(f"{'resources':>10} {'dataclass':>11} {'slots':>11} {'per resource':>17} {'saved':>6}")
+    for count in sizes:
+        before, _ = measure(DataclassResource, count)
+        after, _ = measure(GenericResource, count)
+        print(f"{count:>10,} {before / 2**20:>9.0f}MB {after / 2**20:>9.0f}MB "
+              f"{before / count:>6.0f}B -> {after / count:>4.0f}B {1 - after / before:>6.0%}")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,130 @@
+"""Cross-check and benchmark of server-side OData filtering
+
+Generates random filters from the supported grammar and checks that
+``client.resources.list(filter=...)`` and ``list_by_resource_group`` return
+exactly what a brute-force scan with a reference implementation returns, on
+the dict store and the columnar store. Then times server-side filtering
+against listing everything and filtering client-side.
+
+Run with ``python -m workshop.benchmarks.odata_filter [resources...]``.
+"""
+import random
+import sys
+from azure.core.exceptions import HttpResponseError
+from workshop.benchmarks._common import OWNERS, RESOURCE_TYPES, make_client, no_simulated_latency, timed
+from workshop.benchmarks.resource_graph import LOCATIONS, populate
+
+DEFAULT_SIZES = [100_000, 250_000]
+CHECK_SIZE = 5_000
+FILTERS_PER_STORE = 300
+
+
+def quote(value: str) -> str:
+    return "'" + value.replace("'", "''") + "'"
+
+
+def random_term(rng: random.Random):
+    """(filter text, reference predicate) for one random condition"""
+    kind = rng.randrange(6)
+    if kind == 0:
+        value = rng.choice(RESOURCE_TYPES + ['microsoft.compute/VIRTUALMACHINES', 'Nope/none'])
+        return f"resourceType eq {quote(value)}", lambda r: r.type.lower() == value.lower()
+    if kind == 1:
+        value = rng.choice(LOCATIONS + ['UKSouth'])
+        return f"location eq {quote(value)}", lambda r: r.location.lower() == value.lower()
+    if kind == 2:
+        value = f"rg-graph-{rng.randrange(6):05d}"
+        return f"resourceGroup eq {quote(value)}", lambda r: r.id.split('/')[4] == value
+    if kind == 3:
+        name = rng.choice(['owner', 'cost_center', 'missing'])
+        if rng.random() < 0.4:
+            return f"tagName eq {quote(name)}", lambda r: name in (r.tags or {})
+        value = rng.choice(OWNERS + ['homer', 'CC001', 'CC003'])
+        return (f"tagName eq {quote(name)} and tagValue eq {quote(value)}",
+                lambda r: str((r.tags or {}).get(name, '')).lower() == value.lower() and name in (r.tags or {}))
+    if kind == 4:
+        value = rng.choice(['-0001', '00003-00', 'RES-', 'zzz'])
+        return f"substringof({quote(value)}, name)", lambda r: value.lower() in r.name.lower()
+    value = rng.choice(['graph-0000', 'GRAPH', 'x'])
+    return (f"substringof({quote(value)}, resourceGroup)",
+            lambda r: value.lower() in r.id.split('/')[4].lower())
+
+
+def random_filter(rng: random.Random, depth: int = 0):
+    if depth >= 2 or rng.random() < 0.4:
+        return random_term(rng)
+    left_text, left = random_filter(rng, depth + 1)
+    right_text, right = random_filter(rng, depth + 1)
+    if rng.random() < 0.5:
+        return f"({left_text}) and ({right_text})", lambda r: left(r) and right(r)
+    return f"({left_text}) or ({right_text})", lambda r: left(r) or right(r)
+
+
+def ids(resources) -> list:
+    return [resource.id for resource in resources]
+
+
+def cross_check(columnar: bool) -> None:
+    client = make_client(columnar_store=columnar)
+    populate(client, CHECK_SIZE)
+    everything = list(client._resource_store.values())
+    rng = random.Random(7)
+    with no_simulated_latency():
+        for _ in range(FILTERS_PER_STORE):
+            text, reference = random_filter(rng)
+            expected = sorted(resource.id for resource in everything if reference(resource))
+            assert sorted(ids(client.resources.list(filter=text))) == expected, text
+            group = f"rg-graph-{rng.randrange(5):05d}"
+            in_group = sorted(ids(client.resources.list_by_resource_group(group, filter=text)))
+            assert in_group == [i for i in expected if i.split('/')[4] == group], text
+            top = rng.randrange(1, 20)
+            assert len(ids(client.resources.list(filter=text, top=top))) == min(top, len(expected))
+        for bad in ["tagValue eq 'x'", "location eq", "location ne 'x'", "colour eq 'red'",
+                    "substringof('x', location)", "(location eq 'x'", "location eq 'x' or"]:
+            try:
+                client.resources.list(filter=bad)
+            except HttpResponseError:
+                continue
+            raise AssertionError(f"accepted invalid filter {bad!r}")
+    print(f"{'columnar' if columnar else 'dict'} store: {FILTERS_PER_STORE} random filters match a full scan")
+
+
+CASES = [
+    "tagName eq 'owner' and tagValue eq 'Homer'",
+    "resourceGroup eq 'rg-graph-00042'",
+    "resourceType eq 'Microsoft.Sql/servers' and location eq 'ukwest'",
+    "substringof('-0042-', name)",
+]
+
+
+def client_side(client, text):
+    # What callers do without server-side filtering: list everything, test each resource
+    compiled_reference = {
+        CASES[0]: lambda r: (r.tags or {}).get('owner', '').lower() == 'homer',
+        CASES[1]: lambda r: r.id.split('/')[4].lower() == 'rg-graph-00042',
+        CASES[2]: lambda r: r.type.lower() == 'microsoft.sql/servers' and r.location.lower() == 'ukwest',
+        CASES[3]: lambda r: '-0042-' in r.name.lower(),
+    }[text]
+    return [resource for resource in client.resources.list() if compiled_reference(resource)]
+
+
+def main(sizes=None):
+    sizes = sizes or DEFAULT_SIZES
+    cross_check(columnar=False)
+    cross_check(columnar=True)
+    print(f"{'resources':>10} {'store':>8} {'filter':<66} {'client-side':>12} {'$filter':>9}")
+    for count in sizes:
+        for columnar in (False, True):
+            client = make_client(columnar_store=columnar)
+            populate(client, count)
+            store = 'columnar' if columnar else 'dict'
+            with no_simulated_latency():
+                for text in CASES:
+                    expected, scan_seconds = timed(client_side, client, text)
+                    result, filter_seconds = timed(lambda: list(client.resources.list(filter=text)))
+                    assert ids(result) == ids(expected), text
+                    print(f"{count:>10,} {store:>8} {text:<66} {scan_seconds:>11.3f}s {filter_seconds:>8.3f}s")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]])
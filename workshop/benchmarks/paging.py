@@ -0,0 +1,120 @@
+"""Benchmark and consistency check of lazy, prefetching pagers
+
+1. Consistency: resources are created and deleted from another thread
+   while a listing is paged through. Every resource that existed for the
+   whole listing must appear exactly once, nothing may repeat, and
+   resuming from any page's continuation token must give the same tail.
+2. Time to first item: the old pager copied every resource before
+   returning anything (on the columnar store that builds every object);
+   the lazy pager copies only the keys.
+3. Overlap: a consumer doing work per item, with and without prefetch.
+   The page delay is scaled down so large listings finish quickly.
+
+Run with ``python -m workshop.benchmarks.paging [resources...]``.
+"""
+import random
+import sys
+import threading
+import time
+from azure.core.paging import ItemPaged
+from azure.core.simulation import SimulationProfile
+from workshop.benchmarks._common import make_client, no_simulated_latency, populate, timed
+
+DEFAULT_SIZES = [100_000, 1_000_000]
+RESOURCES_PER_GROUP = 1000
+OVERLAP_RESOURCES = 20_000
+OVERLAP_PAGE_DELAY = 0.01
+WORK_PER_PAGE = 0.008
+
+
+def check_consistency(seeds=range(3), count: int = 20_000) -> None:
+    for seed in seeds:
+        client = make_client(simulation=SimulationProfile(latencies={'paging.page': 0.0005}))
+        populate(client, count // RESOURCES_PER_GROUP, RESOURCES_PER_GROUP)
+        original = list(client._resource_store)
+        rng = random.Random(seed)
+        doomed = set(rng.sample(original, count // 10))
+        stop = threading.Event()
+
+        def churn():
+            # Delete a tenth of the resources and add new ones while the listing runs
+            for group, resource_id in enumerate(doomed):
+                with client._lock:
+                    client._resource_store.pop(resource_id, None)
+                    client._unindex_resource(resource_id)
+                if group % 500 == 0:
+                    populate(client, 1, 50, first_group=1000 + group, seed=seed)
+                if stop.is_set():
+                    return
+
+        pager = client.resources.list()
+        worker = threading.Thread(target=churn)
+        worker.start()
+        seen, tokens = [], []
+        for page, token in pager.by_page():
+            seen.extend(resource.id for resource in page)
+            tokens.append((len(seen), token))
+        stop.set()
+        worker.join()
+        assert len(seen) == len(set(seen)), "a resource was listed twice"
+        assert set(seen) <= set(original), "a resource created mid-listing was included"
+        assert set(original) - doomed <= set(seen), "a surviving resource was skipped"
+        for position, token in rng.sample(tokens[:-1], 5):
+            tail = [resource.id for page, _ in pager.by_page(token) for resource in page]
+            expected = [resource_id for resource_id in seen[position:] if resource_id in client._resource_store]
+            assert tail == expected, "resuming from a token changed the tail"
+    print(f"consistency: {len(seeds)} listings under concurrent deletes and creates are exact")
+
+
+def consume(pager, work_per_page: float) -> int:
+    """Iterate ``pager``, spending ``work_per_page`` (e.g. waiting on writes) after every 100 items"""
+    count = 0
+    for _ in pager:
+        count += 1
+        if count % 100 == 0:
+            time.sleep(work_per_page)
+    return count
+
+
+def first_item(pager) -> None:
+    next(iter(pager))
+
+
+def eager_pager(client) -> ItemPaged:
+    """The previous behaviour: copy every resource, then page the copy"""
+    return ItemPaged(list(client._resource_store.values()))
+
+
+def measure_overlap() -> None:
+    client = make_client()
+    populate(client, OVERLAP_RESOURCES // RESOURCES_PER_GROUP, RESOURCES_PER_GROUP)
+    simulation = SimulationProfile(latencies={'paging.page': OVERLAP_PAGE_DELAY})
+    results = {}
+    for prefetch in (False, True):
+        entries, resolve = client.resources._list()
+        pager = ItemPaged(entries, resolve=resolve, prefetch=prefetch, simulation=simulation)
+        _, results[prefetch] = timed(consume, pager, WORK_PER_PAGE)
+    pages = OVERLAP_RESOURCES // 100
+    print(f"overlap: {OVERLAP_RESOURCES:,} resources, {pages} pages of {OVERLAP_PAGE_DELAY * 1000:.0f}ms, "
+          f"{WORK_PER_PAGE * 1000:.0f}ms work per page: {results[False]:.2f}s without prefetch, "
+          f"{results[True]:.2f}s with")
+
+
+def main(sizes=None):
+    sizes = sizes or DEFAULT_SIZES
+    check_consistency()
+    measure_overlap()
+    print(f"{'resources':>10} {'store':>8} {'eager first item':>17} {'lazy first item':>16}")
+    for count in sizes:
+        for columnar in (False, True):
+            client = make_client(columnar_store=columnar)
+            populate(client, count // RESOURCES_PER_GROUP, RESOURCES_PER_GROUP)
+            with no_simulated_latency():
+                _, eager_seconds = timed(lambda: first_item(eager_pager(client)))
+                _, lazy_seconds = timed(lambda: first_item(client.resources.list()))
+            store = 'columnar' if columnar else 'dict'
+            print(f"{count:>10,} {store:>8} {eager_seconds * 1000:>15.1f}ms {lazy_seconds * 1000:>14.1f}ms")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,96 @@
+"""Benchmark: ProgressTracker under heavy update load
+
+- callbacks: a printing progress callback on every item (the old
+  behaviour, ``callback_interval_ms=0``) against the default 100ms limit;
+- threads: updates from 16 threads, a tenth of them throttling failures,
+  must all be counted, with only a bounded sample of messages kept;
+- rate: items done every simulated millisecond on a virtual clock must
+  show as 1000 ops/s, with the matching ETA and latency percentiles.
+
+Run with ``python -m workshop.benchmarks.progress_tracker [updates...]``.
+"""
+import io
+import sys
+import threading
+from azure.core.exceptions import ThrottlingError
+from azure.core.simulation import VirtualClock
+from workshop.benchmarks._common import timed
+from workshop.utilities import ProgressTracker
+
+DEFAULT_SIZES = [100_000, 500_000]
+THREADS = 16
+RATE_ITEMS = 10_000
+
+
+def callbacks(updates: int, interval_ms: float):
+    """(seconds, callbacks made) for ``updates`` updates printing progress"""
+    out = io.StringIO()
+    calls = []
+
+    def progress_callback(tracker):
+        calls.append(None)
+        print(f"\rProgress: {tracker.percentage:.1f}% "
+              f"({tracker.completed} completed, {tracker.failed} failed)",
+              end='', flush=True, file=out)
+
+    tracker = ProgressTracker(updates, progress_callback, callback_interval_ms=interval_ms)
+    _, seconds = timed(lambda: [tracker.update(True) for _ in range(updates)])
+    return seconds, len(calls)
+
+
+def threads(updates: int):
+    """(seconds, tracker) for ``updates`` updates spread over THREADS threads"""
+    tracker = ProgressTracker(updates)
+    error = ThrottlingError("subscription write limit exceeded")
+
+    def worker(count: int) -> None:
+        for i in range(count):
+            tracker.update(i % 10 != 0, None if i % 10 else error)
+
+    def run() -> None:
+        workers = [threading.Thread(target=worker, args=(updates // THREADS,)) for _ in range(THREADS)]
+        for thread in workers:
+            thread.start()
+        for thread in workers:
+            thread.join()
+
+    _, seconds = timed(run)
+    return seconds, tracker
+
+
+def check_rate() -> None:
+    clock = VirtualClock()
+    tracker = ProgressTracker(RATE_ITEMS, clock=clock, callback_interval_ms=0)
+    for i in range(RATE_ITEMS // 2):
+        clock.sleep(0.001)
+        tracker.record_latency(0.001 * (1 + i % 10))
+        tracker.update(True)
+    rate, eta = tracker.ops_per_second, tracker.eta
+    latency = tracker.latency_percentiles()
+    assert abs(rate - 1000) < 10, f"{rate:.1f} ops/s"
+    assert abs(eta - RATE_ITEMS / 2 / 1000) < 0.1, f"ETA {eta:.2f}s"
+    assert abs(latency['p50'] - 0.005) < 0.0002 and abs(latency['max'] - 0.010) < 1e-9, latency
+    print(f"rate: {rate:.1f} ops/s, ETA {eta:.2f}s at half way, latency p50 {latency['p50'] * 1e3:.2f}ms "
+          f"p99 {latency['p99'] * 1e3:.2f}ms")
+
+
+def main(sizes=None):
+    sizes = sizes or DEFAULT_SIZES
+    check_rate()
+    print(f"{'updates':>10} {'every item':>18} {'every 100ms':>18} {'16 threads':>11} {'errors kept':>12}")
+    for updates in sizes:
+        every_item, every_calls = callbacks(updates, 0)
+        limited, limited_calls = callbacks(updates, 100)
+        assert every_calls == updates and limited_calls < updates / 100
+        seconds, tracker = threads(updates)
+        counted = updates // THREADS * THREADS
+        assert tracker.completed + tracker.failed == counted
+        assert tracker.errors_by_status == {429: tracker.failed}
+        assert tracker.errors_by_class == {'ThrottlingError': tracker.failed}
+        assert len(tracker.errors) == tracker.max_error_samples
+        print(f"{updates:>10,} {every_item:>6.2f}s {every_calls:>9,}x {limited:>6.2f}s {limited_calls:>9,}x "
+              f"{seconds:>10.2f}s {len(tracker.errors):>5} of {tracker.failed:,}")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]])
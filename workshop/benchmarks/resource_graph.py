@@ -0,0 +1,166 @@
+"""Benchmark: Resource Graph queries vs listing and filtering client-side
+
+Answers the same questions once with ``client.resource_graph.query`` and
+once the way the workshop scripts do it - ``client.resources.list()`` and
+Python filtering - checks both give the same answer, then times them on the
+dict store and the columnar store. Simulated delays are recorded instead of
+slept: "wall" is the work done, "simulated" the network time the mock SDK
+would have added (listing pays per page of 100 resources, a query per page
+of up to 1000 result rows).
+
+Run with ``python -m workshop.benchmarks.resource_graph [resources...]``.
+"""
+import random
+import sys
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from unittest import mock
+from azure.mgmt.resource.models import ChangeType, GenericResource, ProvisioningState
+from workshop.benchmarks._common import (
+    ENVIRONMENTS, OWNERS, RESOURCE_TYPES, make_client, timed
+)
+
+DEFAULT_SIZES = [100_000, 250_000]
+RESOURCES_PER_GROUP = 1000
+LOCATIONS = ['uksouth', 'ukwest', 'eastus', 'westeurope']
+COST_CENTERS = ['CC001', 'CC002', 'CC003', 'CC004', 'CC005']
+
+
+def populate(client, count: int, seed: int = 42) -> None:
+    """Load ``count`` resources with varied locations, cost centres and costs"""
+    rng = random.Random(seed)
+    for g in range(count // RESOURCES_PER_GROUP):
+        rg_name = f"rg-graph-{g:05d}"
+        for i in range(RESOURCES_PER_GROUP):
+            resource_type = rng.choice(RESOURCE_TYPES)
+            name = f"res-{g:05d}-{i:04d}"
+            tags = {'owner': rng.choice(OWNERS), 'environment': rng.choice(ENVIRONMENTS)}
+            if rng.random() < 0.7:
+                tags['cost_center'] = rng.choice(COST_CENTERS)
+            resource = GenericResource(
+                id=(f"/subscriptions/{client.subscription_id}/resourceGroups/{rg_name}"
+                    f"/providers/{resource_type}/{name}"),
+                name=name,
+                type=resource_type,
+                location=rng.choice(LOCATIONS),
+                tags=tags,
+                properties={'monthlyCost': round(rng.uniform(5, 500), 2)},
+                provisioning_state=ProvisioningState.SUCCEEDED,
+            )
+            client._resource_store[resource.id] = resource
+            client._index_resource(resource, ChangeType.CREATE)
+
+
+@contextmanager
+def recorded_latency():
+    """Patch out ``time.sleep``, adding up what would have been slept"""
+    slept = [0.0]
+
+    def sleep(seconds):
+        slept[0] += seconds
+    with mock.patch('time.sleep', sleep):
+        yield slept
+
+
+def measure(func, *args):
+    """(result, wall seconds, simulated seconds)"""
+    with recorded_latency() as slept:
+        result, seconds = timed(func, *args)
+    return result, seconds, slept[0]
+
+
+def run_query(client, query: str) -> list:
+    rows = []
+    for page in client.resource_graph.query_pages(query):
+        rows.extend(page.data)
+    return rows
+
+
+# Each case: (label, query, list-and-filter equivalent, result normaliser)
+
+def prod_vms_by_owner(client):
+    counts = Counter(resource.tags['owner'] for resource in client.resources.list()
+                     if resource.type == 'Microsoft.Compute/virtualMachines'
+                     and resource.tags.get('environment') == 'prod'
+                     and resource.location != 'uksouth')
+    return dict(counts)
+
+
+def cost_by_cost_center(client):
+    totals = defaultdict(float)
+    for resource in client.resources.list():
+        cost_center = (resource.tags or {}).get('cost_center')
+        if cost_center is not None:
+            totals[cost_center] += resource.properties['monthlyCost']
+    return {key: round(value, 2) for key, value in totals.items()}
+
+
+def homer_in_ukwest(client):
+    return sorted(resource.name for resource in client.resources.list()
+                  if resource.tags.get('owner') == 'Homer' and resource.location == 'ukwest')
+
+
+def cheapest_storage(client):
+    storage = [resource for resource in client.resources.list()
+               if resource.type == 'Microsoft.Storage/storageAccounts']
+    storage.sort(key=lambda resource: resource.properties['monthlyCost'])
+    return [resource.name for resource in storage[:10]]
+
+
+CASES = [
+    ("prod VMs per owner outside uksouth",
+     "Resources | where type == 'Microsoft.Compute/virtualMachines' and tags.environment == 'prod'"
+     " and location != 'uksouth' | summarize count() by owner = tags.owner",
+     prod_vms_by_owner,
+     lambda rows: {row['owner']: row['count_'] for row in rows}),
+    ("monthly cost per cost centre",
+     "Resources | where isnotempty(tags.cost_center)"
+     " | summarize cost = sum(properties.monthlyCost) by tags.cost_center",
+     cost_by_cost_center,
+     lambda rows: {row['tags_cost_center']: round(row['cost'], 2) for row in rows}),
+    ("Homer's resources in ukwest",
+     "Resources | where tags.owner == 'Homer' and location == 'ukwest' | project name",
+     homer_in_ukwest,
+     lambda rows: sorted(row['name'] for row in rows)),
+    ("10 cheapest storage accounts",
+     "Resources | where type =~ 'microsoft.storage/storageaccounts'"
+     " | order by properties.monthlyCost asc | take 10 | project name",
+     cheapest_storage,
+     lambda rows: [row['name'] for row in rows]),
+]
+
+
+def check_paging(client) -> None:
+    query = "Resources | where tags.owner == 'Lisa' | project id"
+    expected = run_query(client, query)
+    pages = list(client.resource_graph.query_pages(query, max_page_size=333))
+    assert [row for page in pages for row in page.data] == expected
+    assert all(page.count == 333 for page in pages[:-1]) and pages[-1].skip_token is None
+    first = client.resource_graph.query(query, max_page_size=10)
+    second = client.resource_graph.query(query, skip_token=first.skip_token, max_page_size=10)
+    assert first.data + second.data == expected[:20]
+    print(f"paging: {len(expected):,} rows in {len(pages)} pages of 333 match a single pass")
+
+
+def main(sizes=None):
+    sizes = sizes or DEFAULT_SIZES
+    print(f"{'resources':>10} {'store':>8} {'query':<36} {'list+filter wall/simulated':>27} "
+          f"{'graph wall/simulated':>21} {'wall':>6}")
+    for count in sizes:
+        for columnar in (False, True):
+            client = make_client(columnar_store=columnar)
+            populate(client, count)
+            store = 'columnar' if columnar else 'dict'
+            if count == sizes[0] and not columnar:
+                with recorded_latency():
+                    check_paging(client)
+            for label, query, baseline, normalise in CASES:
+                expected, list_seconds, list_simulated = measure(baseline, client)
+                rows, graph_seconds, graph_simulated = measure(run_query, client, query)
+                assert normalise(rows) == expected, label
+                print(f"{count:>10,} {store:>8} {label:<36} {list_seconds:>12.3f}s {list_simulated:>12.1f}s "
+                      f"{graph_seconds:>9.3f}s {graph_simulated:>9.2f}s {list_seconds / graph_seconds:>5.1f}x")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,57 @@
+"""Benchmark: per-resource-group list/delete cost as the store grows
+
+Each resource group holds a fixed number of resources while the number of
+groups grows, so an index-backed implementation should show a flat
+per-group cost. The substring scan the SDK used before the resource group
+index is timed alongside for comparison.
+
+Run with ``python -m workshop.benchmarks.resource_group_scaling [sizes...]``.
+"""
+import random
+import sys
+from workshop.benchmarks._common import make_client, no_simulated_latency, populate, timed
+
+RESOURCES_PER_GROUP = 100
+SAMPLE_GROUPS = 50
+LEGACY_SAMPLE_GROUPS = 3
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000]
+
+
+def legacy_scan(client, resource_group_name):
+    """The pre-index child lookup: a substring test over the whole store"""
+    return [resource for resource in client._resource_store.values()
+            if f"/resourceGroups/{resource_group_name}/" in resource.id]
+
+
+def main(sizes=None):
+    sizes = sorted(sizes or DEFAULT_SIZES)
+    client = make_client()
+    rng = random.Random(7)
+    groups = 0
+    
+    print(f"{'resources':>10} {'list/group':>12} {'delete/group':>14} {'legacy scan/group':>18}")
+    for size in sizes:
+        target_groups = size // RESOURCES_PER_GROUP
+        populate(client, target_groups - groups, RESOURCES_PER_GROUP, first_group=groups)
+        groups = target_groups
+        names = rng.sample(sorted(client._resource_groups_store), SAMPLE_GROUPS)
+        
+        with no_simulated_latency():
+            _, list_time = timed(lambda: [list(client.resources.list_by_resource_group(n))
+                                          for n in names])
+            _, legacy_time = timed(lambda: [legacy_scan(client, n)
+                                            for n in names[:LEGACY_SAMPLE_GROUPS]])
+            _, delete_time = timed(lambda: [client.resource_groups.delete(n) for n in names])
+        
+        # Put the deleted groups back so the next size starts from a full store
+        for name in names:
+            populate(client, 1, RESOURCES_PER_GROUP, first_group=int(name.rsplit('-', 1)[1]))
+        
+        print(f"{len(client._resource_store):>10,} "
+              f"{list_time / SAMPLE_GROUPS * 1e6:>10.1f}us "
+              f"{delete_time / SAMPLE_GROUPS * 1e6:>12.1f}us "
+              f"{legacy_time / LEGACY_SAMPLE_GROUPS * 1e6:>16.1f}us")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]])
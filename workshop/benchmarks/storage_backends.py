@@ -0,0 +1,121 @@
+"""Benchmark of the persistent storage backends
+
+1. Snapshots: a columnar store is saved to a binary snapshot, which is
+   then reopened (memory-mapped) and read: random lookups and the
+   vectorized compliance report, checked against the live store. A client
+   is opened on the snapshot, its tag and resource group lookups answered
+   from the snapshot's columns rather than indexes built up front. Several
+   processes then open the same file at once and count resources per
+   owner, sharing its pages.
+2. SQLite: the same resources are written to a SQLite database one
+   transaction per write and in a single transaction, then a client is
+   reopened on the database (rebuilding its indexes) and queried through
+   the SQL indexes.
+
+Run with ``python -m workshop.benchmarks.storage_backends [resources...]``.
+"""
+import os
+import random
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from azure.mgmt.resource import SqliteStorage
+from azure.mgmt.resource._snapshot import open_snapshot, save_snapshot
+from workshop.benchmarks._common import make_client, populate, timed
+from workshop.utilities import WorkshopUtilities
+
+DEFAULT_SIZES = [100_000, 1_000_000]
+RESOURCES_PER_GROUP = 1000
+LOOKUPS = 10_000
+PROCESSES = 4
+SQLITE_SINGLE_WRITES = 2_500
+SQLITE_MAX_RESOURCES = 250_000
+
+
+def owners_in_snapshot(path: str):
+    """Open a snapshot in a worker process and count resources per owner"""
+    storage, seconds = timed(open_snapshot, path)
+    return seconds, storage.resources.value_counts('owner')
+
+
+def check_snapshot(client, path: str) -> None:
+    count, save_seconds = timed(save_snapshot, client, path)
+    storage, open_seconds = timed(open_snapshot, path)
+    snapshot = storage.resources
+    assert len(snapshot) == count == len(client._resource_store)
+    resource_ids = random.Random(1).sample(list(client._resource_store), min(LOOKUPS, count))
+    resources, lookup_seconds = timed(lambda: [snapshot[resource_id] for resource_id in resource_ids])
+    assert resources == [client._resource_store[resource_id] for resource_id in resource_ids]
+    assert "/subscriptions/none" not in snapshot
+    expected, live_seconds = timed(WorkshopUtilities._columnar_compliance_report, client.columnar_store)
+    report, snapshot_seconds = timed(WorkshopUtilities._columnar_compliance_report, snapshot)
+    expected.pop('timestamp'), report.pop('timestamp')
+    assert report == expected, "the snapshot's compliance report differs from the live store's"
+    reopened, client_seconds = timed(make_client, storage=open_snapshot(path))
+    homer, tag_seconds = timed(reopened._tag_index.ids_with_tag_value, 'owner', 'homer')
+    assert homer == client._tag_index.ids_with_tag_value('owner', 'homer')
+    group = next(iter(client._resource_groups_store))
+    assert reopened._resource_group_index.ids_in_group(group) == client._resource_group_index.ids_in_group(group)
+    reopened.close()
+
+    with ProcessPoolExecutor(PROCESSES) as pool:
+        results = list(pool.map(owners_in_snapshot, [path] * PROCESSES))
+    assert all(counts == client.columnar_store.value_counts('owner') for _, counts in results)
+    worst_open = max(seconds for seconds, _ in results)
+    size = os.path.getsize(path) / 2 ** 20
+    print(f"{count:>10,} snapshot: saved in {save_seconds:.2f}s ({size:.0f} MiB), "
+          f"opened in {open_seconds * 1000:.1f}ms ({worst_open * 1000:.1f}ms slowest of "
+          f"{PROCESSES} processes), {lookup_seconds / len(resource_ids) * 1e6:.1f}us per lookup, "
+          f"compliance report {snapshot_seconds:.2f}s (live store {live_seconds:.2f}s), "
+          f"client opened in {client_seconds * 1000:.1f}ms, first tag query {tag_seconds * 1000:.1f}ms")
+
+
+def check_sqlite(client, directory: str) -> None:
+    count = min(len(client._resource_store), SQLITE_MAX_RESOURCES)
+    resources = list(client._resource_store.items())[:count]
+    groups = dict(client._resource_groups_store)
+
+    single = SqliteStorage(os.path.join(directory, 'single.sqlite'))
+    single_items = resources[:SQLITE_SINGLE_WRITES]
+    _, single_seconds = timed(lambda: [single.resources.__setitem__(*item) for item in single_items])
+    single.close()
+
+    path = os.path.join(directory, 'resources.sqlite')
+
+    def load():
+        with SqliteStorage(path) as storage, storage.transaction():
+            storage.resource_groups.update(groups)
+            for resource_id, resource in resources:
+                storage.resources[resource_id] = resource
+    _, bulk_seconds = timed(load)
+
+    reopened, open_seconds = timed(make_client, storage=SqliteStorage(path))
+    store = reopened._resource_store
+    assert len(store) == count
+    sample = random.Random(2).sample(resources, min(1000, count))
+    assert all(store[resource_id] == resource for resource_id, resource in sample)
+    homer, tag_seconds = timed(store.ids_with_tag, 'owner', 'homer')
+    assert sorted(homer) == sorted(reopened._tag_index.ids_with_tag_value('owner', 'homer'))
+    group = next(iter(groups))
+    in_group, group_seconds = timed(store.ids_in_group, group)
+    assert sorted(in_group) == sorted(reopened._resource_group_index.ids_in_group(group))
+    reopened.close()
+    per_write = single_seconds / len(single_items) * 1e6
+    print(f"{count:>10,} sqlite: {per_write:.0f}us per single write, bulk load {bulk_seconds:.2f}s "
+          f"({bulk_seconds / count * 1e6:.0f}us per resource), client reopened in {open_seconds:.2f}s, "
+          f"tag query {tag_seconds * 1000:.1f}ms ({len(homer):,} ids), "
+          f"group query {group_seconds * 1000:.2f}ms")
+
+
+def main(sizes=None):
+    sizes = sizes or DEFAULT_SIZES
+    for count in sizes:
+        client = make_client(columnar_store=True)
+        populate(client, count // RESOURCES_PER_GROUP, RESOURCES_PER_GROUP)
+        with tempfile.TemporaryDirectory() as directory:
+            check_snapshot(client, os.path.join(directory, 'resources.snap'))
+            check_sqlite(client, directory)
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,232 @@
+"""Benchmark suite of the workshop scenarios, checked against a stored baseline
+
+Each scenario runs at every inventory size (2.5k to 1M resources by
+default) on a seeded virtual clock (``SimulationProfile.fast``), so the
+simulated latency costs nothing and is the same on every run:
+
+- bulk_create_resources: creating ``size`` resources sequentially
+- find_resources_by_owner: one owner's resources, through the tag index
+- transfer_ownership: one owner's resources handed to another
+- generate_compliance_report: over every resource
+- list_by_resource_group: every resource, one resource group at a time
+- resource_groups.delete: a twentieth of the groups, with their resources
+
+For each it records wall time, simulated time, operations per second
+(resources handled per wall second) and the tracemalloc peak. Memory is
+measured in a second run of the scenario (on the next owner or groups),
+since tracing slows everything down. Results are compared with
+``baseline.json`` next to this file on the numbers that do not depend on
+the machine: a scenario regresses when its simulated time grows by more
+than 1%, its peak memory by more than 10%, or it handles fewer resources
+than recorded. Wall time is only printed, as a ratio to the baseline's,
+unless ``--check-wall`` also fails a scenario whose wall time grows by more
+than 50% (runs on a busy machine easily vary by a third); record a
+baseline on the machine that runs the suite before using it.
+
+Run with ``python -m workshop.benchmarks.suite [resources...] [--update-baseline] [--check-wall]``;
+the exit status is 1 if anything regressed.
+"""
+import argparse
+import gc
+import io
+import json
+import os
+import random
+import tracemalloc
+from contextlib import redirect_stdout
+from typing import Dict, List, Optional
+from azure.core.simulation import SimulationProfile
+from workshop.benchmarks._common import ENVIRONMENTS, OWNERS, RESOURCE_TYPES, make_client, populate, timed
+from workshop.utilities import WorkshopUtilities
+
+DEFAULT_SIZES = [2_500, 25_000, 250_000, 1_000_000]
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), 'baseline.json')
+RESOURCES_PER_GROUP = 250
+SEED = 11
+# Allowed growth before a measurement counts as a regression, and the
+# noise floor below which differences are ignored
+WALL_TOLERANCE, WALL_FLOOR = 0.5, 0.02
+SIMULATED_TOLERANCE, SIMULATED_FLOOR = 0.01, 0.001
+MEMORY_TOLERANCE, MEMORY_FLOOR = 0.10, 1.0
+
+
+def payloads(count: int, seed: int = SEED):
+    """Bulk creation payloads for ``count`` resources"""
+    rng = random.Random(seed)
+    return [{
+        'name': f"new-{i:07d}",
+        'resource_type': rng.choice(RESOURCE_TYPES),
+        'resource_group': f"rg-new-{i // RESOURCES_PER_GROUP:05d}",
+        'location': 'uksouth',
+        'tags': {'owner': rng.choice(OWNERS), 'environment': rng.choice(ENVIRONMENTS)},
+    } for i in range(count)]
+
+
+def group_names(size: int) -> List[str]:
+    """Resource groups of the inventory loaded by ``populate``"""
+    return [f"rg-bench-{g:06d}" for g in range(size // RESOURCES_PER_GROUP)]
+
+
+# Each scenario: prepare(inventory, size, run) -> (client, arguments), untimed;
+# then measured(client, *arguments) -> resources handled. ``run`` is 0 for
+# the timed run and 1 for the memory run, which must not see the same data
+
+def prepare_bulk_create(inventory, size: int, run: int):
+    return make_client(simulation=SimulationProfile.fast(SEED)), (payloads(size, SEED + run),)
+
+
+def bulk_create(client, resources_data) -> int:
+    return WorkshopUtilities.bulk_create_resources(client, resources_data).completed
+
+
+def prepare_owner(inventory, size: int, run: int):
+    return inventory, (OWNERS[run],)
+
+
+def find_by_owner(client, owner: str) -> int:
+    return len(WorkshopUtilities.find_resources_by_owner(client, owner))
+
+
+def prepare_transfer(inventory, size: int, run: int):
+    # Owners 0 and 1 were looked up; hand 2 to 3, then 4 to 5
+    return inventory, (OWNERS[2 + 2 * run], OWNERS[3 + 2 * run])
+
+
+def transfer(client, from_owner: str, to_owner: str) -> int:
+    return WorkshopUtilities.transfer_ownership(client, from_owner, to_owner)['successfully_transferred']
+
+
+def prepare_inventory(inventory, size: int, run: int):
+    return inventory, ()
+
+
+def compliance_report(client) -> int:
+    return WorkshopUtilities.generate_compliance_report(client)['total_resources']
+
+
+def list_by_resource_group(client) -> int:
+    return sum(1 for name in group_names(len(client._resource_store))
+               for _ in client.resources.list_by_resource_group(name))
+
+
+def prepare_delete(inventory, size: int, run: int):
+    groups = group_names(size)
+    count = max(1, len(groups) // 20)
+    return inventory, (groups[run * count:(run + 1) * count],)
+
+
+def delete_groups(client, names: List[str]) -> int:
+    before = len(client._resource_store)
+    for name in names:
+        client.resource_groups.delete(name)
+    return before - len(client._resource_store)
+
+
+# (name, prepare, measured); deletes go last as they shrink the inventory
+SCENARIOS = [
+    ('bulk_create_resources', prepare_bulk_create, bulk_create),
+    ('find_resources_by_owner', prepare_owner, find_by_owner),
+    ('transfer_ownership', prepare_transfer, transfer),
+    ('generate_compliance_report', prepare_inventory, compliance_report),
+    ('list_by_resource_group', prepare_inventory, list_by_resource_group),
+    ('resource_groups.delete', prepare_delete, delete_groups),
+]
+
+
+def measure(prepare, measured, inventory, size: int, run: int, traced: bool) -> Dict[str, float]:
+    client, arguments = prepare(inventory, size, run)
+    gc.collect()
+    if traced:
+        tracemalloc.start()
+    started = client.simulation.elapsed()
+    # Drop the scenarios' warnings about resource groups that failed to create
+    with redirect_stdout(io.StringIO()):
+        handled, seconds = timed(measured, client, *arguments)
+    result = {'wall': seconds, 'simulated': client.simulation.elapsed() - started,
+              'ops': handled, 'ops_per_sec': handled / seconds if seconds else 0.0}
+    if traced:
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        result['peak_mib'] = peak / 2 ** 20
+    return result
+
+
+def run_size(size: int) -> Dict[str, Dict[str, float]]:
+    """{scenario: measurements} at one inventory size"""
+    inventory = make_client(simulation=SimulationProfile.fast(SEED))
+    populate(inventory, size // RESOURCES_PER_GROUP, RESOURCES_PER_GROUP, seed=SEED)
+    results = {}
+    for name, prepare, measured in SCENARIOS:
+        result = measure(prepare, measured, inventory, size, 0, traced=False)
+        result['peak_mib'] = measure(prepare, measured, inventory, size, 1, traced=True)['peak_mib']
+        results[name] = result
+    return results
+
+
+def regressions(result: Dict[str, float], baseline: Optional[Dict[str, float]],
+                check_wall: bool = False) -> List[str]:
+    """Measurements of ``result`` that are worse than the baseline's, described
+
+    Wall time is compared only with ``check_wall``, since it depends on the machine.
+    """
+    if baseline is None:
+        return []
+    found = []
+    checks = [('simulated', SIMULATED_TOLERANCE, SIMULATED_FLOOR, 's'),
+              ('peak_mib', MEMORY_TOLERANCE, MEMORY_FLOOR, 'MiB')]
+    if check_wall:
+        checks.insert(0, ('wall', WALL_TOLERANCE, WALL_FLOOR, 's'))
+    for key, tolerance, floor, unit in checks:
+        before, after = baseline[key], result[key]
+        if after > before * (1 + tolerance) and after - before > floor:
+            found.append(f"{key} {before:.3f}{unit} -> {after:.3f}{unit}")
+    if result['ops'] < baseline['ops']:
+        found.append(f"ops {baseline['ops']:,} -> {result['ops']:,}")
+    return found
+
+
+def load_baseline(path: str) -> Dict[str, Dict[str, Dict[str, float]]]:
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding='utf-8') as baseline_file:
+        return json.load(baseline_file)
+
+
+def main(sizes=None, update_baseline: bool = False, baseline_path: str = BASELINE_PATH,
+         check_wall: bool = False) -> List[str]:
+    """Run the suite; return the regressions found (none when updating the baseline)"""
+    sizes = sizes or DEFAULT_SIZES
+    baseline = load_baseline(baseline_path)
+    failures = []
+    print(f"{'resources':>10} {'scenario':<27} {'wall':>9} {'simulated':>11} {'ops/s':>11} "
+          f"{'peak':>10}  vs baseline")
+    for size in sizes:
+        for name, result in run_size(size).items():
+            recorded = baseline.get(name, {}).get(str(size))
+            found = [] if update_baseline else regressions(result, recorded, check_wall)
+            failures.extend(f"{name} at {size:,}: {description}" for description in found)
+            verdict = ('recorded' if update_baseline else 'no baseline' if recorded is None
+                       else 'REGRESSED' if found else f"{result['wall'] / recorded['wall']:.2f}x wall")
+            print(f"{size:>10,} {name:<27} {result['wall']:>8.3f}s {result['simulated']:>10.1f}s "
+                  f"{result['ops_per_sec']:>11,.0f} {result['peak_mib']:>7.1f}MiB  {verdict}")
+            if update_baseline:
+                baseline.setdefault(name, {})[str(size)] = result
+    if update_baseline:
+        with open(baseline_path, 'w', encoding='utf-8') as baseline_file:
+            json.dump(baseline, baseline_file, indent=2, sort_keys=True)
+            baseline_file.write('\n')
+        print(f"baseline written to {baseline_path}")
+    for failure in failures:
+        print(f"regression: {failure}")
+    return failures
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the workshop scenarios against a baseline")
+    parser.add_argument('sizes', nargs='*', type=int, help="inventory sizes (resources)")
+    parser.add_argument('--update-baseline', action='store_true', help="record these results as the baseline")
+    parser.add_argument('--baseline', default=BASELINE_PATH, help="baseline file")
+    parser.add_argument('--check-wall', action='store_true',
+                        help="also fail on wall time regressions (needs a baseline from this machine)")
+    args = parser.parse_args()
+    raise SystemExit(1 if main(args.sizes, args.update_baseline, args.baseline, args.check_wall) else 0)
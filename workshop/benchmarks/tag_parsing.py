@@ -0,0 +1,68 @@
+"""Benchmark: tag string parsing throughput
+
+Resamples the ``tags`` column of the workshop CSV and parses it four ways:
+the hand-rolled split every consumer used to write, ``parse_tags`` per row
+(cached), ``parse_tag_series`` and ``expand_tags``. Results are checked to
+agree with the uncached parser.
+
+Run with ``python -m workshop.benchmarks.tag_parsing [rows...]``.
+"""
+import sys
+import numpy as np
+import pandas as pd
+from workshop.benchmarks._common import timed
+from workshop.tags import (
+    canonical_tag_key, clear_tag_cache, expand_tags, parse_tag_series, parse_tags, tag_cache_info
+)
+
+CSV_PATH = "springfield_azure_resources.csv"
+DEFAULT_SIZES = [25_000, 250_000, 2_500_000]
+
+
+def load_tags(rows: int, seed: int = 42) -> pd.Series:
+    """Resample the workshop CSV's tags column up to ``rows`` rows"""
+    source = pd.read_csv(CSV_PATH, usecols=['tags'])['tags']
+    picks = np.random.default_rng(seed).integers(0, len(source), rows)
+    return source.iloc[picks].reset_index(drop=True)
+
+
+def parse_by_hand(raw) -> dict:
+    """Uncached reference: detect the format and split, as notebook code does"""
+    if not isinstance(raw, str) or not raw:
+        return {}
+    pair_separator, key_separator = (';', ':') if ';' in raw else (',', '=')
+    tags = {}
+    for pair in raw.split(pair_separator):
+        key, _, value = pair.partition(key_separator)
+        tags[canonical_tag_key(key.strip())] = value.strip()
+    return tags
+
+
+def per_row(values: pd.Series) -> list:
+    return [parse_tags(raw) for raw in values]
+
+
+def by_hand(values: pd.Series) -> list:
+    return [parse_by_hand(raw) for raw in values]
+
+
+def main(sizes=None):
+    sizes = sizes or DEFAULT_SIZES
+    print(f"{'rows':>10} {'by hand':>9} {'per row':>9} {'series':>9} {'expand':>9} {'rows/s':>12}")
+    for rows in sizes:
+        values = load_tags(rows)
+        clear_tag_cache()
+        reference, by_hand_seconds = timed(by_hand, values)
+        parsed, per_row_seconds = timed(per_row, values)
+        series, series_seconds = timed(parse_tag_series, values)
+        expanded, expand_seconds = timed(expand_tags, values)
+        assert parsed == reference and series.tolist() == reference
+        assert expanded['owner'].astype(object).where(expanded['owner'].notna(), None).tolist() \
+            == [tags.get('owner') for tags in reference]
+        print(f"{rows:>10,} {by_hand_seconds:>8.3f}s {per_row_seconds:>8.3f}s "
+              f"{series_seconds:>8.3f}s {expand_seconds:>8.3f}s {rows / expand_seconds:>12,.0f}")
+    print(tag_cache_info())
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,131 @@
+"""Benchmark of fast mode: workshop scenarios on a virtual clock
+
+1. Each bulk creation scenario (sequential, thread pool, asyncio) runs
+   under ``SimulationProfile.fast(seed)``: simulated latency is accounted
+   for on a virtual clock instead of slept, so the run takes as long as
+   the work itself while reporting the simulated duration.
+2. Determinism: running a scenario again with the same seed fails the same
+   resources and takes the same simulated time. Sequential and asyncio
+   runs repeat exactly; a thread pool's timing depends on which tasks the
+   threads happen to finish first, so it may differ slightly.
+3. Accuracy: each scenario is run once more on a clock scaled 10x, which
+   really sleeps, and must fail the same resources. The sequential and
+   asyncio durations must match the virtual clock's to within 10%; the
+   scaled clock also counts the real work done between sleeps (scaled up
+   as well), so it reads a little longer. Real thread pools vary from run
+   to run, so their difference is only reported.
+
+Run with ``python -m workshop.benchmarks.virtual_clock [resources...]``.
+"""
+import io
+import random
+import sys
+from contextlib import redirect_stdout
+from azure.core.exceptions import ClientAuthenticationError
+from azure.core.simulation import SimulationProfile
+from azure.identity import DefaultAzureCredential
+from azure.identity.aio import DefaultAzureCredential as AsyncDefaultAzureCredential
+from azure.mgmt.resource import ResourceManagementClient
+from azure.mgmt.resource.aio import ResourceManagementClient as AsyncResourceManagementClient
+from workshop.async_utilities import AsyncWorkshopUtilities
+from workshop.benchmarks._common import ENVIRONMENTS, OWNERS, RESOURCE_TYPES, timed
+from workshop.utilities import WorkshopUtilities
+
+DEFAULT_SIZES = [2_500, 25_000]
+RESOURCES_PER_GROUP = 100
+MAX_WORKERS = 32
+SEED = 7
+SCALED_RESOURCES = 250
+SCALE = 10
+# Allowed difference between the scaled and virtual simulated durations
+SCALED_TOLERANCE = 0.1
+# Allowed difference between two thread pool runs with the same seed
+REPEAT_TOLERANCE = 0.05
+
+
+def payloads(count: int, seed: int = 42):
+    """Bulk creation payloads for ``count`` resources"""
+    rng = random.Random(seed)
+    return [{
+        'name': f"res-{i:07d}",
+        'resource_type': rng.choice(RESOURCE_TYPES),
+        'resource_group': f"rg-fast-{i // RESOURCES_PER_GROUP:05d}",
+        'location': 'uksouth',
+        'tags': {'owner': rng.choice(OWNERS), 'environment': rng.choice(ENVIRONMENTS)},
+    } for i in range(count)]
+
+
+def simulated_client(simulation: SimulationProfile) -> ResourceManagementClient:
+    """A client on ``simulation``, retrying its (deterministic) auth failures"""
+    while True:
+        try:
+            return ResourceManagementClient(DefaultAzureCredential(simulation=simulation),
+                                            "springfield-fast", simulation=simulation)
+        except ClientAuthenticationError:
+            continue
+
+
+def sequential(simulation, resources_data):
+    return WorkshopUtilities.bulk_create_resources(simulated_client(simulation), resources_data)
+
+
+def threads(simulation, resources_data):
+    return WorkshopUtilities.bulk_create_resources(simulated_client(simulation), resources_data,
+                                                   parallel=True, max_workers=MAX_WORKERS)
+
+
+def coroutines(simulation, resources_data):
+    client = AsyncResourceManagementClient(AsyncDefaultAzureCredential(simulation=simulation),
+                                           "springfield-fast", simulation=simulation)
+    return simulation.run(AsyncWorkshopUtilities.bulk_create_resources(client, resources_data))
+
+
+# (label, scenario, whether its simulated time is exactly repeatable)
+SCENARIOS = [
+    ('sequential', sequential, True),
+    (f'{MAX_WORKERS} threads', threads, False),
+    ('asyncio', coroutines, True),
+]
+
+
+def run(scenario, simulation, resources_data):
+    """(tracker, wall seconds, simulated seconds); warnings about failed resource groups are dropped"""
+    with redirect_stdout(io.StringIO()):
+        tracker, seconds = timed(scenario, simulation, resources_data)
+    return tracker, seconds, simulation.elapsed()
+
+
+def check_accuracy() -> None:
+    resources_data = payloads(SCALED_RESOURCES)
+    for label, scenario, exact in SCENARIOS:
+        fast, _, fast_simulated = run(scenario, SimulationProfile.fast(SEED), resources_data)
+        scaled, wall, scaled_simulated = run(scenario, SimulationProfile.scaled(SCALE, SEED), resources_data)
+        assert scaled.errors_by_class == fast.errors_by_class, f"{label}: the scaled run failed differently"
+        difference = abs(scaled_simulated - fast_simulated) / fast_simulated
+        assert difference < SCALED_TOLERANCE or not exact, f"{label}: simulated durations differ by {difference:.1%}"
+        print(f"accuracy: {SCALED_RESOURCES} resources, {label:<12} {fast_simulated:6.2f}s simulated on the "
+              f"virtual clock, {scaled_simulated:6.2f}s on a {SCALE}x clock ({wall:.2f}s wall, "
+              f"{difference:.1%} apart)")
+
+
+def main(sizes=None):
+    sizes = sizes or DEFAULT_SIZES
+    check_accuracy()
+    print(f"{'resources':>10} {'scenario':<12} {'wall':>8} {'simulated':>11} {'speedup':>9} "
+          f"{'failed':>7} {'repeat':>8}")
+    for count in sizes:
+        resources_data = payloads(count)
+        for label, scenario, exact in SCENARIOS:
+            tracker, wall, simulated = run(scenario, SimulationProfile.fast(SEED), resources_data)
+            again, _, simulated_again = run(scenario, SimulationProfile.fast(SEED), resources_data)
+            assert tracker.completed + tracker.failed == count
+            assert again.errors_by_class == tracker.errors_by_class, f"{label}: a rerun failed differently"
+            difference = abs(simulated_again - simulated) / simulated
+            assert difference == 0 if exact else difference < REPEAT_TOLERANCE, \
+                f"{label}: a rerun took {difference:.1%} longer or shorter"
+            print(f"{count:>10,} {label:<12} {wall:>7.2f}s {simulated:>10.1f}s {simulated / wall:>8.0f}x "
+                  f"{tracker.failed:>7} {difference:>7.1%}")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,168 @@
+"""Vectorized data cleansing for the Springfield inventory
+
+Applies the workshop's Phase 2 business rules and normalizes the messy
+columns produced by ``generation.py``. Every rule works on pandas
+categoricals: the handful of distinct raw values is looked up once, and the
+result is spread over all rows with NumPy integer indexing, so the cost per
+row is an array lookup rather than a Python call.
+"""
+import re
+from typing import List, Mapping, Optional
+import numpy as np
+import pandas as pd
+from workshop.utilities import VALID_LOCATIONS, VALID_OWNERS
+
+# Business rules (readme, Phase 2)
+TARGET_LOCATION = VALID_LOCATIONS[0]
+ENVIRONMENT_OWNERS = {
+    'dev': 'Marge',
+    'prod': 'Homer',
+    'test': 'Lisa',
+    'staging': 'Marge',
+}
+
+# Canonical values, in category order
+ENVIRONMENTS = ['dev', 'prod', 'test', 'staging']
+STATUSES = ['Running', 'Stopped', 'Failed', 'Updating']
+COMPLIANCE_STATUSES = ['Compliant', 'NonCompliant', 'Unknown']
+
+# Known variants, keyed by normalize_key() of the raw value
+ENVIRONMENT_VARIANTS = {
+    'dev': 'dev', 'development': 'dev',
+    'prod': 'prod', 'production': 'prod',
+    'test': 'test', 'qa': 'test', 'uat': 'test',
+    'staging': 'staging', 'stage': 'staging',
+}
+STATUS_VARIANTS = {
+    'running': 'Running',
+    'stopped': 'Stopped',
+    'failed': 'Failed',
+    'updating': 'Updating',
+}
+COMPLIANCE_VARIANTS = {
+    'compliant': 'Compliant',
+    'noncompliant': 'NonCompliant',
+    'unknown': 'Unknown', 'na': 'Unknown', '': 'Unknown',
+}
+BOOLEAN_VARIANTS = {
+    'true': True, 'yes': True, '1': True, 'enabled': True,
+    'false': False, 'no': False, '0': False, 'disabled': False,
+}
+BOOLEAN_COLUMNS = ['backup_enabled', 'monitoring_enabled', 'public_ip_enabled']
+
+_WAVE_NUMBER = re.compile(r'(\d+)')
+
+
+def normalize_key(value) -> str:
+    """Lookup key for a raw value: lower case, no spaces, dashes, underscores or slashes"""
+    if value is None or (isinstance(value, float) and np.isnan(value)):
+        return ''
+    return re.sub(r'[\s\-_/]', '', str(value)).lower()
+
+
+def _lookup_codes(values: pd.Series, lookup: Mapping[str, object],
+                  targets: List[object]) -> np.ndarray:
+    """Map every row to the index of its canonical value in ``targets`` (-1 if unknown)"""
+    categorical = values.astype('category')
+    position = {target: i for i, target in enumerate(targets)}
+    # One lookup per distinct raw value; the extra trailing slot catches NaN (code -1)
+    code_map = np.array(
+        [position.get(lookup.get(normalize_key(raw)), -1) for raw in categorical.cat.categories]
+        + [position.get(lookup.get(''), -1)],
+        dtype=np.int16,
+    )
+    return code_map[categorical.cat.codes.to_numpy()]
+
+
+def _categorical(codes: np.ndarray, categories: List[str], like: pd.Series) -> pd.Series:
+    return pd.Series(pd.Categorical.from_codes(codes, categories=categories),
+                     index=like.index, name=like.name)
+
+
+def normalize_categorical(values: pd.Series, lookup: Mapping[str, str],
+                          categories: List[str]) -> pd.Series:
+    """Map raw values onto canonical categories; unknown values become NaN"""
+    return _categorical(_lookup_codes(values, lookup, categories), categories, values)
+
+
+def normalize_environment(values: pd.Series) -> pd.Series:
+    """dev / prod / test / staging"""
+    return normalize_categorical(values, ENVIRONMENT_VARIANTS, ENVIRONMENTS)
+
+
+def normalize_status(values: pd.Series) -> pd.Series:
+    """Running / Stopped / Failed / Updating"""
+    return normalize_categorical(values, STATUS_VARIANTS, STATUSES)
+
+
+def normalize_compliance_status(values: pd.Series) -> pd.Series:
+    """Compliant / NonCompliant / Unknown"""
+    return normalize_categorical(values, COMPLIANCE_VARIANTS, COMPLIANCE_STATUSES)
+
+
+def normalize_boolean(values: pd.Series) -> pd.Series:
+    """Nullable booleans from true/yes/1/enabled style variants"""
+    codes = _lookup_codes(values, BOOLEAN_VARIANTS, [False, True])
+    return pd.Series(pd.arrays.BooleanArray(codes == 1, codes == -1),
+                     index=values.index, name=values.name)
+
+
+def normalize_migration_wave(values: pd.Series) -> pd.Series:
+    """Wave numbers from 'Wave 1' / 'wave1' / 'WAVE 2' style labels"""
+    categorical = values.astype('category')
+    numbers = []
+    for raw in categorical.cat.categories:
+        match = _WAVE_NUMBER.search(str(raw))
+        numbers.append(int(match.group(1)) if match else -1)
+    number_map = np.array(numbers + [-1], dtype=np.int16)
+    waves = number_map[categorical.cat.codes.to_numpy()]
+    return pd.Series(pd.arrays.IntegerArray(waves.astype(np.int16), waves == -1),
+                     index=values.index, name=values.name)
+
+
+def assign_owners(owners: pd.Series, environments: Optional[pd.Series] = None) -> pd.Series:
+    """Apply environment-based ownership and drop unauthorized owners
+
+    ``environments``, if given, must already be normalized. Rows with a
+    known environment get that environment's owner; the rest keep their
+    owner if it is authorized and become NaN otherwise.
+    """
+    owner_categories = list(VALID_OWNERS)
+    authorized = {normalize_key(owner): owner for owner in owner_categories}
+    codes = _lookup_codes(owners, authorized, owner_categories)
+    if environments is not None:
+        by_environment = np.array(
+            [owner_categories.index(ENVIRONMENT_OWNERS[env]) for env in environments.cat.categories]
+            + [-1],
+            dtype=np.int16,
+        )
+        environment_owner = by_environment[environments.cat.codes.to_numpy()]
+        codes = np.where(environment_owner >= 0, environment_owner, codes)
+    return _categorical(codes, owner_categories, owners)
+
+
+def cleanse(df: pd.DataFrame) -> pd.DataFrame:
+    """Return a cleansed copy of an inventory DataFrame
+
+    Only the columns present are touched: locations become ``uksouth``,
+    environments and owners follow the business rules, and status,
+    compliance, migration wave and boolean columns are normalized.
+    """
+    clean = df.copy()
+    if 'location' in clean:
+        clean['location'] = _categorical(np.zeros(len(clean), dtype=np.int8),
+                                         [TARGET_LOCATION], clean['location'])
+    if 'environment' in clean:
+        clean['environment'] = normalize_environment(clean['environment'])
+    if 'owner' in clean:
+        clean['owner'] = assign_owners(clean['owner'], clean.get('environment'))
+    if 'status' in clean:
+        clean['status'] = normalize_status(clean['status'])
+    if 'compliance_status' in clean:
+        clean['compliance_status'] = normalize_compliance_status(clean['compliance_status'])
+    if 'migration_wave' in clean:
+        clean['migration_wave'] = normalize_migration_wave(clean['migration_wave'])
+    for column in BOOLEAN_COLUMNS:
+        if column in clean:
+            clean[column] = normalize_boolean(clean[column])
+    return clean
@@ -0,0 +1,151 @@
+"""Incrementally maintained compliance report
+
+``ComplianceView`` listens to a client's resource store and keeps the
+counters and issue lists of ``WorkshopUtilities.generate_compliance_report``
+up to date as resources are created, updated, re-tagged and deleted.
+Producing the report then costs only the size of its output instead of a
+paged scan of the whole subscription.
+
+The view lives in the workshop package, which the SDK client does not
+depend on, so it is attached through the client's store listeners rather
+than exposed as a client attribute: ``ComplianceView.attach(client)``
+returns the client's view, creating it on first use.
+"""
+import threading
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Any, Dict, NamedTuple, Tuple
+from azure.mgmt.resource import ResourceManagementClient
+from workshop.utilities import WorkshopUtilities
+
+COUNT_KEYS = ['resources_by_owner', 'resources_by_environment',
+              'resources_by_location', 'resources_by_type']
+
+
+class _Entry(NamedTuple):
+    """What one resource contributes to the report"""
+    sequence: int
+    name: str
+    type: str
+    owner: str
+    environment: str
+    location: str
+    tagged: bool
+    issues: Tuple[str, ...]
+
+    def counted_values(self) -> Tuple[str, str, str, str]:
+        """Values counted under each of ``COUNT_KEYS``"""
+        return self.owner, self.environment, self.location, self.type
+
+
+class ComplianceView:
+    """Live compliance report for a client's resources
+
+    Seeded from the client's store, then kept current through the client's
+    store listener hooks. ``report()`` returns the same result as a full
+    ``generate_compliance_report``, with resources listed in store order.
+    Call ``close()`` to stop tracking.
+    """
+
+    def __init__(self, client: ResourceManagementClient):
+        self._client = client
+        self._lock = threading.RLock()
+        self._entries: Dict[str, _Entry] = {}
+        self._counts: Dict[str, Counter] = {key: Counter() for key in COUNT_KEYS}
+        # resource_id -> sequence, kept in store order unless flagged otherwise
+        self._untagged: Dict[str, int] = {}
+        self._non_compliant: Dict[str, int] = {}
+        self._out_of_order = set()
+        self._next_sequence = 0
+        with client._lock:
+            for resource in client._resource_store.values():
+                self.resource_stored(resource)
+            client.add_store_listener(self)
+
+    @classmethod
+    def attach(cls, client: ResourceManagementClient) -> 'ComplianceView':
+        """The view attached to ``client``, created on first use"""
+        with client._lock:
+            for listener in client._store_listeners:
+                if isinstance(listener, cls):
+                    return listener
+            return cls(client)
+
+    def close(self) -> None:
+        """Detach from the client"""
+        self._client.remove_store_listener(self)
+
+    def resource_stored(self, resource) -> None:
+        """Store listener hook: a resource was created or updated"""
+        tags = resource.tags or {}
+        with self._lock:
+            old = self._entries.get(resource.id)
+            if old is None:
+                sequence = self._next_sequence
+                self._next_sequence += 1
+            else:
+                sequence = old.sequence
+                self._count(old, -1)
+            entry = _Entry(
+                sequence, resource.name, resource.type,
+                tags.get('owner', 'unassigned'),
+                tags.get('environment', 'untagged'),
+                resource.location,
+                bool(tags),
+                tuple(WorkshopUtilities._compliance_issues(resource)),
+            )
+            self._entries[resource.id] = entry
+            self._count(entry, 1)
+            self._track('_untagged', resource.id, sequence, not entry.tagged)
+            self._track('_non_compliant', resource.id, sequence, bool(entry.issues))
+
+    def resource_removed(self, resource_id: str) -> None:
+        """Store listener hook: a resource was deleted"""
+        with self._lock:
+            entry = self._entries.pop(resource_id, None)
+            if entry is None:
+                return
+            self._count(entry, -1)
+            self._untagged.pop(resource_id, None)
+            self._non_compliant.pop(resource_id, None)
+
+    def report(self) -> Dict[str, Any]:
+        """The current compliance report"""
+        with self._lock:
+            for table in list(self._out_of_order):
+                setattr(self, table, dict(sorted(getattr(self, table).items(),
+                                                 key=lambda item: item[1])))
+            self._out_of_order.clear()
+            entries = self._entries
+            report = {
+                'timestamp': datetime.now(timezone.utc).isoformat(),
+                'total_resources': len(entries),
+            }
+            for key in COUNT_KEYS:
+                report[key] = dict(self._counts[key])
+            report['untagged_resources'] = [entries[resource_id].name
+                                            for resource_id in self._untagged]
+            report['non_compliant_resources'] = [{
+                'resource_id': resource_id,
+                'resource_name': entries[resource_id].name,
+                'resource_type': entries[resource_id].type,
+                'issues': list(entries[resource_id].issues)
+            } for resource_id in self._non_compliant]
+            return report
+
+    def _count(self, entry: _Entry, delta: int) -> None:
+        for key, value in zip(COUNT_KEYS, entry.counted_values()):
+            counter = self._counts[key]
+            counter[value] += delta
+            if not counter[value]:
+                del counter[value]
+
+    def _track(self, table_name: str, resource_id: str, sequence: int, member: bool) -> None:
+        """Add or drop a resource from an ordered report list, keeping its position on updates"""
+        table = getattr(self, table_name)
+        if not member:
+            table.pop(resource_id, None)
+        elif resource_id not in table:
+            if table and table[next(reversed(table))] > sequence:
+                self._out_of_order.add(table_name)
+            table[resource_id] = sequence
@@ -0,0 +1,505 @@
+"""Sharded, streaming generator for large Springfield inventories
+
+Produces rows with the columns and the intentional data-quality issues of
+``generation.py`` (same value pools, same probabilities), but fast enough
+for multi-million-row load tests:
+
+- fields are drawn a block of ``BLOCK_ROWS`` rows at a time as NumPy index
+  arrays into precomputed pools (words, company names, padded numbers,
+  dates), and strings are assembled with vectorized object-array
+  concatenation instead of per-row Faker calls;
+- every block has its own generator, seeded from ``(seed, block)``, so
+  any row range can be regenerated on its own, identical to the same rows
+  of a full run, without generating the rows before it;
+- the row space is split into shards of whole blocks that run on a process
+  pool; their CSV text is streamed to the output file in row order, with
+  at most two shards per worker in flight, so memory does not grow with
+  the size of the file.
+
+Output depends only on the seed and ``REFERENCE_DATE`` (dates are drawn
+relative to it rather than to today), not on the number of workers or the
+shard size. Words and company names come from built-in pools shaped like
+Faker's, so Faker is not needed.
+
+Run with ``python -m workshop.generator ROWS [--output PATH] [--seed N]
+[--workers N] [--range START:STOP]``.
+"""
+import argparse
+import csv
+import io
+import os
+import random
+import sys
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, timedelta
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+import numpy as np
+
+SEED = 42
+BLOCK_ROWS = 10_000
+DEFAULT_SHARD_ROWS = 100_000
+OUTPUT_FILE = 'springfield_azure_resources.csv'
+# csv.DictWriter's default, as used by generation.py
+LINE_TERMINATOR = '\r\n'
+REFERENCE_DATE = date(2025, 6, 23)
+
+COLUMNS = [
+    'resource_name', 'resource_type', 'location', 'owner', 'environment',
+    'cost_center', 'created_date', 'last_modified_date', 'tags',
+    'subscription_id', 'resource_group_name', 'resource_id', 'sku',
+    'status', 'provisioning_state', 'managed_by', 'monthly_cost',
+    'compliance_status', 'backup_enabled', 'monitoring_enabled',
+    'security_group', 'public_ip_enabled', 'encryption_status', 'identity_type',
+    'migration_wave', 'migration_status', 'on_premises_server', 'dependencies'
+]
+
+# Distributions of generation.py
+SUBSCRIPTION_IDS = [
+    'a1b2c3d4-e5f6-7890-abcd-ef1234567890',
+    'b2c3d4e5-f6g7-8901-bcde-f12345678901',
+    'c3d4e5f6-g7h8-9012-cdef-123456789012'
+]
+OWNER_WEIGHTS = {'Homer': 25, 'Marge': 30, 'Lisa': 20, 'Bart': 8, 'Ned': 7, 'Apu': 5, 'Milhouse': 5}
+MESSY_LOCATIONS = ['uksouth', 'eastus', 'westus', 'Springfield', 'Shelbyville',
+                   'uk-south', 'east-us', 'UK South', 'East US']
+INCONSISTENT_ENVIRONMENTS = ['dev', 'prod', 'test', 'staging', 'Dev', 'PROD', 'Test', 'STAGING',
+                             'development', 'production', 'qa', 'uat']
+# (type, name prefix, monthly cost range)
+RESOURCE_TYPES = [
+    ('Microsoft.Compute/virtualMachines', 'vm', (50, 500)),
+    ('Microsoft.Storage/storageAccounts', 'sa', (10, 100)),
+    ('Microsoft.Sql/servers', 'sql', (100, 2000)),
+    ('Microsoft.Web/sites', 'app', (20, 200)),
+    ('Microsoft.Network/virtualNetworks', 'vnet', (5, 50)),
+    ('Microsoft.Network/networkSecurityGroups', 'nsg', (0, 10)),
+    ('Microsoft.Network/loadBalancers', 'lb', (25, 300)),
+    ('Microsoft.KeyVault/vaults', 'kv', (5, 30)),
+    ('Microsoft.ContainerInstance/containerGroups', 'ci', (30, 400)),
+    ('Microsoft.DocumentDB/databaseAccounts', 'cosmos', (50, 1000)),
+]
+VM_SKUS = ['Standard_D2s_v3', 'Standard_D4s_v3', 'Standard_B1s', 'Standard_B2s',
+           'STANDARD_D2S_V3', 'standard_d4s_v3', 'Standard_D8s_v3', 'Standard_F4s_v2']
+STORAGE_SKUS = ['Standard_LRS', 'Standard_GRS', 'Premium_LRS', 'standard_lrs']
+DATABASE_SKUS = ['Basic', 'Standard', 'Premium', 'GeneralPurpose']
+OTHER_SKUS = ['Standard', 'Premium', 'Basic']
+COST_CENTERS = ['CC001', 'CC002', 'CC003', 'nuclear-ops', 'NUCLEAR_OPS', '']
+STATUSES = ['Running', 'Stopped', 'Failed', 'Updating', 'running', 'STOPPED']
+PROVISIONING_STATES = ['Succeeded', 'Failed', 'InProgress', 'succeeded']
+BOOLEAN_FORMATS = ['true', 'false', 'True', 'False', 'yes', 'no', '1', '0', 'enabled', 'disabled']
+COMPLIANCE_STATUSES = ['Compliant', 'Non-Compliant', 'compliant', 'UNKNOWN', 'NonCompliant', 'N/A', '']
+ENCRYPTION_STATUSES = ['Enabled', 'Disabled', 'enabled', 'Not Configured', '']
+IDENTITY_TYPES = ['SystemAssigned', 'UserAssigned', 'None', 'system-assigned']
+MIGRATION_WAVES = ['Wave 1', 'Wave 2', 'Wave 3', 'Wave 4', 'wave1', 'WAVE 2']
+MIGRATION_STATUSES = ['NotStarted', 'InProgress', 'Complete', 'Failed', 'not started', 'IN PROGRESS', 'completed']
+MANAGED_TYPES = ['Microsoft.Compute/virtualMachines', 'Microsoft.Storage/storageAccounts']
+
+# Word and company pools standing in for Faker's lorem words and company names
+WORDS = """
+ability able about above accept according account across act action activity add address admit adult
+affect after again against age agency agent ago agree ahead air allow almost alone along already also
+although always among amount analysis animal another answer anyone anything appear apply approach area
+argue arm around arrive art artist ask assume attack attention attorney audience author available avoid
+away baby back bad bag ball bank bar base beat beautiful because become bed before begin behavior behind
+believe benefit best better between beyond big bill billion bit black blood blue board body book born
+both box boy break bring brother budget build building business buy call camera campaign can cancer
+candidate capital car card care career carry case catch cause cell center central century certain
+certainly chair challenge chance change character charge check child choice choose church citizen city
+civil claim class clear clearly close coach cold collection college color come commercial common
+community company compare computer concern condition conference consider consumer contain continue
+control cost could country couple course court cover create crime cultural culture cup current customer
+cut dark data daughter day dead deal death debate decade decide decision deep defense degree democratic
+describe design despite detail determine develop development difference different difficult dinner
+direction director discover discuss discussion disease doctor dog door down draw dream drive drop drug
+during each early east easy eat economic economy edge education effect effort eight either election
+else employee end energy enjoy enough enter entire environment especially establish evening event
+everybody everyone everything evidence exactly example executive exist expect experience expert explain
+eye face fact factor fail fall family far fast father fear federal feel feeling few field fight figure
+fill film final finally financial find fine finish fire firm first fish five floor fly focus follow food
+foot force foreign forget form former forward four free friend front full fund future game garden gas
+general generation get girl give glass goal good government great green ground group grow growth guess
+gun guy hair half hand hang happen happy hard have head health hear heart heat heavy help her here
+herself high himself his history hit hold home hope hospital hot hotel hour house however huge human
+hundred husband idea identify image imagine impact important improve include including increase indeed
+indicate individual industry information inside instead institution interest interesting international
+interview into investment involve issue item itself job join just keep key kid kill kind kitchen know
+knowledge land language large last late later laugh law lawyer lay lead leader learn least leave left
+leg legal less letter level lie life light like likely line list listen little live local long look
+lose loss lot love low machine magazine main maintain major majority make manage management manager
+many market marriage material matter maybe mean measure media medical meet meeting member memory
+mention message method middle might military million mind minute miss mission model modern moment
+money month more morning most mother mouth move movement movie much music must myself name nation
+national natural nature near nearly necessary need network never new news newspaper next nice night
+none nor north not note nothing notice now number occur offer office officer official often oil old
+once only onto open operation opportunity option order organization other others our out outside over
+own owner page pain painting paper parent part participant particular partner party pass past patient
+pattern pay peace people per perform performance perhaps period person personal phone physical pick
+picture piece place plan plant play player point police policy political politics poor popular
+population position positive possible power practice prepare present president pressure pretty
+prevent price private probably problem process produce product production professional professor
+program project property protect prove provide public pull purpose push put quality question quickly
+quite race radio raise range rate rather reach read ready real reality realize really reason receive
+recent recently recognize record red reduce reflect region relate relationship religious remain
+remember remove report represent republican require research resource respond response responsibility
+rest result return reveal rich right rise risk road rock role room rule run safe same save say scene
+school science scientist score sea season seat second section security see seek seem sell send senior
+sense series serious serve service set seven several shake share she shoot short shot should
+shoulder show side sign significant similar simple simply since sing single sister sit site situation
+six size skill skin small smile social society soldier some somebody someone something sometimes son
+song soon sort sound source south southern space speak special specific speech spend sport spring
+staff stage stand standard star start state statement station stay step still stock stop store story
+strategy street strong structure student study stuff style subject success successful such suddenly
+suffer suggest summer support sure surface system table take talk task tax teach teacher team
+technology television tell ten tend term test than thank that their them themselves then theory there
+these they thing think third this those though thought thousand threat three through throughout throw
+thus time today together tonight too top total tough toward town trade traditional training travel
+treat treatment tree trial trip trouble true truth try turn two type under understand unit until upon
+use usually value various very victim view violence visit voice vote wait walk wall want war watch
+water way weapon wear week weight well west western what whatever when where whether which while white
+whole whom whose why wide wife will win wind window wish with within without woman wonder word work
+worker world worry would write writer wrong yard yeah year yes yet you young your yourself
+""".split()
+LAST_NAMES = """
+Adams Aguilar Allen Anderson Andrews Armstrong Arroyo Austin Baker Ballard Barnes Bates Beard Becker Bell
+Bennett Berry Black Blackwell Boone Booth Bowen Bowman Bradford Bradley Brady Braun Brewer Brock Brooks
+Brown Bryant Buckley Burch Burgess Campbell Carey Carter Castro Chavez Clark Coleman Collins Cook Cooper
+Cruz Davis Diaz Edwards Evans Fisher Fletcher Flores Foster Garcia Gibson Gilmore Gomez Gonzalez Gordon
+Grant Gray Green Gutierrez Hall Harris Harrington Henry Hernandez Hill Hood Huff Hughes Jackson James
+Jenkins Johnson Johnston Jones Kelly Kim King Kirby Larsen Lee Lewis Lopez Lucas Martin Martinez Miller
+Mitchell Moore Morales Morgan Murphy Murray Nelson Nguyen Ortiz Parker Perez Peters Peterson Phillips
+Powell Price Ramirez Reed Reyes Reynolds Richardson Rivera Roberts Robinson Rodriguez Rogers Ross Roth
+Sanchez Sanders Schmitt Scott Shaw Silva Smith Snyder Stein Stevenson Stewart Taylor Thomas Thompson
+Torres Turner Valdez Valentine Vega Velasquez Velez Walker Walters Ward Watson Watts White Williams
+Willis Wilson Wood Woods Wright Young
+""".split()
+COMPANY_SUFFIXES = ['Inc', 'and Sons', 'LLC', 'Group', 'PLC', 'Ltd']
+COMPANY_POOL_SIZE = 4096
+
+
+def _pool(values) -> np.ndarray:
+    """An object array, so that indexing yields Python strings and ``+`` concatenates them"""
+    values = list(values)
+    pool = np.empty(len(values), dtype=object)
+    pool[:] = values
+    return pool
+
+
+def _companies(count: int) -> List[str]:
+    """Company names in Faker's en_US formats, lower-cased without spaces as generation.py uses them"""
+    rng = random.Random(0)
+    names = []
+    for _ in range(count):
+        style = rng.randrange(3)
+        if style == 0:
+            name = f"{rng.choice(LAST_NAMES)} {rng.choice(COMPANY_SUFFIXES)}"
+        elif style == 1:
+            name = f"{rng.choice(LAST_NAMES)}-{rng.choice(LAST_NAMES)}"
+        else:
+            name = f"{rng.choice(LAST_NAMES)}, {rng.choice(LAST_NAMES)} and {rng.choice(LAST_NAMES)}"
+        names.append(name.replace(' ', '').lower())
+    return names
+
+
+_OWNERS = list(OWNER_WEIGHTS)
+_OWNER_P = np.array([OWNER_WEIGHTS[owner] for owner in _OWNERS], dtype=float)
+_OWNER_P /= _OWNER_P.sum()
+_P_OWNERS, _P_OWNERS_LOWER, _P_OWNERS_UPPER = (
+    _pool(_OWNERS), _pool(o.lower() for o in _OWNERS), _pool(o.upper() for o in _OWNERS))
+_P_ENVS, _P_ENVS_LOWER, _P_ENVS_UPPER = (
+    _pool(INCONSISTENT_ENVIRONMENTS), _pool(e.lower() for e in INCONSISTENT_ENVIRONMENTS),
+    _pool(e.upper() for e in INCONSISTENT_ENVIRONMENTS))
+_PROD_ENVS = np.array([e.lower() in ('prod', 'production') for e in INCONSISTENT_ENVIRONMENTS])
+_P_TYPES = _pool(t for t, _, _ in RESOURCE_TYPES)
+_P_PREFIXES = _pool(p for _, p, _ in RESOURCE_TYPES)
+_COST_MIN = np.array([c[0] for _, _, c in RESOURCE_TYPES], dtype=float)
+_COST_MAX = np.array([c[1] for _, _, c in RESOURCE_TYPES], dtype=float)
+_MANAGED = np.array([t in MANAGED_TYPES for t, _, _ in RESOURCE_TYPES])
+# SKUs of every family in one pool, with each type's offset into it and family size
+_SKU_FAMILIES = [VM_SKUS, STORAGE_SKUS, DATABASE_SKUS, OTHER_SKUS]
+_P_SKUS = _pool(sku for family in _SKU_FAMILIES for sku in family)
+_PREMIUM_SKUS = np.array(['Premium' in sku or 'Standard_D' in sku for sku in _P_SKUS])
+_FAMILY_OFFSETS = np.cumsum([0] + [len(family) for family in _SKU_FAMILIES])
+
+
+def _sku_family(resource_type: str) -> int:
+    if 'virtualMachines' in resource_type:
+        return 0
+    if 'storageAccounts' in resource_type:
+        return 1
+    if 'servers' in resource_type:
+        return 2
+    return 3
+
+
+_TYPE_FAMILIES = np.array([_sku_family(t) for t, _, _ in RESOURCE_TYPES])
+_SKU_OFFSET = _FAMILY_OFFSETS[_TYPE_FAMILIES]
+_SKU_COUNT = np.diff(_FAMILY_OFFSETS)[_TYPE_FAMILIES]
+_P_WORDS = _pool(WORDS)
+_P_WORDS_UPPER = _pool(w.upper() for w in WORDS)
+_P_COMPANIES = _pool(_companies(COMPANY_POOL_SIZE))
+_P_NUMBERS = _pool(str(i) for i in range(1000))
+_P_PADDED = _pool(f"{i:03d}" for i in range(1000))
+# Dates that many days before REFERENCE_DATE (generation.py: created -2y to -1m, modified up to today)
+_P_DATES = _pool((REFERENCE_DATE - timedelta(days=i)).isoformat() for i in range(732))
+_P_SUBSCRIPTIONS = _pool(SUBSCRIPTION_IDS)
+_P_LOCATIONS = _pool(MESSY_LOCATIONS)
+_P_COST_CENTERS = _pool(COST_CENTERS)
+_P_STATUSES = _pool(STATUSES)
+_P_PROVISIONING = _pool(PROVISIONING_STATES)
+_P_BOOLEANS = _pool(BOOLEAN_FORMATS)
+_P_COMPLIANCE = _pool(COMPLIANCE_STATUSES)
+_P_ENCRYPTION = _pool(ENCRYPTION_STATUSES)
+_P_IDENTITY = _pool(IDENTITY_TYPES)
+_P_WAVES = _pool(MIGRATION_WAVES)
+_P_MIGRATION = _pool(MIGRATION_STATUSES)
+
+
+def _choice(rng: np.random.Generator, pool: np.ndarray, n: int) -> np.ndarray:
+    return pool[rng.integers(len(pool), size=n)]
+
+
+def _by_style(rng: np.random.Generator, n: int, builders) -> np.ndarray:
+    """Each row built by one of ``builders`` (picked uniformly), given the rows it applies to"""
+    style = rng.integers(len(builders), size=n)
+    out = np.empty(n, dtype=object)
+    for i, build in enumerate(builders):
+        rows = np.flatnonzero(style == i)
+        out[rows] = build(rows)
+    return out
+
+
+def generate_block(seed: int, block: int) -> Dict[str, np.ndarray]:
+    """Columns of rows ``block * BLOCK_ROWS`` to ``(block + 1) * BLOCK_ROWS``, as object arrays"""
+    rng = np.random.default_rng([seed, block])
+    n = BLOCK_ROWS
+    type_index = rng.integers(len(RESOURCE_TYPES), size=n)
+    env_index = rng.integers(len(INCONSISTENT_ENVIRONMENTS), size=n)
+    owner_index = rng.choice(len(_OWNERS), size=n, p=_OWNER_P)
+    resource_type, prefix = _P_TYPES[type_index], _P_PREFIXES[type_index]
+    env, env_lower, env_upper = _P_ENVS[env_index], _P_ENVS_LOWER[env_index], _P_ENVS_UPPER[env_index]
+    owner, owner_lower, owner_upper = (
+        _P_OWNERS[owner_index], _P_OWNERS_LOWER[owner_index], _P_OWNERS_UPPER[owner_index])
+
+    def word(count):
+        return _choice(rng, _P_WORDS, count)
+
+    def number(count, high, pool=_P_NUMBERS):
+        """Numbers from 1 to ``high``, as strings"""
+        return pool[rng.integers(1, high + 1, size=count)]
+
+    resource_name = _by_style(rng, n, [
+        lambda r: prefix[r] + '-' + env[r] + '-' + word(len(r)) + '-' + number(len(r), 999, _P_PADDED),
+        lambda r: prefix[r] + env[r] + word(len(r)) + number(len(r), 99),
+        lambda r: 'springfield-' + prefix[r] + '-' + word(len(r)) + '-' + env[r],
+        lambda r: _choice(rng, _P_COMPANIES, len(r)) + '-' + prefix[r] + '-' + number(len(r), 999),
+    ])
+    location = _choice(rng, _P_LOCATIONS, n)
+    cost_center = _choice(rng, _P_COST_CENTERS, n)
+    subscription_id = _choice(rng, _P_SUBSCRIPTIONS, n)
+    resource_group_name = _by_style(rng, n, [
+        lambda r: 'rg-' + env[r] + '-' + owner_lower[r],
+        lambda r: 'RG-' + env_upper[r] + '-' + owner_upper[r],
+        lambda r: 'resourcegroup-' + env[r] + '-' + word(len(r)),
+        lambda r: owner[r] + '-' + env[r] + '-rg',
+        lambda r: 'springfield-' + env[r] + '-resources',
+    ])
+    resource_id = ('/subscriptions/' + subscription_id + '/resourceGroups/' + resource_group_name
+                   + '/providers/' + resource_type + '/' + resource_name)
+    sku_index = _SKU_OFFSET[type_index] + (rng.random(n) * _SKU_COUNT[type_index]).astype(np.int64)
+    sku = _P_SKUS[sku_index]
+
+    created_back = rng.integers(30, 731, size=n)
+    modified_back = created_back - rng.integers(0, created_back + 1)
+
+    low, high = _COST_MIN[type_index].copy(), _COST_MAX[type_index].copy()
+    prod = _PROD_ENVS[env_index]
+    low[prod] *= 2
+    high[prod] *= 3
+    premium = _PREMIUM_SKUS[sku_index]
+    low[premium] *= 1.5
+    high[premium] *= 2
+    monthly_cost = np.round(rng.uniform(low, high), 2).astype(object)
+
+    security_group = np.where(rng.random(n) > 0.2,
+                              'nsg-' + env + '-' + number(n, 10), '').astype(object)
+    on_premises_server = np.where(rng.random(n) > 0.3,
+                                  'SPNF-' + _choice(rng, _P_WORDS_UPPER, n) + '-' + number(n, 999, _P_PADDED),
+                                  '').astype(object)
+    # 30% depend on one to three resources
+    dependency_count = np.where(rng.random(n) > 0.7, rng.integers(1, 4, size=n), 0)
+    dependencies = np.full(n, '', dtype=object)
+    for k in range(3):
+        dependency = 'res-' + word(n) + '-' + number(n, 999)
+        rows = dependency_count > k
+        dependencies[rows] += (',' if k else '') + dependency[rows]
+    tags = _by_style(rng, n, [
+        lambda r: 'Environment=' + env[r] + ',Owner=' + owner[r] + ',CostCenter=' + cost_center[r],
+        lambda r: 'env=' + env_lower[r] + ',owner=' + owner_lower[r] + ',department=nuclear',
+        lambda r: 'Environment:' + env[r] + ';Owner:' + owner[r] + ';Project:Migration',
+        lambda r: ('owner=' + owner[r] + ',env=' + env[r] + ',cost_center=' + cost_center[r]
+                   + ',backup=required'),
+        lambda r: np.full(len(r), '', dtype=object),
+    ])
+    # 20% of VMs and storage accounts are managed by another service
+    managed_by = np.full(n, '', dtype=object)
+    managed = np.flatnonzero(_MANAGED[type_index] & (rng.random(n) > 0.8))
+    managed_by[managed] = _by_style(rng, len(managed), [
+        lambda r: owner[managed[r]] + '-automation',
+        lambda r: np.full(len(r), 'Azure-Backup', dtype=object),
+        lambda r: np.full(len(r), 'azure-site-recovery', dtype=object),
+        lambda r: np.full(len(r), '', dtype=object),
+    ])
+    return {
+        'resource_name': resource_name,
+        'resource_type': resource_type,
+        'location': location,
+        'owner': owner,
+        'environment': env,
+        'cost_center': cost_center,
+        'created_date': _P_DATES[created_back],
+        'last_modified_date': _P_DATES[modified_back],
+        'tags': tags,
+        'subscription_id': subscription_id,
+        'resource_group_name': resource_group_name,
+        'resource_id': resource_id,
+        'sku': sku,
+        'status': _choice(rng, _P_STATUSES, n),
+        'provisioning_state': _choice(rng, _P_PROVISIONING, n),
+        'managed_by': managed_by,
+        'monthly_cost': monthly_cost,
+        'compliance_status': _choice(rng, _P_COMPLIANCE, n),
+        'backup_enabled': _choice(rng, _P_BOOLEANS, n),
+        'monitoring_enabled': _choice(rng, _P_BOOLEANS, n),
+        'security_group': security_group,
+        'public_ip_enabled': _choice(rng, _P_BOOLEANS, n),
+        'encryption_status': _choice(rng, _P_ENCRYPTION, n),
+        'identity_type': _choice(rng, _P_IDENTITY, n),
+        'migration_wave': _choice(rng, _P_WAVES, n),
+        'migration_status': _choice(rng, _P_MIGRATION, n),
+        'on_premises_server': on_premises_server,
+        'dependencies': dependencies,
+    }
+
+
+def iter_blocks(start: int, stop: int, seed: int = SEED) -> Iterator[Dict[str, np.ndarray]]:
+    """Columns of rows ``start`` to ``stop``, a block (or the part of one in range) at a time"""
+    if stop <= start:
+        return
+    for block in range(start // BLOCK_ROWS, -(-stop // BLOCK_ROWS)):
+        columns = generate_block(seed, block)
+        first = block * BLOCK_ROWS
+        low, high = max(start - first, 0), min(stop - first, BLOCK_ROWS)
+        if (low, high) != (0, BLOCK_ROWS):
+            columns = {name: values[low:high] for name, values in columns.items()}
+        yield columns
+
+
+def generate_rows(start: int, stop: int, seed: int = SEED) -> List[Dict[str, Any]]:
+    """Rows ``start`` to ``stop`` as dicts, like ``generation.generate_csv_data`` returns them"""
+    return [dict(zip(COLUMNS, row)) for columns in iter_blocks(start, stop, seed)
+            for row in zip(*(columns[name] for name in COLUMNS))]
+
+
+def csv_text(columns: Dict[str, np.ndarray]) -> str:
+    """CSV lines of a block, as ``csv.writer`` would write them, ending in ``LINE_TERMINATOR``
+
+    No pool value contains a quote or a line break, so only fields with a
+    comma need quoting, and only columns with a comma anywhere are checked.
+    """
+    fields = []
+    for name in COLUMNS:
+        values = columns[name]
+        if values.dtype != object or (len(values) and not isinstance(values[0], str)):
+            values = np.array([str(value) for value in values], dtype=object)
+        if ',' in '\n'.join(values):
+            quoted = np.fromiter((',' in value for value in values), dtype=bool, count=len(values))
+            values = values.copy()
+            values[quoted] = '"' + values[quoted] + '"'
+        fields.append(values.tolist())
+    return ''.join(line + LINE_TERMINATOR for line in map(','.join, zip(*fields)))
+
+
+def render_shard(start: int, stop: int, seed: int = SEED) -> Tuple[str, Counter, Counter]:
+    """(CSV text without header, owner counts, environment counts) of rows ``start`` to ``stop``"""
+    text = io.StringIO()
+    owners, environments = Counter(), Counter()
+    for columns in iter_blocks(start, stop, seed):
+        text.write(csv_text(columns))
+        owners.update(columns['owner'])
+        environments.update(env.lower() for env in columns['environment'])
+    return text.getvalue(), owners, environments
+
+
+def shards(start: int, stop: int, shard_rows: int = DEFAULT_SHARD_ROWS) -> List[Tuple[int, int]]:
+    """Row ranges of at most ``shard_rows`` rows, cut at block boundaries"""
+    shard_rows = max(BLOCK_ROWS, shard_rows // BLOCK_ROWS * BLOCK_ROWS)
+    bounds = [start] + list(range((start // shard_rows + 1) * shard_rows, stop, shard_rows)) + [stop]
+    return [(low, high) for low, high in zip(bounds, bounds[1:]) if high > low]
+
+
+def iter_shards(start: int, stop: int, seed: int = SEED, workers: Optional[int] = None,
+                shard_rows: int = DEFAULT_SHARD_ROWS) -> Iterator[Tuple[str, Counter, Counter]]:
+    """``render_shard`` of every shard, in row order, rendered on ``workers`` processes
+
+    With one worker the shards are rendered in this process.
+    """
+    workers = workers or os.cpu_count() or 1
+    ranges = shards(start, stop, shard_rows)
+    if workers == 1:
+        for low, high in ranges:
+            yield render_shard(low, high, seed)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = []
+        for low, high in ranges:
+            pending.append(executor.submit(render_shard, low, high, seed))
+            # Keep a couple of shards per worker queued; write the oldest meanwhile
+            if len(pending) >= 2 * workers:
+                yield pending.pop(0).result()
+        for future in pending:
+            yield future.result()
+
+
+def write_inventory(path: str, rows: int, seed: int = SEED, workers: Optional[int] = None,
+                    start: int = 0, shard_rows: int = DEFAULT_SHARD_ROWS) -> Dict[str, Counter]:
+    """Stream rows ``start`` to ``rows`` to ``path`` with a header; returns owner and environment counts"""
+    owners, environments = Counter(), Counter()
+    with open(path, 'w', newline='', encoding='utf-8') as csvfile:
+        csv.writer(csvfile, lineterminator=LINE_TERMINATOR).writerow(COLUMNS)
+        for text, shard_owners, shard_environments in iter_shards(start, rows, seed, workers, shard_rows):
+            csvfile.write(text)
+            owners.update(shard_owners)
+            environments.update(shard_environments)
+    return {'owners': owners, 'environments': environments}
+
+
+def parse_range(value: str) -> Tuple[int, int]:
+    start, _, stop = value.partition(':')
+    if not stop or int(start) >= int(stop) or int(start) < 0:
+        raise argparse.ArgumentTypeError(f"expected START:STOP with 0 <= START < STOP, got {value!r}")
+    return int(start), int(stop)
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Generate a Springfield inventory of any size")
+    parser.add_argument('rows', type=int, nargs='?', default=2500, help="rows in the inventory")
+    parser.add_argument('--output', default=OUTPUT_FILE, help="CSV file to write")
+    parser.add_argument('--seed', type=int, default=SEED)
+    parser.add_argument('--workers', type=int, default=None, help="processes (default: one per CPU)")
+    parser.add_argument('--shard-rows', type=int, default=DEFAULT_SHARD_ROWS, help="rows per process task")
+    parser.add_argument('--range', type=parse_range, default=None,
+                        help="only write rows START:STOP of the inventory (as a full run would)")
+    args = parser.parse_args(argv)
+    start, stop = args.range or (0, args.rows)
+    print(f"Generating rows {start:,} to {stop:,} of a {args.rows:,}-row inventory "
+          f"(seed {args.seed}) into {args.output}...")
+    counts = write_inventory(args.output, stop, args.seed, args.workers, start, args.shard_rows)
+    print(f"Homer's Resources: {counts['owners']['Homer']:,}")
+    print("Environment Distribution:")
+    for env, count in sorted(counts['environments'].items()):
+        print(f"  {env}: {count:,}")
+    print(f"File size: {os.path.getsize(args.output) / 2 ** 20:.1f} MiB")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
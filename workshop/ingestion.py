@@ -0,0 +1,105 @@
+"""Streaming CSV ingestion for bulk migration
+
+Reads ``springfield_azure_resources.csv``-shaped inventories in bounded
+chunks and turns each chunk into ``bulk_create_resources`` payloads, so
+memory use depends on the chunk size rather than on the size of the file.
+"""
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set
+import pandas as pd
+from azure.mgmt.resource import ResourceManagementClient
+from workshop.utilities import ProgressTracker, WorkshopUtilities
+
+# Inventory columns needed to build creation payloads
+PAYLOAD_COLUMNS = [
+    'resource_name', 'resource_type', 'resource_group_name',
+    'owner', 'environment', 'migration_wave'
+]
+DEFAULT_CHUNK_SIZE = 10_000
+
+
+def count_rows(path: str, block_size: int = 1 << 20) -> int:
+    """Count data rows without parsing them (header excluded)
+
+    Rows are counted by their line breaks, skipping the ones inside quoted
+    cells, which ``csv.writer`` emits for values holding a newline. Blank
+    lines are assumed absent, as in files written by ``csv.writer``.
+    """
+    lines = 0
+    quoted = False
+    last_block = b''
+    with open(path, 'rb') as csvfile:
+        for block in iter(lambda: csvfile.read(block_size), b''):
+            # Quotes alternate between opening and closing a quoted cell; an
+            # escaped quote ("") closes and reopens it around an empty part
+            parts = block.split(b'"')
+            lines += sum(part.count(b'\n') for part in parts[quoted::2])
+            quoted ^= (len(parts) - 1) % 2 == 1
+            last_block = block
+    # A final row without a trailing newline still counts
+    if last_block and not last_block.endswith(b'\n'):
+        lines += 1
+    return max(lines - 1, 0)
+
+
+def iter_chunks(path: str, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                columns: Optional[List[str]] = None) -> Iterator[pd.DataFrame]:
+    """Stream the inventory as DataFrames of at most ``chunk_size`` rows
+
+    Only ``columns`` are parsed, all as strings, with empty cells kept as ''.
+    """
+    yield from pd.read_csv(
+        path,
+        usecols=columns or PAYLOAD_COLUMNS,
+        dtype=str,
+        keep_default_na=False,
+        chunksize=chunk_size,
+    )
+
+
+def to_payloads(chunk: pd.DataFrame, location: str = 'uksouth') -> List[Dict[str, Any]]:
+    """Normalize an inventory chunk into bulk creation payloads"""
+    return [{
+        'name': name,
+        'resource_type': resource_type,
+        'resource_group': resource_group,
+        'location': location,  # Standardized location
+        'tags': {
+            'owner': owner,
+            'environment': environment,
+            'migration_wave': migration_wave
+        }
+    } for name, resource_type, resource_group, owner, environment, migration_wave in zip(
+        chunk['resource_name'], chunk['resource_type'], chunk['resource_group_name'],
+        chunk['owner'], chunk['environment'], chunk['migration_wave']
+    )]
+
+
+def iter_payload_chunks(path: str, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                        location: str = 'uksouth') -> Iterator[List[Dict[str, Any]]]:
+    """Stream the inventory as lists of bulk creation payloads"""
+    for chunk in iter_chunks(path, chunk_size):
+        yield to_payloads(chunk, location)
+
+
+def bulk_create_from_csv(client: ResourceManagementClient, path: str,
+                         chunk_size: int = DEFAULT_CHUNK_SIZE,
+                         progress_callback: Optional[Callable] = None,
+                         parallel: bool = False,
+                         max_workers: int = 16,
+                         location: str = 'uksouth') -> ProgressTracker:
+    """Stream an inventory file straight into bulk resource creation
+
+    One tracker covers the whole file; resource groups already created for
+    an earlier chunk are not checked again.
+    """
+    tracker = ProgressTracker(count_rows(path), progress_callback, client.simulation.clock)
+    ensured_groups: Set[str] = set()
+    for payloads in iter_payload_chunks(path, chunk_size, location):
+        WorkshopUtilities.bulk_create_resources(
+            client, payloads,
+            parallel=parallel,
+            max_workers=max_workers,
+            tracker=tracker,
+            ensured_groups=ensured_groups
+        )
+    return tracker
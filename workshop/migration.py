@@ -0,0 +1,391 @@
+"""Dependency-aware migration scheduling
+
+The inventory assigns each resource a ``migration_wave`` and lists the
+resources it depends on in a comma-separated ``dependencies`` column.
+``load_plan`` reads both into a ``MigrationPlan``: waves are normalized
+('wave1', 'WAVE 2' and 'Wave 3' become 1, 2 and 3) and the dependencies
+form a graph that is checked for cycles, dependencies on resources that
+are not in the inventory, and dependencies on resources of a later wave.
+
+``run_migration`` then migrates one wave after another. Within a wave
+every resource starts as soon as its dependencies (and its resource
+group) exist, on a pool of ``max_workers`` threads. A resource whose
+dependency failed or was skipped is skipped too, as is one the plan
+found a problem with, so nothing is attempted before the resources it
+needs are in place. The report compares each wave's critical path (the
+longest chain of dependent requests, as timed during the run) with how
+long the wave actually took.
+"""
+from concurrent.futures import FIRST_COMPLETED, wait
+from typing import Any, Dict, List, Optional, Set, Tuple
+import pandas as pd
+from azure.mgmt.resource import ResourceManagementClient
+from workshop.cleansing import normalize_migration_wave
+from workshop.ingestion import DEFAULT_CHUNK_SIZE, PAYLOAD_COLUMNS, iter_chunks, to_payloads
+from workshop.utilities import ProgressTracker, WorkshopUtilities
+
+DEFAULT_MAX_WORKERS = 32
+
+
+class MigrationPlanError(ValueError):
+    """The plan has cycles, missing dependencies or dependencies on later waves"""
+
+
+class DependencyError(Exception):
+    """A resource was skipped because a dependency could not be migrated"""
+
+
+def parse_dependencies(raw: str) -> List[str]:
+    """Resource names from a comma-separated ``dependencies`` cell"""
+    return [name.strip() for name in raw.split(',') if name.strip()] if raw else []
+
+
+class MigrationPlan:
+    """Resources by migration wave, with their dependency graph
+
+    ``missing`` maps resources to dependencies that are not in the plan,
+    ``wave_conflicts`` to dependencies planned for a later wave, and
+    ``cycles`` lists the groups of resources that depend on each other.
+    All of them are ``blocked``: ``run_migration`` skips them, and so
+    everything that depends on them, unless the plan was built with
+    ``ignore_missing``, which drops dependencies on unknown resources
+    instead. Resources without a wave go last; a name listed twice keeps
+    its first row and is reported in ``duplicates``.
+    """
+
+    def __init__(self, payloads: List[Dict[str, Any]], waves: List[Optional[int]],
+                 dependencies: List[List[str]], ignore_missing: bool = False):
+        self.payloads: Dict[str, Dict[str, Any]] = {}
+        self.waves: Dict[str, Optional[int]] = {}
+        self.dependencies: Dict[str, List[str]] = {}
+        self.duplicates: List[str] = []
+        for payload, wave, needs in zip(payloads, waves, dependencies):
+            name = payload['name']
+            if name in self.payloads:
+                self.duplicates.append(name)
+                continue
+            self.payloads[name] = payload
+            self.waves[name] = wave
+            self.dependencies[name] = list(dict.fromkeys(needs))
+        self.missing: Dict[str, List[str]] = {}
+        for name, needs in self.dependencies.items():
+            unknown = [need for need in needs if need not in self.payloads]
+            if unknown:
+                self.missing[name] = unknown
+                if ignore_missing:
+                    self.dependencies[name] = [need for need in needs if need in self.payloads]
+        self.dependents: Dict[str, List[str]] = {name: [] for name in self.payloads}
+        for name, needs in self.dependencies.items():
+            for need in needs:
+                if need in self.dependents:
+                    self.dependents[need].append(name)
+        self.wave_conflicts: Dict[str, List[str]] = {}
+        for name, needs in self.dependencies.items():
+            later = [need for need in needs
+                     if need in self.payloads and _wave_key(self.waves[need]) > _wave_key(self.waves[name])]
+            if later:
+                self.wave_conflicts[name] = later
+        self.cycles = _cycles(self.dependencies)
+        self.blocked: Set[str] = set(self.wave_conflicts).union(*self.cycles)
+        if not ignore_missing:
+            self.blocked.update(self.missing)
+
+    def wave_order(self) -> List[Optional[int]]:
+        """Waves in the order they migrate"""
+        return sorted(set(self.waves.values()), key=_wave_key)
+
+    def members(self, wave: Optional[int]) -> List[str]:
+        """Resources of ``wave``, in inventory order"""
+        return [name for name, member_wave in self.waves.items() if member_wave == wave]
+
+    def problems(self) -> List[str]:
+        """The plan's problems, described"""
+        found = [f"{name} depends on {', '.join(needs)}, not in the inventory"
+                 for name, needs in self.missing.items()]
+        found += [f"{name} (wave {self.waves[name]}) depends on {need} (wave {self.waves[need]})"
+                  for name, needs in self.wave_conflicts.items() for need in needs]
+        found += [f"dependency cycle: {' -> '.join(cycle + cycle[:1])}" for cycle in self.cycles]
+        found += [f"{name} is listed more than once" for name in self.duplicates]
+        return found
+
+    def validate(self) -> None:
+        """Raise ``MigrationPlanError`` if the plan has any problems"""
+        problems = self.problems()
+        if problems:
+            more = f" (and {len(problems) - 10} more)" if len(problems) > 10 else ""
+            raise MigrationPlanError("; ".join(problems[:10]) + more)
+
+    def __len__(self) -> int:
+        return len(self.payloads)
+
+
+def _wave_key(wave: Optional[int]) -> float:
+    return float('inf') if wave is None else wave
+
+
+def _cycles(dependencies: Dict[str, List[str]]) -> List[List[str]]:
+    """Strongly connected groups of resources (Tarjan's algorithm, without recursion)"""
+    index: Dict[str, int] = {}
+    lowlink: Dict[str, int] = {}
+    stack: List[str] = []
+    on_stack: Set[str] = set()
+    cycles = []
+    for root in dependencies:
+        if root in index:
+            continue
+        work = [(root, 0)]
+        while work:
+            name, position = work.pop()
+            if position == 0:
+                index[name] = lowlink[name] = len(index)
+                stack.append(name)
+                on_stack.add(name)
+            needs = [need for need in dependencies[name] if need in dependencies]
+            if position < len(needs):
+                work.append((name, position + 1))
+                need = needs[position]
+                if need not in index:
+                    work.append((need, 0))
+                elif need in on_stack:
+                    lowlink[name] = min(lowlink[name], index[need])
+                continue
+            if lowlink[name] == index[name]:
+                component = []
+                while True:
+                    member = stack.pop()
+                    on_stack.discard(member)
+                    component.append(member)
+                    if member == name:
+                        break
+                if len(component) > 1 or name in dependencies[name]:
+                    cycles.append(component[::-1])
+            if work:
+                parent = work[-1][0]
+                lowlink[parent] = min(lowlink[parent], lowlink[name])
+    return cycles
+
+
+def load_plan(path: str, chunk_size: int = DEFAULT_CHUNK_SIZE, location: str = 'uksouth',
+              ignore_missing: bool = False) -> MigrationPlan:
+    """Build the migration plan of an inventory file"""
+    payloads: List[Dict[str, Any]] = []
+    waves: List[Optional[int]] = []
+    dependencies: List[List[str]] = []
+    for chunk in iter_chunks(path, chunk_size, PAYLOAD_COLUMNS + ['dependencies']):
+        payloads.extend(to_payloads(chunk, location))
+        waves.extend(None if pd.isna(wave) else int(wave)
+                     for wave in normalize_migration_wave(chunk['migration_wave']))
+        dependencies.extend(parse_dependencies(raw) for raw in chunk['dependencies'])
+    return MigrationPlan(payloads, waves, dependencies, ignore_missing)
+
+
+class MigrationReport:
+    """Outcome of ``run_migration``
+
+    ``timings`` holds each attempted resource's (start, end) on the client's
+    simulation clock; ``waves`` has one entry per wave with its resource
+    count, ``elapsed`` time and ``critical_path``, the least time the wave
+    could have taken with unlimited workers and the same request latencies.
+    """
+
+    def __init__(self, plan: MigrationPlan, tracker: ProgressTracker):
+        self.plan = plan
+        self.tracker = tracker
+        self.succeeded: List[str] = []
+        self.failed: Dict[str, BaseException] = {}
+        self.skipped: Dict[str, str] = {}
+        self.timings: Dict[str, Tuple[float, float]] = {}
+        self.waves: List[Dict[str, Any]] = []
+
+    @property
+    def elapsed(self) -> float:
+        return sum(wave['elapsed'] for wave in self.waves)
+
+    @property
+    def critical_path(self) -> float:
+        return sum(wave['critical_path'] for wave in self.waves)
+
+    def summary(self) -> Dict[str, Any]:
+        """Counts, times and the share of the elapsed time the critical path accounts for"""
+        return {
+            'total_resources': len(self.plan),
+            'succeeded': len(self.succeeded),
+            'failed': len(self.failed),
+            'skipped': len(self.skipped),
+            'plan_problems': len(self.plan.problems()),
+            'errors_by_status': self.tracker.errors_by_status,
+            'elapsed_seconds': self.elapsed,
+            'critical_path_seconds': self.critical_path,
+            'efficiency': self.critical_path / self.elapsed if self.elapsed else 1.0,
+            'waves': [dict(wave) for wave in self.waves],
+        }
+
+
+def _timed(clock, func, *args) -> Tuple[float, float, Optional[Exception]]:
+    """(start, end, error) of calling ``func`` on ``clock``"""
+    started = clock.now()
+    try:
+        func(*args)
+        error = None
+    except Exception as e:
+        error = e
+    return started, clock.now(), error
+
+
+def _create_resource(client: ResourceManagementClient, payload: Dict[str, Any]) -> None:
+    client.resources.create_or_update(**WorkshopUtilities._creation_arguments(payload))
+
+
+class _WaveRun:
+    """Runs one wave of a plan, feeding the shared report"""
+
+    def __init__(self, client: ResourceManagementClient, plan: MigrationPlan, report: MigrationReport,
+                 groups: Dict[str, Any], executor):
+        self.client = client
+        self.plan = plan
+        self.report = report
+        # Resource group: True once it exists, False if it could not be
+        # created, or the resources waiting for it while it is created
+        self.groups = groups
+        self.executor = executor
+        self.clock = client.simulation.clock
+        self.status: Dict[str, str] = {}
+        self.waiting: Dict[str, int] = {}
+        self.pending: Dict[Any, Tuple[str, str]] = {}
+        self.finished: List[str] = []
+        self.group_times: Dict[str, Tuple[float, float]] = {}
+
+    def run(self, members: List[str], done: Dict[str, str]) -> float:
+        """Migrate ``members``, given the outcome of earlier waves; returns the critical path"""
+        in_wave = set(members)
+        for name in members:
+            if name in self.status:
+                continue
+            if name in self.plan.blocked:
+                self.skip(name, "the migration plan has a problem with it")
+                continue
+            unmet = [need for need in self.plan.dependencies[name] if done.get(need, 'pending') != 'succeeded']
+            failed = [need for need in unmet if need not in in_wave or self.status.get(need, 'pending') != 'pending']
+            if failed:
+                self.skip(name, f"dependency {failed[0]} was not migrated")
+            else:
+                self.waiting[name] = len(unmet)
+        for name in members:
+            if self.waiting.get(name) == 0 and name not in self.status:
+                self.start(name)
+        while self.pending:
+            finished, _ = wait(self.pending, return_when=FIRST_COMPLETED)
+            for future in finished:
+                kind, name = self.pending.pop(future)
+                started, ended, error = future.result()
+                if kind == 'group':
+                    self.group_done(name, started, ended, error)
+                else:
+                    self.resource_done(name, started, ended, error)
+        done.update(self.status)
+        return self.critical_path()
+
+    def start(self, name: str) -> None:
+        self.status[name] = 'pending'
+        rg_name = self.plan.payloads[name]['resource_group']
+        group = self.groups.get(rg_name)
+        if group is True:
+            self.submit('resource', name, _create_resource, self.client, self.plan.payloads[name])
+        elif group is False:
+            self.skip(name, f"resource group {rg_name} could not be created")
+        elif group is not None:
+            group.append(name)
+        else:
+            self.groups[rg_name] = [name]
+            self.submit('group', rg_name, WorkshopUtilities._ensure_resource_group, self.client, rg_name)
+
+    def submit(self, kind: str, name: str, func, *args) -> None:
+        self.pending[self.executor.submit(_timed, self.clock, func, *args)] = (kind, name)
+
+    def group_done(self, rg_name: str, started: float, ended: float, error: Optional[Exception]) -> None:
+        waiting, self.groups[rg_name] = self.groups[rg_name], error is None
+        self.group_times[rg_name] = (started, ended)
+        if error is not None:
+            print(f"Warning: Could not create resource group {rg_name}: {error}")
+        for name in waiting:
+            del self.status[name]
+            self.start(name)
+
+    def resource_done(self, name: str, started: float, ended: float, error: Optional[Exception]) -> None:
+        self.report.timings[name] = (started, ended)
+        self.finished.append(name)
+        if error is not None:
+            self.status[name] = 'failed'
+            self.report.failed[name] = error
+            self.report.tracker.update(False, error)
+            self.skip_dependents(name)
+            return
+        self.status[name] = 'succeeded'
+        self.report.succeeded.append(name)
+        self.report.tracker.update(True)
+        for dependent in self.plan.dependents[name]:
+            if dependent in self.waiting and dependent not in self.status:
+                self.waiting[dependent] -= 1
+                if self.waiting[dependent] == 0:
+                    self.start(dependent)
+
+    def skip(self, name: str, reason: str) -> None:
+        self.status[name] = 'skipped'
+        self.report.skipped[name] = reason
+        self.report.tracker.update(False, DependencyError(f"{name}: {reason}"))
+        self.skip_dependents(name)
+
+    def skip_dependents(self, name: str) -> None:
+        """Skip whatever in this wave was waiting for ``name``"""
+        stack = [name]
+        while stack:
+            for dependent in self.plan.dependents[stack.pop()]:
+                if dependent in self.waiting and dependent not in self.status:
+                    self.status[dependent] = 'skipped'
+                    self.report.skipped[dependent] = f"dependency {name} was not migrated"
+                    self.report.tracker.update(False, DependencyError(
+                        f"{dependent}: dependency {name} was not migrated"))
+                    stack.append(dependent)
+
+    def critical_path(self) -> float:
+        """Longest chain of group creation and dependent requests in this wave"""
+        chain: Dict[str, float] = {}
+        for name in self.finished:
+            started, ended = self.report.timings[name]
+            group = self.group_times.get(self.plan.payloads[name]['resource_group'])
+            before = [chain[need] for need in self.plan.dependencies[name] if need in chain]
+            if group is not None:
+                before.append(group[1] - group[0])
+            chain[name] = max(before, default=0.0) + ended - started
+        return max(chain.values(), default=0.0)
+
+
+def run_migration(client: ResourceManagementClient, plan: MigrationPlan,
+                  max_workers: int = DEFAULT_MAX_WORKERS,
+                  progress_callback=None, strict: bool = False) -> MigrationReport:
+    """Migrate ``plan`` wave by wave, each resource as soon as its dependencies are in place
+
+    With ``strict=True`` a plan with problems raises ``MigrationPlanError``
+    before anything is created; otherwise its blocked resources are skipped.
+    """
+    if max_workers < 1:
+        raise ValueError("max_workers must be at least 1")
+    if strict:
+        plan.validate()
+    tracker = ProgressTracker(len(plan), progress_callback, client.simulation.clock)
+    report = MigrationReport(plan, tracker)
+    groups: Dict[str, Any] = {}
+    done: Dict[str, str] = {}
+    for wave in plan.wave_order():
+        members = plan.members(wave)
+        started = client.simulation.clock.now()
+        with client.simulation.clock.executor(max_workers=max_workers,
+                                              thread_name_prefix="migration") as executor:
+            critical_path = _WaveRun(client, plan, report, groups, executor).run(members, done)
+        report.waves.append({
+            'wave': wave,
+            'resources': len(members),
+            'elapsed': client.simulation.clock.now() - started,
+            'critical_path': critical_path,
+        })
+    return report
@@ -0,0 +1,104 @@
+"""Parsing of the inventory's ``tags`` strings
+
+The CSV mixes ``Environment=dev,Owner=Homer,...``, ``Environment:dev;Owner:Homer;...``
+and empty cells, with inconsistent key casing. ``parse_tags`` turns any of
+them into a dict with canonical snake_case keys. Parsed strings are cached,
+since a few thousand distinct strings repeat across millions of rows, and
+the Series helpers parse each distinct value only once.
+"""
+import re
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+import pandas as pd
+
+TAG_CACHE_SIZE = 8192
+
+# Canonical key for each known spelling, keyed by the lower-cased key without separators
+TAG_KEY_ALIASES = {
+    'env': 'environment',
+    'environment': 'environment',
+    'owner': 'owner',
+    'costcenter': 'cost_center',
+    'department': 'department',
+    'dept': 'department',
+    'project': 'project',
+    'backup': 'backup',
+    'migrationwave': 'migration_wave',
+    'wave': 'migration_wave',
+}
+
+# One ``key=value`` or ``key:value`` pair, terminated by ``,``, ``;`` or the end
+_TAG_PAIR = re.compile(r'\s*([^=:;,]+?)\s*[=:]\s*([^;,]*?)\s*(?:[;,]|$)')
+_CAMEL_BOUNDARY = re.compile(r'(?<=[a-z0-9])(?=[A-Z])')
+_KEY_SEPARATORS = re.compile(r'[\s\-_]+')
+
+
+@lru_cache(maxsize=256)
+def canonical_tag_key(key: str) -> str:
+    """Canonical name for a tag key, e.g. ``Env`` -> ``environment``, ``CostCenter`` -> ``cost_center``"""
+    alias = TAG_KEY_ALIASES.get(_KEY_SEPARATORS.sub('', key).lower())
+    if alias is not None:
+        return alias
+    return _KEY_SEPARATORS.sub('_', _CAMEL_BOUNDARY.sub('_', key.strip())).lower()
+
+
+@lru_cache(maxsize=TAG_CACHE_SIZE)
+def _parse_pairs(raw: str) -> Tuple[Tuple[str, str], ...]:
+    # Cached as an immutable tuple so callers can never alias each other's dicts
+    pairs = {}
+    for key, value in _TAG_PAIR.findall(raw):
+        pairs[canonical_tag_key(key)] = value
+    return tuple(pairs.items())
+
+
+def _is_missing(raw) -> bool:
+    return raw is None or (isinstance(raw, float) and raw != raw)
+
+
+def parse_tags(raw: Optional[str]) -> Dict[str, str]:
+    """Parse a tag string into a new dict with canonical keys; empty or missing gives ``{}``"""
+    if _is_missing(raw):
+        return {}
+    return dict(_parse_pairs(str(raw)))
+
+
+def tag_cache_info():
+    """Hit/miss statistics of the parsed string cache"""
+    return _parse_pairs.cache_info()
+
+
+def clear_tag_cache() -> None:
+    """Empty the parsed string cache"""
+    _parse_pairs.cache_clear()
+
+
+def parse_tag_series(values: pd.Series) -> pd.Series:
+    """Parse a whole column into a Series of tag dicts (one new dict per row)
+
+    Every distinct string is parsed once; rows then only copy its pairs.
+    """
+    codes, uniques = pd.factorize(values, use_na_sentinel=True)
+    parsed = [_parse_pairs(str(raw)) for raw in uniques] + [()]
+    return pd.Series([dict(parsed[code]) for code in codes],
+                     index=values.index, name=values.name, dtype=object)
+
+
+def expand_tags(values: pd.Series) -> pd.DataFrame:
+    """Parse a whole column into one categorical column per canonical tag key
+
+    Rows without a tag hold NaN. Only the distinct strings are parsed; the
+    per-row work is a categorical ``take``.
+    """
+    codes, uniques = pd.factorize(values, use_na_sentinel=True)
+    table = pd.DataFrame.from_records(
+        [dict(_parse_pairs(str(raw))) for raw in uniques],
+        index=pd.RangeIndex(len(uniques)),
+    )
+    expanded = {}
+    for key in table.columns:
+        column = pd.Categorical(table[key])
+        # Code -1 (missing string) falls through to NaN
+        column_codes = column.codes[codes]
+        column_codes[codes == -1] = -1
+        expanded[key] = pd.Categorical.from_codes(column_codes, categories=column.categories)
+    return pd.DataFrame(expanded, index=values.index)
@@ -1,33 +1,172 @@
 """Workshop utilities for Springfield Nuclear Power Plant migration"""
+import itertools
+import math
+import queue
+import threading
 import time
 from datetime import datetime, timezone
-from typing import Dict, List, Any, Optional, Callable
+from typing import Dict, List, Any, Optional, Callable, Set, Tuple, Union
 from collections import defaultdict
 from azure.mgmt.resource import ResourceManagementClient
+from azure.core.instrumentation import LatencyHistogram, error_status
 from azure.core.paging import ItemPaged
+from azure.core.simulation import RealClock
 
+# Compliance business rules
+VALID_LOCATIONS = ['uksouth']
+VALID_OWNERS = ['Homer', 'Marge', 'Lisa']
+VALID_ENVIRONMENTS = ['dev', 'prod', 'test']
 
-class ProgressTracker:
-    """Track progress of bulk operations"""
-    def __init__(self, total_items: int, callback: Optional[Callable] = None):
-        self.total = total_items
+# Operations per batch request when the client supports batching
+BATCH_SIZE = 50
+
+
+class _Stripe:
+    """Counters updated by the threads assigned to one stripe of a ProgressTracker"""
+    __slots__ = ('lock', 'completed', 'failed', 'by_status', 'by_class', 'latency')
+    
+    def __init__(self):
+        self.lock = threading.Lock()
         self.completed = 0
         self.failed = 0
-        self.errors = []
+        self.by_status: Dict[Any, int] = {}
+        self.by_class: Dict[str, int] = {}
+        self.latency = LatencyHistogram()
+
+
+class ProgressTracker:
+    """Track progress of bulk operations
+    
+    Safe to update from several threads: each thread counts into one of
+    ``STRIPES`` lock stripes, which are summed when read. ``callback`` is
+    called at most once every ``callback_interval_ms`` of real time (and
+    once more for the last item), from the thread whose update crossed the
+    interval.
+    
+    Failures are counted by status code (or class name, for errors without
+    one) and by error class; only the first ``max_error_samples`` messages
+    are kept in ``errors``. Plain message strings count as ``'Error'``.
+    ``ops_per_second`` is a moving average over about ``EWMA_WINDOW``
+    seconds, and ``record_latency`` (or ``measure``) collects the request
+    latencies behind ``latency_percentiles()``.
+    
+    Times are read from ``clock`` (real time by default); pass the client's
+    ``simulation.clock`` to report simulated time.
+    """
+    STRIPES = 16
+    EWMA_WINDOW = 5.0
+    
+    def __init__(self, total_items: int, callback: Optional[Callable] = None, clock=None,
+                 callback_interval_ms: float = 100, max_error_samples: int = 100):
+        self.total = total_items
+        self.errors: List[str] = []
         self.callback = callback
-        self.start_time = time.time()
+        self.callback_interval = callback_interval_ms / 1000
+        self.max_error_samples = max_error_samples
+        self.clock = RealClock() if clock is None else clock
+        self.start_time = self.clock.now()
+        self._stripes = [_Stripe() for _ in range(self.STRIPES)]
+        self._local = threading.local()
+        # next() on itertools.count is atomic, so neither needs a lock
+        self._next_stripe = itertools.count()
+        self._processed = itertools.count(1)
+        self._errors_lock = threading.Lock()
+        self._tick_lock = threading.Lock()
+        self._next_tick = time.monotonic() + self.callback_interval
+        self._last_tick = (self.start_time, 0)
+        self._rate: Optional[float] = None
         
-    def update(self, success: bool = True, error: Optional[str] = None):
+    def update(self, success: bool = True, error: Optional[Union[str, BaseException]] = None):
         """Update progress"""
-        if success:
-            self.completed += 1
-        else:
-            self.failed += 1
-            if error:
-                self.errors.append(error)
-        
-        if self.callback:
-            self.callback(self)
+        stripe = self._stripe()
+        with stripe.lock:
+            if success:
+                stripe.completed += 1
+            else:
+                stripe.failed += 1
+                if error is not None:
+                    status, error_class = (('Error', 'Error') if isinstance(error, str)
+                                           else (error_status(error), type(error).__name__))
+                    stripe.by_status[status] = stripe.by_status.get(status, 0) + 1
+                    stripe.by_class[error_class] = stripe.by_class.get(error_class, 0) + 1
+        if error is not None and not success and len(self.errors) < self.max_error_samples:
+            with self._errors_lock:
+                if len(self.errors) < self.max_error_samples:
+                    self.errors.append(str(error))
+        processed = next(self._processed)
+        if processed >= self.total or time.monotonic() >= self._next_tick:
+            self._tick(processed >= self.total)
+    
+    def record_latency(self, seconds: float) -> None:
+        """Record the latency of one request"""
+        stripe = self._stripe()
+        with stripe.lock:
+            stripe.latency.record(seconds)
+    
+    def measure(self, func: Callable, *args, **kwargs):
+        """Call ``func``, recording its latency"""
+        started = self.clock.now()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            self.record_latency(self.clock.now() - started)
+    
+    def _stripe(self) -> _Stripe:
+        """The calling thread's stripe"""
+        stripe = getattr(self._local, 'stripe', None)
+        if stripe is None:
+            stripe = self._local.stripe = self._stripes[next(self._next_stripe) % self.STRIPES]
+        return stripe
+    
+    def _tick(self, last: bool) -> None:
+        """Update the moving average and call the callback, unless another thread already is"""
+        if not self._tick_lock.acquire(blocking=not last):
+            return
+        try:
+            if time.monotonic() < self._next_tick and not last:
+                return
+            self._next_tick = time.monotonic() + self.callback_interval
+            now = self.clock.now()
+            last_time, last_processed = self._last_tick
+            processed = self.completed + self.failed
+            if now > last_time:
+                rate = (processed - last_processed) / (now - last_time)
+                weight = 1 - math.exp(-(now - last_time) / self.EWMA_WINDOW)
+                self._rate = rate if self._rate is None else self._rate + weight * (rate - self._rate)
+                self._last_tick = (now, processed)
+            if self.callback:
+                self.callback(self)
+        finally:
+            self._tick_lock.release()
+    
+    def _sum(self, field: str) -> int:
+        return sum(getattr(stripe, field) for stripe in self._stripes)
+    
+    def _merged(self, field: str) -> Dict[Any, int]:
+        merged: Dict[Any, int] = {}
+        for stripe in self._stripes:
+            with stripe.lock:
+                for key, count in getattr(stripe, field).items():
+                    merged[key] = merged.get(key, 0) + count
+        return merged
+    
+    @property
+    def completed(self) -> int:
+        return self._sum('completed')
+    
+    @property
+    def failed(self) -> int:
+        return self._sum('failed')
+    
+    @property
+    def errors_by_status(self) -> Dict[Any, int]:
+        """Failures per HTTP status code (or class name, for errors without one)"""
+        return self._merged('by_status')
+    
+    @property
+    def errors_by_class(self) -> Dict[str, int]:
+        """Failures per error class"""
+        return self._merged('by_class')
     
     @property
     def percentage(self) -> float:
@@ -38,7 +177,32 @@ class ProgressTracker:
     @property
     def elapsed_time(self) -> float:
         """Get elapsed time in seconds"""
-        return time.time() - self.start_time
+        return self.clock.now() - self.start_time
+    
+    @property
+    def ops_per_second(self) -> float:
+        """Items processed per second, averaged over the last few seconds"""
+        if self._rate is not None:
+            return self._rate
+        elapsed = self.elapsed_time
+        return (self.completed + self.failed) / elapsed if elapsed > 0 else 0.0
+    
+    @property
+    def eta(self) -> Optional[float]:
+        """Estimated seconds until every item is processed (None before any progress)"""
+        remaining = self.total - self.completed - self.failed
+        if remaining <= 0:
+            return 0.0
+        rate = self.ops_per_second
+        return remaining / rate if rate > 0 else None
+    
+    def latency_percentiles(self) -> Dict[str, float]:
+        """count, mean, p50, p95, p99 and max of the recorded latencies, in seconds"""
+        merged = LatencyHistogram()
+        for stripe in self._stripes:
+            with stripe.lock:
+                merged.merge(stripe.latency)
+        return merged.summary()
 
 
 class WorkshopUtilities:
@@ -47,60 +211,244 @@ class WorkshopUtilities:
     @staticmethod
     def bulk_create_resources(client: ResourceManagementClient, 
                             resources_data: List[Dict[str, Any]],
-                            progress_callback: Optional[Callable] = None) -> ProgressTracker:
-        """Bulk create resources with progress tracking"""
+                            progress_callback: Optional[Callable] = None,
+                            parallel: bool = False,
+                            max_workers: int = 16,
+                            tracker: Optional[ProgressTracker] = None,
+                            ensured_groups: Optional[Set[str]] = None) -> ProgressTracker:
+        """Bulk create resources with progress tracking
+        
+        With ``parallel=True`` resource groups are created concurrently on a
+        pool of ``max_workers`` threads and each group's resources are
+        submitted as soon as the group exists. Progress is still reported on
+        the calling thread.
+        
+        Callers feeding several chunks (see ``workshop.ingestion``) can pass
+        one ``tracker`` to accumulate into, and an ``ensured_groups`` set of
+        resource groups known to exist; groups created here are added to it.
+        """
+        if tracker is None:
+            tracker = ProgressTracker(len(resources_data), progress_callback, client.simulation.clock)
+        if ensured_groups is None:
+            ensured_groups = set()
+        if parallel:
+            return WorkshopUtilities._bulk_create_resources_parallel(
+                client, resources_data, tracker, ensured_groups, max_workers
+            )
         # First, create all unique resource groups
-        resource_groups = set(r['resource_group'] for r in resources_data)
+        resource_groups = set(r['resource_group'] for r in resources_data) - ensured_groups
         for rg_name in resource_groups:
             try:
-                if not client.resource_groups.check_existence(rg_name):
-                    client.resource_groups.create_or_update(
-                        rg_name,
-                        {"location": "uksouth", "tags": {"created_by": "bulk_migration"}}
-                    )
+                WorkshopUtilities._ensure_resource_group(client, rg_name)
+                ensured_groups.add(rg_name)
             except Exception as e:
                 print(f"Warning: Could not create resource group {rg_name}: {e}")
-        # Now create resources
-        tracker = ProgressTracker(len(resources_data), progress_callback)
-        for i, resource_data in enumerate(resources_data):
-            try:
-                # Parse resource type safely
-                if '/' in resource_data['resource_type']:
-                    provider_namespace, resource_type = resource_data['resource_type'].split('/', 1)
+        # Now create resources, a batch request at a time when the client supports it
+        start = 0
+        while start < len(resources_data):
+            chunk_size = WorkshopUtilities._chunk_size(client, client.resources, 'batch_create_or_update')
+            chunk = resources_data[start:start + chunk_size]
+            start += len(chunk)
+            for error in tracker.measure(WorkshopUtilities._create_resources, client, chunk):
+                tracker.update(error is None, error)
+            # Batch delay every 50 resources, unless a rate limiter paces the client
+            if start % 50 == 0 and not WorkshopUtilities._is_rate_limited(client):
+                client.simulation.clock.sleep(0.5)
+        return tracker
+    
+    @staticmethod
+    def _bulk_create_resources_parallel(client: ResourceManagementClient,
+                                        resources_data: List[Dict[str, Any]],
+                                        tracker: ProgressTracker,
+                                        ensured_groups: Set[str],
+                                        max_workers: int) -> ProgressTracker:
+        """Thread pool implementation of bulk_create_resources"""
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        resources_by_group: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        for resource_data in resources_data:
+            resources_by_group[resource_data['resource_group']].append(resource_data)
+        
+        with client.simulation.clock.executor(max_workers=max_workers,
+                                              thread_name_prefix="bulk-create") as executor:
+            pending = {}
+            # Futures are queued as they finish, so each completion is handled
+            # in O(1) however many chunks are still in flight
+            finished = queue.Queue()
+            
+            def submit(rg_name: Optional[str], fn: Callable, *args) -> None:
+                future = executor.submit(fn, *args)
+                pending[future] = rg_name
+                future.add_done_callback(finished.put)
+            
+            def fan_out(rg_name: str) -> None:
+                group_resources = resources_by_group[rg_name]
+                chunk_size = WorkshopUtilities._chunk_size(client, client.resources, 'batch_create_or_update')
+                for start in range(0, len(group_resources), chunk_size):
+                    submit(None, tracker.measure, WorkshopUtilities._create_resources, client,
+                           group_resources[start:start + chunk_size])
+            
+            for rg_name in resources_by_group:
+                if rg_name in ensured_groups:
+                    fan_out(rg_name)
                 else:
-                    provider_namespace = 'Microsoft.Resources'
-                    resource_type = resource_data['resource_type']
-                # Create resource
-                client.resources.create_or_update(
-                    resource_group_name=resource_data['resource_group'],
-                    resource_provider_namespace=provider_namespace,
-                    parent_resource_path='',
-                    resource_type=resource_type,
-                    resource_name=resource_data['name'],
-                    parameters={
-                        'location': resource_data['location'],
-                        'tags': resource_data.get('tags', {}),
-                        'properties': resource_data.get('properties', {})
-                    }
-                )
-                tracker.update(True)
-            except Exception as e:
-                tracker.update(False, str(e))
-            # Batch delay every 50 resources
-            if (i + 1) % 50 == 0:
-                time.sleep(0.5)
+                    submit(rg_name, WorkshopUtilities._ensure_resource_group, client, rg_name)
+            while pending:
+                future = finished.get()
+                rg_name = pending.pop(future)
+                if rg_name is None:
+                    for error in future.result():
+                        tracker.update(error is None, error)
+                    continue
+                # A group finished: fan out its resources. If the group
+                # could not be created they fail like they do sequentially.
+                if future.exception() is not None:
+                    print(f"Warning: Could not create resource group {rg_name}: {future.exception()}")
+                else:
+                    ensured_groups.add(rg_name)
+                fan_out(rg_name)
         return tracker
     
     @staticmethod
-    def find_resources_by_owner(client: ResourceManagementClient, owner: str) -> List[Any]:
-        """Find all resources owned by a specific user"""
-        owned_resources = []
+    def _is_rate_limited(client: ResourceManagementClient) -> bool:
+        """Whether the client paces its own requests"""
+        retry_policy = getattr(client, 'retry_policy', None)
+        return retry_policy is not None and retry_policy.rate_limiter is not None
+    
+    @staticmethod
+    def _chunk_size(client: ResourceManagementClient, operations, batch_method: str) -> int:
+        """Items per request: a full batch if the operation group supports batching
         
-        for resource in client.resources.list():
-            if resource.tags and resource.tags.get('owner', '').lower() == owner.lower():
-                owned_resources.append(resource)
+        A rate-limited client sends at most a second's worth of items (at the
+        limiter's current rate) per batch, as a larger batch would burst past
+        the service's write limit however it is paced.
+        """
+        if not callable(getattr(operations, batch_method, None)):
+            return 1
+        if WorkshopUtilities._is_rate_limited(client):
+            return max(1, min(BATCH_SIZE, int(client.retry_policy.rate_limiter.rate)))
+        return BATCH_SIZE
+    
+    @staticmethod
+    def _ensure_resource_group(client: ResourceManagementClient, rg_name: str) -> None:
+        """Create a resource group for a migration if it does not exist yet"""
+        if not client.resource_groups.check_existence(rg_name):
+            client.resource_groups.create_or_update(
+                rg_name,
+                {"location": "uksouth", "tags": {"created_by": "bulk_migration"}}
+            )
+    
+    @staticmethod
+    def _create_resources(client: ResourceManagementClient,
+                          chunk: List[Dict[str, Any]]) -> List[Optional[Exception]]:
+        """Create a chunk of resources, returning the error (or None) per item"""
+        operations = [WorkshopUtilities._creation_arguments(r) for r in chunk]
+        if callable(getattr(client.resources, 'batch_create_or_update', None)):
+            return WorkshopUtilities._run_batch(client, client.resources.batch_create_or_update,
+                                                operations)
+        return WorkshopUtilities._run_each(client.resources.create_or_update, operations)
+    
+    @staticmethod
+    def _update_tags(client: ResourceManagementClient,
+                     operations: List[Dict[str, Any]]) -> List[Optional[Exception]]:
+        """Apply a chunk of tag updates, returning the error (or None) per item"""
+        if callable(getattr(client.tags, 'batch_update_at_scope', None)):
+            return WorkshopUtilities._run_batch(client, client.tags.batch_update_at_scope,
+                                                operations)
+        return WorkshopUtilities._run_each(client.tags.update_at_scope, operations)
+    
+    @staticmethod
+    def _run_each(method: Callable, operations: List[Dict[str, Any]]) -> List[Optional[Exception]]:
+        """Issue one request per operation"""
+        errors: List[Optional[Exception]] = []
+        for operation in operations:
+            try:
+                method(**operation)
+                errors.append(None)
+            except Exception as e:
+                errors.append(e)
+        return errors
+    
+    @staticmethod
+    def _run_batch(client: ResourceManagementClient, batch_method: Callable,
+                   operations: List[Dict[str, Any]]) -> List[Optional[Exception]]:
+        """Send operations as one batch, resubmitting retryable item failures
+        
+        Item failures are retried under the client's retry policy, if any,
+        whose rate limiter takes a token for and learns from every item; a
+        failure of the batch request itself is reported for every item.
+        """
+        errors: List[Optional[Exception]] = [None] * len(operations)
+        pending = list(range(len(operations)))
+        attempt = 0
+        while pending:
+            try:
+                results = batch_method([operations[i] for i in pending])
+            except Exception as e:
+                for i in pending:
+                    errors[i] = e
+                break
+            pending, backoff = WorkshopUtilities._batch_retries(client, pending, results, errors, attempt)
+            if pending:
+                client.simulation.clock.sleep(backoff)
+            attempt += 1
+        return errors
+    
+    @staticmethod
+    def _batch_retries(client: ResourceManagementClient, pending: List[int], results: List[Any],
+                       errors: List[Optional[Exception]], attempt: int) -> Tuple[List[int], float]:
+        """Record a batch's item errors; return the items to resubmit and the backoff before it
         
-        return owned_resources
+        ``pending`` are the operation indices the batch was sent with, in
+        order. An item is retried when the client's retry policy, if any,
+        has retries left and deems its error retryable; the backoff is the
+        longest any of them asks for.
+        """
+        retry_policy = getattr(client, 'retry_policy', None)
+        retry = []
+        for i, result in zip(pending, results):
+            errors[i] = result.error
+            if (result.error is not None and retry_policy is not None
+                    and attempt < retry_policy.total_retries
+                    and retry_policy.is_retryable(result.error)):
+                retry.append(i)
+        if not retry:
+            return retry, 0.0
+        return retry, max(retry_policy.get_backoff_time(attempt, errors[i], client.simulation) for i in retry)
+    
+    @staticmethod
+    def _creation_arguments(resource_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Map a bulk creation payload onto resources.create_or_update arguments"""
+        # Parse resource type safely
+        if '/' in resource_data['resource_type']:
+            provider_namespace, resource_type = resource_data['resource_type'].split('/', 1)
+        else:
+            provider_namespace = 'Microsoft.Resources'
+            resource_type = resource_data['resource_type']
+        return {
+            'resource_group_name': resource_data['resource_group'],
+            'resource_provider_namespace': provider_namespace,
+            'parent_resource_path': '',
+            'resource_type': resource_type,
+            'resource_name': resource_data['name'],
+            'parameters': {
+                'location': resource_data['location'],
+                'tags': resource_data.get('tags', {}),
+                'properties': resource_data.get('properties', {})
+            }
+        }
+    
+    @staticmethod
+    def find_resources_by_owner(client: ResourceManagementClient, owner: str) -> List[Any]:
+        """Find all resources owned by a specific user"""
+        # Served from the client's tag index (case-insensitive on the value)
+        return list(client.resources.list(filter=WorkshopUtilities._owner_filter(owner)))
+    
+    @staticmethod
+    def _owner_filter(owner: str) -> str:
+        """OData filter selecting resources by their owner tag"""
+        escaped_owner = owner.replace("'", "''")
+        return f"tagName eq 'owner' and tagValue eq '{escaped_owner}'"
     
     @staticmethod
     def transfer_ownership(client: ResourceManagementClient, 
@@ -110,42 +458,71 @@ class WorkshopUtilities:
         """Transfer ownership of all resources"""
         # Find resources to transfer
         resources_to_transfer = WorkshopUtilities.find_resources_by_owner(client, from_owner)
-        tracker = ProgressTracker(len(resources_to_transfer), progress_callback)
+        tracker = ProgressTracker(len(resources_to_transfer), progress_callback, client.simulation.clock)
         transferred_resources = []
-        for resource in resources_to_transfer:
-            try:
-                # Update tags directly on the resource object
-                if not resource.tags:
-                    resource.tags = {}
-                resource.tags['owner'] = to_owner
-                resource.tags['previous_owner'] = from_owner
-                resource.tags['ownership_transferred'] = datetime.now(timezone.utc).isoformat()
-                # Use the tags operation to persist the change
-                client.tags.create_or_update_at_scope(
-                    scope=resource.id,
-                    parameters={
-                        'properties': {
-                            'tags': resource.tags
-                        }
-                    }
-                )
-                transferred_resources.append(resource)
-                tracker.update(True)
-            except Exception as e:
-                tracker.update(False, str(e))
+        chunk_size = WorkshopUtilities._chunk_size(client, client.tags, 'batch_update_at_scope')
+        for start in range(0, len(resources_to_transfer), chunk_size):
+            chunk = resources_to_transfer[start:start + chunk_size]
+            # Patch only the ownership tags; the stored tags are never touched directly
+            operations = [{
+                'scope': resource.id,
+                'parameters': WorkshopUtilities._transfer_parameters(from_owner, to_owner)
+            } for resource in chunk]
+            errors = tracker.measure(WorkshopUtilities._update_tags, client, operations)
+            for resource, error in zip(chunk, errors):
+                if error is None:
+                    transferred_resources.append(resource)
+                    tracker.update(True)
+                else:
+                    tracker.update(False, error)
+        return WorkshopUtilities._transfer_result(resources_to_transfer, transferred_resources, tracker)
+    
+    @staticmethod
+    def _transfer_parameters(from_owner: str, to_owner: str) -> Dict[str, Any]:
+        """Tag patch (Merge) that hands a resource over to a new owner"""
+        return {
+            'operation': 'Merge',
+            'properties': {
+                'tags': {
+                    'owner': to_owner,
+                    'previous_owner': from_owner,
+                    'ownership_transferred': datetime.now(timezone.utc).isoformat()
+                }
+            }
+        }
+    
+    @staticmethod
+    def _transfer_result(resources_to_transfer: List[Any], transferred_resources: List[Any],
+                         tracker: ProgressTracker) -> Dict[str, Any]:
+        """Summarize an ownership transfer"""
         return {
             'total_resources': len(resources_to_transfer),
             'successfully_transferred': tracker.completed,
             'failed_transfers': tracker.failed,
             'transferred_resources': transferred_resources,
             'errors': tracker.errors,
+            'errors_by_status': tracker.errors_by_status,
             'duration_seconds': tracker.elapsed_time
         }
     
     @staticmethod
     def generate_compliance_report(client: ResourceManagementClient) -> Dict[str, Any]:
-        """Generate compliance report for all resources"""
-        report = {
+        """Generate compliance report for all resources
+        
+        A client with a columnar store is reported on from its code arrays
+        instead of by listing every resource.
+        """
+        if client.columnar_store is not None:
+            return WorkshopUtilities._columnar_compliance_report(client.columnar_store)
+        report = WorkshopUtilities._new_compliance_report()
+        for resource in client.resources.list():
+            WorkshopUtilities._add_to_compliance_report(report, resource)
+        return WorkshopUtilities._finish_compliance_report(report)
+    
+    @staticmethod
+    def _new_compliance_report() -> Dict[str, Any]:
+        """Empty compliance report accumulator"""
+        return {
             'timestamp': datetime.now(timezone.utc).isoformat(),
             'total_resources': 0,
             'resources_by_owner': defaultdict(int),
@@ -155,50 +532,124 @@ class WorkshopUtilities:
             'untagged_resources': [],
             'non_compliant_resources': []
         }
+    
+    @staticmethod
+    def _add_to_compliance_report(report: Dict[str, Any], resource) -> None:
+        """Count a resource and record its compliance issues"""
+        report['total_resources'] += 1
         
-        # Business rules
-        valid_locations = ['uksouth']
-        valid_owners = ['Homer', 'Marge', 'Lisa']
-        valid_environments = ['dev', 'prod', 'test']
+        # Analyze tags
+        tags = resource.tags or {}
+        owner = tags.get('owner', 'unassigned')
+        environment = tags.get('environment', 'untagged')
         
-        for resource in client.resources.list():
-            report['total_resources'] += 1
-            
-            # Analyze tags
-            tags = resource.tags or {}
-            owner = tags.get('owner', 'unassigned')
-            environment = tags.get('environment', 'untagged')
-            
-            report['resources_by_owner'][owner] += 1
-            report['resources_by_environment'][environment] += 1
-            report['resources_by_location'][resource.location] += 1
-            report['resources_by_type'][resource.type] += 1
-            
-            # Check compliance
-            compliance_issues = []
-            
-            if not tags:
-                report['untagged_resources'].append(resource.name)
-                compliance_issues.append('No tags')
-            
-            if resource.location not in valid_locations:
-                compliance_issues.append(f'Invalid location: {resource.location}')
-            
-            if owner not in valid_owners and owner != 'unassigned':
-                compliance_issues.append(f'Unauthorized owner: {owner}')
-            
-            if environment not in valid_environments and environment != 'untagged':
-                compliance_issues.append(f'Invalid environment: {environment}')
-            
-            if compliance_issues:
-                report['non_compliant_resources'].append({
-                    'resource_id': resource.id,
-                    'resource_name': resource.name,
-                    'resource_type': resource.type,
-                    'issues': compliance_issues
-                })
-        
-        # Convert defaultdicts to regular dicts
+        report['resources_by_owner'][owner] += 1
+        report['resources_by_environment'][environment] += 1
+        report['resources_by_location'][resource.location] += 1
+        report['resources_by_type'][resource.type] += 1
+        
+        if not tags:
+            report['untagged_resources'].append(resource.name)
+        
+        compliance_issues = WorkshopUtilities._compliance_issues(resource)
+        if compliance_issues:
+            report['non_compliant_resources'].append({
+                'resource_id': resource.id,
+                'resource_name': resource.name,
+                'resource_type': resource.type,
+                'issues': compliance_issues
+            })
+    
+    @staticmethod
+    def _columnar_compliance_report(store) -> Dict[str, Any]:
+        """Compliance report computed with bincounts over a ColumnarResourceStore
+        
+        Rows are grouped by their (tagged, location, owner, environment)
+        codes, so the business rules run once per distinct combination and
+        only rows with issues are visited individually.
+        """
+        import numpy as np
+        report = WorkshopUtilities._new_compliance_report()
+        rows = store.rows()
+        report['total_resources'] = len(rows)
+        for key, column, missing in [('resources_by_owner', 'owner', 'unassigned'),
+                                     ('resources_by_environment', 'environment', 'untagged'),
+                                     ('resources_by_location', 'location', None),
+                                     ('resources_by_type', 'type', None)]:
+            for value, count in store.value_counts(column).items():
+                report[key][missing if value is None else value] += count
+        
+        tagged = store.is_tagged(rows)
+        report['untagged_resources'] = store.names(rows[~tagged])
+        
+        columns = ['location', 'owner', 'environment']
+        categories = [store.categories(column) + [None] for column in columns]
+        codes = [store.codes(column, rows) for column in columns]
+        # One integer key per combination; code -1 (missing) maps to the trailing None
+        combined = tagged.astype(np.int64)
+        for column_codes, values in zip(codes, categories):
+            combined = combined * len(values) + np.where(column_codes < 0, len(values) - 1, column_codes)
+        combinations, inverse = np.unique(combined, return_inverse=True)
+        
+        issues_by_combination = []
+        for value in combinations.tolist():
+            decoded = []
+            for values in reversed(categories):
+                value, code = divmod(value, len(values))
+                decoded.append(values[code])
+            environment, owner, location = decoded
+            issues_by_combination.append(WorkshopUtilities._issues(
+                bool(value), location,
+                'unassigned' if owner is None else owner,
+                'untagged' if environment is None else environment
+            ))
+        has_issues = np.array([bool(issues) for issues in issues_by_combination], dtype=bool)
+        
+        flagged = np.flatnonzero(has_issues[inverse])
+        flagged_rows = rows[flagged]
+        type_codes = store.codes('type', flagged_rows)
+        types = store.categories('type') + [None]
+        report['non_compliant_resources'] = [{
+            'resource_id': resource_id,
+            'resource_name': name,
+            'resource_type': types[type_code],
+            'issues': list(issues_by_combination[combination])
+        } for resource_id, name, type_code, combination in zip(
+            store.ids(flagged_rows), store.names(flagged_rows),
+            type_codes.tolist(), inverse[flagged].tolist()
+        )]
+        return WorkshopUtilities._finish_compliance_report(report)
+    
+    @staticmethod
+    def _compliance_issues(resource) -> List[str]:
+        """Business-rule violations for a single resource"""
+        tags = resource.tags or {}
+        return WorkshopUtilities._issues(bool(tags), resource.location,
+                                         tags.get('owner', 'unassigned'),
+                                         tags.get('environment', 'untagged'))
+    
+    @staticmethod
+    def _issues(tagged: bool, location: str, owner: str, environment: str) -> List[str]:
+        """Business-rule violations for one combination of resource attributes"""
+        compliance_issues = []
+        
+        if not tagged:
+            compliance_issues.append('No tags')
+        
+        if location not in VALID_LOCATIONS:
+            compliance_issues.append(f'Invalid location: {location}')
+        
+        if owner not in VALID_OWNERS and owner != 'unassigned':
+            compliance_issues.append(f'Unauthorized owner: {owner}')
+        
+        if environment not in VALID_ENVIRONMENTS and environment != 'untagged':
+            compliance_issues.append(f'Invalid environment: {environment}')
+        
+        return compliance_issues
+    
+    @staticmethod
+    def _finish_compliance_report(report: Dict[str, Any]) -> Dict[str, Any]:
+        """Convert defaultdicts to regular dicts"""
         for key in ['resources_by_owner', 'resources_by_environment', 
                    'resources_by_location', 'resources_by_type']:
             report[key] = dict(report[key])